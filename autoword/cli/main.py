@@ -170,7 +170,8 @@ def inspect(document_path):
                 if comments:
                     click.echo(f"\n💬 批注详情:")
                     for i, comment in enumerate(comments[:5], 1):
-                        click.echo(f"   {i}. {comment.author} (第{comment.page}页): {comment.comment_text[:50]}...")
+                        location = f"第{comment.page}页" if comment.page is not None else f"位置 {comment.range_start}"
+                        click.echo(f"   {i}. {comment.author} ({location}): {comment.comment_text[:50]}...")
                     
                     if len(comments) > 5:
                         click.echo(f"   ... 还有 {len(comments) - 5} 个批注")
@@ -0,0 +1,287 @@
+"""
+AutoWord Comment Reader
+直接从 DOCX 包读取批注，无需 Word 分页
+
+通过 COM 读取批注时，每个批注的 Scope.Information 都会触发 Word 重新分页，
+批注较多的文档仅检查就需要数分钟。本模块一次流式解析：
+
+- word/comments.xml：批注作者、时间和内容
+- word/commentsExtended.xml：回复关系和完成状态
+- word/document.xml：commentRangeStart/commentRangeEnd 锚点的字符位置和锚点文本
+
+字符位置按 Word Range 的计数方式累计：文本逐字计数，段落标记、制表符、换行、
+域字符、批注/脚注引用标记、内嵌图片以及表格行结束标记各计 1。文本框内容属于
+独立的文字部分，不计入正文位置；mc:AlternateContent 只计 mc:Choice，
+mc:Fallback 中的备用内容（如图形的 VML 版本）与 paragraph_table 一样跳过。
+w:hyperlink 和 w:fldSimple 在 Word 中是域（HYPERLINK 或 instr 中的域代码），
+域开始符、域代码、分隔符和域结束符虽不可见，也占用位置。页码只有 Word 排版后才能得到，这里留空，
+由 DocumentInspector.resolve_comment_pages 按需计算。
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .models import Comment
+from .exceptions import DocumentError
+
+
+logger = logging.getLogger(__name__)
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+W15_NS = "http://schemas.microsoft.com/office/word/2012/wordml"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+W = f"{{{W_NS}}}"
+W14 = f"{{{W14_NS}}}"
+W15 = f"{{{W15_NS}}}"
+MC = f"{{{MC_NS}}}"
+R = f"{{{R_NS}}}"
+
+ANCHOR_TEXT_LIMIT = 50  # 与 COM 提取保持一致
+
+# 在正文中占一个字符位置的元素
+_SINGLE_CHAR_TAGS = {
+    W + "tab": "\t",
+    W + "br": "\n",
+    W + "cr": "\n",
+    W + "noBreakHyphen": "-",
+    W + "softHyphen": "",
+    W + "sym": "",
+    W + "fldChar": "",
+    W + "commentReference": "",
+    W + "footnoteReference": "",
+    W + "endnoteReference": "",
+    W + "drawing": "",
+    W + "pict": "",
+    W + "object": "",
+}
+
+
+def read_comments(docx_path: str) -> List[Comment]:
+    """
+    从 DOCX 包读取批注
+
+    Args:
+        docx_path: 文档路径
+
+    Returns:
+        按锚点位置排序的批注列表（页码为空）
+
+    Raises:
+        DocumentError: 无法读取文档包
+    """
+    try:
+        package = zipfile.ZipFile(docx_path)
+    except (OSError, zipfile.BadZipFile) as e:
+        raise DocumentError(f"无法打开文档包 {docx_path}: {e}")
+
+    with package:
+        names = set(package.namelist())
+        if "word/comments.xml" not in names:
+            return []
+
+        try:
+            contents = _read_comment_contents(package)
+            extended = _read_comments_extended(package) if "word/commentsExtended.xml" in names else {}
+            rels_name = "word/_rels/document.xml.rels"
+            targets = _read_relationship_targets(package, rels_name) if rels_name in names else {}
+            with package.open("word/document.xml") as stream:
+                anchors = _read_anchors(stream, targets)
+        except (KeyError, ET.ParseError) as e:
+            raise DocumentError(f"解析批注失败 {docx_path}: {e}")
+
+    # 与 Word 的 Comments 集合一致：按锚点位置排序
+    ordered = sorted(
+        (anchor + (xml_id,) for xml_id, anchor in anchors.items() if xml_id in contents),
+        key=lambda item: (item[0], item[3])
+    )
+    ids = {xml_id: f"comment_{i}" for i, (_, _, _, _, xml_id) in enumerate(ordered, 1)}
+    para_to_id = {contents[xml_id]["para_id"]: ids[xml_id] for xml_id in ids if contents[xml_id]["para_id"]}
+
+    comments = []
+    for start, end, anchor_text, _, xml_id in ordered:
+        content = contents[xml_id]
+        extra = extended.get(content["para_id"], {})
+        comments.append(Comment(
+            id=ids[xml_id],
+            author=content["author"],
+            comment_text=content["text"],
+            anchor_text=anchor_text.strip()[:ANCHOR_TEXT_LIMIT],
+            range_start=start,
+            range_end=end,
+            created_date=content["date"],
+            parent_id=para_to_id.get(extra.get("parent")),
+            resolved=extra.get("done", False)
+        ))
+
+    skipped = len(contents) - len(comments)
+    if skipped:
+        logger.debug(f"{skipped} 个批注在正文中没有锚点，已跳过")
+
+    return comments
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _read_comment_contents(package: zipfile.ZipFile) -> Dict[str, dict]:
+    """读取 comments.xml：批注ID到作者、时间、内容和最后一段 paraId 的映射"""
+    contents = {}
+    with package.open("word/comments.xml") as stream:
+        for _, element in ET.iterparse(stream, events=("end",)):
+            if element.tag != W + "comment":
+                continue
+            paragraphs = element.findall(f"{W}p")
+            text = "\n".join("".join(node.text or "" for node in paragraph.iter(W + "t"))
+                             for paragraph in paragraphs)
+            contents[element.get(W + "id")] = {
+                "author": element.get(W + "author") or "",
+                "date": _parse_date(element.get(W + "date")),
+                "text": text.strip(),
+                # commentsExtended 通过批注最后一段的 paraId 关联
+                "para_id": paragraphs[-1].get(W14 + "paraId") if paragraphs else None,
+            }
+            element.clear()
+    return contents
+
+
+def _read_comments_extended(package: zipfile.ZipFile) -> Dict[str, dict]:
+    """读取 commentsExtended.xml：paraId 到上级 paraId 和完成状态的映射"""
+    extended = {}
+    with package.open("word/commentsExtended.xml") as stream:
+        for _, element in ET.iterparse(stream, events=("end",)):
+            if element.tag != W15 + "commentEx":
+                continue
+            extended[element.get(W15 + "paraId")] = {
+                "parent": element.get(W15 + "paraIdParent"),
+                "done": element.get(W15 + "done") in ("1", "true", "on"),
+            }
+    return extended
+
+
+def _read_relationship_targets(package: zipfile.ZipFile, name: str) -> Dict[str, str]:
+    """读取关系部件：关系ID到目标的映射（外部超链接的地址）"""
+    targets = {}
+    with package.open(name) as stream:
+        for _, element in ET.iterparse(stream, events=("end",)):
+            if element.tag == f"{{{PKG_REL_NS}}}Relationship":
+                targets[element.get("Id")] = element.get("Target") or ""
+    return targets
+
+
+def _field_code(element: ET.Element, targets: Dict[str, str]) -> str:
+    """w:hyperlink / w:fldSimple 在 Word 中对应的域代码"""
+    if element.tag == W + "fldSimple":
+        return element.get(W + "instr") or ""
+    parts = ["HYPERLINK"]
+    target = targets.get(element.get(R + "id"))
+    if target:
+        parts.append(f'"{target}"')
+    for attribute, switch in (("anchor", "l"), ("tooltip", "o"), ("tgtFrame", "t")):
+        value = element.get(W + attribute)
+        if value:
+            parts.append(f'\\{switch} "{value}"')
+    return f" {' '.join(parts)} "
+
+
+def _read_anchors(stream, targets: Optional[Dict[str, str]] = None) -> Dict[str, Tuple[int, int, str, int]]:
+    """
+    流式扫描 document.xml，记录批注锚点
+
+    Args:
+        stream: document.xml 数据流
+        targets: 文档关系ID到目标的映射，用于计算超链接域代码的长度
+
+    Returns:
+        批注ID到 (起始位置, 结束位置, 锚点文本, 出现顺序) 的映射
+    """
+    position = 0
+    sequence = 0
+    skipped_depth = 0  # 位于文本框或兼容性备用内容中
+    open_anchors: Dict[str, dict] = {}
+    anchors: Dict[str, Tuple[int, int, str, int]] = {}
+
+    def add_text(text: str, visible: bool = True):
+        nonlocal position
+        position += len(text)
+        if visible:
+            for anchor in open_anchors.values():
+                if anchor["length"] < ANCHOR_TEXT_LIMIT * 4:
+                    anchor["parts"].append(text)
+                    anchor["length"] += len(text)
+
+    def open_anchor() -> dict:
+        nonlocal sequence
+        sequence += 1
+        return {"start": position, "parts": [], "length": 0, "order": sequence}
+
+    def close_anchor(xml_id: str):
+        anchor = open_anchors.pop(xml_id)
+        anchors[xml_id] = (anchor["start"], position, "".join(anchor["parts"]), anchor["order"])
+
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if tag in (W + "txbxContent", MC + "Fallback"):
+            skipped_depth += 1 if event == "start" else -1
+            continue
+        if skipped_depth:
+            continue
+
+        if tag in (W + "hyperlink", W + "fldSimple"):
+            if event == "start":
+                # 域开始符 + 域代码 + 分隔符，之后是域结果（元素内容）
+                add_text(" " * (len(_field_code(element, targets or {})) + 2), visible=False)
+            else:
+                add_text(" ", visible=False)  # 域结束符
+            continue
+
+        if event == "start":
+            if tag == W + "commentRangeStart":
+                xml_id = element.get(W + "id")
+                open_anchors[xml_id] = open_anchor()
+            elif tag == W + "commentRangeEnd":
+                xml_id = element.get(W + "id")
+                if xml_id in open_anchors:
+                    close_anchor(xml_id)
+            continue
+
+        if tag == W + "t":
+            add_text(element.text or "")
+        elif tag in (W + "delText", W + "instrText"):
+            add_text(element.text or "", visible=False)
+        elif tag in _SINGLE_CHAR_TAGS:
+            if tag == W + "commentReference":
+                xml_id = element.get(W + "id")
+                if xml_id not in anchors:
+                    if xml_id in open_anchors:
+                        close_anchor(xml_id)
+                    else:
+                        # 没有范围的批注锚定在引用标记处
+                        anchors[xml_id] = (position, position, "", open_anchor()["order"])
+            marker = _SINGLE_CHAR_TAGS[tag]
+            add_text(marker or " ", visible=bool(marker))
+        elif tag == W + "p":
+            add_text("\r")
+            element.clear()
+        elif tag == W + "tr":
+            position += 1  # 行结束标记
+            element.clear()
+
+    # 缺少 commentRangeEnd 的批注延伸到文档末尾
+    for xml_id in list(open_anchors):
+        close_anchor(xml_id)
+
+    return anchors
@@ -4,7 +4,8 @@ Word 文档检查器，提取批注和文档结构
 """
 
 import logging
-from typing import List, Any, Optional
+import os
+from typing import List, Any, Optional, Iterable
 from datetime import datetime
 
 import win32com.client as win32
@@ -15,6 +16,7 @@ from .models import (
     DocumentStructure, DocumentSnapshot
 )
 from .utils import calculate_file_checksum, truncate_text
+from .comment_reader import read_comments
 from .exceptions import DocumentError, COMError
 
 
@@ -51,7 +53,86 @@ class DocumentInspector:
             raise DocumentError(f"获取文档信息失败: {str(e)}")
     
     def extract_comments(self, document) -> List[Comment]:
-        """提取文档批注"""
+        """
+        提取文档批注
+        
+        已保存的 .docx/.docm 文档直接解析包内的 comments.xml，不触发分页，
+        页码留空，由 resolve_comment_pages 按需计算；未保存的文档通过 COM 读取。
+        
+        Args:
+            document: Word 文档对象
+            
+        Returns:
+            批注列表
+        """
+        package_path = self._saved_package_path(document)
+        if package_path:
+            try:
+                comments = read_comments(package_path)
+                if len(comments) != document.Comments.Count:
+                    logger.info(f"OOXML 批注数 {len(comments)} 与 Word 不一致，改用 COM 读取")
+                elif not self._anchors_match(document, comments):
+                    logger.info("OOXML 批注位置与 Word 不一致，改用 COM 读取")
+                else:
+                    logger.debug(f"从 OOXML 读取 {len(comments)} 个批注")
+                    return comments
+            except Exception as e:
+                logger.warning(f"从 OOXML 读取批注失败，改用 COM 读取: {str(e)}")
+        
+        return self._extract_comments_com(document)
+    
+    def resolve_comment_pages(self, document, comments: List[Comment],
+                              comment_ids: Optional[Iterable[str]] = None) -> List[Comment]:
+        """
+        按需计算批注页码
+        
+        Args:
+            document: Word 文档对象
+            comments: 批注列表
+            comment_ids: 需要页码的批注ID，None 表示全部
+            
+        Returns:
+            原批注列表（页码已就地填充）
+        """
+        wanted = set(comment_ids) if comment_ids is not None else None
+        for comment in comments:
+            if comment.page is not None or (wanted is not None and comment.id not in wanted):
+                continue
+            try:
+                scope = document.Range(comment.range_start, comment.range_end)
+                comment.page = scope.Information(1)  # wdActiveEndPageNumber
+            except Exception as e:
+                logger.warning(f"计算批注 {comment.id} 页码失败: {str(e)}")
+        
+        return comments
+    
+    def _anchors_match(self, document, comments: List[Comment]) -> bool:
+        """
+        用最后一个批注的 Scope 核对 OOXML 计算的位置
+        
+        位置偏差会向后累积，最后一个锚点最能暴露偏差；Scope.Start/End 不触发分页。
+        """
+        if not comments:
+            return True
+        last = comments[-1]
+        scope = document.Comments.Item(len(comments)).Scope
+        return (scope.Start, scope.End) == (last.range_start, last.range_end)
+    
+    def _saved_package_path(self, document) -> Optional[str]:
+        """已保存且磁盘内容与内存一致的 OOXML 文档路径"""
+        try:
+            path = document.FullName
+            if not isinstance(path, str) or document.Saved is not True:
+                return None
+        except Exception:
+            return None
+        
+        if os.path.splitext(path)[1].lower() in (".docx", ".docm") and os.path.isfile(path):
+            return path
+        return None
+    
+    def _extract_comments_com(self, document) -> List[Comment]:
+        """通过 COM 逐个提取批注（含页码）"""
         comments = []
         
         try:
@@ -10,8 +10,9 @@ from datetime import datetime
 
 from .models import (
     Task, Comment, DocumentStructure, DocumentSnapshot, 
-    ValidationResult, TaskType
+    ValidationResult, TaskType, TaskResult, LocatorType
 )
+from .interval_tree import IntervalTree
 from .constants import FORMAT_TYPES
 from .exceptions import FormatProtectionError
 
@@ -30,10 +31,22 @@ class FormatChange:
     authorized: bool
     source_comment_id: Optional[str] = None
     timestamp: datetime = None
+    range_start: Optional[int] = None  # 变更元素的字符范围（文档级变更为 None）
+    range_end: Optional[int] = None
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
+    
+    @property
+    def position(self) -> Optional[Tuple[int, int]]:
+        """变更的字符范围，未显式给出时从 element_id（如 heading_0_10）解析"""
+        if self.range_start is not None and self.range_end is not None:
+            return self.range_start, self.range_end
+        parts = self.element_id.rsplit("_", 2)
+        if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+            return int(parts[1]), int(parts[2])
+        return None
 
 
 @dataclass
@@ -108,6 +121,8 @@ class DocumentComparator:
                         change_type="heading_level_change",
                         element_type="heading",
                         element_id=f"heading_{pos[0]}_{pos[1]}",
+                        range_start=pos[0],
+                        range_end=pos[1],
                         old_value=before_heading.level,
                         new_value=after_heading.level,
                         authorized=False  # 需要后续验证
@@ -118,6 +133,8 @@ class DocumentComparator:
                         change_type="heading_style_change",
                         element_type="heading",
                         element_id=f"heading_{pos[0]}_{pos[1]}",
+                        range_start=pos[0],
+                        range_end=pos[1],
                         old_value=before_heading.style,
                         new_value=after_heading.style,
                         authorized=False  # 需要后续验证
@@ -130,6 +147,8 @@ class DocumentComparator:
                     change_type="heading_added",
                     element_type="heading",
                     element_id=f"heading_{pos[0]}_{pos[1]}",
+                    range_start=pos[0],
+                    range_end=pos[1],
                     old_value=None,
                     new_value=after_heading.level,
                     authorized=False  # 需要后续验证
@@ -142,6 +161,8 @@ class DocumentComparator:
                     change_type="heading_removed",
                     element_type="heading",
                     element_id=f"heading_{pos[0]}_{pos[1]}",
+                    range_start=pos[0],
+                    range_end=pos[1],
                     old_value=before_heading.level,
                     new_value=None,
                     authorized=False  # 需要后续验证
@@ -226,6 +247,8 @@ class DocumentComparator:
                         change_type="hyperlink_address_change",
                         element_type="hyperlink",
                         element_id=f"link_{pos[0]}_{pos[1]}",
+                        range_start=pos[0],
+                        range_end=pos[1],
                         old_value=before_link.address,
                         new_value=after_link.address,
                         authorized=False  # 需要后续验证
@@ -235,7 +258,12 @@ class DocumentComparator:
 
 
 class AuthorizationChecker:
-    """授权检查器 - 验证格式变更是否有相应的批注授权"""
+    """授权检查器 - 验证格式变更是否有相应的批注授权
+    
+    有批注来源的任务按执行时解析出的字符范围存入按任务类型划分的区间树，
+    带范围的变更通过区间重叠查询查找授权任务，复杂度 O(变更数 × log 任务数)。
+    文档级变更（样式、目录）以及无法解析范围的任务仍按任务类型匹配。
+    """
     
     def __init__(self):
         """初始化授权检查器"""
@@ -244,7 +272,8 @@ class AuthorizationChecker:
     def check_authorization(self, 
                           changes: List[FormatChange],
                           executed_tasks: List[Task],
-                          comments: List[Comment]) -> List[FormatChange]:
+                          comments: List[Comment],
+                          task_ranges: Optional[Dict[str, Tuple[int, int]]] = None) -> List[FormatChange]:
         """
         检查格式变更的授权状态
         
@@ -252,20 +281,19 @@ class AuthorizationChecker:
             changes: 格式变更列表
             executed_tasks: 已执行的任务列表
             comments: 批注列表
+            task_ranges: 任务ID到执行时解析出的字符范围（见 TaskResult.range_start/range_end）
             
         Returns:
             更新授权状态的格式变更列表
         """
-        # 创建任务映射
-        task_map = {task.id: task for task in executed_tasks}
         comment_map = {comment.id: comment for comment in comments}
         
-        # 创建位置到任务的映射
-        position_to_tasks = self._create_position_mapping(executed_tasks)
+        # 创建任务类型到区间树的索引
+        task_index = self._build_task_index(executed_tasks, comment_map, task_ranges or {})
         
         for change in changes:
             # 检查是否有对应的授权任务
-            authorized_task = self._find_authorizing_task(change, position_to_tasks, task_map)
+            authorized_task = self._find_authorizing_task(change, task_index)
             
             if authorized_task:
                 change.authorized = True
@@ -277,46 +305,78 @@ class AuthorizationChecker:
         
         return changes
     
-    def _create_position_mapping(self, tasks: List[Task]) -> Dict[str, List[Task]]:
-        """创建位置到任务的映射"""
-        position_map = {}
-        
-        for task in tasks:
-            # 根据定位器类型创建位置键
-            if task.locator.by.value == "range":
-                key = f"range_{task.locator.value}"
-            elif task.locator.by.value == "bookmark":
-                key = f"bookmark_{task.locator.value}"
-            elif task.locator.by.value == "heading":
-                key = f"heading_{task.locator.value}"
-            elif task.locator.by.value == "find":
-                key = f"find_{task.locator.value}"
-            else:
-                key = f"unknown_{task.locator.value}"
+    def _build_task_index(self,
+                          tasks: List[Task],
+                          comment_map: Dict[str, Comment],
+                          task_ranges: Dict[str, Tuple[int, int]]) -> Dict[TaskType, "_TaskTypeIndex"]:
+        """
+        创建任务索引
+        
+        Args:
+            tasks: 已执行的任务列表
+            comment_map: 批注ID到批注的映射
+            task_ranges: 任务ID到执行时解析出的字符范围
+            
+        Returns:
+            任务类型到该类型授权任务索引的映射
+        """
+        index: Dict[TaskType, _TaskTypeIndex] = {}
+        
+        for order, task in enumerate(tasks):
+            if not task.source_comment_id:  # 必须有批注授权
+                continue
             
-            if key not in position_map:
-                position_map[key] = []
-            position_map[key].append(task)
+            type_index = index.setdefault(task.type, _TaskTypeIndex())
+            type_index.add(order, task, self._resolve_task_range(task, comment_map, task_ranges))
         
-        return position_map
+        return index
+    
+    def _resolve_task_range(self,
+                            task: Task,
+                            comment_map: Dict[str, Comment],
+                            task_ranges: Dict[str, Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+        """解析任务的字符范围：执行时范围 > 范围定位器 > 来源批注范围"""
+        if task.id in task_ranges:
+            return task_ranges[task.id]
+        
+        if task.locator.by == LocatorType.RANGE:
+            range_spec = task.locator.value
+            try:
+                if '-' in range_spec:
+                    start, end = map(int, range_spec.split('-'))
+                    return start, end
+                elif ',' in range_spec:
+                    start, length = map(int, range_spec.split(','))
+                    return start, start + length
+                else:
+                    start = int(range_spec)
+                    return start, start + 1
+            except ValueError:
+                logger.debug(f"无法解析任务 {task.id} 的范围定位器: {range_spec}")
+        
+        comment = comment_map.get(task.source_comment_id)
+        if comment is not None:
+            return comment.range_start, comment.range_end
+        
+        return None
     
     def _find_authorizing_task(self, 
                              change: FormatChange,
-                             position_map: Dict[str, List[Task]],
-                             task_map: Dict[str, Task]) -> Optional[Task]:
-        """查找授权此变更的任务"""
-        # 根据变更类型查找可能的授权任务
-        relevant_task_types = self._get_relevant_task_types(change.change_type)
-        
-        # 在位置映射中查找相关任务
-        for tasks in position_map.values():
-            for task in tasks:
-                if (task.type in relevant_task_types and 
-                    task.source_comment_id and  # 必须有批注授权
-                    self._is_task_relevant_to_change(task, change)):
-                    return task
+                             task_index: Dict[TaskType, "_TaskTypeIndex"]) -> Optional[Task]:
+        """查找授权此变更的任务（多个候选时取最先执行的任务）"""
+        position = change.position
+        best: Optional[Tuple[int, Task]] = None
         
-        return None
+        # 根据变更类型查找可能的授权任务
+        for task_type in self._get_relevant_task_types(change.change_type):
+            type_index = task_index.get(task_type)
+            if type_index is None:
+                continue
+            candidate = type_index.find(position)
+            if candidate is not None and (best is None or candidate[0] < best[0]):
+                best = candidate
+        
+        return best[1] if best else None
     
     def _get_relevant_task_types(self, change_type: str) -> List[TaskType]:
         """获取与变更类型相关的任务类型"""
@@ -330,13 +390,33 @@ class AuthorizationChecker:
         }
         
         return type_mapping.get(change_type, [])
+
+
+class _TaskTypeIndex:
+    """同一类型授权任务的索引"""
+    
+    def __init__(self):
+        self.tree: IntervalTree = IntervalTree()  # 值为 (执行顺序, 任务)
+        self.first: Optional[Tuple[int, Task]] = None
+        self.first_unranged: Optional[Tuple[int, Task]] = None
+    
+    def add(self, order: int, task: Task, task_range: Optional[Tuple[int, int]]):
+        entry = (order, task)
+        if self.first is None:
+            self.first = entry
+        if task_range is None:
+            if self.first_unranged is None:
+                self.first_unranged = entry
+        else:
+            self.tree.add(task_range[0], task_range[1], entry)
     
-    def _is_task_relevant_to_change(self, task: Task, change: FormatChange) -> bool:
-        """判断任务是否与变更相关"""
-        # 这里可以实现更复杂的相关性判断逻辑
-        # 目前简化为基于任务类型的判断
-        relevant_types = self._get_relevant_task_types(change.change_type)
-        return task.type in relevant_types
+    def find(self, position: Optional[Tuple[int, int]]) -> Optional[Tuple[int, Task]]:
+        """文档级变更返回第一个任务；带范围的变更返回最早的重叠任务或无范围任务"""
+        if position is None:
+            return self.first
+        overlapping = self.tree.first_overlapping(position[0], position[1])
+        candidates = [entry for entry in (overlapping, self.first_unranged) if entry is not None]
+        return min(candidates, key=lambda entry: entry[0]) if candidates else None
 
 
 class FormatValidator:
@@ -351,7 +431,8 @@ class FormatValidator:
                                 before_snapshot: DocumentSnapshot,
                                 after_snapshot: DocumentSnapshot,
                                 executed_tasks: List[Task],
-                                comments: List[Comment]) -> ValidationReport:
+                                comments: List[Comment],
+                                task_results: Optional[List[TaskResult]] = None) -> ValidationReport:
         """
         验证执行结果
         
@@ -360,6 +441,7 @@ class FormatValidator:
             after_snapshot: 执行后快照
             executed_tasks: 已执行的任务列表
             comments: 批注列表
+            task_results: 任务执行结果，提供执行时定位到的字符范围
             
         Returns:
             验证报告
@@ -374,8 +456,13 @@ class FormatValidator:
             logger.info(f"检测到 {len(all_changes)} 个格式变更")
             
             # 2. 检查变更的授权状态
+            task_ranges = {
+                result.task_id: (result.range_start, result.range_end)
+                for result in task_results or []
+                if result.range_start is not None and result.range_end is not None
+            }
             authorized_changes = self.auth_checker.check_authorization(
-                all_changes, executed_tasks, comments
+                all_changes, executed_tasks, comments, task_ranges
             )
             
             # 3. 分类变更
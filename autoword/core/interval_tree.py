@@ -0,0 +1,110 @@
+"""
+AutoWord Interval Tree
+区间树 - 按字符范围快速查找重叠区间
+
+区间按起点排序后存入数组，数组隐式构成平衡二叉树（中点为根），每个节点
+记录子树内的最大终点。重叠查询时跳过最大终点在查询起点之前的子树、以及
+起点在查询终点之后的右侧部分，复杂度 O(log n + k)。
+
+区间使用 Word Range 的半开语义 [start, end)；空区间按 [start, start + 1)
+处理，使批注锚点等零长度位置也能命中。
+"""
+
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+def normalize_range(start: int, end: int) -> Tuple[int, int]:
+    """规范化区间（交换颠倒的端点，空区间扩展为长度 1）"""
+    if end < start:
+        start, end = end, start
+    return start, max(end, start + 1)
+
+
+class IntervalTree(Generic[T]):
+    """静态区间树，插入后首次查询时重建"""
+
+    def __init__(self):
+        """初始化区间树"""
+        self._items: List[Tuple[int, int, int, T]] = []  # (start, end, 插入序号, 值)
+        self._max_end: List[int] = []
+        self._dirty = False
+
+    def add(self, start: int, end: int, value: T):
+        """
+        添加区间
+
+        Args:
+            start: 起始位置
+            end: 结束位置（不含）
+            value: 关联的值
+        """
+        start, end = normalize_range(start, end)
+        self._items.append((start, end, len(self._items), value))
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _build(self):
+        self._items.sort(key=lambda item: (item[0], item[2]))
+        self._max_end = [0] * len(self._items)
+        self._fill_max_end(0, len(self._items) - 1)
+        self._dirty = False
+
+    def _fill_max_end(self, low: int, high: int) -> int:
+        if low > high:
+            return -1
+        mid = (low + high) // 2
+        self._max_end[mid] = max(self._items[mid][1],
+                                 self._fill_max_end(low, mid - 1),
+                                 self._fill_max_end(mid + 1, high))
+        return self._max_end[mid]
+
+    def overlapping(self, start: int, end: int) -> List[T]:
+        """
+        查找与 [start, end) 重叠的全部区间
+
+        Args:
+            start: 查询起始位置
+            end: 查询结束位置（不含）
+
+        Returns:
+            重叠区间的值，按插入顺序排列
+        """
+        if self._dirty:
+            self._build()
+        start, end = normalize_range(start, end)
+        found: List[Tuple[int, T]] = []
+        stack = [(0, len(self._items) - 1)]
+        while stack:
+            low, high = stack.pop()
+            if low > high:
+                continue
+            mid = (low + high) // 2
+            if self._max_end[mid] <= start:
+                continue  # 子树内所有区间都在查询起点之前结束
+            item_start, item_end, order, value = self._items[mid]
+            stack.append((low, mid - 1))
+            if item_start < end:
+                if item_end > start:
+                    found.append((order, value))
+                stack.append((mid + 1, high))
+        found.sort(key=lambda item: item[0])
+        return [value for _, value in found]
+
+    def first_overlapping(self, start: int, end: int) -> Optional[T]:
+        """
+        查找最早插入的重叠区间
+
+        Args:
+            start: 查询起始位置
+            end: 查询结束位置（不含）
+
+        Returns:
+            重叠区间的值，没有时返回 None
+        """
+        values = self.overlapping(start, end)
+        return values[0] if values else None
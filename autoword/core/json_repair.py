@@ -0,0 +1,476 @@
+"""
+AutoWord JSON Repair
+容错 JSON 解析器：一次线性扫描修复 LLM 输出中的常见格式问题
+
+LLMClient 以前对每次响应依次尝试 json.loads、_clean_json_content（多轮正则）
+和 _aggressive_json_fix，每一步都重写整个字符串，全部失败后再请求一次 LLM。
+repair_json 在一次扫描中处理：
+
+- 代码块标记和 JSON 前后的说明文字
+- // 和 /* */ 注释
+- 尾随逗号、多余逗号、缺失的逗号和冒号
+- 中文全角引号和标点（“ ” ‘ ’ ， ：）、单引号字符串
+- 字符串内未转义的引号、控制字符和非法转义
+- 未加引号的键和值、Python 字面量（True/False/None）
+- 截断的尾部（未闭合的对象和数组，丢弃不完整的成员）
+
+响应截断在字符串、数字或字面量中间时无法知道原值（"size_pt": 1 可能是 14），
+repair_json 抛出 JSONRepairError，由调用方重新请求，而不是补全成错误的值。
+
+每处修复都记录在 RepairResult.repairs 中（位置、类型、说明）。
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+from .exceptions import LLMError
+
+
+# 修复类型
+PREFIX_TEXT = "prefix_text"
+SUFFIX_TEXT = "suffix_text"
+COMMENT = "comment"
+TRAILING_COMMA = "trailing_comma"
+EXTRA_COMMA = "extra_comma"
+MISSING_COMMA = "missing_comma"
+MISSING_COLON = "missing_colon"
+MISSING_VALUE = "missing_value"
+FULLWIDTH_QUOTE = "fullwidth_quote"
+FULLWIDTH_PUNCTUATION = "fullwidth_punctuation"
+SINGLE_QUOTES = "single_quotes"
+UNESCAPED_QUOTE = "unescaped_quote"
+CONTROL_CHARACTER = "control_character"
+INVALID_ESCAPE = "invalid_escape"
+UNQUOTED_KEY = "unquoted_key"
+UNQUOTED_VALUE = "unquoted_value"
+PYTHON_LITERAL = "python_literal"
+NUMBER_FORMAT = "number_format"
+MISMATCHED_BRACKET = "mismatched_bracket"
+UNEXPECTED_CHARACTER = "unexpected_character"
+TRUNCATED = "truncated"
+
+
+_WHITESPACE = " \t\r\n﻿　\xa0"
+_FULLWIDTH_PUNCTUATION = {"，": ",", "：": ":", "｛": "{", "｝": "}", "［": "[", "］": "]"}
+# 起始引号 -> 可作为结束的引号
+_QUOTES = {'"': '"', "“": "”\"", "”": "”\"", "'": "'", "‘": "’'", "’": "’'"}
+_STRUCTURAL_AFTER_STRING = ",:}]，：｝］"
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+_LITERALS = {"true": "true", "false": "false", "null": "null",
+             "True": "true", "False": "false", "None": "null",
+             "NaN": "null", "Infinity": "null", "-Infinity": "null", "undefined": "null"}
+_JSON_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?\Z")
+_BARE_TOKEN_END = set(_WHITESPACE) | set(",:{}[]\"'“”‘’/") | set(_FULLWIDTH_PUNCTUATION)
+_BARE_VALUE_END = set(",}]\n\r") | {"，", "｝", "］"}
+
+
+class JSONRepairError(LLMError):
+    """JSON 修复失败"""
+
+    def __init__(self, message: str, position: Optional[int] = None):
+        super().__init__(message)
+        self.position = position
+
+
+@dataclass
+class JsonRepair:
+    """一处修复"""
+    position: int       # 原始内容中的字符位置
+    kind: str
+    detail: str = ""
+
+    def __str__(self) -> str:
+        return f"{self.kind}@{self.position}" + (f" ({self.detail})" if self.detail else "")
+
+
+@dataclass
+class RepairResult:
+    """修复结果"""
+    text: str                                   # 可被 json.loads 解析的 JSON 文本
+    value: Any                                  # 解析后的值
+    repairs: List[JsonRepair] = field(default_factory=list)
+
+    @property
+    def repaired(self) -> bool:
+        return bool(self.repairs)
+
+    def summary(self) -> str:
+        """修复摘要，用于日志"""
+        return ", ".join(str(repair) for repair in self.repairs[:20]) + (
+            f" ... (+{len(self.repairs) - 20})" if len(self.repairs) > 20 else "")
+
+
+class _Frame:
+    """一个未闭合的对象或数组"""
+    __slots__ = ("kind", "state", "member_start", "position")
+
+    def __init__(self, kind: str, member_start: int, position: int):
+        self.kind = kind                  # "{" 或 "["
+        self.state = "key" if kind == "{" else "value"  # key/colon/value/after
+        self.member_start = member_start  # 当前成员在输出中的起始位置（用于丢弃截断成员）
+        self.position = position
+
+
+class _Repairer:
+    """单遍扫描修复器"""
+
+    def __init__(self, content: str):
+        self.s = content
+        self.n = len(content)
+        self.i = 0
+        self.out: List[str] = []
+        self.stack: List[_Frame] = []
+        self.repairs: List[JsonRepair] = []
+        self.done = False
+        self.truncated_value: Optional[JsonRepair] = None
+
+    def note(self, kind: str, position: int, detail: str = ""):
+        self.repairs.append(JsonRepair(position, kind, detail))
+
+    # 扫描主循环
+
+    def run(self) -> str:
+        self._skip_prefix()
+        while self.i < self.n and not self.done:
+            ch = self.s[self.i]
+            if ch in _WHITESPACE:
+                self.i += 1
+            elif ch == "/" and self.i + 1 < self.n and self.s[self.i + 1] in "/*":
+                self._skip_comment()
+            elif ch in _FULLWIDTH_PUNCTUATION:
+                self.note(FULLWIDTH_PUNCTUATION, self.i, ch)
+                self._structural(_FULLWIDTH_PUNCTUATION[ch])
+            elif ch in "{}[],:":
+                self._structural(ch)
+            elif ch in _QUOTES:
+                self._string(ch)
+            else:
+                self._bare_token()
+
+        if self.i < self.n and self.s[self.i:].strip(_WHITESPACE):
+            self.note(SUFFIX_TEXT, self.i, f"{self.n - self.i} characters dropped")
+        if self.stack:
+            self._close_truncated()
+        return "".join(self.out)
+
+    def _skip_prefix(self):
+        starts = [pos for pos in (self.s.find("{"), self.s.find("[")) if pos != -1]
+        start = min(starts) if starts else self.n
+        if self.s[:start].strip(_WHITESPACE):
+            self.note(PREFIX_TEXT, 0, f"{start} characters dropped")
+        self.i = start
+
+    def _skip_comment(self):
+        start = self.i
+        if self.s.startswith("/*", self.i):
+            end = self.s.find("*/", self.i + 2)
+            self.i = self.n if end == -1 else end + 2
+        else:
+            end = self.s.find("\n", self.i)
+            self.i = self.n if end == -1 else end + 1
+        self.note(COMMENT, start)
+
+    # 结构符号
+
+    def _structural(self, ch: str):
+        position = self.i
+        self.i += 1
+        frame = self.stack[-1] if self.stack else None
+
+        if ch in "{[":
+            self._before_value(position)
+            self.out.append(ch)
+            self.stack.append(_Frame(ch, len(self.out), position))
+        elif ch in "}]":
+            if frame is None:
+                self.note(UNEXPECTED_CHARACTER, position, ch)
+                return
+            expected = "}" if frame.kind == "{" else "]"
+            if ch != expected:
+                self.note(MISMATCHED_BRACKET, position, f"{ch} -> {expected}")
+            self._end_members(frame, position)
+            self.out.append(expected)
+            self.stack.pop()
+            self._after_value()
+        elif ch == ",":
+            if frame is not None and frame.kind == "{" and frame.state in ("colon", "value"):
+                # 键后直接是逗号：补 null 作为值
+                self._end_members(frame, position)
+                frame.state = "after"
+            if frame is not None and frame.state == "after":
+                frame.member_start = len(self.out)
+                self.out.append(",")
+                frame.state = "key" if frame.kind == "{" else "value"
+            else:
+                self.note(EXTRA_COMMA, position)
+        else:  # ":"
+            if frame is not None and frame.kind == "{" and frame.state == "colon":
+                self.out.append(":")
+                frame.state = "value"
+            else:
+                self.note(UNEXPECTED_CHARACTER, position, ":")
+
+    def _end_members(self, frame: _Frame, position: int):
+        """对象/数组结束前处理尾随逗号或缺失的值"""
+        if frame.state == "after":
+            return
+        if self.out and self.out[-1] == ",":
+            self.out.pop()
+            self.note(TRAILING_COMMA, position)
+        elif frame.kind == "{" and frame.state in ("colon", "value"):
+            if frame.state == "colon":
+                self.out.append(":")
+            self.out.append("null")
+            self.note(MISSING_VALUE, position)
+
+    def _before_value(self, position: int) -> bool:
+        """
+        值开始前补全缺失的逗号或冒号
+
+        Returns:
+            当前位置是否为对象的键
+        """
+        frame = self.stack[-1] if self.stack else None
+        if frame is None:
+            return False
+        if frame.state == "after":
+            frame.member_start = len(self.out)
+            self.out.append(",")
+            self.note(MISSING_COMMA, position)
+            frame.state = "key" if frame.kind == "{" else "value"
+        elif frame.state == "colon":
+            self.out.append(":")
+            self.note(MISSING_COLON, position)
+            frame.state = "value"
+        return frame.kind == "{" and frame.state == "key"
+
+    def _after_value(self):
+        if self.stack:
+            frame = self.stack[-1]
+            frame.state = "colon" if frame.kind == "{" and frame.state == "key" else "after"
+        else:
+            self.done = True
+
+    # 字符串
+
+    def _string(self, opener: str):
+        position = self.i
+        is_key = self._before_value(position)
+        if opener in "“”":
+            self.note(FULLWIDTH_QUOTE, position)
+        elif opener in "'‘’":
+            self.note(SINGLE_QUOTES, position)
+        closers = _QUOTES[opener]
+
+        buf = ['"']
+        i = self.i + 1
+        terminated = False
+        while i < self.n:
+            ch = self.s[i]
+            if ch == "\\":
+                if i + 1 >= self.n:
+                    i += 1
+                    break
+                nxt = self.s[i + 1]
+                if nxt in '"\\/bfnrt':
+                    buf.append(self.s[i:i + 2])
+                    i += 2
+                elif nxt == "u" and re.match(r"[0-9a-fA-F]{4}", self.s[i + 2:i + 6]):
+                    buf.append(self.s[i:i + 6])
+                    i += 6
+                elif nxt == "'":
+                    buf.append("'")
+                    i += 2
+                else:
+                    buf.append("\\\\")
+                    self.note(INVALID_ESCAPE, i, f"\\{nxt}")
+                    i += 1
+                continue
+            if ch in closers and self._ends_string(i + 1):
+                terminated = True
+                i += 1
+                break
+            if ch == '"':
+                buf.append('\\"')
+                if opener == '"':
+                    self.note(UNESCAPED_QUOTE, i)
+            elif ch in _CONTROL_ESCAPES or ord(ch) < 0x20:
+                buf.append(_CONTROL_ESCAPES.get(ch, f"\\u{ord(ch):04x}"))
+                self.note(CONTROL_CHARACTER, i, repr(ch))
+            else:
+                buf.append(ch)
+            i += 1
+
+        self.i = i
+        buf.append('"')
+        self.out.append("".join(buf))
+        if not terminated:
+            # 截断的键在闭合容器时连同成员一起丢弃；截断的值无法还原
+            self.done = True
+            if is_key:
+                self.note(TRUNCATED, self.n, "unterminated key")
+            else:
+                self._truncated(position, "unterminated string")
+            return
+        self._after_value()
+
+    def _ends_string(self, j: int) -> bool:
+        """判断引号后是否是字符串结束（后跟结构符号、换行后的新成员或注释）"""
+        newline = False
+        while j < self.n and self.s[j] in _WHITESPACE:
+            newline = newline or self.s[j] == "\n"
+            j += 1
+        if j >= self.n:
+            return True
+        ch = self.s[j]
+        if ch in _STRUCTURAL_AFTER_STRING:
+            return True
+        if ch == "/" and self.s[j + 1:j + 2] in ("/", "*"):
+            return True
+        return newline and (ch in _QUOTES or ch in "{[" or ch.isalpha() or ch == "_")
+
+    # 未加引号的内容
+
+    def _bare_token(self):
+        position = self.i
+        is_key = self._before_value(position)
+
+        end = position
+        while end < self.n and self.s[end] not in _BARE_TOKEN_END:
+            end += 1
+        token = self.s[position:end]
+        if not token:
+            self.note(UNEXPECTED_CHARACTER, position, self.s[position])
+            self.i = position + 1
+            return
+
+        if is_key:
+            self.out.append(json.dumps(token, ensure_ascii=False))
+            self.note(UNQUOTED_KEY, position, token)
+            self.i = end
+            self._after_value()
+            return
+
+        if end >= self.n and token not in _LITERALS:
+            # 末尾的数字、未写完的字面量或未加引号的值可能被截断
+            self._truncated(position, token)
+            self.i = end
+            self.done = True
+            return
+
+        if token in _LITERALS:
+            if _LITERALS[token] != token:
+                self.note(PYTHON_LITERAL, position, token)
+            self.out.append(_LITERALS[token])
+            self.i = end
+        elif _JSON_NUMBER.match(token):
+            self.out.append(token)
+            self.i = end
+        else:
+            number = self._parse_number(token)
+            if number is not None:
+                self.out.append(number)
+                self.note(NUMBER_FORMAT, position, token)
+                self.i = end
+            else:
+                # 未加引号的字符串值可以包含空格，读到行尾或结构符号为止
+                end = position
+                while end < self.n and self.s[end] not in _BARE_VALUE_END:
+                    end += 1
+                value = self.s[position:end].strip(_WHITESPACE)
+                self.out.append(json.dumps(value, ensure_ascii=False))
+                self.note(UNQUOTED_VALUE, position, value[:40])
+                self.i = end
+        self._after_value()
+
+    def _truncated(self, position: int, detail: str):
+        """记录截断在中间的值（repair_json 据此判定修复失败）"""
+        self.truncated_value = JsonRepair(position, TRUNCATED, detail[:40])
+        self.repairs.append(self.truncated_value)
+
+    @staticmethod
+    def _parse_number(token: str) -> Optional[str]:
+        try:
+            if re.fullmatch(r"[+-]?\d+", token):
+                return str(int(token))
+            if re.fullmatch(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?", token):
+                return repr(float(token))
+        except ValueError:
+            pass
+        return None
+
+    # 截断
+
+    def _close_truncated(self):
+        position = self.n
+        while self.stack:
+            frame = self.stack[-1]
+            if frame.kind == "{" and frame.state != "after":
+                # 丢弃不完整的成员（只有逗号、键或键和冒号）
+                del self.out[frame.member_start:]
+            elif self.out and self.out[-1] == ",":
+                self.out.pop()
+            self.out.append("}" if frame.kind == "{" else "]")
+            self.stack.pop()
+            if self.stack:
+                self.stack[-1].state = "after"
+        self.note(TRUNCATED, position, "closed unterminated containers")
+
+
+def strip_code_fence(content: str) -> str:
+    """去掉包裹 JSON 的 markdown 代码块标记"""
+    content = content.strip()
+    if content.startswith("```"):
+        newline = content.find("\n")
+        content = content[newline + 1:] if newline != -1 else content[3:]
+        if content.rstrip().endswith("```"):
+            content = content.rstrip()[:-3]
+    return content.strip()
+
+
+def repair_json(content: str) -> RepairResult:
+    """
+    解析并修复 JSON
+
+    合法 JSON 直接由 json.loads 解析，不做任何改写；否则单遍扫描修复后再解析。
+
+    Args:
+        content: LLM 输出内容
+
+    Returns:
+        修复结果（JSON 文本、解析值和修复记录）
+
+    Raises:
+        JSONRepairError: 内容中没有可修复的 JSON，或响应截断在某个值中间
+    """
+    try:
+        return RepairResult(text=content, value=json.loads(content))
+    except (json.JSONDecodeError, TypeError):
+        pass
+
+    if not isinstance(content, str):
+        raise JSONRepairError(f"无法修复非字符串内容: {type(content).__name__}")
+
+    repairer = _Repairer(content)
+    text = repairer.run()
+    if repairer.truncated_value is not None:
+        raise JSONRepairError(
+            f"响应在值中间被截断，无法还原: {repairer.truncated_value.detail}",
+            position=repairer.truncated_value.position)
+    if not text:
+        raise JSONRepairError("内容中没有 JSON 对象或数组", position=0)
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise JSONRepairError(f"JSON 修复失败: {e.msg} (修复后位置 {e.pos})", position=e.pos)
+    return RepairResult(text=text, value=value, repairs=repairer.repairs)
+
+
+def try_repair_json(content: str) -> Tuple[Optional[RepairResult], Optional[str]]:
+    """repair_json 的不抛异常版本，返回 (结果, 错误信息)"""
+    try:
+        return repair_json(content), None
+    except JSONRepairError as e:
+        return None, str(e)
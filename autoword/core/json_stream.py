@@ -0,0 +1,118 @@
+"""
+AutoWord Incremental JSON
+增量 JSON 解析：流式响应中逐个取出数组元素
+
+IncrementalArrayParser 接收 LLM 流式输出的文本片段，跟踪顶层对象中指定
+键（如 "ops"）对应的数组，每当一个元素的对象/数组闭合就立即解析并返回，
+不必等待完整响应。元素文本先用 json.loads 解析，失败时用 repair_json 修复。
+"""
+
+import json
+from typing import Any, List, Optional
+
+from .json_repair import JSONRepairError, repair_json
+
+
+class IncrementalArrayParser:
+    """从流式 JSON 文本中增量提取顶层数组元素"""
+
+    def __init__(self, array_key: str = "ops"):
+        """
+        初始化增量解析器
+
+        Args:
+            array_key: 顶层对象中数组的键名
+        """
+        self.array_key = array_key
+        self.items: List[Any] = []
+        self.errors: List[str] = []
+        self.complete = False
+
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._key_chars: Optional[List[str]] = None
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._in_array = False
+        self._item_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """目前收到的全部文本"""
+        return self._buffer
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        输入一段文本
+
+        Args:
+            chunk: 新收到的文本片段
+
+        Returns:
+            本次新完成的数组元素
+        """
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        for pos in range(self._pos, len(buffer)):
+            ch = buffer[pos]
+            if self.complete:
+                break
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_chars is not None:
+                        self._last_string = "".join(self._key_chars)
+                        self._key_chars = None
+                elif self._key_chars is not None:
+                    self._key_chars.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                # 只记录顶层对象中的字符串（可能是键）
+                self._key_chars = [] if self._depth == 1 else None
+            elif ch == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif ch == "," and self._depth == 1:
+                self._current_key = None
+            elif ch in "{[":
+                self._started = True
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._current_key == self.array_key:
+                    self._in_array = True
+                elif self._in_array and self._depth == 3:
+                    self._item_start = pos
+            elif ch in "}]" and self._started:
+                if self._in_array and self._depth == 3 and self._item_start is not None:
+                    item = self._parse_item(buffer[self._item_start:pos + 1])
+                    if item is not None:
+                        completed.append(item)
+                    self._item_start = None
+                elif self._in_array and self._depth == 2:
+                    self._in_array = False
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+        self._pos = len(buffer)
+        self.items.extend(completed)
+        return completed
+
+    def _parse_item(self, text: str) -> Optional[Any]:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+        try:
+            return repair_json(text).value
+        except JSONRepairError as e:
+            self.errors.append(f"元素 {len(self.items)} 无法解析: {e}")
+            return None
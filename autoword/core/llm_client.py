@@ -8,11 +8,16 @@ import json
 import logging
 import time
 import http.client
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, TYPE_CHECKING
 from enum import Enum
 from dataclasses import dataclass
 
 from .exceptions import LLMError, APIKeyError
+from .json_repair import strip_code_fence, try_repair_json
+from .json_stream import IncrementalArrayParser
+
+if TYPE_CHECKING:
+    from .llm_stub import LLMFixtureStore
 
 
 logger = logging.getLogger(__name__)
@@ -32,6 +37,7 @@ class LLMResponse:
     model: str
     usage: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    metrics: Optional[Dict[str, Any]] = None  # 流式模式的时间指标
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -40,10 +46,15 @@ class LLMResponse:
             "content": self.content,
             "model": self.model,
             "usage": self.usage,
-            "error": self.error
+            "error": self.error,
+            "metrics": self.metrics
         }
 
 
+# 流式元素校验函数：(元素, 序号) -> 错误信息，None 表示通过
+ItemValidator = Callable[[Any, int], Optional[str]]
+
+
 class LLMClient:
     """LLM 客户端"""
     
@@ -51,19 +62,39 @@ class LLMClient:
                  api_keys: Optional[Dict[str, str]] = None,
                  base_url: str = "globalai.vip",
                  timeout: int = 60,
-                 max_retries: int = 3):
+                 max_retries: int = 3,
+                 fixture_store: Optional["LLMFixtureStore"] = None,
+                 fixture_mode: str = "off",
+                 stream: bool = False,
+                 stream_array_key: str = "ops"):
         """
         初始化 LLM 客户端
         
         Args:
             api_keys: API密钥字典 {"gpt": "key", "claude": "key"}
-            base_url: API 基础URL
+            base_url: API 基础URL（主机名使用HTTPS；也可写 http://host:port，如本地桩服务器）
             timeout: 请求超时时间
             max_retries: 最大重试次数
+            fixture_store: 录制/回放存储
+            fixture_mode: "off"、"record"（录制真实响应）或 "replay"（只回放，不访问网络）
+            stream: 使用 SSE 流式响应，边接收边校验 stream_array_key 数组元素
+            stream_array_key: 流式校验的顶层数组键名
         """
+        if fixture_mode not in ("off", "record", "replay"):
+            raise ValueError(f"不支持的录制模式: {fixture_mode}")
+        if fixture_mode != "off" and fixture_store is None:
+            raise ValueError(f"录制模式 {fixture_mode} 需要 fixture_store")
+        
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
+        self.fixture_store = fixture_store
+        self.fixture_mode = fixture_mode
+        self.stream = stream
+        self.stream_array_key = stream_array_key
+        
+        # JSON 解析统计：直接解析、单遍修复、旧修复策略、失败（需要重新请求）
+        self.json_repair_stats = {"parsed": 0, "repaired": 0, "legacy_fixed": 0, "failed": 0}
         
         # API密钥 - 默认值作为后备
         self.api_keys = api_keys or {
@@ -89,27 +120,31 @@ class LLMClient:
                      temperature: float = 0.7) -> Dict[str, Any]:
         """发送API请求"""
         api_key = self._get_api_key(model_type)
+        payload = self._build_payload(model_type, messages, temperature)
         
-        payload = {
-            "model": model_type.value,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": 4000
-        }
+        if self.fixture_mode == "replay":
+            record = self.fixture_store.lookup(payload)
+            if record is None:
+                raise LLMError("回放模式下未找到录制的响应")
+            if record.get("status", 200) != 200:
+                raise LLMError(f"API请求失败: HTTP {record['status']}（回放）")
+            return record["response"]
         
+        connection_class, host = self._connection_target()
         headers = {
             'Accept': 'application/json',
             'Authorization': f'Bearer {api_key}',
             'Content-Type': 'application/json',
-            'Host': self.base_url,
+            'Host': host,
             'Connection': 'keep-alive'
         }
         
         for attempt in range(self.max_retries):
             try:
-                conn = http.client.HTTPSConnection(self.base_url, timeout=self.timeout)
+                conn = connection_class(host, timeout=self.timeout)
                 
                 payload_json = json.dumps(payload)
+                started = time.perf_counter()
                 conn.request("POST", "/v1/chat/completions", payload_json, headers)
                 
                 response = conn.getresponse()
@@ -117,6 +152,9 @@ class LLMClient:
                 
                 if response.status == 200:
                     result = json.loads(data.decode("utf-8"))
+                    if self.fixture_mode == "record":
+                        self.fixture_store.record(payload, result,
+                                                  latency_ms=(time.perf_counter() - started) * 1000)
                     return result
                 else:
                     error_msg = f"API请求失败: HTTP {response.status}"
@@ -142,6 +180,137 @@ class LLMClient:
         
         raise LLMError("所有重试都失败了")
     
+    def _build_payload(self, model_type: ModelType, messages: list,
+                       temperature: float) -> Dict[str, Any]:
+        """构建请求载荷"""
+        return {
+            "model": model_type.value,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": 4000
+        }
+    
+    def _stream_request(self, model_type: ModelType, messages: list, temperature: float,
+                        item_validator: Optional[ItemValidator] = None) -> LLMResponse:
+        """
+        发送流式请求（SSE），边接收边解析和校验数组元素
+        
+        元素校验失败时立即关闭连接取消生成。
+        
+        Args:
+            model_type: 模型类型
+            messages: 消息列表
+            temperature: 温度参数
+            item_validator: 元素校验函数
+            
+        Returns:
+            LLM响应（metrics 含首字节、首个元素时间和取消原因）
+        """
+        api_key = self._get_api_key(model_type)
+        payload = self._build_payload(model_type, messages, temperature)
+        payload["stream"] = True
+        
+        connection_class, host = self._connection_target()
+        headers = {
+            'Accept': 'text/event-stream',
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json',
+            'Host': host
+        }
+        
+        parser = IncrementalArrayParser(self.stream_array_key)
+        metrics = {
+            "streamed": True,
+            "time_to_first_token_ms": None,
+            "time_to_first_op_ms": None,
+            "total_ms": None,
+            "ops_received": 0,
+            "cancelled": False,
+            "cancel_reason": None
+        }
+        started = time.perf_counter()
+        
+        def elapsed_ms() -> float:
+            return (time.perf_counter() - started) * 1000
+        
+        conn = None
+        for attempt in range(self.max_retries):
+            try:
+                conn = connection_class(host, timeout=self.timeout)
+                conn.request("POST", "/v1/chat/completions", json.dumps(payload), headers)
+                response = conn.getresponse()
+                if response.status != 200:
+                    response.read()
+                    raise LLMError(f"API请求失败: HTTP {response.status}")
+                
+                while True:
+                    line = response.readline()
+                    if not line:
+                        break
+                    line = line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    event = json.loads(data)
+                    choices = event.get("choices") or []
+                    delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                    if not delta:
+                        continue
+                    if metrics["time_to_first_token_ms"] is None:
+                        metrics["time_to_first_token_ms"] = elapsed_ms()
+                    
+                    for item in parser.feed(delta):
+                        index = metrics["ops_received"]
+                        metrics["ops_received"] += 1
+                        if metrics["time_to_first_op_ms"] is None:
+                            metrics["time_to_first_op_ms"] = elapsed_ms()
+                        error = item_validator(item, index) if item_validator else None
+                        if error:
+                            # 关闭连接即取消服务端生成
+                            metrics["cancelled"] = True
+                            metrics["cancel_reason"] = error
+                            metrics["total_ms"] = elapsed_ms()
+                            logger.warning(f"流式校验失败，已取消生成 (第 {index + 1} 个元素): {error}")
+                            return LLMResponse(
+                                success=False,
+                                content=parser.text,
+                                model=model_type.value,
+                                error=f"流式校验失败: {error}",
+                                metrics=metrics
+                            )
+                
+                metrics["total_ms"] = elapsed_ms()
+                return LLMResponse(
+                    success=True,
+                    content=strip_code_fence(parser.text),
+                    model=model_type.value,
+                    metrics=metrics
+                )
+                
+            except Exception as e:
+                # 已收到内容后不再重试，避免重复生成
+                if metrics["time_to_first_token_ms"] is None and attempt < self.max_retries - 1:
+                    logger.warning(f"流式请求异常: {str(e)}, 重试中... ({attempt + 1}/{self.max_retries})")
+                    time.sleep(2 ** attempt)
+                    continue
+                raise LLMError(f"流式请求失败: {str(e)}")
+            finally:
+                if conn is not None:
+                    conn.close()
+        
+        raise LLMError("所有重试都失败了")
+    
+    def _connection_target(self):
+        """根据 base_url 选择连接类型和主机"""
+        if self.base_url.startswith("http://"):
+            return http.client.HTTPConnection, self.base_url[len("http://"):].rstrip("/")
+        if self.base_url.startswith("https://"):
+            return http.client.HTTPSConnection, self.base_url[len("https://"):].rstrip("/")
+        return http.client.HTTPSConnection, self.base_url
+    
     def _parse_response(self, response_data: Dict[str, Any], model_type: ModelType) -> LLMResponse:
         """解析API响应"""
         try:
@@ -149,8 +318,8 @@ class LLMClient:
                 content = response_data["choices"][0]["message"]["content"]
                 usage = response_data.get("usage", {})
                 
-                # 清理JSON标记
-                content = self._clean_json_content(content)
+                # 去掉代码块标记；其余修复在 call_with_json_retry 中单遍完成
+                content = strip_code_fence(content)
                 
                 return LLMResponse(
                     success=True,
@@ -232,7 +401,8 @@ class LLMClient:
                    model_type: ModelType,
                    system_prompt: str,
                    user_prompt: str,
-                   temperature: float = 0.7) -> LLMResponse:
+                   temperature: float = 0.7,
+                   item_validator: Optional[ItemValidator] = None) -> LLMResponse:
         """
         调用指定模型
         
@@ -241,6 +411,7 @@ class LLMClient:
             system_prompt: 系统提示词
             user_prompt: 用户提示词
             temperature: 温度参数
+            item_validator: 流式模式下的数组元素校验函数
             
         Returns:
             LLM响应
@@ -251,6 +422,9 @@ class LLMClient:
         ]
         
         try:
+            # 录制/回放使用完整响应
+            if self.stream and self.fixture_mode == "off":
+                return self._stream_request(model_type, messages, temperature, item_validator)
             response_data = self._make_request(model_type, messages, temperature)
             return self._parse_response(response_data, model_type)
         except Exception as e:
@@ -276,7 +450,8 @@ class LLMClient:
                            model_type: ModelType,
                            system_prompt: str,
                            user_prompt: str,
-                           max_json_retries: int = 3) -> LLMResponse:
+                           max_json_retries: int = 3,
+                           item_validator: Optional[ItemValidator] = None) -> LLMResponse:
         """
         调用模型并重试JSON解析
         
@@ -285,6 +460,7 @@ class LLMClient:
             system_prompt: 系统提示词
             user_prompt: 用户提示词
             max_json_retries: JSON解析最大重试次数
+            item_validator: 流式模式下的数组元素校验函数，校验失败时取消生成并返回失败
             
         Returns:
             LLM响应
@@ -292,31 +468,46 @@ class LLMClient:
         original_system_prompt = system_prompt
         
         for attempt in range(max_json_retries):
-            response = self.call_model(model_type, system_prompt, user_prompt)
+            response = self.call_model(model_type, system_prompt, user_prompt,
+                                       item_validator=item_validator)
             
             if not response.success:
                 return response
             
-            # 尝试多种JSON修复策略
-            json_candidates = [
-                response.content,  # 原始内容
-                self._clean_json_content(response.content),  # 清理后的内容
-                self._aggressive_json_fix(response.content),  # 激进修复
-            ]
+            # 单遍容错解析（合法JSON不做改写）
+            repair_result, repair_error = try_repair_json(response.content)
+            if repair_result is not None:
+                if repair_result.repaired:
+                    self.json_repair_stats["repaired"] += 1
+                    logger.info(f"JSON已修复 ({len(repair_result.repairs)} 处): {repair_result.summary()}")
+                else:
+                    self.json_repair_stats["parsed"] += 1
+                return LLMResponse(
+                    success=True,
+                    content=repair_result.text,
+                    model=response.model,
+                    usage=response.usage,
+                    metrics=response.metrics
+                )
             
-            for i, candidate in enumerate(json_candidates):
+            # 旧的正则修复策略作为最后手段
+            for candidate_fix in (self._clean_json_content, self._aggressive_json_fix):
+                candidate = candidate_fix(response.content)
                 try:
-                    parsed = json.loads(candidate)
-                    # JSON解析成功，返回修复后的内容
-                    return LLMResponse(
-                        success=True,
-                        content=candidate,
-                        model=response.model,
-                        usage=response.usage
-                    )
-                except json.JSONDecodeError as e:
-                    if i == len(json_candidates) - 1:  # 最后一个候选也失败了
-                        logger.warning(f"JSON解析失败 (尝试 {i+1}/{len(json_candidates)}): {str(e)}")
+                    json.loads(candidate)
+                except json.JSONDecodeError:
+                    continue
+                self.json_repair_stats["legacy_fixed"] += 1
+                return LLMResponse(
+                    success=True,
+                    content=candidate,
+                    model=response.model,
+                    usage=response.usage,
+                    metrics=response.metrics
+                )
+            
+            self.json_repair_stats["failed"] += 1
+            logger.warning(f"JSON解析失败: {repair_error}")
             
             # 所有修复策略都失败了，准备重试
             if attempt < max_json_retries - 1:
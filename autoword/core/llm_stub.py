@@ -0,0 +1,381 @@
+"""
+AutoWord LLM Record/Replay
+LLM 请求录制/回放与本地 OpenAI 兼容桩服务器
+
+- LLMFixtureStore: 以 JSON Lines 保存请求/响应对，按请求内容哈希查找
+- LLMStubServer: 本地 /v1/chat/completions 服务，回放录制的响应，
+  可配置延迟、抖动和错误注入，支持高并发吞吐测试；请求带 "stream": true
+  时以 SSE 分块返回内容
+- measure_throughput: 并发调用并统计吞吐量和延迟分位数
+
+LLMClient 通过 fixture_mode="record"/"replay" 使用 LLMFixtureStore；
+或将 base_url 指向 LLMStubServer.base_url 走完整 HTTP 路径。
+"""
+
+import hashlib
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+CHAT_COMPLETIONS_PATH = "/v1/chat/completions"
+
+
+def request_key(payload: Dict[str, Any]) -> str:
+    """计算请求键（模型、消息和温度的哈希，不含密钥和 max_tokens）"""
+    canonical = json.dumps(
+        {
+            "model": payload.get("model"),
+            "messages": payload.get("messages"),
+            "temperature": payload.get("temperature"),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def completion_response(content: str, model: str) -> Dict[str, Any]:
+    """构造 OpenAI 格式的 chat completion 响应"""
+    return {
+        "id": f"chatcmpl-stub-{hashlib.md5(content.encode('utf-8')).hexdigest()[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+class LLMFixtureStore:
+    """请求/响应录制存储"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        初始化录制存储
+
+        Args:
+            path: JSON Lines 文件路径（None 时仅保存在内存中）
+        """
+        self.path = Path(path) if path else None
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._replay_positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if self.path and self.path.exists():
+            self.load()
+
+    def load(self):
+        """从文件加载录制记录"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"跳过损坏的录制记录 {self.path}:{line_number}: {e}")
+                    continue
+                self._records.setdefault(record["key"], []).append(record)
+
+    def record(self, payload: Dict[str, Any], response: Dict[str, Any],
+               status: int = 200, latency_ms: Optional[float] = None) -> Dict[str, Any]:
+        """
+        录制一次请求/响应
+
+        Args:
+            payload: 请求载荷
+            response: 响应 JSON
+            status: HTTP 状态码
+            latency_ms: 实际请求耗时
+
+        Returns:
+            录制记录
+        """
+        record = {
+            "key": request_key(payload),
+            "request": payload,
+            "status": status,
+            "response": response,
+            "latency_ms": latency_ms,
+            "recorded_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._records.setdefault(record["key"], []).append(record)
+            if self.path:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return record
+
+    def lookup(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        查找请求对应的录制记录
+
+        同一请求录制了多次时按录制顺序依次返回，到末尾后重复最后一条，
+        这样"先返回错误JSON、重试后返回正确JSON"的序列可以被完整回放。
+
+        Args:
+            payload: 请求载荷
+
+        Returns:
+            录制记录，未录制时返回 None
+        """
+        key = request_key(payload)
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                return None
+            position = self._replay_positions.get(key, 0)
+            self._replay_positions[key] = position + 1
+            return records[min(position, len(records) - 1)]
+
+    def rewind(self):
+        """重置回放位置"""
+        with self._lock:
+            self._replay_positions.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(records) for records in self._records.values())
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    """桩服务器请求处理器"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if self.path != CHAT_COMPLETIONS_PATH:
+            self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            self._send(400, {"error": {"message": f"invalid JSON body: {e}"}})
+            return
+        stub = self.server.stub
+        status, response = stub.respond(payload)
+        if payload.get("stream") and status == 200:
+            self._send_stream(response)
+            return
+        self._send(status, response)
+
+    def _send_stream(self, response: Dict[str, Any]):
+        """以 SSE 分块发送响应内容，客户端断开时停止"""
+        stub = self.server.stub
+        content = response["choices"][0]["message"]["content"]
+        model = response.get("model", "stub")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        size = max(1, stub.stream_chunk_chars)
+        chunks = [content[i:i + size] for i in range(0, len(content), size)]
+        try:
+            for chunk in chunks:
+                event = {
+                    "id": response.get("id"),
+                    "object": "chat.completion.chunk",
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": chunk}, "finish_reason": None}],
+                }
+                self._write_event(json.dumps(event, ensure_ascii=False))
+                with stub._lock:
+                    stub.stats["chunks_sent"] += 1
+                if stub.stream_delay_ms > 0:
+                    time.sleep(stub.stream_delay_ms / 1000)
+            self._write_event("[DONE]")
+        except (BrokenPipeError, ConnectionResetError):
+            with stub._lock:
+                stub.stats["streams_cancelled"] += 1
+
+    def _write_event(self, data: str):
+        self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _send(self, status: int, response: Dict[str, Any]):
+        data = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("stub server: " + format % args)
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    """支持高并发连接的 HTTP 服务器"""
+
+    daemon_threads = True
+    request_queue_size = 256  # 默认 5 的监听队列在高并发压测时会重置连接
+
+
+class LLMStubServer:
+    """本地 OpenAI 兼容桩服务器"""
+
+    def __init__(self, store: Optional[LLMFixtureStore] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 500,
+                 default_content: Optional[str] = None,
+                 seed: Optional[int] = None,
+                 stream_chunk_chars: int = 16, stream_delay_ms: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        初始化桩服务器
+
+        Args:
+            store: 录制存储（None 时所有请求都使用 default_content）
+            latency_ms: 每个响应的基础延迟
+            jitter_ms: 延迟抖动上限（均匀分布 0..jitter_ms）
+            error_rate: 注入错误响应的概率（0-1）
+            error_status: 注入错误使用的 HTTP 状态码
+            default_content: 未录制请求的回复内容（None 时返回 404）
+            seed: 抖动和错误注入的随机种子
+            stream_chunk_chars: 流式响应每个 SSE 事件的字符数
+            stream_delay_ms: 流式响应相邻事件之间的延迟
+            host: 监听地址
+            port: 监听端口（0 表示自动分配）
+        """
+        self.store = store if store is not None else LLMFixtureStore()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.default_content = default_content
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_delay_ms = stream_delay_ms
+        self.host = host
+        self.port = port
+
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "injected_errors": 0,
+                      "chunks_sent": 0, "streams_cancelled": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[_StubHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """供 LLMClient(base_url=...) 使用的地址"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "LLMStubServer":
+        """在后台线程启动服务器"""
+        self._server = _StubHTTPServer((self.host, self.port), _StubRequestHandler)
+        self._server.stub = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="llm-stub-server", daemon=True)
+        self._thread.start()
+        logger.info(f"LLM 桩服务器已启动: {self.base_url}")
+        return self
+
+    def stop(self):
+        """停止服务器"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "LLMStubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def respond(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        生成请求的响应（含延迟和错误注入）
+
+        Args:
+            payload: 请求载荷
+
+        Returns:
+            (HTTP 状态码, 响应 JSON)
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency_ms + (self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+            inject_error = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if inject_error:
+            with self._lock:
+                self.stats["injected_errors"] += 1
+            return self.error_status, {"error": {"message": "injected error", "type": "stub_error"}}
+
+        record = self.store.lookup(payload)
+        with self._lock:
+            self.stats["hits" if record else "misses"] += 1
+        if record:
+            return record.get("status", 200), record["response"]
+        if self.default_content is not None:
+            return 200, completion_response(self.default_content, payload.get("model", "stub"))
+        return 404, {"error": {"message": "no recorded response for request", "type": "stub_miss"}}
+
+
+def measure_throughput(call: Callable[[], Any], total_requests: int,
+                       concurrency: int) -> Dict[str, Any]:
+    """
+    并发执行调用并统计吞吐量
+
+    Args:
+        call: 单次调用（异常计为错误）
+        total_requests: 调用总数
+        concurrency: 并发线程数
+
+    Returns:
+        吞吐量、延迟分位数和错误数
+    """
+    def timed_call() -> Tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            result = call()
+            ok = getattr(result, "success", True)
+        except Exception:
+            ok = False
+        return (time.perf_counter() - start) * 1000, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda _: timed_call(), range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in outcomes)
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "requests_per_s": total_requests / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": quantiles[49],
+        "p95_ms": quantiles[94],
+        "errors": sum(1 for _, ok in outcomes if not ok),
+    }
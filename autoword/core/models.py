@@ -43,17 +43,19 @@ class Comment(BaseModel):
     """文档批注模型"""
     id: str = Field(..., description="批注唯一标识")
     author: str = Field(..., description="批注作者")
-    page: int = Field(..., description="批注所在页码")
+    page: Optional[int] = Field(None, description="批注所在页码（从 OOXML 读取时按需计算）")
     anchor_text: str = Field(..., description="批注锚点文本")
     comment_text: str = Field(..., description="批注内容")
     range_start: int = Field(..., description="批注范围起始位置")
     range_end: int = Field(..., description="批注范围结束位置")
     created_date: Optional[datetime] = Field(None, description="创建时间")
+    parent_id: Optional[str] = Field(None, description="回复的上级批注ID")
+    resolved: bool = Field(default=False, description="批注是否已标记为完成")
     
     @field_validator('page')
     @classmethod
     def page_must_be_positive(cls, v):
-        if v <= 0:
+        if v is not None and v <= 0:
             raise ValueError('页码必须为正数')
         return v
 
@@ -183,6 +185,8 @@ class TaskResult(BaseModel):
     message: str = Field(..., description="执行消息")
     execution_time: float = Field(..., description="执行时间(秒)")
     error_details: Optional[str] = Field(None, description="错误详情")
+    range_start: Optional[int] = Field(None, description="执行时定位到的目标起始位置")
+    range_end: Optional[int] = Field(None, description="执行时定位到的目标结束位置")
 
 
 class ExecutionResult(BaseModel):
@@ -0,0 +1,488 @@
+"""
+AutoWord Paragraph Table
+一次读取文档 OOXML，替代逐段落的 COM 属性读取
+
+逐段落读取 Range.Text、Style.NameLocal、OutlineLevel 时，每个属性都是一次
+跨进程 COM 调用，段落多的文档仅遍历就需要数万次调用。本模块通过一次
+Content.WordOpenXML 调用取得整篇文档的 Flat OPC XML，在 Python 中解析成
+段落表：
+
+- 段落按 Word Paragraphs 集合的顺序排列（包括表格单元格中的段落和行结束
+  标记，不包括文本框内容）
+- 文本与 Range.Text 一致：制表符、换行、分页符、域结果、图片和引用标记按
+  Word 的字符输出，域代码不计入文本
+- 起止位置按 Word Range 的计数方式累计（与 comment_reader 相同）
+- 大纲级别和段前分页沿段落属性、样式、基准样式链解析
+
+段落数与 Paragraphs.Count 不一致时不使用段落表；总长度与 Content.End
+不一致时只使用文本、样式和大纲级别，不使用位置。
+"""
+
+import bisect
+import logging
+import xml.etree.ElementTree as ET
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .exceptions import DocumentError
+
+
+logger = logging.getLogger(__name__)
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+PKG_NS = "http://schemas.microsoft.com/office/2006/xmlPackage"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+W = f"{{{W_NS}}}"
+PKG = f"{{{PKG_NS}}}"
+
+BODY_TEXT_OUTLINE_LEVEL = 10  # wdOutlineLevelBodyText
+
+PARAGRAPH_MARK = "\r"
+CELL_MARK = "\r\x07"
+
+# 在正文中占一个字符位置的元素及其在 Range.Text 中的字符
+_RANGE_CHARACTERS = {
+    W + "tab": "\t",
+    W + "cr": "\v",
+    W + "noBreakHyphen": "\x1e",
+    W + "softHyphen": "\x1f",
+    W + "sym": "(",
+    W + "commentReference": "\x05",
+    W + "footnoteReference": "\x02",
+    W + "endnoteReference": "\x02",
+    W + "drawing": "\x01",
+    W + "pict": "\x01",
+    W + "object": "\x01",
+}
+_BREAK_CHARACTERS = {"page": "\f", "column": "\x0e"}
+
+# 内置样式名以小写存储，Word 界面显示为首字母大写
+_BUILTIN_NAME_WORDS = {"toc": "TOC", "of": "of"}
+
+_TRUE_VALUES = ("1", "true", "on")
+
+# 内容控件等包装元素，其内容按所在位置处理
+_WRAPPER_TAGS = (W + "sdt", W + "sdtContent", W + "customXml")
+
+
+def _unwrap(element: ET.Element) -> ET.Element:
+    if element.tag == W + "sdt":
+        content = element.find(W + "sdtContent")
+        return content if content is not None else element
+    return element
+
+
+def display_style_name(name: Optional[str]) -> Optional[str]:
+    """
+    styles.xml 中存储的样式名转换为 Word 显示的样式名
+
+    Args:
+        name: w:name 的值
+
+    Returns:
+        显示名（内置样式 "heading 1" 显示为 "Heading 1"）
+    """
+    if not name or not name[0].islower():
+        return name
+    return " ".join(_BUILTIN_NAME_WORDS.get(word, word[:1].upper() + word[1:]) for word in name.split(" "))
+
+
+@dataclass
+class ParagraphRow:
+    """段落表中的一行，对应 Paragraphs 集合中的一个段落"""
+    index: int
+    text: str                          # 段落文本（不含段落标记）
+    style_id: Optional[str]
+    style_name: Optional[str]          # Style.NameLocal
+    outline_level: int                 # OutlineLevel：1-9，正文为 10
+    start: int                         # Range.Start
+    end: int                           # Range.End（含段落标记）
+    in_table: bool = False
+    cell_end: bool = False             # 单元格最后一段，段落标记为单元格标记
+    row_end: bool = False              # 表格行结束标记
+    page_break_before: bool = False    # ParagraphFormat.PageBreakBefore
+
+    @property
+    def range_text(self) -> str:
+        """与 Range.Text 相同的文本（含段落标记或单元格标记）"""
+        return self.text + (CELL_MARK if self.cell_end or self.row_end else PARAGRAPH_MARK)
+
+
+class _StyleSheet:
+    """styles.xml 中段落样式的名称、大纲级别和段前分页"""
+
+    def __init__(self, styles_root: Optional[ET.Element]):
+        self.names: Dict[str, str] = {}
+        self.based_on: Dict[str, str] = {}
+        self.outline: Dict[str, int] = {}
+        self.page_break: Dict[str, bool] = {}
+        self.default_id: Optional[str] = None
+
+        if styles_root is None:
+            return
+        for style in styles_root.findall(W + "style"):
+            if (style.get(W + "type") or "paragraph") != "paragraph":
+                continue
+            style_id = style.get(W + "styleId")
+            name = style.find(W + "name")
+            self.names[style_id] = display_style_name(name.get(W + "val") if name is not None else style_id)
+            based_on = style.find(W + "basedOn")
+            if based_on is not None:
+                self.based_on[style_id] = based_on.get(W + "val")
+            ppr = style.find(W + "pPr")
+            level = _outline_level(ppr)
+            if level is not None:
+                self.outline[style_id] = level
+            page_break = _on_off(ppr, "pageBreakBefore")
+            if page_break is not None:
+                self.page_break[style_id] = page_break
+            if style.get(W + "default") in _TRUE_VALUES:
+                self.default_id = style_id
+
+    def resolve(self, style_id: Optional[str], values: Dict[str, object], default):
+        """沿基准样式链查找属性"""
+        seen = set()
+        current = style_id if style_id in self.names else self.default_id
+        while current is not None and current not in seen:
+            seen.add(current)
+            if current in values:
+                return values[current]
+            current = self.based_on.get(current)
+        return default
+
+    def name(self, style_id: Optional[str]) -> Optional[str]:
+        if style_id in self.names:
+            return self.names[style_id]
+        return self.names.get(self.default_id)
+
+
+def _on_off(ppr: Optional[ET.Element], tag: str) -> Optional[bool]:
+    element = ppr.find(W + tag) if ppr is not None else None
+    if element is None:
+        return None
+    return element.get(W + "val", "1") in _TRUE_VALUES
+
+
+def _outline_level(ppr: Optional[ET.Element]) -> Optional[int]:
+    element = ppr.find(W + "outlineLvl") if ppr is not None else None
+    if element is None:
+        return None
+    value = element.get(W + "val", "")
+    return int(value) + 1 if value.isdigit() and int(value) < 9 else BODY_TEXT_OUTLINE_LEVEL
+
+
+class ParagraphTable:
+    """整篇文档的段落表"""
+
+    def __init__(self, rows: List[ParagraphRow], end: int):
+        """
+        初始化段落表
+
+        Args:
+            rows: 按文档顺序排列的段落行
+            end: 正文总长度（对应 Content.End）
+        """
+        self.rows = rows
+        self.end = end
+        self.offsets_verified = False
+        self._starts: Optional[List[int]] = None
+
+    @classmethod
+    def from_xml(cls, document_root: ET.Element, styles_root: Optional[ET.Element] = None) -> "ParagraphTable":
+        """
+        从 document.xml 和 styles.xml 的元素树构建段落表
+
+        Args:
+            document_root: w:document 元素
+            styles_root: w:styles 元素
+
+        Returns:
+            段落表
+        """
+        body = document_root.find(W + "body")
+        if body is None:
+            raise DocumentError("document.xml 中没有 w:body")
+        builder = _TableBuilder(_StyleSheet(styles_root))
+        builder.walk_container(body)
+        return cls(builder.rows, builder.position)
+
+    @classmethod
+    def from_flat_opc(cls, xml_text: str) -> "ParagraphTable":
+        """
+        从 WordOpenXML 返回的 Flat OPC 文本构建段落表
+
+        Args:
+            xml_text: Range.WordOpenXML 的返回值
+
+        Returns:
+            段落表
+
+        Raises:
+            DocumentError: 无法解析或缺少 document.xml
+        """
+        try:
+            root = ET.fromstring(xml_text.encode("utf-8") if isinstance(xml_text, str) else xml_text)
+        except ET.ParseError as e:
+            raise DocumentError(f"解析 WordOpenXML 失败: {e}")
+
+        parts = {}
+        for part in root.iter(PKG + "part"):
+            data = part.find(PKG + "xmlData")
+            if data is not None and len(data):
+                parts[part.get(PKG + "name")] = data[0]
+        document_root = parts.get("/word/document.xml")
+        if document_root is None:
+            raise DocumentError("WordOpenXML 中没有 /word/document.xml")
+        return cls.from_xml(document_root, parts.get("/word/styles.xml"))
+
+    @classmethod
+    def from_package(cls, docx_path: str) -> "ParagraphTable":
+        """
+        从 DOCX 包构建段落表
+
+        Args:
+            docx_path: 文档路径
+
+        Returns:
+            段落表
+
+        Raises:
+            DocumentError: 无法读取文档包
+        """
+        try:
+            with zipfile.ZipFile(docx_path) as package:
+                document_root = ET.fromstring(package.read("word/document.xml"))
+                names = set(package.namelist())
+                styles_root = ET.fromstring(package.read("word/styles.xml")) if "word/styles.xml" in names else None
+        except (OSError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+            raise DocumentError(f"无法读取文档包 {docx_path}: {e}")
+        return cls.from_xml(document_root, styles_root)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[ParagraphRow]:
+        return iter(self.rows)
+
+    def __getitem__(self, index: int) -> ParagraphRow:
+        return self.rows[index]
+
+    def align(self, paragraph_count: int) -> bool:
+        """
+        按 Paragraphs.Count 对齐段落表
+
+        行结束标记是否计入 Paragraphs 集合因文档而异，两种情况都尝试。
+
+        Args:
+            paragraph_count: Paragraphs.Count
+
+        Returns:
+            是否对齐成功
+        """
+        if len(self.rows) == paragraph_count:
+            return True
+        without_row_ends = [row for row in self.rows if not row.row_end]
+        if len(without_row_ends) != paragraph_count:
+            return False
+        for index, row in enumerate(without_row_ends):
+            row.index = index
+        self.rows = without_row_ends
+        self._starts = None
+        return True
+
+    def localize_style_names(self, document) -> int:
+        """
+        用 Word 的本地化样式名替换样式显示名
+
+        每个用到的样式只读一次 Styles(name).NameLocal。
+
+        Args:
+            document: Word 文档对象
+
+        Returns:
+            COM 调用次数
+        """
+        local_names: Dict[str, str] = {}
+        calls = 0
+        for row in self.rows:
+            name = row.style_name
+            if name is None:
+                continue
+            if name not in local_names:
+                calls += 2
+                try:
+                    local_names[name] = document.Styles(name).NameLocal
+                except Exception:
+                    local_names[name] = name
+            row.style_name = local_names[name]
+        return calls
+
+    def paragraph_at(self, position: int, include_end: bool = False) -> Optional[ParagraphRow]:
+        """
+        查找包含字符位置的段落
+
+        Args:
+            position: 字符位置（Range.Start）
+            include_end: 段落终点也算包含（与 Start <= 位置 <= End 的逐段比较
+                一致，位于两段交界处时返回前一段）
+
+        Returns:
+            段落行，位置无效或未经校验时返回 None
+        """
+        if not self.offsets_verified or not self.rows:
+            return None
+        if self._starts is None:
+            self._starts = [row.start for row in self.rows]
+        index = bisect.bisect_right(self._starts, position) - 1
+        if include_end and index > 0 and position == self.rows[index - 1].end:
+            index -= 1
+        if index < 0:
+            return None
+        row = self.rows[index]
+        if position > row.end or (position == row.end and not include_end):
+            return None
+        return row
+
+    def paragraphs_in(self, start: int, end: int) -> List[ParagraphRow]:
+        """
+        查找落在 [start, end] 内的段落
+
+        Args:
+            start: 起始位置
+            end: 结束位置
+
+        Returns:
+            段落行列表，未经校验时为空
+        """
+        if not self.offsets_verified:
+            return []
+        if self._starts is None:
+            self._starts = [row.start for row in self.rows]
+        first = bisect.bisect_left(self._starts, start)
+        result = []
+        for row in self.rows[first:]:
+            if row.start >= end:
+                break
+            if row.end <= end:
+                result.append(row)
+        return result
+
+
+class _TableBuilder:
+    """遍历 w:body，累计文本、位置和段落属性"""
+
+    def __init__(self, styles: _StyleSheet):
+        self.styles = styles
+        self.rows: List[ParagraphRow] = []
+        self.position = 0
+
+    def walk_container(self, container: ET.Element, in_table: bool = False):
+        last_paragraph = None
+        if container.tag == W + "tc":
+            paragraphs = [child for child in container if child.tag == W + "p"]
+            last_paragraph = paragraphs[-1] if paragraphs else None
+        for child in container:
+            if child.tag == W + "p":
+                self.add_paragraph(child, in_table, child is last_paragraph)
+            elif child.tag == W + "tbl":
+                self.walk_table(child)
+            elif child.tag in _WRAPPER_TAGS:
+                self.walk_container(_unwrap(child), in_table)
+
+    def walk_table(self, table: ET.Element):
+        for child in table:
+            if child.tag == W + "tr":
+                self.walk_row(child)
+            elif child.tag in _WRAPPER_TAGS:
+                self.walk_table(_unwrap(child))
+
+    def walk_row(self, row: ET.Element, close: bool = True):
+        for child in row:
+            if child.tag == W + "tc":
+                self.walk_container(child, in_table=True)
+            elif child.tag in _WRAPPER_TAGS:
+                self.walk_row(_unwrap(child), close=False)
+        if not close:
+            return
+        start = self.position
+        self.position += 1
+        self.rows.append(ParagraphRow(
+            index=len(self.rows), text="", style_id=None, style_name=self.styles.name(None),
+            outline_level=BODY_TEXT_OUTLINE_LEVEL, start=start, end=self.position,
+            in_table=True, row_end=True
+        ))
+
+    def add_paragraph(self, paragraph: ET.Element, in_table: bool, cell_end: bool):
+        start = self.position
+        parts: List[str] = []
+        self._collect(paragraph, parts)
+        self.position += 1  # 段落标记或单元格标记
+
+        ppr = paragraph.find(W + "pPr")
+        pstyle = ppr.find(W + "pStyle") if ppr is not None else None
+        style_id = pstyle.get(W + "val") if pstyle is not None else None
+        outline = _outline_level(ppr)
+        if outline is None:
+            outline = self.styles.resolve(style_id, self.styles.outline, BODY_TEXT_OUTLINE_LEVEL)
+        page_break = _on_off(ppr, "pageBreakBefore")
+        if page_break is None:
+            page_break = self.styles.resolve(style_id, self.styles.page_break, False)
+
+        self.rows.append(ParagraphRow(
+            index=len(self.rows), text="".join(parts), style_id=style_id,
+            style_name=self.styles.name(style_id), outline_level=outline,
+            start=start, end=self.position, in_table=in_table, cell_end=cell_end,
+            page_break_before=page_break
+        ))
+
+    def _collect(self, element: ET.Element, parts: List[str]):
+        for child in element:
+            tag = child.tag
+            if tag == W + "t":
+                text = child.text or ""
+                parts.append(text)
+                self.position += len(text)
+            elif tag in (W + "instrText", W + "delText"):
+                self.position += len(child.text or "")  # 计入位置，不计入文本
+            elif tag == W + "fldChar":
+                self.position += 1
+            elif tag == W + "br":
+                parts.append(_BREAK_CHARACTERS.get(child.get(W + "type"), "\v"))
+                self.position += 1
+            elif tag in _RANGE_CHARACTERS:
+                parts.append(_RANGE_CHARACTERS[tag])
+                self.position += 1
+            elif tag in (W + "pPr", W + "rPr", W + "txbxContent", f"{{{MC_NS}}}Fallback"):
+                continue  # 属性、文本框（独立文字部分）和兼容性备用内容不计入正文
+            else:
+                self._collect(child, parts)
+
+
+def load_paragraph_table(document) -> Optional[ParagraphTable]:
+    """
+    通过一次 WordOpenXML 调用读取文档段落表
+
+    Args:
+        document: Word 文档对象
+
+    Returns:
+        与 Paragraphs 集合对齐的段落表；无法读取或无法对齐时返回 None，
+        调用方回退到逐段落 COM 读取
+    """
+    try:
+        table = ParagraphTable.from_flat_opc(document.Content.WordOpenXML)
+        paragraph_count = document.Paragraphs.Count
+        if not table.align(paragraph_count):
+            logger.info(f"段落表与 Paragraphs 不一致（{len(table)} != {paragraph_count}），使用 COM 逐段读取")
+            return None
+        table.offsets_verified = table.end == document.Content.End
+        if not table.offsets_verified:
+            logger.debug("段落表位置与 Content.End 不一致，不使用段落位置")
+        table.localize_style_names(document)
+        return table
+    except Exception as e:
+        logger.warning(f"读取段落表失败，使用 COM 逐段读取: {e}")
+        return None
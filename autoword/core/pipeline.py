@@ -12,7 +12,7 @@ from enum import Enum
 
 from .models import (
     Comment, DocumentStructure, TaskPlan, ExecutionResult, 
-    TaskResult, ValidationResult
+    TaskResult, ValidationResult, DocumentSnapshot
 )
 from .doc_loader import WordSession, DocLoader
 from .doc_inspector import DocInspector
@@ -22,6 +22,7 @@ from .word_executor import WordExecutor, ExecutionMode
 from .format_validator import FormatValidator
 from .exporter import Exporter, export_execution_report
 from .llm_client import ModelType
+from .utils import calculate_file_checksum
 from .exceptions import (
     DocumentError, LLMError, TaskExecutionError, 
     FormatProtectionError, ValidationError
@@ -168,9 +169,15 @@ class DocumentProcessor:
                     raise TaskExecutionError(f"任务规划失败: {planning_result.error_message}")
                 
                 task_plan = planning_result.task_plan
+                self._resolve_task_comment_pages(document, comments, task_plan)
                 stages_completed.append(PipelineStage.PLANNING)
                 self._report_progress(PipelineStage.PLANNING, 1.0, f"任务规划完成: {len(task_plan.tasks)} 个任务")
                 
+                # 执行前快照，供事后校验比较
+                before_snapshot = None
+                if self.config.enable_validation:
+                    before_snapshot = self._create_snapshot(document_path, structure, comments)
+                
                 # 阶段4: 任务执行
                 self._report_progress(PipelineStage.EXECUTION, 0.0, "开始执行任务")
                 execution_result = self._execute_tasks(task_plan, document_path, comments, output_file_path)
@@ -182,7 +189,10 @@ class DocumentProcessor:
                 validation_result = None
                 if self.config.enable_validation:
                     self._report_progress(PipelineStage.VALIDATION, 0.0, "开始验证结果")
-                    validation_result = self._validate_results(task_plan, execution_result, comments)
+                    validation_result = self._validate_results(
+                        task_plan, execution_result, comments, before_snapshot,
+                        output_file_path or document_path
+                    )
                     stages_completed.append(PipelineStage.VALIDATION)
                     self._report_progress(PipelineStage.VALIDATION, 1.0, "结果验证完成")
                 
@@ -252,6 +262,16 @@ class DocumentProcessor:
         except Exception as e:
             raise DocumentError(f"文档检查失败: {e}")
     
+    def _resolve_task_comment_pages(self, document, comments: List[Comment], task_plan: TaskPlan):
+        """只为任务引用的批注计算页码（分页代价高）"""
+        comment_ids = {task.source_comment_id for task in task_plan.tasks if task.source_comment_id}
+        if not comment_ids:
+            return
+        try:
+            self.doc_inspector.resolve_comment_pages(document, comments, comment_ids)
+        except Exception as e:
+            logger.warning(f"计算批注页码失败: {e}")
+    
     def _plan_tasks(self, structure: DocumentStructure, comments: List[Comment], document_path: str) -> PlanningResult:
         """规划任务"""
         try:
@@ -273,13 +293,59 @@ class DocumentProcessor:
         except Exception as e:
             raise TaskExecutionError(f"任务执行失败: {e}")
     
-    def _validate_results(self, task_plan: TaskPlan, execution_result: ExecutionResult, comments: List[Comment]) -> ValidationResult:
-        """验证结果"""
+    def _create_snapshot(self, document_path: str, structure: DocumentStructure,
+                         comments: List[Comment]) -> DocumentSnapshot:
+        """根据已提取的结构和批注创建文档快照"""
+        return DocumentSnapshot(
+            document_path=document_path,
+            structure=structure,
+            comments=comments,
+            checksum=calculate_file_checksum(document_path)
+        )
+    
+    def _snapshot_document(self, document_path: str) -> DocumentSnapshot:
+        """重新打开执行后的文档并创建快照"""
+        word_app, document = self.doc_loader.load_document(document_path, create_backup=False)
+        try:
+            comments, structure = self._inspect_document(document)
+        finally:
+            try:
+                document.Close(SaveChanges=False)
+                word_app.Quit()
+            except:
+                pass
+        return self._create_snapshot(document_path, structure, comments)
+    
+    def _validate_results(self, task_plan: TaskPlan, execution_result: ExecutionResult,
+                          comments: List[Comment], before_snapshot: DocumentSnapshot,
+                          executed_document_path: str) -> ValidationResult:
+        """验证结果：比较执行前后快照，并按执行时定位到的范围授权变更"""
         if not self.format_validator:
             return ValidationResult(is_valid=True, errors=[], warnings=[])
         
         try:
-            return self.format_validator.validate_execution_result(task_plan, execution_result, comments)
+            after_snapshot = self._snapshot_document(executed_document_path)
+            succeeded = {result.task_id for result in execution_result.task_results if result.success}
+            executed_tasks = [task for task in task_plan.tasks if task.id in succeeded]
+            
+            report = self.format_validator.validate_execution_result(
+                before_snapshot, after_snapshot, executed_tasks, comments,
+                task_results=execution_result.task_results
+            )
+            
+            return ValidationResult(
+                is_valid=report.is_valid,
+                errors=[
+                    f"未授权变更: {change.change_type} ({change.element_id})"
+                    for change in report.unauthorized_changes
+                ],
+                warnings=report.warnings,
+                details={
+                    "authorized_changes": len(report.authorized_changes),
+                    "unauthorized_changes": len(report.unauthorized_changes),
+                    "recommendations": report.recommendations
+                }
+            )
         except Exception as e:
             logger.error(f"结果验证失败: {e}")
             return ValidationResult(
@@ -321,7 +321,8 @@ class TaskPlanner:
     def __init__(self, 
                  schema_path: str = "schemas/tasks.schema.json",
                  default_model: ModelType = ModelType.GPT5,
-                 api_keys: Optional[Dict[str, str]] = None):
+                 api_keys: Optional[Dict[str, str]] = None,
+                 llm_client: Optional[LLMClient] = None):
         """
         初始化任务规划器
         
@@ -329,13 +330,14 @@ class TaskPlanner:
             schema_path: JSON Schema 文件路径
             default_model: 默认使用的 LLM 模型
             api_keys: API密钥字典
+            llm_client: LLM 客户端（如录制/回放客户端；None 时按 api_keys 创建）
         """
         self.schema_path = schema_path
         self.default_model = default_model
         
         # 初始化组件
         self.prompt_builder = PromptBuilder(schema_path)
-        self.llm_client = LLMClient(api_keys=api_keys)
+        self.llm_client = llm_client or LLMClient(api_keys=api_keys)
         self.format_guard = FormatProtectionGuard()
         self.dependency_resolver = TaskDependencyResolver()
         self.risk_assessor = RiskAssessment()
@@ -196,7 +196,8 @@ class PromptBuilder:
             # 基本信息
             summary_parts.append(f"\n{i}. ID: {comment.id}")
             summary_parts.append(f"   作者: {comment.author}")
-            summary_parts.append(f"   页码: {comment.page}")
+            if comment.page is not None:
+                summary_parts.append(f"   页码: {comment.page}")
             
             # 锚点文本
             if comment.anchor_text:
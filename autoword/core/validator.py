@@ -15,6 +15,7 @@ from pathlib import Path
 from .models import ValidationRule, ValidationResult, DocumentSnapshot
 from .exceptions import ValidationError, DocumentError
 from .doc_loader import WordSession
+from .paragraph_table import load_paragraph_table
 from .utils import safe_filename
 
 
@@ -99,17 +100,25 @@ class DocumentValidator:
     def _extract_document_data(self, document) -> Dict[str, Any]:
         """提取文档数据用于验证"""
         try:
+            # 段落样式名和文本：优先一次读取段落表，否则逐段通过 COM 读取
+            table = load_paragraph_table(document)
+            if table is not None:
+                paragraphs = [(row.style_name or "", row.range_text) for row in table]
+            else:
+                paragraphs = [(paragraph.Style.NameLocal, paragraph.Range.Text)
+                              for paragraph in document.Paragraphs]
+            
             # 提取标题
             headings = []
-            for paragraph in document.Paragraphs:
-                if paragraph.Style.NameLocal.startswith("标题"):
-                    level_str = paragraph.Style.NameLocal.split()[-1]
+            for style_name, text in paragraphs:
+                if style_name.startswith("标题"):
+                    level_str = style_name.split()[-1]
                     try:
                         level = int(level_str)
                         headings.append({
-                            "text": paragraph.Range.Text.strip(),
+                            "text": text.strip(),
                             "level": level,
-                            "style": paragraph.Style.NameLocal
+                            "style": style_name
                         })
                     except ValueError:
                         pass
@@ -117,8 +126,7 @@ class DocumentValidator:
             # 提取样式
             styles = []
             used_styles = set()
-            for paragraph in document.Paragraphs:
-                style_name = paragraph.Style.NameLocal
+            for style_name, _ in paragraphs:
                 if style_name not in used_styles:
                     styles.append({
                         "name": style_name,
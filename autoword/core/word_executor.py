@@ -20,6 +20,7 @@ from .models import (
     LocatorType, ValidationResult, Comment
 )
 from .doc_loader import WordSession
+from .paragraph_table import load_paragraph_table
 from .planner import FormatProtectionGuard
 from .exceptions import COMError, TaskExecutionError, FormatProtectionError
 from .utils import truncate_text
@@ -269,14 +270,19 @@ class TaskExecutor:
                 if style.InUse:
                     styles.append(style.NameLocal)
             
-            # 获取标题信息
+            # 获取标题信息（优先使用一次读取的段落表）
             headings = []
-            for para in self.context.document.Paragraphs:
-                if para.Style.NameLocal.startswith(('标题', 'Heading', 'Title')):
+            table = load_paragraph_table(self.context.document)
+            if table is not None:
+                paragraphs = ((row.style_name or "", row.range_text) for row in table)
+            else:
+                paragraphs = ((para.Style.NameLocal, para.Range.Text) for para in self.context.document.Paragraphs)
+            for style_name, text in paragraphs:
+                if style_name.startswith(('标题', 'Heading', 'Title')):
                     headings.append({
-                        'text': para.Range.Text.strip().replace('\r', ''),
-                        'style': para.Style.NameLocal,
-                        'level': self._extract_heading_level_from_style(para.Style.NameLocal)
+                        'text': text.strip().replace('\r', ''),
+                        'style': style_name,
+                        'level': self._extract_heading_level_from_style(style_name)
                     })
             
             # 获取目录数量
@@ -429,8 +435,9 @@ class TaskExecutor:
                 pre_execution_snapshot = self.create_document_snapshot()
                 logger.debug(f"创建任务 {task.id} 执行前快照")
             
-            # 定位目标
+            # 定位目标，记录解析出的字符范围供事后授权校验使用
             target_range = self.locator.locate_target(task)
+            range_start, range_end = self._range_bounds(target_range)
             
             # 根据任务类型执行相应操作
             if task.type == TaskType.REWRITE:
@@ -477,7 +484,9 @@ class TaskExecutor:
                 task_id=task.id,
                 success=True,
                 message=result,
-                execution_time=execution_time
+                execution_time=execution_time,
+                range_start=range_start,
+                range_end=range_end
             )
             
         except Exception as e:
@@ -494,6 +503,13 @@ class TaskExecutor:
                 error_details=str(e)
             )
     
+    def _range_bounds(self, target_range: Any) -> Tuple[Optional[int], Optional[int]]:
+        """读取 Word Range 的起止位置（无法读取时返回 None）"""
+        try:
+            return int(target_range.Start), int(target_range.End)
+        except Exception:
+            return None, None
+    
     def _validate_task_before_execution(self, task: Task):
         """执行前验证任务 - 第3层防线"""
         if self.context.comments:
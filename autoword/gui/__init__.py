@@ -1,19 +1,47 @@
 """
 AutoWord GUI Module
 图形用户界面模块
+
+Public names are loaded lazily on first attribute access (PEP 562), so
+importing a single GUI submodule does not import the whole Qt window stack.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 __version__ = "1.0.0"
 __author__ = "AutoWord Team"
 
-from .main_window import MainWindow
-from .config_manager import ConfigurationManager
-from .processor_controller import DocumentProcessorController
-from .error_handler import ErrorHandler
+_LAZY_ATTRIBUTES = {
+    'MainWindow': '.main_window',
+    'ConfigurationManager': '.config_manager',
+    'DocumentProcessorController': '.processor_controller',
+    'ErrorHandler': '.error_handler',
+}
+
+if TYPE_CHECKING:
+    from .main_window import MainWindow
+    from .config_manager import ConfigurationManager
+    from .processor_controller import DocumentProcessorController
+    from .error_handler import ErrorHandler
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     'MainWindow',
     'ConfigurationManager', 
     'DocumentProcessorController',
     'ErrorHandler'
-]
\ No newline at end of file
+]
@@ -3,31 +3,93 @@ AutoWord vNext - Next generation document processing pipeline.
 
 This module implements a structured "Extract→Plan→Execute→Validate→Audit" 
 closed loop system for Word document processing with >99% stability.
+
+Public names are loaded lazily on first attribute access (PEP 562), so
+``import autoword.vnext`` and the CLI do not pay for pydantic models,
+jsonschema and the pipeline until they are actually used.
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 __version__ = "2.0.0"
 __author__ = "AutoWord Team"
 
-from .models import StructureV1, PlanV1, InventoryFullV1, ProcessingResult
-from .exceptions import VNextError, ExtractionError, PlanningError, ExecutionError, ValidationError, AuditError
-from .core import VNextConfig, LLMConfig, LocalizationConfig, ValidationConfig, AuditConfig, ExecutorConfig, CustomLLMClient, load_config, save_config
-from .simple_pipeline import SimplePipeline, VNextPipeline
-
-# 保持向后兼容性
-try:
-    from .schema_validator import (
-        SchemaValidator, validate_structure, validate_plan, validate_inventory,
-        validate_with_detailed_errors
-    )
-    from .error_handler import (
-        PipelineErrorHandler, WarningsLogger, SecurityValidator, RollbackManager,
-        RevisionHandler, ProcessingStatus, RevisionHandlingStrategy, ErrorContext,
-        RecoveryResult
-    )
-    from .pipeline import ProgressReporter
-except ImportError:
-    # 如果完整版本不可用，使用简化版本
-    pass
+# public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    "StructureV1": ".models",
+    "PlanV1": ".models",
+    "InventoryFullV1": ".models",
+    "ProcessingResult": ".models",
+    "VNextError": ".exceptions",
+    "ExtractionError": ".exceptions",
+    "PlanningError": ".exceptions",
+    "ExecutionError": ".exceptions",
+    "ValidationError": ".exceptions",
+    "AuditError": ".exceptions",
+    "VNextConfig": ".core",
+    "LLMConfig": ".core",
+    "LocalizationConfig": ".core",
+    "ValidationConfig": ".core",
+    "AuditConfig": ".core",
+    "ExecutorConfig": ".core",
+    "CustomLLMClient": ".core",
+    "load_config": ".core",
+    "save_config": ".core",
+    "SimplePipeline": ".simple_pipeline",
+    "VNextPipeline": ".simple_pipeline",
+}
+
+# 保持向后兼容性: 完整版本的名称, 不可用时不导出
+_OPTIONAL_ATTRIBUTES = {
+    "SchemaValidator": ".schema_validator",
+    "validate_structure": ".schema_validator",
+    "validate_plan": ".schema_validator",
+    "validate_inventory": ".schema_validator",
+    "validate_with_detailed_errors": ".schema_validator",
+    "PipelineErrorHandler": ".error_handler",
+    "WarningsLogger": ".error_handler",
+    "SecurityValidator": ".error_handler",
+    "RollbackManager": ".error_handler",
+    "RevisionHandler": ".error_handler",
+    "ProcessingStatus": ".error_handler",
+    "RevisionHandlingStrategy": ".error_handler",
+    "ErrorContext": ".error_handler",
+    "RecoveryResult": ".error_handler",
+    "ProgressReporter": ".pipeline",
+}
+
+if TYPE_CHECKING:
+    from .models import StructureV1, PlanV1, InventoryFullV1, ProcessingResult
+    from .exceptions import VNextError, ExtractionError, PlanningError, ExecutionError, ValidationError, AuditError
+    from .core import VNextConfig, LLMConfig, LocalizationConfig, ValidationConfig, AuditConfig, ExecutorConfig, CustomLLMClient, load_config, save_config
+    from .simple_pipeline import SimplePipeline, VNextPipeline
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    optional = module_name is None
+    if optional:
+        module_name = _OPTIONAL_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        value = getattr(import_module(module_name, __name__), name)
+    except ImportError as e:
+        if not optional:
+            raise
+        # 如果完整版本不可用，使用简化版本
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r} ({e})") from e
+
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | set(_OPTIONAL_ATTRIBUTES))
+
 
 __all__ = [
     "StructureV1",
@@ -51,4 +113,4 @@ __all__ = [
     "save_config",
     "SimplePipeline",
     "VNextPipeline"
-]
\ No newline at end of file
+]
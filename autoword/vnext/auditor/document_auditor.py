@@ -10,25 +10,34 @@ import json
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 
-from ..models import StructureV1, PlanV1, DiffReport
+from ..models import StructureV1, PlanV1, InventoryFullV1, DiffReport
+from ..compact import CompactParagraphs
+from ..serialization import ArtifactSerializer, get_serializer
 from ..exceptions import AuditError
+from ..log_sink import get_log_sink, close_log_sinks
 
 
 class DocumentAuditor:
     """Create complete audit trails with timestamped snapshots."""
     
-    def __init__(self, base_audit_dir: Optional[str] = None):
+    def __init__(self, base_audit_dir: Optional[str] = None,
+                 artifact_format: Union[str, ArtifactSerializer, None] = None):
         """
         Initialize document auditor.
         
         Args:
             base_audit_dir: Base directory for audit trails (defaults to ./audit_trails)
+            artifact_format: Serializer for structure/inventory/plan artifacts
+                ("json", "json-stream" or "binary"; defaults to "json")
         """
         self.base_audit_dir = Path(base_audit_dir or "./audit_trails")
+        self.serializer = get_serializer(artifact_format)
         self.current_audit_dir: Optional[Path] = None
         self.warnings: List[str] = []
+        self._warnings_written = 0
+        self.before_snapshot_saved = False
     
     def create_audit_directory(self) -> str:
         """
@@ -55,6 +64,7 @@ class DocumentAuditor:
             (self.current_audit_dir / "snapshots").mkdir()
             (self.current_audit_dir / "structures").mkdir()
             (self.current_audit_dir / "reports").mkdir()
+            self.before_snapshot_saved = False
             
             return str(self.current_audit_dir)
             
@@ -64,6 +74,68 @@ class DocumentAuditor:
                 audit_stage="directory_creation"
             )
     
+    def open_audit_directory(self, audit_directory: str) -> str:
+        """
+        Reopen the run directory of an earlier run (to resume it).
+
+        Args:
+            audit_directory: Existing run directory
+
+        Returns:
+            str: Path to the audit directory
+
+        Raises:
+            AuditError: If the directory does not exist
+        """
+        directory = Path(audit_directory)
+        if not directory.is_dir():
+            raise AuditError(
+                f"Audit directory not found: {audit_directory}",
+                audit_directory=str(audit_directory),
+                audit_stage="directory_creation"
+            )
+        self.current_audit_dir = directory
+        for subdirectory in ("snapshots", "structures", "reports"):
+            (directory / subdirectory).mkdir(exist_ok=True)
+        self.before_snapshot_saved = False
+        return str(directory)
+
+    def save_before_snapshot(self, before_docx: str, before_structure: StructureV1):
+        """
+        Save the original DOCX and structure ahead of the rest of the audit.
+        
+        The pipeline calls this while planning is still running;
+        save_snapshots() then only writes the after/plan artifacts.
+        
+        Args:
+            before_docx: Path to original DOCX file
+            before_structure: Original document structure
+            
+        Raises:
+            AuditError: If snapshot saving fails
+        """
+        if not self.current_audit_dir:
+            raise AuditError(
+                "No audit directory created. Call create_audit_directory() first.",
+                audit_stage="snapshot_saving"
+            )
+        
+        try:
+            before_docx_path = Path(before_docx)
+            if before_docx_path.exists():
+                shutil.copy2(before_docx_path, self.current_audit_dir / "snapshots" / "before.docx")
+            
+            self.serializer.dump(before_structure,
+                                 self.current_audit_dir / "structures" / f"structure.before.v1{self.serializer.extension}")
+            self.before_snapshot_saved = True
+            
+        except Exception as e:
+            raise AuditError(
+                f"Failed to save before snapshot: {str(e)}",
+                audit_directory=str(self.current_audit_dir),
+                audit_stage="snapshot_saving"
+            )
+    
     def save_snapshots(self, before_docx: str, after_docx: str, 
                       before_structure: StructureV1, after_structure: StructureV1, 
                       plan: PlanV1):
@@ -86,27 +158,22 @@ class DocumentAuditor:
                 audit_stage="snapshot_saving"
             )
         
+        if not self.before_snapshot_saved:
+            self.save_before_snapshot(before_docx, before_structure)
+        
         try:
             # Save DOCX snapshots with fixed names
-            before_docx_path = Path(before_docx)
             after_docx_path = Path(after_docx)
-            
-            if before_docx_path.exists():
-                shutil.copy2(before_docx_path, self.current_audit_dir / "snapshots" / "before.docx")
-            
             if after_docx_path.exists():
                 shutil.copy2(after_docx_path, self.current_audit_dir / "snapshots" / "after.docx")
             
-            # Save structure JSON files
-            with open(self.current_audit_dir / "structures" / "structure.before.v1.json", 'w', encoding='utf-8') as f:
-                json.dump(before_structure.model_dump(), f, indent=2, ensure_ascii=False, default=str)
-            
-            with open(self.current_audit_dir / "structures" / "structure.after.v1.json", 'w', encoding='utf-8') as f:
-                json.dump(after_structure.model_dump(), f, indent=2, ensure_ascii=False, default=str)
+            # Save structure files
+            extension = self.serializer.extension
+            self.serializer.dump(after_structure,
+                                 self.current_audit_dir / "structures" / f"structure.after.v1{extension}")
             
             # Save execution plan
-            with open(self.current_audit_dir / "plan.v1.json", 'w', encoding='utf-8') as f:
-                json.dump(plan.model_dump(), f, indent=2, ensure_ascii=False, default=str)
+            self.serializer.dump(plan, self.current_audit_dir / f"plan.v1{extension}")
             
         except Exception as e:
             raise AuditError(
@@ -115,6 +182,58 @@ class DocumentAuditor:
                 audit_stage="snapshot_saving"
             )
     
+    def save_inventory(self, inventory: InventoryFullV1):
+        """
+        Save the full inventory artifact.
+        
+        Args:
+            inventory: Inventory extracted from the original document
+            
+        Raises:
+            AuditError: If inventory saving fails
+        """
+        if not self.current_audit_dir:
+            raise AuditError(
+                "No audit directory created. Call create_audit_directory() first.",
+                audit_stage="inventory_saving"
+            )
+        
+        try:
+            self.serializer.dump(inventory,
+                                 self.current_audit_dir / f"inventory.full.v1{self.serializer.extension}")
+        except Exception as e:
+            raise AuditError(
+                f"Failed to save inventory: {str(e)}",
+                audit_directory=str(self.current_audit_dir),
+                audit_stage="inventory_saving"
+            )
+    
+    def save_layout_decisions(self, layout_state: Dict[str, Any]):
+        """
+        Save field update / repagination decisions to reports/layout_decisions.json.
+        
+        Args:
+            layout_state: LayoutDependencyTracker.to_dict() output
+            
+        Raises:
+            AuditError: If saving fails
+        """
+        if not self.current_audit_dir:
+            raise AuditError(
+                "No audit directory created. Call create_audit_directory() first.",
+                audit_stage="layout_decisions_saving"
+            )
+        
+        try:
+            with open(self.current_audit_dir / "reports" / "layout_decisions.json", 'w', encoding='utf-8') as f:
+                json.dump(layout_state, f, indent=2, ensure_ascii=False, default=str)
+        except Exception as e:
+            raise AuditError(
+                f"Failed to save layout decisions: {str(e)}",
+                audit_directory=str(self.current_audit_dir),
+                audit_stage="layout_decisions_saving"
+            )
+    
     def generate_diff_report(self, before_structure: StructureV1, 
                            after_structure: StructureV1) -> DiffReport:
         """
@@ -131,31 +250,16 @@ class DocumentAuditor:
             AuditError: If diff generation fails
         """
         try:
-            # Create paragraph index mappings
-            before_paragraphs = {p.index: p for p in before_structure.paragraphs}
-            after_paragraphs = {p.index: p for p in after_structure.paragraphs}
-            
-            before_indices = set(before_paragraphs.keys())
-            after_indices = set(after_paragraphs.keys())
-            
-            # Find added, removed, and potentially modified paragraphs
-            added_paragraphs = list(after_indices - before_indices)
-            removed_paragraphs = list(before_indices - after_indices)
-            
-            # Check for modifications in common paragraphs
-            modified_paragraphs = []
-            common_indices = before_indices & after_indices
-            
-            for idx in common_indices:
-                before_p = before_paragraphs[idx]
-                after_p = after_paragraphs[idx]
-                
-                # Compare key attributes
-                if (before_p.style_name != after_p.style_name or
-                    before_p.preview_text != after_p.preview_text or
-                    before_p.is_heading != after_p.is_heading or
-                    before_p.heading_level != after_p.heading_level):
-                    modified_paragraphs.append(idx)
+            if (isinstance(before_structure.paragraphs, CompactParagraphs) and
+                    isinstance(after_structure.paragraphs, CompactParagraphs)):
+                # Compact structures are diffed directly on their columns
+                added_paragraphs, removed_paragraphs, modified_paragraphs = (
+                    before_structure.paragraphs.diff_indexes(after_structure.paragraphs)
+                )
+            else:
+                added_paragraphs, removed_paragraphs, modified_paragraphs = (
+                    self._diff_paragraphs(before_structure.paragraphs, after_structure.paragraphs)
+                )
             
             # Analyze style changes
             style_changes = self._analyze_style_changes(before_structure.styles, after_structure.styles)
@@ -201,6 +305,36 @@ class DocumentAuditor:
                 audit_stage="diff_generation"
             )
     
+    def _diff_paragraphs(self, before: List, after: List):
+        """Find added, removed and modified paragraph indexes."""
+        # Create paragraph index mappings
+        before_paragraphs = {p.index: p for p in before}
+        after_paragraphs = {p.index: p for p in after}
+
+        before_indices = set(before_paragraphs.keys())
+        after_indices = set(after_paragraphs.keys())
+
+        # Find added, removed, and potentially modified paragraphs
+        added_paragraphs = list(after_indices - before_indices)
+        removed_paragraphs = list(before_indices - after_indices)
+
+        # Check for modifications in common paragraphs
+        modified_paragraphs = []
+        common_indices = before_indices & after_indices
+
+        for idx in common_indices:
+            before_p = before_paragraphs[idx]
+            after_p = after_paragraphs[idx]
+
+            # Compare key attributes
+            if (before_p.style_name != after_p.style_name or
+                before_p.preview_text != after_p.preview_text or
+                before_p.is_heading != after_p.is_heading or
+                before_p.heading_level != after_p.heading_level):
+                modified_paragraphs.append(idx)
+
+        return added_paragraphs, removed_paragraphs, modified_paragraphs
+
     def _analyze_style_changes(self, before_styles: List, after_styles: List) -> Dict[str, Dict[str, Any]]:
         """Analyze changes in style definitions."""
         before_style_map = {s.name: s for s in before_styles}
@@ -294,7 +428,12 @@ class DocumentAuditor:
         self.warnings.append(f"{datetime.now().isoformat()}: {warning}")
     
     def write_warnings_log(self):
-        """Write warnings.log file with all accumulated warnings."""
+        """
+        Write accumulated warnings to warnings.log.
+        
+        The file is shared with the pipeline's warnings logger, so warnings are
+        appended; warnings already written by an earlier call are skipped.
+        """
         if not self.current_audit_dir:
             raise AuditError(
                 "No audit directory created. Call create_audit_directory() first.",
@@ -303,12 +442,14 @@ class DocumentAuditor:
         
         try:
             warnings_file = self.current_audit_dir / "warnings.log"
-            with open(warnings_file, 'w', encoding='utf-8') as f:
-                if self.warnings:
-                    f.write("\n".join(self.warnings))
-                    f.write("\n")
-                else:
-                    f.write("No warnings generated during processing.\n")
+            sink = get_log_sink(str(warnings_file))
+            sink.write_many(self.warnings[self._warnings_written:])
+            self._warnings_written = len(self.warnings)
+            sink.flush(raise_errors=True)
+            
+            if not self.warnings and not warnings_file.exists():
+                sink.write("No warnings generated during processing.")
+                sink.flush(raise_errors=True)
                     
         except Exception as e:
             raise AuditError(
@@ -319,7 +460,7 @@ class DocumentAuditor:
     
     def write_status(self, status: str, details: str):
         """
-        Write final status (SUCCESS/ROLLBACK/FAILED_VALIDATION).
+        Write final status (SUCCESS/ROLLBACK/FAILED_VALIDATION/TIMEOUT).
         
         Args:
             status: Final processing status
@@ -335,7 +476,7 @@ class DocumentAuditor:
             )
         
         # Validate status
-        valid_statuses = {"SUCCESS", "ROLLBACK", "FAILED_VALIDATION"}
+        valid_statuses = {"SUCCESS", "ROLLBACK", "FAILED_VALIDATION", "TIMEOUT"}
         if status not in valid_statuses:
             raise AuditError(
                 f"Invalid status '{status}'. Must be one of: {', '.join(valid_statuses)}",
@@ -386,6 +527,10 @@ class DocumentAuditor:
                 audit_directory=str(self.current_audit_dir) if self.current_audit_dir else None,
                 audit_stage="finalization"
             )
+        finally:
+            # Buffered logs of this run must reach disk even if finalization failed
+            if self.current_audit_dir:
+                close_log_sinks(str(self.current_audit_dir))
     
     def get_audit_directory(self) -> Optional[str]:
         """
@@ -0,0 +1,160 @@
+"""
+Batch manifest for incremental batch processing.
+
+The batch command records every input it processed in a manifest: the
+content hash of the input, the user intent, the pipeline version and a hash
+of the processing configuration, together with the run audit directory and
+the output document. On the next batch an input whose key is unchanged and
+whose output still exists is skipped, and an input whose content was already
+processed under another path (a renamed or copied file) is re-linked to the
+existing output. Only new and changed inputs reach the pipeline.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from . import __version__
+from .checkpoint import _atomic_write_text
+from .models import ProcessingResult
+
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_SCHEMA = "autoword.batch_manifest.v1"
+MANIFEST_FILE = "batch_manifest.json"
+
+# Fields that must match for a recorded output to be reused
+KEY_FIELDS = ("sha256", "user_intent", "pipeline_version", "config_hash")
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """
+    Hash the processing configuration that affects a run's output.
+
+    Args:
+        config: Settings such as the LLM model and temperature
+
+    Returns:
+        str: SHA-256 hex digest of the canonical JSON form
+    """
+    canonical = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def output_path(audit_directory: Optional[str]) -> Optional[str]:
+    """Modified document the auditor saved for a run, if it exists."""
+    if not audit_directory:
+        return None
+    path = os.path.join(audit_directory, "snapshots", "after.docx")
+    return path if os.path.exists(path) else None
+
+
+class BatchManifest:
+    """Processed batch inputs, keyed by absolute input path."""
+
+    def __init__(self, path: Union[str, Path], pipeline_version: str = __version__):
+        """
+        Load or create a batch manifest.
+
+        An unreadable manifest is replaced by an empty one, so every input is
+        processed again rather than failing the batch.
+
+        Args:
+            path: Manifest JSON file
+            pipeline_version: Version recorded with and required of entries
+        """
+        self.path = Path(path)
+        self.pipeline_version = pipeline_version
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable batch manifest {self.path}: {e}")
+            return {}
+        if data.get("schema") != MANIFEST_SCHEMA:
+            logger.warning(f"Ignoring batch manifest with unsupported schema: {data.get('schema')}")
+            return {}
+        return data.get("entries", {})
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_text(self.path, json.dumps(
+            {"schema": MANIFEST_SCHEMA, "entries": self.entries}, indent=2, ensure_ascii=False))
+
+    def _key(self, sha256: str, user_intent: str, processing_config_hash: str) -> Dict[str, str]:
+        return {
+            "sha256": sha256,
+            "user_intent": user_intent,
+            "pipeline_version": self.pipeline_version,
+            "config_hash": processing_config_hash,
+        }
+
+    def _reusable(self, entry: Dict[str, Any], key: Dict[str, str]) -> bool:
+        return (entry.get("status") == "SUCCESS"
+                and all(entry.get(field) == key[field] for field in KEY_FIELDS)
+                and entry.get("output_path") is not None
+                and os.path.exists(entry["output_path"]))
+
+    def find(self, document_path: Union[str, Path], sha256: str, user_intent: str,
+             processing_config_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a successful run whose output can be reused for an input.
+
+        The entry of the input path itself is preferred; otherwise any entry
+        with the same content hash, intent, version and configuration is
+        returned, and its "path" differs from document_path.
+
+        Args:
+            document_path: Input DOCX path
+            sha256: Content hash of the input
+            user_intent: Intent of the current batch
+            processing_config_hash: config_hash() of the current batch
+
+        Returns:
+            Optional[Dict[str, Any]]: Manifest entry including its "path", or None
+        """
+        key = self._key(sha256, user_intent, processing_config_hash)
+        path = os.path.abspath(document_path)
+        candidates = [path] + [other for other in self.entries if other != path]
+        for candidate in candidates:
+            entry = self.entries.get(candidate)
+            if entry is not None and self._reusable(entry, key):
+                return {"path": candidate, **entry}
+        return None
+
+    def record(self, document_path: Union[str, Path], sha256: str, user_intent: str,
+               processing_config_hash: str, result: ProcessingResult,
+               relinked_from: Optional[str] = None):
+        """
+        Record the run of an input (call save() to persist).
+
+        Args:
+            document_path: Input DOCX path
+            sha256: Content hash of the input
+            user_intent: Intent of the batch
+            processing_config_hash: config_hash() of the batch
+            result: Result of the run, or of the run whose output is re-linked
+            relinked_from: Input path of the re-linked run
+        """
+        entry = {
+            **self._key(sha256, user_intent, processing_config_hash),
+            "status": result.status,
+            "audit_directory": result.audit_directory,
+            "output_path": output_path(result.audit_directory),
+            "processed_at": datetime.now().isoformat(),
+        }
+        if relinked_from:
+            entry["relinked_from"] = relinked_from
+        self.entries[os.path.abspath(document_path)] = entry
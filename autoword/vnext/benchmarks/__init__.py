@@ -0,0 +1,26 @@
+"""
+Synthetic DOCX corpus and benchmarks for the COM-free pipeline stages.
+
+Run with:
+python -m autoword.vnext.benchmarks run --tiers small medium --output results.json
+"""
+
+from .corpus import CorpusSpec, CorpusDocument, SIZE_TIERS, generate_docx, generate_corpus
+from .harness import (
+    BenchmarkResult, StubLLMClient, benchmark_document, run_benchmarks,
+    load_results, compare_results
+)
+
+__all__ = [
+    "CorpusSpec",
+    "CorpusDocument",
+    "SIZE_TIERS",
+    "generate_docx",
+    "generate_corpus",
+    "BenchmarkResult",
+    "StubLLMClient",
+    "benchmark_document",
+    "run_benchmarks",
+    "load_results",
+    "compare_results",
+]
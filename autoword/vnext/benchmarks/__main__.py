@@ -0,0 +1,13 @@
+"""
+Benchmark entry point.
+
+python -m autoword.vnext.benchmarks generate <dir> [--tiers ...]
+python -m autoword.vnext.benchmarks run [--tiers ...] [--output results.json] [--compare baseline.json]
+"""
+
+import sys
+
+from .harness import main
+
+if __name__ == "__main__":
+    sys.exit(main())
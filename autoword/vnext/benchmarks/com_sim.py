@@ -0,0 +1,272 @@
+"""
+Simulated Word COM document for counting cross-process calls.
+
+Word is not available on build machines, so the bulk-read benchmark runs the
+COM consumers against an in-process object model built from a DOCX package.
+Every property read, method call and collection iteration step is recorded as
+one call, which is the unit that dominates wall time against a real
+out-of-process Word instance. Paragraph text, styles, outline levels and
+offsets come from ParagraphTable.from_package, so the per-paragraph path and
+the WordOpenXML path see the same document.
+"""
+
+import re
+import zipfile
+from collections import Counter
+from typing import Iterator, Optional
+
+from ...core.paragraph_table import ParagraphRow, ParagraphTable
+
+
+PKG_NS = "http://schemas.microsoft.com/office/2006/xmlPackage"
+
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+class ComCallCounter:
+    """Counts simulated COM calls, in total and per member name."""
+
+    def __init__(self):
+        self.calls = 0
+        self.by_member: Counter = Counter()
+
+    def record(self, member: str):
+        self.calls += 1
+        self.by_member[member] += 1
+
+    def reset(self):
+        self.calls = 0
+        self.by_member.clear()
+
+
+def flat_opc(docx_path: str) -> str:
+    """
+    Build the Flat OPC text Range.WordOpenXML returns for a DOCX package.
+
+    Only the document and styles parts are included, which is all the
+    paragraph table reads.
+
+    Args:
+        docx_path: Path to the DOCX package
+
+    Returns:
+        str: pkg:package XML
+    """
+    parts = []
+    with zipfile.ZipFile(docx_path) as package:
+        names = set(package.namelist())
+        for name in ("word/document.xml", "word/styles.xml"):
+            if name in names:
+                xml = _XML_DECLARATION.sub("", package.read(name).decode("utf-8"), count=1)
+                parts.append(f'<pkg:part pkg:name="/{name}"><pkg:xmlData>{xml}</pkg:xmlData></pkg:part>')
+    return f'<?xml version="1.0"?><pkg:package xmlns:pkg="{PKG_NS}">{"".join(parts)}</pkg:package>'
+
+
+class _SimObject:
+    def __init__(self, counter: ComCallCounter):
+        self._counter = counter
+
+
+class SimStyle(_SimObject):
+    def __init__(self, counter: ComCallCounter, name: Optional[str]):
+        super().__init__(counter)
+        self._name = name
+
+    @property
+    def NameLocal(self):
+        self._counter.record("Style.NameLocal")
+        if self._name is None:
+            raise AttributeError("NameLocal")
+        return self._name
+
+
+class SimParagraphFormat(_SimObject):
+    def __init__(self, counter: ComCallCounter, row: ParagraphRow):
+        super().__init__(counter)
+        self._row = row
+
+    @property
+    def PageBreakBefore(self):
+        self._counter.record("ParagraphFormat.PageBreakBefore")
+        return self._row.page_break_before
+
+
+class SimRange(_SimObject):
+    def __init__(self, counter: ComCallCounter, document: "SimulatedDocument",
+                 start: int, end: int, row: Optional[ParagraphRow] = None):
+        super().__init__(counter)
+        self._document = document
+        self._start = start
+        self._end = end
+        self._row = row
+
+    @property
+    def Start(self):
+        self._counter.record("Range.Start")
+        return self._start
+
+    @property
+    def End(self):
+        self._counter.record("Range.End")
+        return self._end
+
+    @property
+    def Text(self):
+        self._counter.record("Range.Text")
+        if self._row is not None:
+            return self._row.range_text
+        return "".join(row.range_text for row in self._document.table
+                       if row.start >= self._start and row.end <= self._end)
+
+    @property
+    def ParagraphFormat(self):
+        self._counter.record("Range.ParagraphFormat")
+        return SimParagraphFormat(self._counter, self._row)
+
+    @property
+    def WordOpenXML(self):
+        self._counter.record("Range.WordOpenXML")
+        if not self._document.bulk_xml:
+            raise AttributeError("WordOpenXML")
+        return self._document.word_open_xml
+
+    def Information(self, kind: int):
+        self._counter.record("Range.Information")
+        return 1
+
+
+class SimParagraph(_SimObject):
+    def __init__(self, counter: ComCallCounter, document: "SimulatedDocument", row: ParagraphRow):
+        super().__init__(counter)
+        self._document = document
+        self._row = row
+
+    @property
+    def Range(self):
+        self._counter.record("Paragraph.Range")
+        return SimRange(self._counter, self._document, self._row.start, self._row.end, self._row)
+
+    @property
+    def Style(self):
+        self._counter.record("Paragraph.Style")
+        return SimStyle(self._counter, self._row.style_name)
+
+    @property
+    def OutlineLevel(self):
+        self._counter.record("Paragraph.OutlineLevel")
+        return self._row.outline_level
+
+
+class SimParagraphs(_SimObject):
+    def __init__(self, counter: ComCallCounter, document: "SimulatedDocument"):
+        super().__init__(counter)
+        self._document = document
+
+    @property
+    def Count(self):
+        self._counter.record("Paragraphs.Count")
+        return len(self._document.table)
+
+    def __call__(self, index: int) -> SimParagraph:
+        self._counter.record("Paragraphs.Item")
+        return SimParagraph(self._counter, self._document, self._document.table[index - 1])
+
+    def __iter__(self) -> Iterator[SimParagraph]:
+        self._counter.record("Paragraphs._NewEnum")
+        for row in self._document.table:
+            self._counter.record("IEnumVARIANT.Next")
+            yield SimParagraph(self._counter, self._document, row)
+
+
+class SimCollection(_SimObject):
+    """Empty COM collection (Fields, Hyperlinks, TablesOfContents, ...)."""
+
+    def __init__(self, counter: ComCallCounter, name: str, count: int = 0):
+        super().__init__(counter)
+        self._name = name
+        self._count = count
+
+    @property
+    def Count(self):
+        self._counter.record(f"{self._name}.Count")
+        return self._count
+
+    def __iter__(self):
+        self._counter.record(f"{self._name}._NewEnum")
+        return iter(())
+
+
+class SimStyles(_SimObject):
+    def __call__(self, name: str) -> SimStyle:
+        self._counter.record("Styles.Item")
+        return SimStyle(self._counter, name)
+
+
+class SimulatedDocument(_SimObject):
+    """
+    In-process stand-in for a Word Document COM object.
+
+    Exposes the members the paragraph consumers read: Paragraphs,
+    Content (Text, Start, End, WordOpenXML), Styles, Range.Information,
+    Words.Count and empty Fields, Hyperlinks and TablesOfContents.
+    """
+
+    def __init__(self, docx_path: str, counter: Optional[ComCallCounter] = None, bulk_xml: bool = True):
+        """
+        Build a simulated document.
+
+        Args:
+            docx_path: DOCX package to simulate
+            counter: Call counter shared by all objects of this document
+            bulk_xml: Whether Range.WordOpenXML is available; when False it
+                raises like an older Word, forcing per-paragraph reads
+        """
+        super().__init__(counter or ComCallCounter())
+        self.table = ParagraphTable.from_package(docx_path)
+        self.word_open_xml = flat_opc(docx_path)
+        self.bulk_xml = bulk_xml
+        self._word_count = sum(len(row.text.split()) for row in self.table)
+
+    @property
+    def counter(self) -> ComCallCounter:
+        return self._counter
+
+    @property
+    def Paragraphs(self):
+        self._counter.record("Document.Paragraphs")
+        return SimParagraphs(self._counter, self)
+
+    @property
+    def Content(self):
+        self._counter.record("Document.Content")
+        return SimRange(self._counter, self, 0, self.table.end)
+
+    @property
+    def Range(self):
+        self._counter.record("Document.Range")
+        return SimRange(self._counter, self, 0, self.table.end)
+
+    @property
+    def Styles(self):
+        self._counter.record("Document.Styles")
+        return SimStyles(self._counter)
+
+    @property
+    def Words(self):
+        self._counter.record("Document.Words")
+        return SimCollection(self._counter, "Words", self._word_count)
+
+    @property
+    def Fields(self):
+        self._counter.record("Document.Fields")
+        return SimCollection(self._counter, "Fields")
+
+    @property
+    def Hyperlinks(self):
+        self._counter.record("Document.Hyperlinks")
+        return SimCollection(self._counter, "Hyperlinks")
+
+    @property
+    def TablesOfContents(self):
+        self._counter.record("Document.TablesOfContents")
+        return SimCollection(self._counter, "TablesOfContents")
@@ -0,0 +1,452 @@
+"""
+Synthetic DOCX corpus generator.
+
+Writes real .docx packages (OOXML parts zipped by hand, no Word or
+python-docx needed) with controllable size and structure: body paragraphs,
+heading depth, tables, simple and complex fields, a TOC field, footnotes,
+inline images and a mix of Chinese and Latin text. Generation is seeded, so
+the same CorpusSpec always produces the same document content.
+
+Each generated document comes with the counts the OOXML reader is expected
+to find, which the benchmark harness and tests use as a sanity check.
+"""
+
+import random
+import struct
+import zipfile
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+
+@dataclass
+class CorpusSpec:
+    """Size and content controls for one synthetic document."""
+    name: str = "document"
+    paragraphs: int = 50            # Body paragraphs (excluding headings, TOC, tables)
+    headings: int = 10
+    heading_depth: int = 3          # Deepest heading level used (1-9)
+    tables: int = 2
+    table_rows: int = 4
+    table_columns: int = 3
+    fields: int = 4                 # PAGE/DATE fields in body paragraphs
+    toc: bool = True
+    footnotes: int = 3
+    images: int = 1
+    cjk_ratio: float = 0.5          # Share of paragraphs written in Chinese
+    seed: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class CorpusDocument:
+    """A generated document and what a reader should find in it."""
+    path: Path
+    spec: CorpusSpec
+    paragraph_count: int
+    heading_texts: List[str] = field(default_factory=list)
+    table_count: int = 0
+    field_count: int = 0
+    footnote_count: int = 0
+    media_count: int = 0
+
+
+SIZE_TIERS: Dict[str, CorpusSpec] = {
+    "tiny": CorpusSpec(name="tiny", paragraphs=12, headings=4, heading_depth=2, tables=1,
+                       table_rows=2, table_columns=2, fields=2, footnotes=1, images=1),
+    "small": CorpusSpec(name="small", paragraphs=60, headings=12, heading_depth=3, tables=2,
+                        fields=4, footnotes=3, images=1),
+    "medium": CorpusSpec(name="medium", paragraphs=600, headings=60, heading_depth=3, tables=10,
+                         table_rows=8, table_columns=4, fields=20, footnotes=20, images=5),
+    "large": CorpusSpec(name="large", paragraphs=5000, headings=300, heading_depth=4, tables=40,
+                        table_rows=12, table_columns=5, fields=100, footnotes=100, images=20),
+}
+
+
+_LATIN_WORDS = (
+    "document structure analysis heading section table figure result method "
+    "performance evaluation format style paragraph reference chapter summary "
+    "introduction conclusion data model system process validation report"
+).split()
+
+_CJK_WORDS = (
+    "文档 结构 分析 标题 章节 表格 图片 结果 方法 性能 评估 格式 样式 段落 "
+    "引用 摘要 引言 结论 数据 模型 系统 过程 验证 报告 研究 设计 实现"
+).split()
+
+_HEADING_PREFIXES = ("第{n}章", "Chapter {n}", "{n}", "Section {n}")
+
+# Content types and relationship types used by the generated package
+_CT_MAIN = "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"
+_CT_STYLES = "application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"
+_CT_FOOTNOTES = "application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"
+_CT_CORE = "application/vnd.openxmlformats-package.core-properties+xml"
+_CT_APP = "application/vnd.openxmlformats-officedocument.extended-properties+xml"
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_DOCUMENT_NAMESPACES = (
+    f'xmlns:w="{_W_NS}" '
+    f'xmlns:r="{_REL}" '
+    'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture"'
+)
+
+_EMU_PER_PIXEL = 9525
+
+
+class _TextSource:
+    """Seeded generator of mixed Chinese/Latin sentences."""
+
+    def __init__(self, seed: int, cjk_ratio: float):
+        self.random = random.Random(seed)
+        self.cjk_ratio = cjk_ratio
+
+    def sentence(self, min_words: int = 8, max_words: int = 30) -> str:
+        count = self.random.randint(min_words, max_words)
+        if self.random.random() < self.cjk_ratio:
+            # Chinese text with an occasional Latin term, as in real papers
+            words = [self.random.choice(_CJK_WORDS) for _ in range(count)]
+            if count > 4:
+                words.insert(self.random.randrange(count), f" {self.random.choice(_LATIN_WORDS)} ")
+            return "".join(words) + "。"
+        words = [self.random.choice(_LATIN_WORDS) for _ in range(count)]
+        return " ".join(words).capitalize() + "."
+
+    def title(self) -> str:
+        if self.random.random() < self.cjk_ratio:
+            return "".join(self.random.choice(_CJK_WORDS) for _ in range(3))
+        return " ".join(self.random.choice(_LATIN_WORDS) for _ in range(3)).title()
+
+
+def _png_bytes(width: int = 4, height: int = 4, rgb: Tuple[int, int, int] = (200, 60, 60)) -> bytes:
+    """Encode a solid-colour RGB PNG."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    row = b"\x00" + bytes(rgb) * width
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height))
+            + chunk(b"IEND", b""))
+
+
+def _run(text: str, rpr: str = "") -> str:
+    return f'<w:r>{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _paragraph(content: str, style_id: Optional[str] = None) -> str:
+    ppr = f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ""
+    return f"<w:p>{ppr}{content}</w:p>"
+
+
+def _complex_field(code: str, result: str) -> str:
+    return ('<w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+            f'<w:r><w:instrText xml:space="preserve"> {escape(code)} </w:instrText></w:r>'
+            '<w:r><w:fldChar w:fldCharType="separate"/></w:r>'
+            f'{_run(result)}'
+            '<w:r><w:fldChar w:fldCharType="end"/></w:r>')
+
+
+def _image_run(rel_id: str, image_number: int) -> str:
+    size = 64 * _EMU_PER_PIXEL
+    return (
+        '<w:r><w:drawing><wp:inline distT="0" distB="0" distL="0" distR="0">'
+        f'<wp:extent cx="{size}" cy="{size}"/>'
+        f'<wp:docPr id="{image_number}" name="Picture {image_number}"/>'
+        '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+        f'<pic:pic><pic:nvPicPr><pic:cNvPr id="{image_number}" name="image{image_number}.png"/>'
+        '<pic:cNvPicPr/></pic:nvPicPr>'
+        f'<pic:blipFill><a:blip r:embed="{rel_id}"/><a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+        f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{size}" cy="{size}"/></a:xfrm>'
+        '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr></pic:pic>'
+        '</a:graphicData></a:graphic></wp:inline></w:drawing></w:r>'
+    )
+
+
+def _styles_xml(heading_depth: int) -> str:
+    font = '<w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:eastAsia="宋体"/>'
+    styles = [
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/>'
+        '<w:pPr><w:spacing w:after="120" w:line="360" w:lineRule="auto"/><w:ind w:firstLine="480"/></w:pPr>'
+        f'<w:rPr>{font}<w:sz w:val="24"/></w:rPr></w:style>',
+        '<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/>'
+        '<w:next w:val="Normal"/><w:rPr><w:b/><w:sz w:val="36"/></w:rPr></w:style>',
+        '<w:style w:type="paragraph" w:styleId="TOCHeading"><w:name w:val="TOC Heading"/>'
+        '<w:basedOn w:val="Normal"/><w:rPr><w:b/><w:sz w:val="28"/></w:rPr></w:style>',
+        '<w:style w:type="paragraph" w:styleId="FootnoteText"><w:name w:val="footnote text"/>'
+        '<w:basedOn w:val="Normal"/><w:rPr><w:sz w:val="18"/></w:rPr></w:style>',
+        '<w:style w:type="character" w:styleId="FootnoteReference"><w:name w:val="footnote reference"/>'
+        '<w:rPr><w:vertAlign w:val="superscript"/></w:rPr></w:style>',
+        '<w:style w:type="table" w:styleId="TableGrid"><w:name w:val="Table Grid"/></w:style>',
+    ]
+    for level in range(1, heading_depth + 1):
+        size = max(24, 36 - 4 * (level - 1))
+        styles.append(
+            f'<w:style w:type="paragraph" w:styleId="Heading{level}"><w:name w:val="heading {level}"/>'
+            f'<w:basedOn w:val="Normal"/><w:next w:val="Normal"/>'
+            f'<w:pPr><w:spacing w:before="240" w:after="120"/><w:outlineLvl w:val="{level - 1}"/></w:pPr>'
+            f'<w:rPr><w:rFonts w:ascii="Arial" w:hAnsi="Arial" w:eastAsia="黑体"/><w:b/><w:sz w:val="{size}"/>'
+            f'</w:rPr></w:style>'
+        )
+        styles.append(
+            f'<w:style w:type="paragraph" w:styleId="TOC{level}"><w:name w:val="toc {level}"/>'
+            f'<w:basedOn w:val="Normal"/><w:pPr><w:ind w:left="{(level - 1) * 240}"/></w:pPr></w:style>'
+        )
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:styles xmlns:w="{_W_NS}">{"".join(styles)}</w:styles>')
+
+
+def _heading_levels(count: int, depth: int, rng: random.Random) -> List[int]:
+    """Heading levels forming a valid outline (no level skipped going down)."""
+    levels = []
+    current = 0
+    for _ in range(count):
+        current = rng.randint(1, min(depth, current + 1))
+        levels.append(current)
+    return levels
+
+
+def generate_docx(spec: CorpusSpec, path) -> CorpusDocument:
+    """
+    Write a synthetic DOCX file for a corpus spec.
+
+    Args:
+        spec: Document size and content controls
+        path: Output .docx path (parent directories are created)
+
+    Returns:
+        CorpusDocument: Output path and the expected reader counts
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = _TextSource(spec.seed, spec.cjk_ratio)
+    rng = random.Random(spec.seed + 1)
+    depth = max(1, min(spec.heading_depth, 9))
+
+    # Headings and body paragraphs, spread evenly over the sections
+    levels = _heading_levels(spec.headings, depth, rng)
+    numbering = [0] * 10
+    heading_texts = []
+    for level in levels:
+        numbering[level] += 1
+        numbering[level + 1:] = [0] * (9 - level)
+        number = ".".join(str(n) for n in numbering[1:level + 1])
+        prefix = rng.choice(_HEADING_PREFIXES).format(n=number) if level == 1 else number
+        heading_texts.append(f"{prefix} {text.title()}")
+
+    sections = max(1, len(levels))
+    body_per_section = [spec.paragraphs // sections] * sections
+    for i in range(spec.paragraphs % sections):
+        body_per_section[i] += 1
+
+    # Positions (body paragraph numbers) carrying fields, footnotes and images,
+    # and sections followed by a table
+    field_at = set(rng.sample(range(spec.paragraphs), min(spec.fields, spec.paragraphs)))
+    footnote_at = set(rng.sample(range(spec.paragraphs), min(spec.footnotes, spec.paragraphs)))
+    image_at = set(rng.sample(range(spec.paragraphs), min(spec.images, spec.paragraphs)))
+    table_after = set(rng.sample(range(sections), min(spec.tables, sections)))
+    extra_tables = max(0, spec.tables - sections)
+
+    parts: List[str] = []
+    paragraph_count = 0
+    field_count = 0
+    footnotes: List[str] = []
+    images = 0
+    table_count = 0
+
+    parts.append(_paragraph(_run(text.title()), "Title"))
+    paragraph_count += 1
+
+    if spec.toc and heading_texts:
+        parts.append(_paragraph(_run("目录 Contents"), "TOCHeading"))
+        toc_levels = min(depth, 3)
+        entries = [(t, l) for t, l in zip(heading_texts, levels) if l <= toc_levels]
+        for i, (heading, level) in enumerate(entries):
+            content = _run(f"{heading}\t{i // 3 + 1}")
+            if i == 0:
+                content = ('<w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+                           f'<w:r><w:instrText xml:space="preserve"> TOC \\o "1-{toc_levels}" \\h \\z \\u </w:instrText></w:r>'
+                           '<w:r><w:fldChar w:fldCharType="separate"/></w:r>' + content)
+            if i == len(entries) - 1:
+                content += '<w:r><w:fldChar w:fldCharType="end"/></w:r>'
+            parts.append(_paragraph(content, f"TOC{level}"))
+        paragraph_count += 1 + len(entries)
+        field_count += 1 if entries else 0
+
+    def table_xml() -> str:
+        rows = []
+        for r in range(spec.table_rows):
+            header = '<w:trPr><w:tblHeader/></w:trPr>' if r == 0 else ""
+            cells = "".join(
+                f'<w:tc><w:tcPr><w:tcW w:w="2000" w:type="dxa"/></w:tcPr>'
+                f'{_paragraph(_run(text.title() if r == 0 else text.sentence(2, 5)))}</w:tc>'
+                for _ in range(spec.table_columns)
+            )
+            rows.append(f"<w:tr>{header}{cells}</w:tr>")
+        grid = "".join('<w:gridCol w:w="2000"/>' for _ in range(spec.table_columns))
+        return ('<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/></w:tblPr>'
+                f'<w:tblGrid>{grid}</w:tblGrid>{"".join(rows)}</w:tbl>')
+
+    body_number = 0
+    for section, count in enumerate(body_per_section):
+        if section < len(levels):
+            parts.append(_paragraph(_run(heading_texts[section]), f"Heading{levels[section]}"))
+            paragraph_count += 1
+        for _ in range(count):
+            content = _run(text.sentence())
+            if body_number in field_at:
+                if field_count % 2:
+                    content += f'<w:fldSimple w:instr=" PAGE ">{_run(str(body_number // 40 + 1))}</w:fldSimple>'
+                else:
+                    content += _complex_field('DATE \\@ "yyyy-MM-dd"', "2025-01-01")
+                field_count += 1
+            if body_number in footnote_at:
+                note_id = len(footnotes) + 1
+                content += ('<w:r><w:rPr><w:rStyle w:val="FootnoteReference"/></w:rPr>'
+                            f'<w:footnoteReference w:id="{note_id}"/></w:r>')
+                footnotes.append(
+                    f'<w:footnote w:id="{note_id}">'
+                    f'{_paragraph(_run(text.sentence(4, 12)), "FootnoteText")}</w:footnote>'
+                )
+            if body_number in image_at:
+                images += 1
+                content += _image_run(f"rIdImage{images}", images)
+            parts.append(_paragraph(content))
+            paragraph_count += 1
+            body_number += 1
+        if section in table_after:
+            tables_here = 1 + (extra_tables if section == max(table_after) else 0)
+            for _ in range(tables_here):
+                parts.append(table_xml())
+                # Word requires a paragraph after a table at the end of a section
+                parts.append(_paragraph(""))
+                paragraph_count += spec.table_rows * spec.table_columns + 1
+                table_count += 1
+
+    parts.append('<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+                 '<w:pgMar w:top="1440" w:right="1800" w:bottom="1440" w:left="1800"/></w:sectPr>')
+    document_xml = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<w:document {_DOCUMENT_NAMESPACES}><w:body>{"".join(parts)}</w:body></w:document>')
+
+    _write_package(path, spec, document_xml, footnotes, images, paragraph_count)
+
+    return CorpusDocument(
+        path=path,
+        spec=spec,
+        paragraph_count=paragraph_count,
+        heading_texts=heading_texts,
+        table_count=table_count,
+        field_count=field_count,
+        footnote_count=len(footnotes),
+        media_count=images
+    )
+
+
+def _write_package(path: Path, spec: CorpusSpec, document_xml: str, footnotes: List[str],
+                   images: int, paragraph_count: int):
+    header = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    overrides = [
+        ("/word/document.xml", _CT_MAIN),
+        ("/word/styles.xml", _CT_STYLES),
+        ("/docProps/core.xml", _CT_CORE),
+        ("/docProps/app.xml", _CT_APP),
+    ]
+    relationships = [
+        ("rIdStyles", f"{_REL}/styles", "styles.xml"),
+    ]
+    if footnotes:
+        overrides.append(("/word/footnotes.xml", _CT_FOOTNOTES))
+        relationships.append(("rIdFootnotes", f"{_REL}/footnotes", "footnotes.xml"))
+    for number in range(1, images + 1):
+        relationships.append((f"rIdImage{number}", f"{_REL}/image", f"media/image{number}.png"))
+
+    content_types = (
+        header + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Default Extension="png" ContentType="image/png"/>'
+        + "".join(f'<Override PartName="{name}" ContentType="{kind}"/>' for name, kind in overrides)
+        + '</Types>'
+    )
+    package_rels = (
+        header + f'<Relationships xmlns="{_PKG_REL}">'
+        f'<Relationship Id="rId1" Type="{_REL}/officeDocument" Target="word/document.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/'
+        'metadata/core-properties" Target="docProps/core.xml"/>'
+        f'<Relationship Id="rId3" Type="{_REL}/extended-properties" Target="docProps/app.xml"/>'
+        '</Relationships>'
+    )
+    document_rels = (
+        header + f'<Relationships xmlns="{_PKG_REL}">'
+        + "".join(f'<Relationship Id="{rid}" Type="{kind}" Target="{target}"/>'
+                  for rid, kind, target in relationships)
+        + '</Relationships>'
+    )
+    core = (
+        header + '<cp:coreProperties '
+        'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f'<dc:title>Synthetic corpus {escape(spec.name)} (seed {spec.seed})</dc:title>'
+        '<dc:creator>autoword corpus generator</dc:creator>'
+        '<dcterms:created xsi:type="dcterms:W3CDTF">2025-01-01T00:00:00Z</dcterms:created>'
+        '<dcterms:modified xsi:type="dcterms:W3CDTF">2025-01-01T00:00:00Z</dcterms:modified>'
+        '</cp:coreProperties>'
+    )
+    app = (
+        header + '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+        f'<Application>Microsoft Office Word</Application><AppVersion>16.0000</AppVersion>'
+        f'<Pages>{max(1, paragraph_count // 25)}</Pages><Paragraphs>{paragraph_count}</Paragraphs>'
+        '</Properties>'
+    )
+    footnotes_xml = (
+        header + f'<w:footnotes xmlns:w="{_W_NS}">'
+        '<w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+        '<w:footnote w:type="continuationSeparator" w:id="0"><w:p><w:r><w:continuationSeparator/></w:r></w:p>'
+        '</w:footnote>' + "".join(footnotes) + '</w:footnotes>'
+    )
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", content_types)
+        package.writestr("_rels/.rels", package_rels)
+        package.writestr("docProps/core.xml", core)
+        package.writestr("docProps/app.xml", app)
+        package.writestr("word/document.xml", document_xml)
+        package.writestr("word/styles.xml", _styles_xml(spec.heading_depth))
+        package.writestr("word/_rels/document.xml.rels", document_rels)
+        if footnotes:
+            package.writestr("word/footnotes.xml", footnotes_xml)
+        for number in range(1, images + 1):
+            package.writestr(f"word/media/image{number}.png",
+                             _png_bytes(rgb=(40 * number % 256, 120, 200)))
+
+
+def generate_corpus(output_dir, tiers: Optional[List[str]] = None,
+                    documents_per_tier: int = 1) -> List[CorpusDocument]:
+    """
+    Generate documents for the given size tiers.
+
+    Args:
+        output_dir: Directory receiving <tier>_<n>.docx files
+        tiers: Size tier names (defaults to all SIZE_TIERS)
+        documents_per_tier: Documents per tier, each with a different seed
+
+    Returns:
+        List[CorpusDocument]: Generated documents
+    """
+    output_dir = Path(output_dir)
+    documents = []
+    for tier in tiers or list(SIZE_TIERS):
+        if tier not in SIZE_TIERS:
+            raise ValueError(f"Unknown size tier: {tier} (available: {', '.join(SIZE_TIERS)})")
+        for number in range(documents_per_tier):
+            spec = CorpusSpec(**{**SIZE_TIERS[tier].to_dict(), "seed": number})
+            documents.append(generate_docx(spec, output_dir / f"{tier}_{number}.docx"))
+    return documents
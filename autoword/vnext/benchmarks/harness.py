@@ -0,0 +1,738 @@
+"""
+End-to-end benchmark harness for the COM-free pipeline stages.
+
+Runs every stage that does not need Word against synthetic corpus documents
+of each size tier and records timing statistics in the layout used by
+pytest-benchmark (min/max/mean/stddev/median per benchmark, plus machine
+info), so results from different commits can be stored and compared:
+
+- ooxml_parse: read StructureV1 and InventoryFullV1 from the DOCX package
+- schema_validation: validate structure and inventory against the schemas
+- planning: DocumentPlanner with a stub LLM returning a fixed plan, which
+  measures prompt building, JSON parsing and all plan validation
+- diffing: DocumentAuditor.generate_diff_report against the structure the
+  plan would produce
+- auditing: write the audit trail (snapshots, structures, plan, inventory,
+  status) to a temporary directory
+"""
+
+import json
+import logging
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ...core.llm_client import LLMResponse, ModelType
+from ..auditor import DocumentAuditor
+from ..models import (
+    StructureV1, PlanV1, DeleteSectionByHeading, SetStyleRule, UpdateToc, FontSpec
+)
+from ..ooxml_reader import read_structure, read_inventory
+from ..planner import DocumentPlanner
+from ..schema_validator import SchemaValidator
+from .corpus import SIZE_TIERS, CorpusDocument, generate_docx
+
+
+logger = logging.getLogger(__name__)
+
+
+RESULTS_SCHEMA = "autoword.benchmark.v1"
+STAGES = ("ooxml_parse", "schema_validation", "planning", "diffing", "auditing")
+DEFAULT_USER_INTENT = "删除最后一章，正文使用宋体小四，更新目录"
+
+
+class StubLLMClient:
+    """LLM client returning a fixed plan, for benchmarks and tests."""
+
+    def __init__(self, plan_json: str):
+        self.plan_json = plan_json
+        self.calls = 0
+
+    def call_with_json_retry(self, model_type: ModelType, system_prompt: str,
+                             user_prompt: str, max_json_retries: int = 3) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(success=True, content=self.plan_json, model="stub")
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing statistics of one stage on one document."""
+    name: str
+    stage: str
+    tier: str
+    params: Dict[str, Any]
+    stats: Dict[str, float]
+    extra_info: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def build_stub_plan(structure: StructureV1) -> PlanV1:
+    """
+    Build the plan the stub LLM returns for a document.
+
+    Deletes the last level-1 section, restyles Normal and updates the TOC if
+    the document has one, which exercises every diff category.
+    """
+    ops = []
+    level_one = [h for h in structure.headings if h.level == 1]
+    if level_one:
+        ops.append(DeleteSectionByHeading(heading_text=level_one[-1].text, level=1))
+    ops.append(SetStyleRule(target_style_name="Normal",
+                            font=FontSpec(east_asian="宋体", latin="Times New Roman", size_pt=12)))
+    if any(f.field_type == "TOC" for f in structure.fields):
+        ops.append(UpdateToc())
+    return PlanV1(ops=ops)
+
+
+def preview_plan(structure: StructureV1, plan: PlanV1) -> StructureV1:
+    """
+    Approximate the structure after applying a plan, without Word.
+
+    Only section deletion and style font changes are modelled; that is
+    enough to give the diff stage a realistic amount of work.
+    """
+    after = structure.model_copy(deep=True)
+    for op in plan.ops:
+        if isinstance(op, DeleteSectionByHeading):
+            start = next((h for h in after.headings if h.text == op.heading_text and h.level == op.level), None)
+            if start is None:
+                continue
+            end = next((h.paragraph_index for h in after.headings
+                        if h.paragraph_index > start.paragraph_index and h.level <= op.level),
+                       len(after.paragraphs))
+            removed = end - start.paragraph_index
+            after.paragraphs = [
+                p.model_copy(update={"index": p.index - removed}) if p.index >= end else p
+                for p in after.paragraphs
+                if not start.paragraph_index <= p.index < end
+            ]
+            after.headings = [
+                h.model_copy(update={"paragraph_index": h.paragraph_index - removed})
+                if h.paragraph_index >= end else h
+                for h in after.headings
+                if not start.paragraph_index <= h.paragraph_index < end
+            ]
+        elif isinstance(op, SetStyleRule) and op.font:
+            for style in after.styles:
+                if style.name == op.target_style_name:
+                    base = style.font.model_dump(exclude_none=True) if style.font else {}
+                    style.font = FontSpec(**{**base, **op.font.model_dump(exclude_none=True)})
+    return after
+
+
+def _stats(durations: List[float]) -> Dict[str, float]:
+    return {
+        "min": min(durations),
+        "max": max(durations),
+        "mean": statistics.fmean(durations),
+        "stddev": statistics.stdev(durations) if len(durations) > 1 else 0.0,
+        "median": statistics.median(durations),
+        "rounds": len(durations),
+    }
+
+
+def _measure(func: Callable[[], Any], rounds: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        func()
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def benchmark_document(document: CorpusDocument, tier: str, rounds: int = 5, warmup: int = 1,
+                       stages: Optional[List[str]] = None,
+                       user_intent: str = DEFAULT_USER_INTENT) -> List[BenchmarkResult]:
+    """
+    Benchmark the COM-free stages on one document.
+
+    Args:
+        document: Generated corpus document
+        tier: Size tier name, used in benchmark names
+        rounds: Timed rounds per stage
+        warmup: Untimed rounds per stage
+        stages: Stages to run (defaults to all STAGES)
+        user_intent: User intent passed to the planner
+
+    Returns:
+        List[BenchmarkResult]: One result per stage
+    """
+    stages = list(stages or STAGES)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark stages: {', '.join(sorted(unknown))}")
+
+    docx_path = str(document.path)
+    structure = read_structure(docx_path)
+    inventory = read_inventory(docx_path)
+    plan = build_stub_plan(structure)
+    after_structure = preview_plan(structure, plan)
+    validator = SchemaValidator()
+    planner = DocumentPlanner(llm_client=StubLLMClient(plan.model_dump_json()))
+
+    work_dir = Path(tempfile.mkdtemp(prefix="autoword_bench_"))
+
+    def audit():
+        auditor = DocumentAuditor(base_audit_dir=tempfile.mkdtemp(dir=work_dir))
+        auditor.create_audit_directory()
+        auditor.save_snapshots(docx_path, docx_path, structure, after_structure, plan)
+        auditor.save_inventory(inventory)
+        auditor.finalize_audit("SUCCESS", "benchmark run")
+
+    def validate():
+        return (validator.validate_structure_v1(structure),
+                validator.validate_inventory_full_v1(inventory))
+
+    stage_functions = {
+        "ooxml_parse": lambda: (read_structure(docx_path), read_inventory(docx_path)),
+        "schema_validation": validate,
+        "planning": lambda: planner.generate_plan(structure, user_intent),
+        "diffing": lambda: DocumentAuditor(base_audit_dir=str(work_dir)).generate_diff_report(
+            structure, after_structure),
+        "auditing": audit,
+    }
+
+    extra_info = {
+        "paragraphs": len(structure.paragraphs),
+        "headings": len(structure.headings),
+        "tables": len(structure.tables),
+        "fields": len(structure.fields),
+        "footnotes": len(inventory.footnotes),
+        "media": len(inventory.media_indexes),
+        "file_size_bytes": document.path.stat().st_size,
+        "plan_ops": len(plan.ops),
+        # Validation findings do not stop the benchmark, but are recorded so
+        # that timings of valid and invalid documents are not compared blindly
+        "schema_errors": sum(len(result.errors) for result in validate()),
+    }
+
+    results = []
+    try:
+        for stage in stages:
+            durations = _measure(stage_functions[stage], rounds, warmup)
+            results.append(BenchmarkResult(
+                name=f"{stage}[{tier}]",
+                stage=stage,
+                tier=tier,
+                params=document.spec.to_dict(),
+                stats=_stats(durations),
+                extra_info=extra_info
+            ))
+            logger.info(f"{stage}[{tier}]: median {statistics.median(durations) * 1000:.2f} ms")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def _legacy_json_fix(client, content: str) -> Optional[Any]:
+    """JSON recovery as LLMClient did it before the single-pass repairer."""
+    cleaned = client._clean_json_content(content)
+    for candidate in (cleaned, client._clean_json_content(cleaned), client._aggressive_json_fix(cleaned)):
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def benchmark_json_repair(corpus_path: str, rounds: int = 20) -> Dict[str, Any]:
+    """
+    Compare the single-pass JSON repairer with the legacy regex pipeline.
+
+    Args:
+        corpus_path: JSON Lines file of captured LLM outputs; each line has
+            "name", "content" and optionally the "expected" parsed value
+            (null for outputs that must be rejected, e.g. truncated values)
+        rounds: Timed passes over the whole corpus per strategy
+
+    Returns:
+        Dict[str, Any]: Per-strategy recovered/correct counts and timing
+            statistics for one pass over the corpus
+    """
+    from ...core.json_repair import try_repair_json
+    from ...core.llm_client import LLMClient
+
+    with open(corpus_path, "r", encoding="utf-8") as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    client = LLMClient(api_keys={"gpt": "unused", "claude": "unused"})
+
+    def single_pass(content):
+        result, _ = try_repair_json(content)
+        return result.value if result is not None else None
+
+    strategies = {"single_pass": single_pass, "legacy": lambda content: _legacy_json_fix(client, content)}
+    report = {"samples": len(samples), "strategies": {}}
+    for name, strategy in strategies.items():
+        values = [strategy(sample["content"]) for sample in samples]
+        durations = _measure(lambda: [strategy(sample["content"]) for sample in samples], rounds, 1)
+        report["strategies"][name] = {
+            "recovered": sum(1 for value in values if value is not None),
+            "correct": sum(1 for sample, value in zip(samples, values)
+                           if "expected" in sample and value == sample["expected"]),
+            "failed": [sample["name"] for sample, value in zip(samples, values)
+                       if (value != sample["expected"] if "expected" in sample else value is None)],
+            "stats": _stats(durations),
+        }
+    return report
+
+
+def _linear_authorization(checker, changes, tasks, comment_map, task_ranges) -> List[Optional[str]]:
+    """Reference authorization: scan every task for every change."""
+    resolved = [(task, checker._resolve_task_range(task, comment_map, task_ranges)) for task in tasks]
+    authorized = []
+    for change in changes:
+        relevant = checker._get_relevant_task_types(change.change_type)
+        position = change.position
+        match = None
+        for task, task_range in resolved:
+            if task.type not in relevant or not task.source_comment_id:
+                continue
+            if position is None or task_range is None or (
+                    min(task_range) < max(position[0] + 1, position[1])
+                    and max(task_range[1], min(task_range) + 1) > position[0]):
+                match = task.id
+                break
+        authorized.append(match)
+    return authorized
+
+
+def benchmark_authorization(changes: int = 5000, tasks: int = 500, rounds: int = 5,
+                            seed: int = 0) -> Dict[str, Any]:
+    """
+    Compare interval-tree change authorization with a linear scan.
+
+    Builds a synthetic document of comment-driven heading and hyperlink
+    tasks, each anchored to a comment range, and heading/hyperlink changes
+    at random character ranges, then times AuthorizationChecker against a
+    reference loop that checks every task for every change.
+
+    Args:
+        changes: Number of format changes
+        tasks: Number of comment-driven tasks
+        rounds: Timed rounds per strategy
+        seed: Random seed for the synthetic ranges
+
+    Returns:
+        Dict[str, Any]: Timing statistics per strategy, the speedup and
+            whether both strategies authorized the same changes
+    """
+    import random
+    from ...core.format_validator import AuthorizationChecker, FormatChange
+    from ...core.models import Comment, Locator, LocatorType, Task, TaskType
+
+    rng = random.Random(seed)
+    document_length = max(tasks, 1) * 400
+    comment_list, task_list = [], []
+    task_types = [(TaskType.SET_HEADING_LEVEL, "heading_level_change"),
+                  (TaskType.REPLACE_HYPERLINK, "hyperlink_address_change")]
+    for i in range(tasks):
+        start = rng.randrange(document_length)
+        comment_list.append(Comment(id=f"c{i}", author="bench", page=1, anchor_text="", comment_text="",
+                                    range_start=start, range_end=start + rng.randint(1, 200)))
+        task_list.append(Task(id=f"t{i}", type=task_types[i % 2][0], source_comment_id=f"c{i}",
+                              locator=Locator(by=LocatorType.FIND, value=f"anchor {i}"), instruction="edit"))
+
+    def make_changes():
+        result = []
+        for i in range(changes):
+            start = rng.randrange(document_length)
+            result.append(FormatChange(change_type=task_types[i % 2][1], element_type="heading",
+                                       element_id=f"heading_{start}_{start + 50}", old_value=1, new_value=2,
+                                       authorized=False))
+        return result
+
+    change_list = make_changes()
+    checker = AuthorizationChecker()
+    comment_map = {comment.id: comment for comment in comment_list}
+
+    def indexed():
+        for change in change_list:
+            change.authorized, change.source_comment_id = False, None
+        checked = checker.check_authorization(change_list, task_list, comment_list)
+        return [change.source_comment_id and f"t{change.source_comment_id[1:]}" for change in checked]
+
+    linear = lambda: _linear_authorization(checker, change_list, task_list, comment_map, {})
+    # The checker logs a warning per unauthorized change; keep the timings free of logging I/O
+    checker_logger = logging.getLogger("autoword.core.format_validator")
+    previous_level = checker_logger.level
+    checker_logger.setLevel(logging.ERROR)
+    try:
+        indexed_result, linear_result = indexed(), linear()
+        indexed_stats, linear_stats = _stats(_measure(indexed, rounds, 1)), _stats(_measure(linear, rounds, 1))
+    finally:
+        checker_logger.setLevel(previous_level)
+    report = {
+        "changes": changes,
+        "tasks": tasks,
+        "authorized": sum(1 for task_id in indexed_result if task_id),
+        "equivalent": indexed_result == linear_result,
+        "strategies": {
+            "interval_tree": indexed_stats,
+            "linear_scan": linear_stats,
+        },
+    }
+    tree_median = report["strategies"]["interval_tree"]["median"]
+    report["speedup"] = report["strategies"]["linear_scan"]["median"] / tree_median if tree_median else None
+    return report
+
+
+def _plan_references(plan: PlanV1) -> List[str]:
+    """Prompt fragments a plan depends on: heading outline entries and style names."""
+    references = []
+    for op in plan.ops:
+        if isinstance(op, DeleteSectionByHeading):
+            references.append(f"H{op.level} {json.dumps(op.heading_text, ensure_ascii=False)}")
+        target_style = getattr(op, "target_style_name", None)
+        if target_style:
+            references.append(json.dumps(target_style, ensure_ascii=False))
+    return references
+
+
+def benchmark_prompt_compaction(tiers: Optional[List[str]] = None, token_budget: Optional[int] = 6000,
+                                rounds: int = 5) -> Dict[str, Any]:
+    """
+    Measure planner prompt size with and without structure compaction.
+
+    Plan equivalence is checked by reference coverage: every heading
+    (level and exact text) and style name used by the plan built from the
+    full structure must appear verbatim in the compacted prompt, so an LLM
+    given the compact view can still emit the same operations.
+
+    Args:
+        tiers: Size tiers to measure (defaults to all SIZE_TIERS)
+        token_budget: Structure token budget passed to the compactor
+        rounds: Timed compaction rounds per document
+
+    Returns:
+        Dict[str, Any]: Per-tier token counts, reduction, budget effects,
+            reference coverage and compaction timing statistics
+    """
+    from ..planner.prompt_compaction import PromptCompactionConfig, compact_structure
+
+    tiers = list(tiers or SIZE_TIERS)
+    config = PromptCompactionConfig(token_budget=token_budget)
+    report = {"token_budget": token_budget, "documents": []}
+    with tempfile.TemporaryDirectory(prefix="autoword_prompt_") as corpus_dir:
+        for tier in tiers:
+            document = generate_docx(SIZE_TIERS[tier], Path(corpus_dir) / f"{tier}.docx")
+            structure = read_structure(str(document.path))
+            compacted = compact_structure(structure, config)
+            missing = [reference for reference in _plan_references(build_stub_plan(structure))
+                       if reference not in compacted.text]
+            durations = _measure(lambda: compact_structure(structure, config), rounds, 1)
+            report["documents"].append({
+                "tier": tier,
+                "paragraphs": len(structure.paragraphs),
+                **compacted.to_dict(),
+                "plan_equivalent": not missing,
+                "missing_references": missing,
+                "stats": _stats(durations),
+            })
+    return report
+
+
+def benchmark_bulk_read(tiers: Optional[List[str]] = None, rounds: int = 3,
+                        call_latency_ms: float = 0.06) -> Dict[str, Any]:
+    """
+    Compare per-paragraph COM reads with one WordOpenXML fetch.
+
+    Runs the DocumentExtractor paragraph consumers (paragraph skeletons and
+    the lookup of anchored objects by paragraph) against a simulated Word
+    document that counts cross-process calls, once with Range.WordOpenXML
+    available and once without it. Estimated time adds
+    call_latency_ms per counted call to the in-process wall time, since
+    the latency of an out-of-process COM call dominates against real Word.
+
+    Args:
+        tiers: Size tiers to measure (defaults to small and medium)
+        rounds: Timed rounds per strategy
+        call_latency_ms: Assumed cost of one COM call in milliseconds
+
+    Returns:
+        Dict[str, Any]: Per-tier COM call counts, wall and estimated times
+            per strategy, and whether both strategies produced the same data
+    """
+    from ...core.paragraph_table import load_paragraph_table
+    from ..extractor.document_extractor import DocumentExtractor
+    from .com_sim import SimulatedDocument
+
+    tiers = list(tiers or ["small", "medium"])
+    extractor = DocumentExtractor()
+    report = {"call_latency_ms": call_latency_ms, "documents": []}
+    # The per-paragraph strategy logs a fallback warning on every read
+    table_logger = logging.getLogger("autoword.core.paragraph_table")
+    previous_level = table_logger.level
+    table_logger.setLevel(logging.ERROR)
+    try:
+        with tempfile.TemporaryDirectory(prefix="autoword_bulk_") as corpus_dir:
+            for tier in tiers:
+                document = generate_docx(SIZE_TIERS[tier], Path(corpus_dir) / f"{tier}.docx")
+                entry = {"tier": tier, "strategies": {}}
+                outputs = {}
+                for strategy, bulk_xml in (("word_open_xml", True), ("per_paragraph", False)):
+                    doc = SimulatedDocument(str(document.path), bulk_xml=bulk_xml)
+                    # Objects anchored in the body (images, footnote references) located by paragraph
+                    anchors = [row.start + row.text.index(marker) for row in doc.table
+                               for marker in ("\x01", "\x02") if marker in row.text]
+
+                    def read(doc=doc, anchors=anchors):
+                        extractor._paragraph_table = load_paragraph_table(doc)
+                        try:
+                            paragraphs = [p.model_dump() for p in extractor._extract_paragraphs(doc)]
+                            return paragraphs, [extractor._paragraph_index(doc, position) for position in anchors]
+                        finally:
+                            extractor._paragraph_table = None
+
+                    doc.counter.reset()
+                    outputs[strategy] = read()
+                    calls = doc.counter.calls
+                    stats = _stats(_measure(read, rounds, 0))
+                    entry["paragraphs"] = len(doc.table)
+                    entry["anchors"] = len(anchors)
+                    entry["strategies"][strategy] = {
+                        "com_calls": calls,
+                        "wall_ms": stats["median"] * 1000,
+                        "estimated_ms": stats["median"] * 1000 + calls * call_latency_ms,
+                        "stats": stats,
+                    }
+                bulk, per_paragraph = entry["strategies"]["word_open_xml"], entry["strategies"]["per_paragraph"]
+                entry["call_reduction"] = 1 - bulk["com_calls"] / per_paragraph["com_calls"]
+                entry["speedup"] = per_paragraph["estimated_ms"] / bulk["estimated_ms"]
+                entry["equivalent"] = outputs["word_open_xml"] == outputs["per_paragraph"]
+                report["documents"].append(entry)
+    finally:
+        table_logger.setLevel(previous_level)
+    return report
+
+
+def machine_info() -> Dict[str, Any]:
+    """Machine description stored with results, as pytest-benchmark does."""
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "python_implementation": platform.python_implementation(),
+        "python_version": platform.python_version(),
+        "processor": platform.processor(),
+    }
+
+
+def run_benchmarks(tiers: Optional[List[str]] = None, rounds: int = 5, warmup: int = 1,
+                   stages: Optional[List[str]] = None, corpus_dir: Optional[str] = None,
+                   output_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate the corpus and benchmark every tier.
+
+    Args:
+        tiers: Size tiers to run (defaults to small and medium)
+        rounds: Timed rounds per stage
+        warmup: Untimed rounds per stage
+        stages: Stages to run (defaults to all STAGES)
+        corpus_dir: Directory for generated documents (temporary if None)
+        output_path: JSON file receiving the results
+
+    Returns:
+        Dict[str, Any]: Results document
+    """
+    from .. import __version__
+
+    tiers = list(tiers or ["small", "medium"])
+    unknown = [tier for tier in tiers if tier not in SIZE_TIERS]
+    if unknown:
+        raise ValueError(f"Unknown size tiers: {', '.join(unknown)} (available: {', '.join(SIZE_TIERS)})")
+
+    temporary_dir = None if corpus_dir else tempfile.mkdtemp(prefix="autoword_corpus_")
+    corpus_path = Path(corpus_dir or temporary_dir)
+    benchmarks = []
+    try:
+        for tier in tiers:
+            document = generate_docx(SIZE_TIERS[tier], corpus_path / f"{tier}.docx")
+            benchmarks.extend(benchmark_document(document, tier, rounds=rounds, warmup=warmup, stages=stages))
+    finally:
+        if temporary_dir:
+            shutil.rmtree(temporary_dir, ignore_errors=True)
+
+    results = {
+        "schema": RESULTS_SCHEMA,
+        "datetime": datetime.now().isoformat(),
+        "version": __version__,
+        "machine_info": machine_info(),
+        "benchmarks": [result.to_dict() for result in benchmarks],
+    }
+    if output_path:
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    return results
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Load a results file written by run_benchmarks."""
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    if results.get("schema") != RESULTS_SCHEMA:
+        raise ValueError(f"{path} is not a {RESULTS_SCHEMA} results file")
+    return results
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Compare median timings of two result documents.
+
+    Args:
+        baseline: Earlier results
+        current: New results
+        threshold: Relative median increase reported as a regression
+
+    Returns:
+        List[Dict[str, Any]]: One entry per benchmark present in both, with
+            baseline/current medians, relative change and regression flag
+    """
+    baseline_by_name = {b["name"]: b for b in baseline.get("benchmarks", [])}
+    comparison = []
+    for bench in current.get("benchmarks", []):
+        previous = baseline_by_name.get(bench["name"])
+        if previous is None:
+            continue
+        old, new = previous["stats"]["median"], bench["stats"]["median"]
+        change = (new - old) / old if old > 0 else 0.0
+        comparison.append({
+            "name": bench["name"],
+            "baseline_median": old,
+            "current_median": new,
+            "change": change,
+            "regression": change > threshold,
+        })
+    return comparison
+
+
+def format_results(results: Dict[str, Any], comparison: Optional[List[Dict[str, Any]]] = None) -> str:
+    """Render results (and an optional comparison) as a text table."""
+    changes = {entry["name"]: entry for entry in comparison or []}
+    lines = [f"{'benchmark':<28} {'min ms':>10} {'median ms':>10} {'max ms':>10} {'rounds':>7}  change"]
+    for bench in results["benchmarks"]:
+        stats = bench["stats"]
+        entry = changes.get(bench["name"])
+        change = ""
+        if entry:
+            change = f"{entry['change']:+.1%}" + (" REGRESSION" if entry["regression"] else "")
+        lines.append(f"{bench['name']:<28} {stats['min'] * 1000:>10.2f} {stats['median'] * 1000:>10.2f} "
+                     f"{stats['max'] * 1000:>10.2f} {stats['rounds']:>7}  {change}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point (python -m autoword.vnext.benchmarks)."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m autoword.vnext.benchmarks",
+                                     description="Synthetic corpus and COM-free stage benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Write corpus documents")
+    generate.add_argument("output_dir")
+    generate.add_argument("--tiers", nargs="+", choices=list(SIZE_TIERS), default=list(SIZE_TIERS))
+    generate.add_argument("--count", type=int, default=1, help="Documents per tier")
+
+    run = subparsers.add_parser("run", help="Run benchmarks")
+    run.add_argument("--tiers", nargs="+", choices=list(SIZE_TIERS), default=["small", "medium"])
+    run.add_argument("--stages", nargs="+", choices=list(STAGES))
+    run.add_argument("--rounds", type=int, default=5)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--corpus-dir", help="Keep generated documents in this directory")
+    run.add_argument("--output", help="Write results JSON to this file")
+    run.add_argument("--compare", help="Baseline results JSON to compare against")
+    run.add_argument("--threshold", type=float, default=0.2,
+                     help="Relative median increase reported as a regression")
+
+    repair = subparsers.add_parser("json-repair", help="Compare JSON repair strategies on captured LLM outputs")
+    repair.add_argument("corpus", help="JSON Lines file with name/content/expected per line")
+    repair.add_argument("--rounds", type=int, default=20)
+
+    prompt = subparsers.add_parser("prompt-size", help="Measure planner prompt compaction on corpus documents")
+    prompt.add_argument("--tiers", nargs="+", choices=list(SIZE_TIERS), default=list(SIZE_TIERS))
+    prompt.add_argument("--token-budget", type=int, default=6000, help="Structure token budget (0 for unlimited)")
+    prompt.add_argument("--rounds", type=int, default=5)
+
+    auth = subparsers.add_parser("authorization", help="Time change authorization against a linear scan")
+    auth.add_argument("--changes", type=int, default=5000)
+    auth.add_argument("--tasks", type=int, default=500)
+    auth.add_argument("--rounds", type=int, default=5)
+
+    bulk = subparsers.add_parser("bulk-read", help="Count COM calls for per-paragraph reads against WordOpenXML")
+    bulk.add_argument("--tiers", nargs="+", choices=list(SIZE_TIERS), default=["small", "medium"])
+    bulk.add_argument("--rounds", type=int, default=3)
+    bulk.add_argument("--call-latency-ms", type=float, default=0.06, help="Assumed cost of one COM call")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "bulk-read":
+        report = benchmark_bulk_read(args.tiers, rounds=args.rounds, call_latency_ms=args.call_latency_ms)
+        for entry in report["documents"]:
+            for name, result in entry["strategies"].items():
+                print(f"{entry['tier']:<8} {name:<14} {result['com_calls']:>8} COM calls  "
+                      f"wall {result['wall_ms']:.1f} ms  estimated {result['estimated_ms']:.1f} ms")
+            print(f"{entry['tier']:<8} {entry['paragraphs']} paragraphs, {entry['anchors']} anchors  "
+                  f"{entry['call_reduction']:.1%} fewer calls  speedup {entry['speedup']:.1f}x  "
+                  f"equivalent: {entry['equivalent']}")
+        return 0 if all(entry["equivalent"] for entry in report["documents"]) else 1
+
+    if args.command == "authorization":
+        report = benchmark_authorization(args.changes, args.tasks, rounds=args.rounds)
+        for name, stats in report["strategies"].items():
+            print(f"{name:<14} median {stats['median'] * 1000:.2f} ms for {report['changes']} changes "
+                  f"x {report['tasks']} tasks")
+        print(f"speedup {report['speedup']:.1f}x  authorized {report['authorized']}  "
+              f"equivalent: {report['equivalent']}")
+        return 0 if report["equivalent"] else 1
+
+    if args.command == "prompt-size":
+        report = benchmark_prompt_compaction(args.tiers, token_budget=args.token_budget or None,
+                                             rounds=args.rounds)
+        for entry in report["documents"]:
+            print(f"{entry['tier']:<8} {entry['paragraphs']:>6} paragraphs  "
+                  f"{entry['original_tokens']:>8} -> {entry['compact_tokens']:>6} tokens "
+                  f"({entry['reduction']:.0%} smaller)  plan equivalent: {entry['plan_equivalent']}"
+                  + (f"  truncated: {', '.join(entry['truncated_sections'])}" if entry["truncated_sections"] else ""))
+        return 0 if all(entry["plan_equivalent"] for entry in report["documents"]) else 1
+
+    if args.command == "json-repair":
+        report = benchmark_json_repair(args.corpus, rounds=args.rounds)
+        for name, result in report["strategies"].items():
+            print(f"{name:<12} correct {result['correct']}/{report['samples']}  "
+                  f"median {result['stats']['median'] * 1000:.3f} ms per corpus pass")
+            if result["failed"]:
+                print(f"{'':<12} failed: {', '.join(result['failed'])}")
+        return 0
+
+    if args.command == "generate":
+        from .corpus import generate_corpus
+        for document in generate_corpus(args.output_dir, args.tiers, args.count):
+            print(f"{document.path}: {document.paragraph_count} paragraphs, "
+                  f"{len(document.heading_texts)} headings, {document.table_count} tables")
+        return 0
+
+    results = run_benchmarks(tiers=args.tiers, rounds=args.rounds, warmup=args.warmup,
+                             stages=args.stages, corpus_dir=args.corpus_dir, output_path=args.output)
+    comparison = compare_results(load_results(args.compare), results, args.threshold) if args.compare else None
+    print(format_results(results, comparison))
+    if comparison and any(entry["regression"] for entry in comparison):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Stage checkpoints for resumable pipeline runs.
+
+Every pipeline run writes the outputs of its completed stages to the
+checkpoints/ directory of its audit directory: the structure and inventory
+from Extract, the plan from Plan and the modified DOCX from Execute. Each
+checkpoint records the hash of the inputs it was computed from (the source
+document, the user intent and the hashes of the upstream checkpoints), so
+VNextPipeline.resume() can skip every stage whose inputs are unchanged and
+a crash or a hung Word instance during Validate does not repeat extraction
+or the paid LLM planning call.
+
+Artifacts are written to a temporary file and moved into place with
+os.replace(), and checkpoint.json is rewritten the same way only after the
+artifact is complete, so a run killed at any point leaves the previous or
+the new checkpoint, never a partial one.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from pydantic import BaseModel
+
+from .exceptions import AuditError
+from .serialization import ArtifactSerializer, get_serializer, load_artifact
+
+
+logger = logging.getLogger(__name__)
+
+
+CHECKPOINT_SCHEMA = "autoword.checkpoint.v1"
+CHECKPOINT_FILE = "checkpoint.json"
+CHECKPOINT_DIR = "checkpoints"
+
+# Upstream checkpoints each checkpoint is computed from (besides the
+# source document and the user intent)
+CHECKPOINT_INPUTS = {
+    "structure": (),
+    "inventory": (),
+    "plan": ("structure",),
+    "modified_docx": ("plan",),
+}
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write_text(path: Path, text: str):
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class CheckpointStore:
+    """Checkpoints of one pipeline run, stored in its audit directory."""
+
+    def __init__(self, audit_directory: Union[str, Path],
+                 artifact_format: Union[str, ArtifactSerializer, None] = None):
+        """
+        Open or create the checkpoint store of an audit directory.
+
+        Args:
+            audit_directory: Run audit directory
+            artifact_format: Serializer for model checkpoints
+                ("json", "json-stream" or "binary"; defaults to "json")
+
+        Raises:
+            AuditError: If an existing checkpoint file cannot be read
+        """
+        self.audit_directory = Path(audit_directory)
+        self.serializer = get_serializer(artifact_format)
+        self.path = self.audit_directory / CHECKPOINT_FILE
+        self._lock = threading.Lock()  # Plan records its checkpoint on a worker thread
+        self.data = self._load()
+
+    @classmethod
+    def open(cls, audit_directory: Union[str, Path]) -> "CheckpointStore":
+        """
+        Open the checkpoints of an existing run.
+
+        Raises:
+            AuditError: If the directory has no checkpoint file
+        """
+        if not (Path(audit_directory) / CHECKPOINT_FILE).exists():
+            raise AuditError(f"No checkpoint found in {audit_directory}",
+                             audit_directory=str(audit_directory), audit_stage="checkpoint_loading")
+        return cls(audit_directory)
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {"schema": CHECKPOINT_SCHEMA, "run": {}, "checkpoints": {}, "result": None}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise AuditError(f"Failed to read checkpoint file: {e}",
+                             audit_directory=str(self.audit_directory), audit_stage="checkpoint_loading")
+        if data.get("schema") != CHECKPOINT_SCHEMA:
+            raise AuditError(f"Unsupported checkpoint schema: {data.get('schema')}",
+                             audit_directory=str(self.audit_directory), audit_stage="checkpoint_loading")
+        return data
+
+    def _save(self):
+        self.audit_directory.mkdir(parents=True, exist_ok=True)
+        _atomic_write_text(self.path, json.dumps(self.data, indent=2, ensure_ascii=False))
+
+    @property
+    def document_path(self) -> Optional[str]:
+        return self.data["run"].get("document_path")
+
+    @property
+    def user_intent(self) -> Optional[str]:
+        return self.data["run"].get("user_intent")
+
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Recorded final ProcessingResult of the run, if it finished."""
+        return self.data.get("result")
+
+    def document_unchanged(self) -> bool:
+        """Whether the recorded source document still has the recorded content."""
+        path, recorded = self.document_path, self.data["run"].get("document_sha256")
+        return bool(path and recorded and os.path.exists(path) and file_sha256(path) == recorded)
+
+    def start_run(self, document_path: str, user_intent: str):
+        """
+        Record the inputs of a (possibly resumed) run.
+
+        Checkpoints computed from a different document or intent stop
+        matching, since their input hashes include both.
+
+        Args:
+            document_path: Original DOCX path
+            user_intent: User intent for planning
+        """
+        document_hash = file_sha256(document_path)
+        with self._lock:
+            previous = self.data["run"].get("document_sha256")
+            if previous and previous != document_hash:
+                logger.info(f"Document changed since the checkpoint was written, rerunning all stages: {document_path}")
+            self.data["run"] = {
+                "document_path": os.path.abspath(document_path),
+                "document_sha256": document_hash,
+                "user_intent": user_intent,
+                "started_at": datetime.now().isoformat(),
+            }
+            self.data["result"] = None
+            self._save()
+
+    def input_hash(self, name: str) -> Optional[str]:
+        """
+        Hash of everything a checkpoint is computed from.
+
+        Returns:
+            Optional[str]: Hex digest, or None if an upstream checkpoint is missing
+        """
+        run = self.data["run"]
+        parts = [CHECKPOINT_SCHEMA, name, run.get("document_sha256") or "", run.get("user_intent") or ""]
+        for upstream in CHECKPOINT_INPUTS[name]:
+            entry = self.data["checkpoints"].get(upstream)
+            if entry is None:
+                return None
+            parts.append(entry["sha256"])
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _valid_entry(self, name: str) -> Optional[Dict[str, Any]]:
+        entry = self.data["checkpoints"].get(name)
+        expected = self.input_hash(name)
+        if entry is None or expected is None or entry["input_hash"] != expected:
+            return None
+        path = self.audit_directory / entry["path"]
+        if not path.exists() or file_sha256(path) != entry["sha256"]:
+            logger.warning(f"Checkpoint {name} is missing or corrupted, recomputing")
+            return None
+        return entry
+
+    def restore_model(self, name: str) -> Optional[BaseModel]:
+        """
+        Load a model checkpoint whose inputs are unchanged.
+
+        Returns:
+            Optional[BaseModel]: The checkpointed artifact, or None if it must be recomputed
+        """
+        with self._lock:
+            entry = self._valid_entry(name)
+        if entry is None:
+            return None
+        return load_artifact(self.audit_directory / entry["path"])
+
+    def restore_file(self, name: str, destination: Union[str, Path]) -> bool:
+        """
+        Copy a file checkpoint whose inputs are unchanged to destination.
+
+        Returns:
+            bool: Whether the checkpoint was restored
+        """
+        with self._lock:
+            entry = self._valid_entry(name)
+        if entry is None:
+            return False
+        shutil.copy2(self.audit_directory / entry["path"], destination)
+        return True
+
+    def save_model(self, name: str, artifact: BaseModel):
+        """Checkpoint a StructureV1, InventoryFullV1 or PlanV1 artifact."""
+        path = self._checkpoint_path(f"{name}{self.serializer.extension}")
+        temp_path = path.with_name(path.name + ".tmp")
+        self.serializer.dump(artifact, temp_path)
+        os.replace(temp_path, path)
+        self._record(name, path)
+
+    def save_file(self, name: str, source: Union[str, Path]):
+        """Checkpoint a file (the modified DOCX)."""
+        path = self._checkpoint_path(f"{name}{Path(source).suffix}")
+        temp_path = path.with_name(path.name + ".tmp")
+        shutil.copy2(source, temp_path)
+        os.replace(temp_path, path)
+        self._record(name, path)
+
+    def _checkpoint_path(self, filename: str) -> Path:
+        directory = self.audit_directory / CHECKPOINT_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / filename
+
+    def _record(self, name: str, path: Path):
+        sha256 = file_sha256(path)
+        with self._lock:
+            self.data["checkpoints"][name] = {
+                "path": path.relative_to(self.audit_directory).as_posix(),
+                "sha256": sha256,
+                "input_hash": self.input_hash(name),
+                "completed_at": datetime.now().isoformat(),
+            }
+            self._save()
+
+    def finish(self, result: BaseModel):
+        """
+        Record the final ProcessingResult of a run that completed.
+
+        Resuming a finished run returns this result instead of running any
+        stage. Runs that stopped on an error are not finished and stay
+        resumable.
+        """
+        with self._lock:
+            self.data["result"] = result.model_dump()
+            self._save()
@@ -12,12 +12,12 @@ import logging
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 
-from .pipeline import VNextPipeline
-from .models import ProcessingResult
-from .monitoring import MonitoringLevel
-from ..core.llm_client import LLMClient, ModelType
+# The pipeline, models, monitoring (psutil) and LLM client are imported inside
+# the subcommands that use them, so `--help`, `status` and `config` start fast.
+if TYPE_CHECKING:
+    from .models import ProcessingResult
 
 
 def setup_logging(verbose: bool = False, log_file: Optional[str] = None):
@@ -65,6 +65,8 @@ def save_config(args, config_path: str):
         "enable_memory_monitoring": args.enable_memory_monitoring,
         "memory_warning_threshold": args.memory_warning_threshold,
         "memory_critical_threshold": args.memory_critical_threshold,
+        "stage_timeout": args.stage_timeout,
+        "operation_timeout": args.operation_timeout,
         "log_file": args.log_file
     }
     
@@ -90,6 +92,8 @@ def apply_config(args, config: Dict[str, Any]):
         'enable_memory_monitoring': True,
         'memory_warning_threshold': 1024,
         'memory_critical_threshold': 2048,
+        'stage_timeout': None,
+        'operation_timeout': 180,
         'log_file': None
     }
     
@@ -99,7 +103,27 @@ def apply_config(args, config: Dict[str, Any]):
             print(f"Applied config: {key} = {config[key]}")
 
 
-def show_performance_summary(result: ProcessingResult):
+def pipeline_timeouts(args) -> Dict[str, Any]:
+    """
+    Watchdog arguments for VNextPipeline from --stage-timeout/--operation-timeout.
+    
+    Returns:
+        Dict[str, Any]: stage_timeouts and operation_timeout_seconds
+    """
+    stage_timeouts = {}
+    for value in getattr(args, 'stage_timeout', None) or []:
+        stage, _, seconds = value.partition("=")
+        try:
+            stage_timeouts[stage.strip().capitalize()] = float(seconds)
+        except ValueError:
+            raise ValueError(f"Invalid --stage-timeout '{value}', expected STAGE=SECONDS")
+    return {
+        "stage_timeouts": stage_timeouts,
+        "operation_timeout_seconds": getattr(args, 'operation_timeout', 180)
+    }
+
+
+def show_performance_summary(result: 'ProcessingResult'):
     """Show performance summary if available."""
     if hasattr(result, 'performance_metrics') and result.performance_metrics:
         print("\n=== Performance Summary ===")
@@ -126,6 +150,10 @@ def progress_callback(stage_name: str, progress_percent: int):
 
 def process_single_document(args) -> int:
     """Process a single document."""
+    from .pipeline import VNextPipeline
+    from .monitoring import MonitoringLevel
+    from ..core.llm_client import LLMClient, ModelType
+
     print(f"Processing document: {args.input}")
     print(f"User intent: {args.intent}")
     
@@ -150,61 +178,146 @@ def process_single_document(args) -> int:
             monitoring_level=monitoring_level,
             enable_memory_monitoring=args.enable_memory_monitoring,
             memory_warning_threshold_mb=args.memory_warning_threshold,
-            memory_critical_threshold_mb=args.memory_critical_threshold
+            memory_critical_threshold_mb=args.memory_critical_threshold,
+            **pipeline_timeouts(args)
         )
         
         # Process document
         result = pipeline.process_document(args.input, args.intent)
+        return report_result(result, args.verbose)
+            
+    except Exception as e:
+        print(f"[ERROR] Processing failed: {str(e)}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+def report_result(result: 'ProcessingResult', verbose: bool = False) -> int:
+    """Print a processing result and return the exit code for its status."""
+    print(f"\nStatus: {result.status}")
+    if result.message:
+        print(f"Message: {result.message}")
+    
+    if result.audit_directory:
+        print(f"Audit directory: {result.audit_directory}")
+    
+    if result.errors:
+        print("Errors:")
+        for error in result.errors:
+            print(f"  - {error}")
+    
+    if result.warnings:
+        print("Warnings:")
+        for warning in result.warnings:
+            print(f"  - {warning}")
+    
+    # Show performance summary in verbose mode
+    if verbose:
+        show_performance_summary(result)
+    
+    # Return appropriate exit code
+    if result.status == "SUCCESS":
+        print("[SUCCESS] Document processing completed successfully!")
+        return 0
+    elif result.status == "FAILED_VALIDATION":
+        print("[WARNING] Document processing failed validation - changes rolled back")
+        return 2
+    elif result.status == "ROLLBACK":
+        print("[ERROR] Document processing failed - rollback performed")
+        return 3
+    elif result.status == "INVALID_PLAN":
+        print("[ERROR] LLM generated invalid plan - processing aborted")
+        return 4
+    elif result.status == "TIMEOUT":
+        print("[ERROR] Word stopped responding - Word was killed and changes rolled back")
+        return 6
+    else:
+        print(f"[UNKNOWN] Unknown status: {result.status}")
+        return 5
+
+
+def resume_run(args) -> int:
+    """Resume an interrupted run from the checkpoints in its audit directory."""
+    from .pipeline import VNextPipeline
+    from .monitoring import MonitoringLevel
+    from ..core.llm_client import LLMClient, ModelType
+
+    print(f"Resuming run: {args.run_dir}")
+    
+    try:
+        llm_client = None
+        if args.model:
+            model_type = ModelType[args.model.upper()]
+            llm_client = LLMClient(
+                model=model_type,
+                api_key=os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY"),
+                temperature=args.temperature
+            )
         
-        # Output results
-        print(f"\nStatus: {result.status}")
-        if result.message:
-            print(f"Message: {result.message}")
-        
-        if result.audit_directory:
-            print(f"Audit directory: {result.audit_directory}")
-        
-        if result.errors:
-            print("Errors:")
-            for error in result.errors:
-                print(f"  - {error}")
-        
-        if result.warnings:
-            print("Warnings:")
-            for warning in result.warnings:
-                print(f"  - {warning}")
+        # Resumed runs stay in their own directory; base_audit_dir only holds the history
+        pipeline = VNextPipeline(
+            llm_client=llm_client,
+            base_audit_dir=args.audit_dir,
+            visible=args.visible,
+            progress_callback=progress_callback if args.verbose else None,
+            monitoring_level=MonitoringLevel[args.monitoring_level.upper()],
+            enable_memory_monitoring=args.enable_memory_monitoring,
+            memory_warning_threshold_mb=args.memory_warning_threshold,
+            memory_critical_threshold_mb=args.memory_critical_threshold,
+            **pipeline_timeouts(args)
+        )
         
-        # Show performance summary in verbose mode
-        if args.verbose:
-            show_performance_summary(result)
+        result = pipeline.resume(args.run_dir)
+        return report_result(result, args.verbose)
         
-        # Return appropriate exit code
-        if result.status == "SUCCESS":
-            print("[SUCCESS] Document processing completed successfully!")
-            return 0
-        elif result.status == "FAILED_VALIDATION":
-            print("[WARNING] Document processing failed validation - changes rolled back")
-            return 2
-        elif result.status == "ROLLBACK":
-            print("[ERROR] Document processing failed - rollback performed")
-            return 3
-        elif result.status == "INVALID_PLAN":
-            print("[ERROR] LLM generated invalid plan - processing aborted")
-            return 4
-        else:
-            print(f"[UNKNOWN] Unknown status: {result.status}")
-            return 5
-            
     except Exception as e:
-        print(f"[ERROR] Processing failed: {str(e)}")
+        print(f"[ERROR] Resume failed: {str(e)}")
         if args.verbose:
             import traceback
             traceback.print_exc()
         return 1
 
 
+def load_batch_summary(summary_path: str, user_intent: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the per-document results of an earlier batch summary.
+    
+    Args:
+        summary_path: batch_summary_*.json written by the batch command
+        user_intent: Intent of the current batch; results of a batch with a
+            different intent are not reused
+        
+    Returns:
+        Dict[str, Dict[str, Any]]: Summary entries by file name
+    """
+    with open(summary_path, 'r', encoding='utf-8') as f:
+        summary = json.load(f)
+    if summary.get("user_intent") != user_intent:
+        print("[WARNING] Batch summary was written for a different intent - reprocessing all documents")
+        return {}
+    return {entry["filename"]: entry for entry in summary.get("results", [])}
+
+
+def write_batch_summary(summary_path: str, summary_data: Dict[str, Any]):
+    """Write the batch summary atomically, so an interrupted batch leaves a readable one."""
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    temp_path = summary_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary_data, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, summary_path)
+
+
 def process_batch_documents(args) -> int:
     """Process multiple documents in batch."""
+    from .pipeline import VNextPipeline
+    from .batch_manifest import MANIFEST_FILE, BatchManifest, config_hash
+    from .checkpoint import CHECKPOINT_FILE, file_sha256
+    from .models import ProcessingResult
+    from .monitoring import MonitoringLevel
+    from ..core.llm_client import LLMClient, ModelType
+
     print(f"Batch processing documents from: {args.batch_dir}")
     
     # Find all DOCX files
@@ -219,6 +332,71 @@ def process_batch_documents(args) -> int:
     
     results = []
     failed_count = 0
+    force = getattr(args, 'force', False)
+    
+    # Resuming rewrites the given summary; otherwise a new one is started
+    previous_results = {}
+    summary_file = None
+    if getattr(args, 'resume', None):
+        summary_file = args.resume
+        previous_results = {} if force else load_batch_summary(args.resume, args.intent)
+    elif args.audit_dir:
+        summary_file = os.path.join(args.audit_dir, f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    
+    # Outputs are reused across batches only for the same intent, version and configuration
+    manifest_path = getattr(args, 'manifest', None) or (
+        os.path.join(args.audit_dir, MANIFEST_FILE) if args.audit_dir else None)
+    manifest = BatchManifest(manifest_path) if manifest_path else None
+    processing_config = config_hash({"model": args.model, "temperature": args.temperature})
+    
+    # Document being processed: file name, hash and run directory once the run has one
+    running = {}
+    
+    def count(action):
+        return sum(1 for _, _, _, result_action in results if result_action == action)
+    
+    def save_summary():
+        if not summary_file:
+            return
+        try:
+            write_batch_summary(summary_file, {
+                "timestamp": datetime.now().isoformat(),
+                "total_documents": len(docx_files),
+                "successful": sum(1 for _, result, _, _ in results if result.status == "SUCCESS"),
+                "failed": sum(1 for _, result, _, _ in results if result.status != "SUCCESS"),
+                "processed": count("processed"),
+                "skipped": count("skipped"),
+                "relinked": count("relinked"),
+                "user_intent": args.intent,
+                "results": [
+                    {
+                        "filename": filename,
+                        "status": result.status,
+                        "action": action,
+                        "audit_directory": result.audit_directory,
+                        "error_count": len(result.errors) if result.errors else 0,
+                        "sha256": sha256
+                    }
+                    for filename, result, sha256, action in results
+                ] + ([
+                    {
+                        "filename": running["filename"],
+                        "status": "RUNNING",
+                        "action": "processed",
+                        "audit_directory": running["audit_directory"],
+                        "error_count": 0,
+                        "sha256": running["sha256"]
+                    }
+                ] if running else [])
+            })
+        except Exception as e:
+            print(f"[WARNING] Could not save batch summary: {e}")
+    
+    def save_manifest():
+        try:
+            manifest.save()
+        except Exception as e:
+            print(f"[WARNING] Could not save batch manifest: {e}")
     
     try:
         # Initialize LLM client
@@ -231,26 +409,73 @@ def process_batch_documents(args) -> int:
                 temperature=args.temperature
             )
         
-        # Process each document
-        for i, docx_file in enumerate(docx_files, 1):
-            print(f"\n[{i}/{len(docx_files)}] Processing: {docx_file.name}")
+        def create_pipeline(filename, sha256):
+            # A fresh pipeline per document with the batch monitoring configuration
+            pipeline = None
+            
+            def on_progress(stage_name, progress_percent):
+                if args.verbose:
+                    progress_callback(stage_name, progress_percent)
+                # Record the run directory as soon as the run has one, so a run
+                # killed mid-pipeline is resumed instead of started over
+                audit_directory = getattr(pipeline, "current_audit_dir", None)
+                if audit_directory and running.get("audit_directory") != audit_directory:
+                    running.update(filename=filename, sha256=sha256, audit_directory=audit_directory)
+                    save_summary()
             
-            # Initialize pipeline for each document with monitoring configuration
-            monitoring_level = MonitoringLevel[args.monitoring_level.upper()]
             pipeline = VNextPipeline(
                 llm_client=llm_client,
                 base_audit_dir=args.audit_dir,
                 visible=args.visible,
-                progress_callback=progress_callback if args.verbose else None,
-                monitoring_level=monitoring_level,
+                progress_callback=on_progress,
+                monitoring_level=MonitoringLevel[args.monitoring_level.upper()],
                 enable_memory_monitoring=args.enable_memory_monitoring,
                 memory_warning_threshold_mb=args.memory_warning_threshold,
-                memory_critical_threshold_mb=args.memory_critical_threshold
+                memory_critical_threshold_mb=args.memory_critical_threshold,
+                **pipeline_timeouts(args)
             )
+            return pipeline
+        
+        # Process each document
+        for i, docx_file in enumerate(docx_files, 1):
+            print(f"\n[{i}/{len(docx_files)}] Processing: {docx_file.name}")
+            
+            sha256 = file_sha256(docx_file)
+            previous = previous_results.get(docx_file.name)
+            previous_run = previous.get("audit_directory") if previous else None
+            reusable = None
+            if manifest is not None and not force:
+                reusable = manifest.find(docx_file, sha256, args.intent, processing_config)
             
-            # Process document
-            result = pipeline.process_document(str(docx_file), args.intent)
-            results.append((docx_file.name, result))
+            # Skip documents the resumed batch already finished or an earlier batch
+            # processed unchanged, continue interrupted runs, process the rest
+            if previous and previous.get("status") == "SUCCESS" and previous.get("sha256") == sha256:
+                print("  [SKIPPED] Already processed")
+                action = "skipped"
+                result = ProcessingResult(status="SUCCESS", message="Already processed in resumed batch",
+                                          audit_directory=previous_run)
+            elif reusable is not None:
+                action = "skipped" if reusable["path"] == os.path.abspath(docx_file) else "relinked"
+                print(f"  [{action.upper()}] Unchanged since {reusable['processed_at']}: {reusable['output_path']}")
+                result = ProcessingResult(status="SUCCESS", message="Unchanged input, output reused",
+                                          audit_directory=reusable["audit_directory"])
+                if action == "relinked":
+                    manifest.record(docx_file, sha256, args.intent, processing_config, result,
+                                    relinked_from=reusable["path"])
+                    save_manifest()
+            elif not force and previous_run and os.path.exists(os.path.join(previous_run, CHECKPOINT_FILE)):
+                action = "processed"
+                result = create_pipeline(docx_file.name, sha256).resume(previous_run)
+            else:
+                action = "processed"
+                result = create_pipeline(docx_file.name, sha256).process_document(str(docx_file), args.intent)
+            
+            if action == "processed" and manifest is not None:
+                manifest.record(docx_file, sha256, args.intent, processing_config, result)
+                save_manifest()
+            running.clear()
+            results.append((docx_file.name, result, sha256, action))
+            save_summary()
             
             if result.status != "SUCCESS":
                 failed_count += 1
@@ -258,55 +483,32 @@ def process_batch_documents(args) -> int:
                 if result.errors:
                     for error in result.errors[:2]:  # Show first 2 errors
                         print(f"    - {error}")
-            else:
+            elif action == "processed":
                 print(f"  [SUCCESS]")
         
         # Summary
         print(f"\n=== Batch Processing Summary ===")
         print(f"Total documents: {len(docx_files)}")
+        print(f"Processed: {count('processed')}")
+        print(f"Skipped (unchanged): {count('skipped')}")
+        print(f"Re-linked (same content): {count('relinked')}")
         print(f"Successful: {len(docx_files) - failed_count}")
         print(f"Failed: {failed_count}")
         
         # Show detailed results
         if args.verbose or failed_count > 0:
             print("\nDetailed Results:")
-            for filename, result in results:
+            for filename, result, _, action in results:
                 status_icon = "[OK]" if result.status == "SUCCESS" else "[FAIL]"
-                print(f"  {status_icon} {filename}: {result.status}")
+                print(f"  {status_icon} {filename}: {result.status} ({action})")
                 if result.status != "SUCCESS" and result.errors:
                     for error in result.errors[:1]:  # Show first error
                         print(f"    Error: {error}")
                 if args.verbose and result.audit_directory:
                     print(f"    Audit: {result.audit_directory}")
         
-        # Create batch summary report
-        if args.audit_dir:
-            try:
-                summary_file = os.path.join(args.audit_dir, f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-                summary_data = {
-                    "timestamp": datetime.now().isoformat(),
-                    "total_documents": len(docx_files),
-                    "successful": len(docx_files) - failed_count,
-                    "failed": failed_count,
-                    "user_intent": args.intent,
-                    "results": [
-                        {
-                            "filename": filename,
-                            "status": result.status,
-                            "audit_directory": result.audit_directory,
-                            "error_count": len(result.errors) if result.errors else 0
-                        }
-                        for filename, result in results
-                    ]
-                }
-                
-                os.makedirs(args.audit_dir, exist_ok=True)
-                with open(summary_file, 'w', encoding='utf-8') as f:
-                    json.dump(summary_data, f, indent=2, ensure_ascii=False)
-                print(f"\nBatch summary saved to: {summary_file}")
-                
-            except Exception as e:
-                print(f"[WARNING] Could not save batch summary: {e}")
+        if summary_file:
+            print(f"\nBatch summary saved to: {summary_file}")
         
         return 0 if failed_count == 0 else 1
         
@@ -461,6 +663,10 @@ def handle_config_command(args) -> int:
 
 def dry_run_document(args) -> int:
     """Perform dry run (plan generation only)."""
+    from .pipeline import VNextPipeline
+    from .monitoring import MonitoringLevel
+    from ..core.llm_client import LLMClient, ModelType
+
     print(f"Dry run for document: {args.input}")
     print(f"User intent: {args.intent}")
     
@@ -485,7 +691,8 @@ def dry_run_document(args) -> int:
             monitoring_level=monitoring_level,
             enable_memory_monitoring=args.enable_memory_monitoring,
             memory_warning_threshold_mb=args.memory_warning_threshold,
-            memory_critical_threshold_mb=args.memory_critical_threshold
+            memory_critical_threshold_mb=args.memory_critical_threshold,
+            **pipeline_timeouts(args)
         )
         
         # Setup and extract
@@ -518,6 +725,208 @@ def dry_run_document(args) -> int:
         return 1
 
 
+def show_performance_history(args) -> int:
+    """Query the cross-run performance history."""
+    from .perf_history import PerformanceHistoryStore, format_percentile_table
+    
+    db_path = args.db or os.path.join(args.audit_dir, "performance_history.sqlite")
+    if not os.path.exists(db_path):
+        print(f"[ERROR] Performance history not found: {db_path}")
+        return 1
+    
+    try:
+        percentiles = [float(q) for q in args.percentiles.split(",")]
+        store = PerformanceHistoryStore(db_path)
+        rows = store.stage_percentiles(
+            group_by=args.by,
+            percentiles=percentiles,
+            stage_name=args.stage,
+            last_runs=args.last_runs
+        )
+        regressions = []
+        if args.regressions:
+            regressions = store.detect_regressions(
+                recent_runs=args.recent_runs,
+                baseline_runs=args.baseline_runs,
+                threshold=args.threshold
+            )
+    except (ValueError, OSError) as e:
+        print(f"[ERROR] Failed to query performance history: {str(e)}")
+        return 1
+    
+    if args.json:
+        output = {"runs": store.run_count(), "percentiles": rows}
+        if args.regressions:
+            output["regressions"] = [r.to_dict() for r in regressions]
+        print(json.dumps(output, indent=2, ensure_ascii=False))
+    else:
+        print(f"=== Stage durations (ms) over {store.run_count()} runs ===")
+        print(format_percentile_table(rows))
+        if args.regressions:
+            print("\n=== p95 regressions ===")
+            if regressions:
+                for regression in regressions:
+                    print(f"  [REGRESSION] {regression.describe()}")
+            else:
+                print("  [OK] No stage regressed")
+    
+    # Non-zero exit lets CI fail on regressions
+    return 2 if regressions else 0
+
+
+def serve_jobs(args) -> int:
+    """Run the job-queue service until interrupted."""
+    import threading
+    from .pipeline import VNextPipeline
+    from .job_queue import JobQueue
+    from .monitoring import MonitoringLevel
+    from .service import JobService, create_http_server, create_unix_server
+    from ..core.llm_client import LLMClient, ModelType
+    
+    try:
+        # One LLM client shared by the warm pipelines of all workers
+        llm_client = None
+        if args.model:
+            model_type = ModelType[args.model.upper()]
+            llm_client = LLMClient(
+                model=model_type,
+                api_key=os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY"),
+                temperature=args.temperature
+            )
+        
+        def create_pipeline(worker_progress):
+            return VNextPipeline(
+                llm_client=llm_client,
+                base_audit_dir=args.audit_dir,
+                visible=args.visible,
+                progress_callback=worker_progress,
+                monitoring_level=MonitoringLevel[args.monitoring_level.upper()],
+                enable_memory_monitoring=args.enable_memory_monitoring,
+                memory_warning_threshold_mb=args.memory_warning_threshold,
+                memory_critical_threshold_mb=args.memory_critical_threshold,
+                **pipeline_timeouts(args)
+            )
+        
+        queue = JobQueue(args.queue_db or os.path.join(args.audit_dir, "job_queue.sqlite"))
+        service = JobService(queue, create_pipeline, workers=args.workers,
+                             poll_interval_seconds=args.poll_interval)
+        servers = []
+        if args.port:
+            servers.append(create_http_server(service, args.host, args.port))
+        if args.socket:
+            servers.append(create_unix_server(service, args.socket))
+        if not servers:
+            print("[ERROR] Nothing to listen on: give --port or --socket")
+            return 1
+    except Exception as e:
+        print(f"[ERROR] Failed to start service: {str(e)}")
+        return 1
+    
+    service.start()
+    threads = []
+    for server in servers:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        threads.append(thread)
+        address = server.server_address
+        print(f"Listening on {'http://%s:%d' % address[:2] if isinstance(address, tuple) else address}")
+    print(f"Job queue: {queue.db_path} ({args.workers} workers)")
+    
+    try:
+        while any(thread.is_alive() for thread in threads):
+            threads[0].join(1.0)
+    except KeyboardInterrupt:
+        print("\nStopping service after the running jobs...")
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        service.stop()
+    return 0
+
+
+def watch_folders(args) -> int:
+    """Process documents dropped into watch folders until interrupted."""
+    import threading
+    from .pipeline import VNextPipeline
+    from .batch_manifest import MANIFEST_FILE
+    from .monitoring import MonitoringLevel
+    from .watch_folder import FS_EVENTS_AVAILABLE, FolderWatcher, WatchFolder, load_watch_config
+    from ..core.llm_client import LLMClient, ModelType
+    
+    try:
+        if args.watch_config:
+            folders = load_watch_config(args.watch_config)
+        elif args.folder and args.intent:
+            folders = [WatchFolder(args.folder, args.intent, model=args.model, temperature=args.temperature,
+                                   output_dir=args.output_dir, failed_dir=args.failed_dir)]
+        else:
+            print("[ERROR] Give a folder and an intent, or --watch-config")
+            return 1
+    except ValueError as e:
+        print(f"[ERROR] {str(e)}")
+        return 1
+    
+    llm_clients = {}
+    llm_clients_lock = threading.Lock()
+    
+    def create_pipeline(folder):
+        # Folders with the same model share one LLM client
+        llm_client = None
+        if folder.model:
+            with llm_clients_lock:
+                key = (folder.model, folder.temperature)
+                if key not in llm_clients:
+                    llm_clients[key] = LLMClient(
+                        model=ModelType[folder.model.upper()],
+                        api_key=os.getenv("OPENAI_API_KEY") or os.getenv("ANTHROPIC_API_KEY"),
+                        temperature=folder.temperature
+                    )
+                llm_client = llm_clients[key]
+        return VNextPipeline(
+            llm_client=llm_client,
+            base_audit_dir=args.audit_dir,
+            visible=args.visible,
+            monitoring_level=MonitoringLevel[args.monitoring_level.upper()],
+            enable_memory_monitoring=args.enable_memory_monitoring,
+            memory_warning_threshold_mb=args.memory_warning_threshold,
+            memory_critical_threshold_mb=args.memory_critical_threshold,
+            **pipeline_timeouts(args)
+        )
+    
+    try:
+        watcher = FolderWatcher(
+            folders, create_pipeline,
+            manifest_path=args.manifest or os.path.join(args.audit_dir, MANIFEST_FILE),
+            workers=args.workers,
+            poll_interval_seconds=args.poll_interval,
+            settle_seconds=args.settle
+        )
+    except ValueError as e:
+        print(f"[ERROR] {str(e)}")
+        return 1
+    
+    for folder in folders:
+        print(f"Watching {folder.path}: {folder.intent}")
+        print(f"  Outputs: {folder.output_dir}  Failures: {folder.failed_dir}")
+    print(f"{args.workers} workers, {'file system events' if watcher.use_fs_events else 'polling'} "
+          f"every {args.poll_interval:g}s, settle {args.settle:g}s"
+          f"{'' if FS_EVENTS_AVAILABLE else ' (install watchdog for file system events)'}")
+    
+    exit_code = 0
+    try:
+        watcher.run(threading.Event())
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    except Exception as e:
+        print(f"[ERROR] Watching stopped: {str(e)}")
+        exit_code = 1
+    
+    stats = watcher.stats
+    print(f"Processed: {stats.processed}, reused: {stats.reused}, failed: {stats.failed}")
+    return exit_code
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -531,6 +940,31 @@ Examples:
   # Batch process all DOCX files in directory
   python -m autoword.vnext.cli batch ./documents "Apply standard formatting"
   
+  # Resume a run that crashed or hung, skipping completed stages
+  python -m autoword.vnext.cli resume ./audit_trails/run_20240101_120000_000
+  
+  # Continue an interrupted batch without reprocessing finished documents
+  python -m autoword.vnext.cli batch ./documents "Apply standard formatting" --resume ./audit_trails/batch_summary_20240101_120000.json
+  
+  # Nightly batch: only new and changed documents are processed
+  python -m autoword.vnext.cli batch ./documents "Apply standard formatting"
+  
+  # Reprocess every document, ignoring the batch manifest
+  python -m autoword.vnext.cli batch ./documents "Apply standard formatting" --force
+  
+  # Kill Word when a single call hangs for more than a minute
+  python -m autoword.vnext.cli batch ./documents "Apply standard formatting" --operation-timeout 60 --stage-timeout Execute=600
+  
+  # Run as a service with a persistent job queue and submit documents over HTTP
+  python -m autoword.vnext.cli serve --port 8765 --workers 2
+  curl -X POST localhost:8765/jobs -d '{"docx_path": "C:/docs/report.docx", "intent": "Update TOC", "priority": 5}'
+  
+  # Process documents as soon as they are dropped into a folder
+  python -m autoword.vnext.cli watch ./inbox "Apply standard formatting" --workers 2
+  
+  # Watch several folders, each with its own intent and model
+  python -m autoword.vnext.cli watch --watch-config watch.json
+  
   # Dry run to see generated plan
   python -m autoword.vnext.cli dry-run document.docx "Update TOC and styles"
   
@@ -552,6 +986,9 @@ Examples:
   # Check system status
   python -m autoword.vnext.cli status
   
+  # Stage duration percentiles per document size bucket, flag p95 regressions
+  python -m autoword.vnext.cli history --by stage size --regressions
+  
   # Create configuration template
   python -m autoword.vnext.cli config create my-config.json
   
@@ -584,6 +1021,13 @@ Examples:
     parser.add_argument("--memory-critical-threshold", type=float, default=2048,
                        help="Memory critical threshold in MB (default: 2048)")
     
+    # Watchdog options
+    parser.add_argument("--stage-timeout", action="append", metavar="STAGE=SECONDS",
+                       help="Deadline of a Word stage (Extract, Execute, Validate); "
+                            "repeatable, 0 disables (defaults: 600, 900, 600)")
+    parser.add_argument("--operation-timeout", type=float, default=180,
+                       help="Deadline of a single Word call in seconds, 0 disables (default: 180)")
+    
     # Configuration file support
     parser.add_argument("--config", help="Configuration file path (JSON format)")
     parser.add_argument("--save-config", help="Save current configuration to file")
@@ -600,6 +1044,48 @@ Examples:
     batch_parser = subparsers.add_parser("batch", help="Batch process documents")
     batch_parser.add_argument("batch_dir", help="Directory containing DOCX files")
     batch_parser.add_argument("intent", help="User intent description for all documents")
+    batch_parser.add_argument("--resume", metavar="SUMMARY",
+                              help="Continue the batch recorded in this batch summary: skip finished "
+                                   "documents and resume interrupted runs from their checkpoints")
+    batch_parser.add_argument("--manifest", metavar="PATH",
+                              help="Batch manifest of processed inputs "
+                                   "(default: <audit-dir>/batch_manifest.json)")
+    batch_parser.add_argument("--force", action="store_true",
+                              help="Process every document, even unchanged ones recorded in the manifest")
+    
+    # Resume command
+    resume_parser = subparsers.add_parser("resume", help="Resume an interrupted run from its checkpoints")
+    resume_parser.add_argument("run_dir", help="Run audit directory (audit_trails/run_*)")
+    
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Run a job-queue service with a local HTTP/Unix socket API")
+    serve_parser.add_argument("--queue-db", help="Job queue database (default: <audit-dir>/job_queue.sqlite)")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="HTTP host (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="HTTP port, 0 disables HTTP (default: 8765)")
+    serve_parser.add_argument("--socket", metavar="PATH", help="Also serve the API on this Unix domain socket")
+    serve_parser.add_argument("--workers", type=int, default=1,
+                              help="Documents processed concurrently (default: 1)")
+    serve_parser.add_argument("--poll-interval", type=float, default=2.0,
+                              help="Seconds between queue checks of idle workers (default: 2)")
+    
+    # Watch command
+    watch_parser = subparsers.add_parser("watch", help="Process documents dropped into watch folders")
+    watch_parser.add_argument("folder", nargs="?", help="Folder to watch")
+    watch_parser.add_argument("intent", nargs="?", help="User intent for documents in the folder")
+    watch_parser.add_argument("--watch-config", metavar="FILE",
+                              help='JSON file with {"folders": [{"path", "intent", "model", "temperature", '
+                                   '"output_dir", "failed_dir"}]}')
+    watch_parser.add_argument("--output-dir", help="Outputs and processed inputs (default: <folder>_done)")
+    watch_parser.add_argument("--failed-dir", help="Inputs that failed (default: <folder>_failed)")
+    watch_parser.add_argument("--workers", type=int, default=1,
+                              help="Documents processed concurrently (default: 1)")
+    watch_parser.add_argument("--poll-interval", type=float, default=1.0,
+                              help="Seconds between folder scans (default: 1)")
+    watch_parser.add_argument("--settle", type=float, default=2.0,
+                              help="Seconds a file must stay unchanged before processing (default: 2)")
+    watch_parser.add_argument("--manifest", metavar="PATH",
+                              help="Batch manifest used to skip duplicates "
+                                   "(default: <audit-dir>/batch_manifest.json)")
     
     # Dry run command
     dry_run_parser = subparsers.add_parser("dry-run", help="Generate plan without execution")
@@ -620,6 +1106,25 @@ Examples:
     # Status command
     status_parser = subparsers.add_parser("status", help="Check system status and requirements")
     
+    # History command
+    history_parser = subparsers.add_parser("history", help="Query cross-run performance history")
+    history_parser.add_argument("--db", help="History database (default: <audit-dir>/performance_history.sqlite)")
+    history_parser.add_argument("--by", nargs="+", choices=["stage", "size", "version"], default=["stage"],
+                                help="Group percentiles by stage, document size bucket and/or pipeline version")
+    history_parser.add_argument("--stage", help="Only show one stage")
+    history_parser.add_argument("--percentiles", default="50,90,95,99",
+                                help="Comma-separated percentiles (default: 50,90,95,99)")
+    history_parser.add_argument("--last-runs", type=int, help="Only use the most recent N runs")
+    history_parser.add_argument("--regressions", action="store_true",
+                                help="Flag stages whose p95 regressed against the baseline window (exit code 2)")
+    history_parser.add_argument("--recent-runs", type=int, default=20,
+                                help="Runs in the recent window (default: 20)")
+    history_parser.add_argument("--baseline-runs", type=int, default=100,
+                                help="Runs in the baseline window (default: 100)")
+    history_parser.add_argument("--threshold", type=float, default=1.2,
+                                help="p95 ratio counted as regression (default: 1.2)")
+    history_parser.add_argument("--json", action="store_true", help="Output JSON")
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -644,12 +1149,20 @@ Examples:
         return process_single_document(args)
     elif args.command == "batch":
         return process_batch_documents(args)
+    elif args.command == "resume":
+        return resume_run(args)
+    elif args.command == "serve":
+        return serve_jobs(args)
+    elif args.command == "watch":
+        return watch_folders(args)
     elif args.command == "dry-run":
         return dry_run_document(args)
     elif args.command == "config":
         return handle_config_command(args)
     elif args.command == "status":
         return check_system_status(args)
+    elif args.command == "history":
+        return show_performance_history(args)
     else:
         print(f"Unknown command: {args.command}")
         return 1
@@ -0,0 +1,308 @@
+"""
+Compact array-backed StructureV1 representation for large documents.
+
+StructureV1 stores paragraphs as a list of validated ParagraphSkeleton models,
+which dominates memory and CPU for documents with tens of thousands of
+paragraphs. This module provides CompactStructureV1, which keeps the small
+collections (styles, headings, fields, tables) as regular models but stores
+paragraphs as:
+
+- interned style names (StringPool)
+- parallel arrays for paragraph index, style id, heading level and flags
+- a text arena holding all preview texts in one string with offsets
+
+CompactStructureV1 exposes the same read API as StructureV1. Paragraphs are
+returned as lightweight ParagraphView objects; Pydantic models are only
+materialized at serialization boundaries (to_structure()/model_dump()).
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .models import (
+    StructureV1, DocumentMetadata, StyleDefinition, ParagraphSkeleton,
+    HeadingReference, FieldReference, TableSkeleton
+)
+
+
+PREVIEW_TEXT_MAX_LENGTH = 120
+
+# Paragraph flag bits
+FLAG_IS_HEADING = 0x01
+
+
+class StringPool:
+    """Intern pool mapping strings to dense integer ids."""
+
+    __slots__ = ("_ids", "_values")
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._values: List[str] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the id for value, adding it to the pool if needed (-1 for None)."""
+        if value is None:
+            return -1
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._values)
+            self._ids[value] = string_id
+            self._values.append(value)
+        return string_id
+
+    def get(self, string_id: int) -> Optional[str]:
+        """Return the string for an id (None for -1)."""
+        return None if string_id < 0 else self._values[string_id]
+
+    def lookup(self, value: str) -> int:
+        """Return the id for value without adding it (-1 if absent)."""
+        return self._ids.get(value, -1)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+
+class ParagraphView:
+    """Read-only view of one paragraph in a CompactParagraphs table."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "CompactParagraphs", row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def index(self) -> int:
+        return self._table._indexes[self._row]
+
+    @property
+    def style_name(self) -> Optional[str]:
+        return self._table.style_pool.get(self._table._style_ids[self._row])
+
+    @property
+    def preview_text(self) -> str:
+        return self._table.text_at(self._row)
+
+    @property
+    def is_heading(self) -> bool:
+        return bool(self._table._flags[self._row] & FLAG_IS_HEADING)
+
+    @property
+    def heading_level(self) -> Optional[int]:
+        return self._table._levels[self._row] or None
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Return the same dictionary as ParagraphSkeleton.model_dump()."""
+        return self._table.row_dict(self._row)
+
+    def to_model(self) -> ParagraphSkeleton:
+        """Materialize this paragraph as a ParagraphSkeleton."""
+        return ParagraphSkeleton.model_construct(**self.model_dump())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ParagraphView, ParagraphSkeleton)):
+            return (self.index == other.index and self.style_name == other.style_name and
+                    self.preview_text == other.preview_text and
+                    self.is_heading == other.is_heading and
+                    self.heading_level == other.heading_level)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (f"ParagraphView(index={self.index}, style_name={self.style_name!r}, "
+                f"preview_text={self.preview_text!r}, is_heading={self.is_heading}, "
+                f"heading_level={self.heading_level})")
+
+
+class CompactParagraphs(Sequence):
+    """Columnar paragraph table with interned style names and a text arena."""
+
+    def __init__(self, style_pool: Optional[StringPool] = None):
+        self.style_pool = style_pool or StringPool()
+        self._indexes = array('l')
+        self._style_ids = array('i')
+        self._levels = array('b')
+        self._flags = array('B')
+        self._text_offsets = array('l', [0])
+        self._arena = ""
+        self._pending_text: List[str] = []
+
+    def append(self, index: int, style_name: Optional[str], preview_text: str,
+               is_heading: bool = False, heading_level: Optional[int] = None):
+        """
+        Append a paragraph, applying the same constraints as ParagraphSkeleton.
+
+        Raises:
+            ValueError: If index or heading_level is out of range
+        """
+        if index < 0:
+            raise ValueError(f"Paragraph index must be >= 0, got {index}")
+        if heading_level is not None and not 1 <= heading_level <= 9:
+            raise ValueError(f"Heading level must be between 1 and 9, got {heading_level}")
+
+        text = preview_text[:PREVIEW_TEXT_MAX_LENGTH]
+        self._indexes.append(index)
+        self._style_ids.append(self.style_pool.intern(style_name))
+        self._levels.append(heading_level or 0)
+        self._flags.append(FLAG_IS_HEADING if is_heading else 0)
+        self._pending_text.append(text)
+        self._text_offsets.append(self._text_offsets[-1] + len(text))
+
+    def extend_models(self, paragraphs: Iterator[ParagraphSkeleton]):
+        """Append paragraphs from ParagraphSkeleton models."""
+        for p in paragraphs:
+            self.append(p.index, p.style_name, p.preview_text, p.is_heading, p.heading_level)
+
+    def _flush_text(self):
+        if self._pending_text:
+            self._arena += "".join(self._pending_text)
+            self._pending_text = []
+
+    def text_at(self, row: int) -> str:
+        """Return the preview text stored for a row."""
+        if self._pending_text:
+            self._flush_text()
+        return self._arena[self._text_offsets[row]:self._text_offsets[row + 1]]
+
+    def row_dict(self, row: int) -> Dict[str, Any]:
+        """Return a row as a ParagraphSkeleton-compatible dictionary."""
+        return {
+            'index': self._indexes[row],
+            'style_name': self.style_pool.get(self._style_ids[row]),
+            'preview_text': self.text_at(row),
+            'is_heading': bool(self._flags[row] & FLAG_IS_HEADING),
+            'heading_level': self._levels[row] or None
+        }
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[ParagraphView, List[ParagraphView]]:
+        if isinstance(item, slice):
+            return [ParagraphView(self, row) for row in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("paragraph index out of range")
+        return ParagraphView(self, item)
+
+    def __iter__(self) -> Iterator[ParagraphView]:
+        for row in range(len(self._indexes)):
+            yield ParagraphView(self, row)
+
+    def model_dump(self) -> List[Dict[str, Any]]:
+        """Return paragraphs as a list of ParagraphSkeleton-compatible dictionaries."""
+        self._flush_text()
+        return [self.row_dict(row) for row in range(len(self))]
+
+    def to_models(self) -> List[ParagraphSkeleton]:
+        """Materialize all paragraphs as ParagraphSkeleton models."""
+        construct = ParagraphSkeleton.model_construct
+        return [construct(**self.row_dict(row)) for row in range(len(self))]
+
+    def diff_indexes(self, other: "CompactParagraphs") -> Tuple[List[int], List[int], List[int]]:
+        """
+        Compare two paragraph tables by paragraph index.
+
+        Args:
+            other: Paragraph table after modification
+
+        Returns:
+            Tuple of sorted (added, removed, modified) paragraph indexes
+        """
+        before_rows = {idx: row for row, idx in enumerate(self._indexes)}
+        after_rows = {idx: row for row, idx in enumerate(other._indexes)}
+
+        added = sorted(after_rows.keys() - before_rows.keys())
+        removed = sorted(before_rows.keys() - after_rows.keys())
+
+        same_pool = self.style_pool is other.style_pool
+        modified = []
+        for idx in sorted(before_rows.keys() & after_rows.keys()):
+            b = before_rows[idx]
+            a = after_rows[idx]
+            if same_pool:
+                style_changed = self._style_ids[b] != other._style_ids[a]
+            else:
+                style_changed = (self.style_pool.get(self._style_ids[b]) !=
+                                 other.style_pool.get(other._style_ids[a]))
+            if (style_changed or
+                    self._levels[b] != other._levels[a] or
+                    self._flags[b] != other._flags[a] or
+                    self.text_at(b) != other.text_at(a)):
+                modified.append(idx)
+
+        return added, removed, modified
+
+
+class CompactStructureV1:
+    """
+    Memory-efficient StructureV1 with an array-backed paragraph table.
+
+    Provides the same read attributes as StructureV1 (schema_version, metadata,
+    styles, paragraphs, headings, fields, tables) plus model_dump() and
+    to_structure() for serialization boundaries.
+    """
+
+    schema_version = "structure.v1"
+
+    def __init__(self, metadata: DocumentMetadata,
+                 styles: Optional[List[StyleDefinition]] = None,
+                 paragraphs: Optional[CompactParagraphs] = None,
+                 headings: Optional[List[HeadingReference]] = None,
+                 fields: Optional[List[FieldReference]] = None,
+                 tables: Optional[List[TableSkeleton]] = None):
+        self.metadata = metadata
+        self.styles = styles or []
+        self.paragraphs = paragraphs if paragraphs is not None else CompactParagraphs()
+        self.headings = headings or []
+        self.fields = fields or []
+        self.tables = tables or []
+
+    @classmethod
+    def from_structure(cls, structure: StructureV1,
+                       style_pool: Optional[StringPool] = None) -> "CompactStructureV1":
+        """
+        Build a compact structure from a StructureV1 model.
+
+        Args:
+            structure: Source structure
+            style_pool: Optional shared style pool (enables id-level diffing)
+        """
+        paragraphs = CompactParagraphs(style_pool)
+        paragraphs.extend_models(structure.paragraphs)
+        return cls(
+            metadata=structure.metadata,
+            styles=list(structure.styles),
+            paragraphs=paragraphs,
+            headings=list(structure.headings),
+            fields=list(structure.fields),
+            tables=list(structure.tables)
+        )
+
+    def to_structure(self) -> StructureV1:
+        """Materialize a StructureV1 model (paragraphs are already validated)."""
+        return StructureV1.model_construct(
+            schema_version=self.schema_version,
+            metadata=self.metadata,
+            styles=list(self.styles),
+            paragraphs=self.paragraphs.to_models(),
+            headings=list(self.headings),
+            fields=list(self.fields),
+            tables=list(self.tables)
+        )
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Return the same dictionary as StructureV1.model_dump()."""
+        return {
+            'schema_version': self.schema_version,
+            'metadata': self.metadata.model_dump(),
+            'styles': [s.model_dump() for s in self.styles],
+            'paragraphs': self.paragraphs.model_dump(),
+            'headings': [h.model_dump() for h in self.headings],
+            'fields': [f.model_dump() for f in self.fields],
+            'tables': [t.model_dump() for t in self.tables]
+        }
@@ -21,6 +21,8 @@ class LLMConfig:
     max_tokens: int = 4000
     timeout: int = 30
     retry_attempts: int = 3
+    compact_prompt: bool = True  # 压缩提示词中的文档结构
+    prompt_token_budget: Optional[int] = 6000  # 文档结构部分的 token 预算
 
 @dataclass
 class LocalizationConfig:
@@ -87,6 +89,7 @@ class CustomLLMClient:
         self.base_url = config.base_url
         self.api_key = config.api_key
         self.model = config.model
+        self.last_prompt_stats: Optional[Dict[str, Any]] = None
         
     def generate_plan(self, structure_json: str, user_intent: str) -> str:
         """生成执行计划"""
@@ -102,8 +105,27 @@ class CustomLLMClient:
         except Exception as e:
             raise Exception(f"LLM API调用失败: {e}")
     
+    def _compact_structure(self, structure_json: str) -> str:
+        """压缩文档结构（无法解析为JSON对象时原样返回）"""
+        if not self.config.compact_prompt:
+            return structure_json
+        try:
+            structure = json.loads(structure_json)
+        except json.JSONDecodeError:
+            return structure_json
+        if not isinstance(structure, dict):
+            return structure_json
+        
+        from .planner.prompt_compaction import PromptCompactionConfig, compact_structure
+        compacted = compact_structure(
+            structure, PromptCompactionConfig(token_budget=self.config.prompt_token_budget)
+        )
+        self.last_prompt_stats = compacted.to_dict()
+        return compacted.text
+    
     def _build_prompt(self, structure_json: str, user_intent: str) -> str:
         """构建提示词"""
+        structure_json = self._compact_structure(structure_json)
         return f"""你是一个Word文档处理专家。根据用户意图和文档结构，生成JSON格式的执行计划。
 
 文档结构:
@@ -198,7 +220,9 @@ def load_config(config_path: str = "vnext_config.json") -> VNextConfig:
                 api_key=llm_data.get('api_key', ''),
                 base_url=llm_data.get('base_url', 'globalai.vip'),
                 temperature=llm_data.get('temperature', 0.1),
-                max_tokens=llm_data.get('max_tokens', 4000)
+                max_tokens=llm_data.get('max_tokens', 4000),
+                compact_prompt=llm_data.get('compact_prompt', True),
+                prompt_token_budget=llm_data.get('prompt_token_budget', 6000)
             )
         
         # 加载其他配置...
@@ -226,7 +250,9 @@ def save_config(config: VNextConfig, config_path: str = "vnext_config.json"):
                 "api_key": config.llm.api_key,
                 "base_url": config.llm.base_url,
                 "temperature": config.llm.temperature,
-                "max_tokens": config.llm.max_tokens
+                "max_tokens": config.llm.max_tokens,
+                "compact_prompt": config.llm.compact_prompt,
+                "prompt_token_budget": config.llm.prompt_token_budget
             },
             "localization": {
                 "language": config.localization.language,
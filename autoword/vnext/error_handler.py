@@ -6,9 +6,11 @@ NOOP operation logging, security violation detection, and revision handling stra
 """
 
 import os
+import re
 import shutil
 import logging
 import traceback
+from collections import deque
 from typing import Dict, List, Optional, Any, Callable, Union
 from pathlib import Path
 from datetime import datetime
@@ -18,9 +20,10 @@ from dataclasses import dataclass
 from .exceptions import (
     VNextError, ExtractionError, PlanningError, ExecutionError, 
     ValidationError, AuditError, RollbackError, SecurityViolationError,
-    LocalizationError, WhitelistViolationError
+    LocalizationError, WhitelistViolationError, WordTimeoutError
 )
 from .models import StructureV1, PlanV1, OperationResult
+from .log_sink import get_log_sink
 
 
 logger = logging.getLogger(__name__)
@@ -33,6 +36,7 @@ class ProcessingStatus(Enum):
     ROLLBACK = "ROLLBACK"
     SECURITY_VIOLATION = "SECURITY_VIOLATION"
     NOOP_OPERATIONS = "NOOP_OPERATIONS"
+    TIMEOUT = "TIMEOUT"
 
 
 class RevisionHandlingStrategy(Enum):
@@ -69,15 +73,24 @@ class RecoveryResult:
 class WarningsLogger:
     """Centralized warnings logger for NOOP operations and fallbacks."""
     
-    def __init__(self, warnings_log_path: str):
+    # Warnings kept in memory for get_warnings()
+    MAX_RETAINED_WARNINGS = 1000
+    
+    _TIMESTAMP_PREFIX = re.compile(r"^\[[^\]]*\]\s*")
+    
+    def __init__(self, warnings_log_path: str, deduplicate: bool = False):
         """
         Initialize warnings logger.
         
         Args:
             warnings_log_path: Path to warnings.log file
+            deduplicate: Write repeated warnings once and record occurrence
+                counts when the logger is closed
         """
         self.warnings_log_path = warnings_log_path
         self._ensure_log_directory()
+        self._sink = get_log_sink(warnings_log_path, deduplicate=deduplicate)
+        self._warnings = deque(maxlen=self.MAX_RETAINED_WARNINGS)
     
     def _ensure_log_directory(self):
         """Ensure the warnings log directory exists."""
@@ -168,13 +181,28 @@ class WarningsLogger:
         self._write_warning(message)
         logger.info(f"Revision handling: {strategy.value} - {action_taken}")
     
+    def get_warnings(self) -> List[str]:
+        """
+        Get the most recent warnings logged by this logger.
+        
+        Returns:
+            List[str]: Up to MAX_RETAINED_WARNINGS warning messages
+        """
+        return list(self._warnings)
+    
+    def flush(self):
+        """Write buffered warnings to warnings.log."""
+        self._sink.flush()
+    
+    def close(self):
+        """Flush buffered warnings and append occurrence counts of repeats."""
+        self._sink.close()
+    
     def _write_warning(self, message: str):
-        """Write warning message to warnings.log file."""
-        try:
-            with open(self.warnings_log_path, 'a', encoding='utf-8') as f:
-                f.write(message + '\n')
-        except Exception as e:
-            logger.error(f"Failed to write to warnings.log: {e}")
+        """Buffer warning message for warnings.log."""
+        self._warnings.append(message)
+        # Repeats differ only in their timestamp
+        self._sink.write(message, key=self._TIMESTAMP_PREFIX.sub("", message))
 
 
 class SecurityValidator:
@@ -517,6 +545,8 @@ class PipelineErrorHandler:
         # Determine recovery strategy based on error type
         if isinstance(error, SecurityViolationError):
             return self._handle_security_violation(error, context)
+        elif isinstance(error, WordTimeoutError):
+            return self._handle_timeout_error(error, context)
         elif isinstance(error, ValidationError):
             return self._handle_validation_error(error, context)
         elif isinstance(error, (ExtractionError, PlanningError, ExecutionError, AuditError)):
@@ -575,6 +605,33 @@ class PipelineErrorHandler:
             recovery_path=rollback_result.recovery_path
         )
     
+    def _handle_timeout_error(self, error: WordTimeoutError,
+                              context: ErrorContext) -> RecoveryResult:
+        """Handle Word calls killed by the watchdog."""
+        rollback_performed = False
+        recovery_path = None
+        
+        if context.docx_path and context.original_docx_path:
+            rollback_result = self.rollback_manager.perform_rollback(
+                context.original_docx_path,
+                context.docx_path,
+                f"{context.pipeline_stage} timeout: {str(error)}"
+            )
+            rollback_performed = rollback_result.rollback_performed
+            recovery_path = rollback_result.recovery_path
+        
+        # Write status file
+        self._write_status_file(ProcessingStatus.TIMEOUT, str(error))
+        
+        return RecoveryResult(
+            success=False,
+            status=ProcessingStatus.TIMEOUT,
+            rollback_performed=rollback_performed,
+            warnings=[f"{context.pipeline_stage} timeout: {error.message}"],
+            errors=[str(error)],
+            recovery_path=recovery_path
+        )
+    
     def _handle_pipeline_stage_error(self, error: VNextError, 
                                    context: ErrorContext) -> RecoveryResult:
         """Handle errors from pipeline stages."""
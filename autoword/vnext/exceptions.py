@@ -157,6 +157,36 @@ class AuditError(VNextError):
         super().__init__(message, details)
 
 
+class WordTimeoutError(VNextError):
+    """Exception raised when a Word COM call exceeds its watchdog deadline."""
+    
+    def __init__(self, message: str, stage: Optional[str] = None,
+                 operation: Optional[str] = None, timeout_seconds: Optional[float] = None,
+                 killed_pids: Optional[List[int]] = None, **kwargs):
+        """
+        Initialize Word timeout error.
+        
+        Args:
+            message: Error message
+            stage: Pipeline stage whose deadline was active
+            operation: Word call that timed out, if an operation deadline expired
+            timeout_seconds: Deadline that expired
+            killed_pids: Word processes killed by the watchdog
+            **kwargs: Additional error details
+        """
+        details = kwargs
+        if stage:
+            details['stage'] = stage
+        if operation:
+            details['operation'] = operation
+        if timeout_seconds is not None:
+            details['timeout_seconds'] = timeout_seconds
+        if killed_pids:
+            details['killed_pids'] = killed_pids
+            
+        super().__init__(message, details)
+
+
 class SchemaValidationError(PlanningError):
     """Exception raised when JSON schema validation fails."""
     
@@ -1,10 +1,14 @@
 """
 Executor module for executing atomic operations through Word COM.
 
+Style-only plans can run directly on the OOXML package (ooxml_executor).
+
 This module performs only whitelisted atomic operations with strict
 safety controls and localization support.
 """
 
 from .document_executor import DocumentExecutor
+from .ooxml_executor import OoxmlStyleExecutor
+from .plan_optimizer import PlanOptimizer, PlanOptimizationReport
 
-__all__ = ["DocumentExecutor"]
\ No newline at end of file
+__all__ = ["DocumentExecutor", "OoxmlStyleExecutor", "PlanOptimizer", "PlanOptimizationReport"]
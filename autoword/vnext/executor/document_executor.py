@@ -30,6 +30,13 @@ from ..models import (
 from ..exceptions import ExecutionError, LocalizationError, SecurityViolationError
 from ..localization import LocalizationManager
 from ..constraints import RuntimeConstraintEnforcer
+from ..layout_tracker import LayoutDependencyTracker, RefreshDecision
+from ..watchdog import ComWatchdog, com_deadline
+from .ooxml_executor import OoxmlStyleExecutor
+from .plan_optimizer import (
+    PlanOptimizer, OptimizedPlan, FusedReassignment,
+    operation_affects_layout, operation_touches_fields
+)
 
 
 logger = logging.getLogger(__name__)
@@ -41,12 +48,22 @@ logger = logging.getLogger(__name__)
 class DocumentExecutor:
     """Execute atomic operations through Word COM with strict safety controls."""
     
-    def __init__(self, warnings_log_path: Optional[str] = None):
+    def __init__(self, warnings_log_path: Optional[str] = None, optimize_plan: bool = True,
+                 layout_tracker: Optional[LayoutDependencyTracker] = None, ooxml_styles: bool = True,
+                 watchdog: Optional[ComWatchdog] = None):
         """
         Initialize document executor.
         
         Args:
             warnings_log_path: Path to warnings.log file for logging fallbacks
+            optimize_plan: Fuse/eliminate operations and skip unneeded field
+                updates and repagination (see plan_optimizer)
+            layout_tracker: If given, field update and repagination are deferred
+                and the stale state is recorded on the tracker instead
+            ooxml_styles: Run style-only plans by editing the package without
+                Word (see ooxml_executor)
+            watchdog: Puts Word startup, Documents.Open, every plan step,
+                Fields.Update, Repaginate and Save under operation deadlines
         """
         if not WIN32_AVAILABLE:
             raise ExecutionError(
@@ -55,6 +72,11 @@ class DocumentExecutor:
             )
         
         self.localization_manager = LocalizationManager(warnings_log_path)
+        self.plan_optimizer = PlanOptimizer() if optimize_plan else None
+        self.last_optimization_report = None
+        self.layout_tracker = layout_tracker
+        self.ooxml_executor = OoxmlStyleExecutor(self.localization_manager) if ooxml_styles else None
+        self.watchdog = watchdog
         self._word_app = None
         
     def execute_plan(self, plan: PlanV1, docx_path: str) -> str:
@@ -77,30 +99,58 @@ class DocumentExecutor:
         # Create temporary copy for modification
         temp_dir = tempfile.mkdtemp(prefix="autoword_executor_")
         temp_docx = os.path.join(temp_dir, "modified_document.docx")
+        
+        if self.ooxml_executor is not None:
+            reason = self.ooxml_executor.fallback_reason(plan, docx_path, self.layout_tracker is not None)
+            if reason is None:
+                return self._execute_plan_ooxml(plan, docx_path, temp_docx)
+            logger.info(f"Executing plan through Word COM: {reason}")
+        
         shutil.copy2(docx_path, temp_docx)
         
         word_app = None
+        word_pid = None
         doc = None
         
         try:
             # Initialize Word application
-            word_app = win32com.client.Dispatch("Word.Application")
-            word_app.Visible = False
-            word_app.DisplayAlerts = False
+            with com_deadline(self.watchdog, "Word.Application"):
+                word_app = win32com.client.Dispatch("Word.Application")
+                if self.watchdog is not None:
+                    word_pid = self.watchdog.attach_word_app(word_app)
+                word_app.Visible = False
+                word_app.DisplayAlerts = False
             self._word_app = word_app
             
             # Open document
-            doc = word_app.Documents.Open(temp_docx)
+            with com_deadline(self.watchdog, "Documents.Open"):
+                doc = word_app.Documents.Open(temp_docx)
             
             # Apply localization fallbacks
             self.apply_localization_fallbacks(doc)
             
-            # Execute all operations in sequence
+            # Execute optimized steps in sequence
+            optimized = self.optimize_plan(plan)
+            report = optimized.report
+            self.last_optimization_report = report
+            
             warnings = []
-            for i, operation in enumerate(plan.ops):
+            # Without optimization every plan is assumed to touch fields and layout
+            field_sources = [] if optimized.optimized else ["plan"]
+            layout_sources = [] if optimized.optimized else ["plan"]
+            for i, operation in enumerate(optimized.steps):
+                op_indexes = optimized.step_op_indexes[i]
                 try:
-                    logger.info(f"Executing operation {i+1}/{len(plan.ops)}: {operation.operation_type}")
-                    result = self.execute_operation(operation, doc)
+                    superseding = optimized.superseding_deletes.get(i)
+                    if superseding is not None and self._section_superseded(operation, superseding, doc):
+                        report.record_elimination(op_indexes[0], operation,
+                                                  "section removed by later delete_section_by_heading")
+                        continue
+                    
+                    logger.info(f"Executing step {i+1}/{len(optimized.steps)} "
+                                f"(ops {op_indexes}): {operation.operation_type}")
+                    with com_deadline(self.watchdog, operation.operation_type):
+                        result = self.execute_operation(operation, doc)
                     
                     if not result.success:
                         operation_data = operation.model_dump() if hasattr(operation, 'model_dump') else str(operation)
@@ -112,20 +162,43 @@ class DocumentExecutor:
                     
                     warnings.extend(result.warnings)
                     
+                    if not (result.message or "").endswith("(NOOP)"):
+                        if operation_touches_fields(operation):
+                            field_sources.append(operation.operation_type)
+                        if operation_affects_layout(operation):
+                            layout_sources.append(operation.operation_type)
+                    
                 except Exception as e:
                     operation_data = operation.model_dump() if hasattr(operation, 'model_dump') else str(operation)
                     raise ExecutionError(
-                        f"Failed to execute operation {i+1}: {str(e)}",
+                        f"Failed to execute operation {op_indexes[0]+1}: {str(e)}",
                         operation_type=operation.operation_type,
                         operation_data=operation_data
                     ) from e
             
-            # Force field updates and repagination
-            doc.Fields.Update()
-            doc.Repaginate()
+            # Field results go stale when fields or pagination change
+            if self.layout_tracker is not None:
+                self._defer_layout_refresh(field_sources, layout_sources)
+                report.field_update_skipped = True
+                report.repagination_skipped = True
+            else:
+                if field_sources or layout_sources:
+                    with com_deadline(self.watchdog, "Fields.Update"):
+                        doc.Fields.Update()
+                else:
+                    report.field_update_skipped = True
+                if layout_sources:
+                    with com_deadline(self.watchdog, "Repaginate"):
+                        doc.Repaginate()
+                else:
+                    report.repagination_skipped = True
+            
+            if optimized.optimized:
+                logger.info(f"Plan optimization: {report.summary()}")
             
             # Save document
-            doc.Save()
+            with com_deadline(self.watchdog, "Document.Save"):
+                doc.Save()
             
             # Write warnings to log if configured
             all_warnings = warnings + self.localization_manager.get_warnings()
@@ -154,10 +227,77 @@ class DocumentExecutor:
             if word_app:
                 try:
                     word_app.Quit()
+                    if self.watchdog is not None:
+                        # The PID may be reused once Word has exited
+                        self.watchdog.detach_process(word_pid)
                 except:
                     pass
             self._word_app = None
     
+    def _execute_plan_ooxml(self, plan: PlanV1, docx_path: str, temp_docx: str) -> str:
+        """Execute a style-only plan on the package, without starting Word."""
+        report = PlanOptimizer.passthrough(plan).report
+        self.last_optimization_report = report
+        try:
+            results = self.ooxml_executor.execute_plan(plan, docx_path, temp_docx)
+        except Exception as e:
+            if os.path.exists(temp_docx):
+                os.remove(temp_docx)
+            if isinstance(e, ExecutionError):
+                raise
+            raise ExecutionError(f"Failed to execute plan on OOXML package: {str(e)}") from e
+        
+        warnings = []
+        field_sources, layout_sources = [], []
+        for operation, result in zip(plan.ops, results):
+            warnings.extend(result.warnings)
+            if not (result.message or "").endswith("(NOOP)"):
+                if operation_touches_fields(operation):
+                    field_sources.append(operation.operation_type)
+                if operation_affects_layout(operation):
+                    layout_sources.append(operation.operation_type)
+        
+        # Fields and pagination are refreshed by Word on open or by the validator
+        if self.layout_tracker is not None:
+            self._defer_layout_refresh(field_sources, layout_sources)
+        report.field_update_skipped = True
+        report.repagination_skipped = True
+        
+        all_warnings = warnings + self.localization_manager.get_warnings()
+        if all_warnings:
+            self.localization_manager.write_warnings_log(warnings)
+        
+        logger.info(f"Plan executed on OOXML package ({len(plan.ops)} ops). Warnings: {len(all_warnings)}")
+        return temp_docx
+    
+    def _defer_layout_refresh(self, field_sources: List[str], layout_sources: List[str]):
+        """Record stale fields/layout on the tracker instead of refreshing now."""
+        tracker = self.layout_tracker
+        for source in field_sources:
+            tracker.mark_fields_dirty(source)
+        for source in layout_sources:
+            tracker.mark_layout_dirty(source)
+        tracker.record(
+            "execute",
+            RefreshDecision(False, False, "deferred to validation (single refresh)"),
+            fields_dirty=tracker.fields_dirty,
+            layout_dirty=tracker.layout_dirty
+        )
+    
+    def optimize_plan(self, plan: PlanV1) -> OptimizedPlan:
+        """
+        Turn a plan into execution steps.
+        
+        Args:
+            plan: Execution plan with atomic operations
+            
+        Returns:
+            OptimizedPlan: Optimized steps, or the plan unchanged if optimization is disabled
+        """
+        if self.plan_optimizer is None:
+            return PlanOptimizer.passthrough(plan)
+        return self.plan_optimizer.optimize(plan)
+    
     def execute_operation(self, operation: AtomicOperationUnion, doc: object) -> OperationResult:
         """
         Execute single atomic operation.
@@ -188,6 +328,8 @@ class DocumentExecutor:
                 success, message = self._reassign_paragraphs_to_style(operation, doc, warnings)
             elif isinstance(operation, ClearDirectFormatting) or operation_type == "clear_direct_formatting":
                 success, message = self._clear_direct_formatting(operation, doc, warnings)
+            elif isinstance(operation, FusedReassignment):
+                success, message = self._reassign_paragraphs_sweep(operation.operations, doc, warnings)
             else:
                 raise SecurityViolationError(
                     f"Unknown operation type: {operation_type}",
@@ -251,34 +393,118 @@ class DocumentExecutor:
                 f"Failed to apply localization fallbacks: {str(e)}"
             ) from e
     
+    def _heading_matches(self, operation, para_text: str) -> bool:
+        """Whether a heading paragraph's text matches a delete_section_by_heading operation."""
+        heading_text = getattr(operation, 'heading_text', '')
+        match_mode = getattr(operation, 'match', MatchMode.EXACT)
+        case_sensitive = getattr(operation, 'case_sensitive', False)
+        
+        if match_mode == MatchMode.EXACT:
+            return (para_text == heading_text) if case_sensitive else (para_text.lower() == heading_text.lower())
+        if match_mode == MatchMode.CONTAINS:
+            return (heading_text in para_text) if case_sensitive else (heading_text.lower() in para_text.lower())
+        if match_mode == MatchMode.REGEX:
+            flags = 0 if case_sensitive else re.IGNORECASE
+            return bool(re.search(heading_text, para_text, flags))
+        return False
+    
+    def _find_matching_headings(self, operation, doc: object) -> List[object]:
+        """Find heading paragraphs matching a delete_section_by_heading operation."""
+        level = getattr(operation, 'level', 1)
+        
+        matching_headings = []
+        
+        for para in doc.Paragraphs:
+            if para.OutlineLevel == level and self._heading_matches(operation, para.Range.Text.strip()):
+                matching_headings.append(para)
+        
+        return matching_headings
+    
+    def _section_range(self, target_heading: object, level: int, doc: object) -> tuple[int, int]:
+        """Return (start, end) of the section from a heading to the next same-or-higher-level heading."""
+        start_range = target_heading.Range.Start
+        end_range = doc.Range().End
+        
+        # Look for next heading at same or higher level
+        current_para = target_heading.Next()
+        while current_para:
+            if current_para.OutlineLevel <= level:
+                end_range = current_para.Range.Start
+                break
+            current_para = current_para.Next()
+        
+        return start_range, end_range
+    
+    def _locate_sections(self, operations: List[object], doc: object) -> List[Optional[tuple[int, int]]]:
+        """Return the ranges several delete_section_by_heading operations would delete.
+        
+        All sections are located in one sweep over the paragraphs that stops once
+        every section has ended. Each paragraph's outline level is read once and
+        its text only when it is a candidate heading.
+        """
+        levels = [getattr(operation, 'level', 1) for operation in operations]
+        occurrences = [getattr(operation, 'occurrence_index', None) or 1 for operation in operations]
+        match_counts = [0] * len(operations)
+        starts: List[Optional[int]] = [None] * len(operations)
+        ends: List[Optional[int]] = [None] * len(operations)
+        
+        for para in doc.Paragraphs:
+            outline_level = para.OutlineLevel
+            para_range = None
+            para_text = None
+            for i, operation in enumerate(operations):
+                if starts[i] is not None:
+                    # A same-or-higher-level heading ends an open section
+                    if ends[i] is None and outline_level <= levels[i]:
+                        if para_range is None:
+                            para_range = para.Range
+                        ends[i] = para_range.Start
+                    continue
+                if outline_level != levels[i]:
+                    continue
+                if para_range is None:
+                    para_range = para.Range
+                if para_text is None:
+                    para_text = para_range.Text.strip()
+                if self._heading_matches(operation, para_text):
+                    match_counts[i] += 1
+                    if match_counts[i] == occurrences[i]:
+                        starts[i] = para_range.Start
+            if all(end is not None for end in ends):
+                break
+        
+        document_end = None
+        sections = []
+        for start, end in zip(starts, ends):
+            if start is None:
+                sections.append(None)
+                continue
+            if end is None:
+                document_end = document_end if document_end is not None else doc.Range().End
+                end = document_end
+            sections.append((start, end))
+        return sections
+    
+    def _section_superseded(self, operation, later_delete, doc: object) -> bool:
+        """Whether later_delete (a higher-level delete) will remove operation's whole section."""
+        try:
+            inner, outer = self._locate_sections([operation, later_delete], doc)
+        except Exception as e:
+            logger.debug(f"Section containment check failed, executing operation: {e}")
+            return False
+        if inner is None or outer is None:
+            return False
+        return outer[0] <= inner[0] and inner[1] <= outer[1]
+    
     def _delete_section_by_heading(self, operation, doc: object, warnings: List[str]) -> tuple[bool, str]:
         """Delete section by heading text."""
         heading_text = getattr(operation, 'heading_text', '')
         level = getattr(operation, 'level', 1)
-        match_mode = getattr(operation, 'match', MatchMode.EXACT)
-        case_sensitive = getattr(operation, 'case_sensitive', False)
         occurrence_index = getattr(operation, 'occurrence_index', None)
         
         try:
             # Find all headings that match criteria
-            matching_headings = []
-            
-            for para in doc.Paragraphs:
-                if para.OutlineLevel == level:
-                    para_text = para.Range.Text.strip()
-                    
-                    # Apply matching logic
-                    is_match = False
-                    if match_mode == MatchMode.EXACT:
-                        is_match = (para_text == heading_text) if case_sensitive else (para_text.lower() == heading_text.lower())
-                    elif match_mode == MatchMode.CONTAINS:
-                        is_match = (heading_text in para_text) if case_sensitive else (heading_text.lower() in para_text.lower())
-                    elif match_mode == MatchMode.REGEX:
-                        flags = 0 if case_sensitive else re.IGNORECASE
-                        is_match = bool(re.search(heading_text, para_text, flags))
-                    
-                    if is_match:
-                        matching_headings.append(para)
+            matching_headings = self._find_matching_headings(operation, doc)
             
             if not matching_headings:
                 warnings.append(f"NOOP: No heading found matching '{heading_text}' at level {level}")
@@ -296,16 +522,7 @@ class DocumentExecutor:
                     warnings.append(f"Multiple headings matched, using first occurrence")
             
             # Find the range to delete (from heading to next same-level heading)
-            start_range = target_heading.Range.Start
-            end_range = doc.Range().End
-            
-            # Look for next heading at same or higher level
-            current_para = target_heading.Next()
-            while current_para:
-                if current_para.OutlineLevel <= level:
-                    end_range = current_para.Range.Start
-                    break
-                current_para = current_para.Next()
+            start_range, end_range = self._section_range(target_heading, level, doc)
             
             # Delete the range
             delete_range = doc.Range(start_range, end_range)
@@ -464,59 +681,79 @@ class DocumentExecutor:
     
     def _reassign_paragraphs_to_style(self, operation, doc: object, warnings: List[str]) -> tuple[bool, str]:
         """Reassign paragraphs to target style."""
-        selector = getattr(operation, 'selector', {})
-        target_style_name = getattr(operation, 'target_style_name', '')
-        clear_direct_formatting = getattr(operation, 'clear_direct_formatting', False)
+        return self._reassign_paragraphs_sweep([operation], doc, warnings)
+    
+    def _reassign_paragraphs_sweep(self, operations: List[Any], doc: object, warnings: List[str]) -> tuple[bool, str]:
+        """
+        Reassign paragraphs for one or more reassign operations in a single sweep.
         
+        Operations are applied to each paragraph in plan order. This matches
+        running them one after another, since each operation only changes the
+        paragraphs it matched.
+        """
         try:
-            # Resolve target style name
-            resolved_target_style = self.localization_manager.resolve_style_name(target_style_name, doc)
+            # Resolve target and selector style names once per operation
+            resolved = []
+            for operation in operations:
+                selector = getattr(operation, 'selector', {})
+                target_style_name = getattr(operation, 'target_style_name', '')
+                resolved_target_style = self.localization_manager.resolve_style_name(target_style_name, doc)
+                expected_style = None
+                if "style_name" in selector:
+                    expected_style = self.localization_manager.resolve_style_name(selector["style_name"], doc)
+                resolved.append((selector, expected_style, resolved_target_style,
+                                 getattr(operation, 'clear_direct_formatting', False)))
             
-            # Find paragraphs matching selector
-            matching_paragraphs = []
+            match_counts = [0] * len(operations)
             
             for para in doc.Paragraphs:
-                is_match = True
-                
-                # Apply selector criteria
-                if "style_name" in selector:
-                    current_style = para.Style.NameLocal
-                    expected_style = self.localization_manager.resolve_style_name(selector["style_name"], doc)
-                    if current_style != expected_style:
-                        is_match = False
-                
-                if "outline_level" in selector:
-                    if para.OutlineLevel != selector["outline_level"]:
-                        is_match = False
-                
-                if "text_contains" in selector:
-                    para_text = para.Range.Text.strip()
-                    if selector["text_contains"] not in para_text:
-                        is_match = False
-                
-                if "text_regex" in selector:
-                    para_text = para.Range.Text.strip()
-                    if not re.search(selector["text_regex"], para_text):
-                        is_match = False
-                
-                if is_match:
-                    matching_paragraphs.append(para)
+                para_text = None
+                for k, (selector, expected_style, resolved_target_style, clear_formatting) in enumerate(resolved):
+                    # Apply selector criteria
+                    if expected_style is not None and para.Style.NameLocal != expected_style:
+                        continue
+                    
+                    if "outline_level" in selector and para.OutlineLevel != selector["outline_level"]:
+                        continue
+                    
+                    if "text_contains" in selector or "text_regex" in selector:
+                        if para_text is None:
+                            para_text = para.Range.Text.strip()
+                        if "text_contains" in selector and selector["text_contains"] not in para_text:
+                            continue
+                        if "text_regex" in selector and not re.search(selector["text_regex"], para_text):
+                            continue
+                    
+                    # Reassign paragraph to target style
+                    para.Style = resolved_target_style
+                    
+                    if clear_formatting:
+                        para.Range.ClearFormatting()
+                    
+                    match_counts[k] += 1
             
-            if not matching_paragraphs:
-                warnings.append("NOOP: No paragraphs found matching selector criteria")
-                return True, "No matching paragraphs found (NOOP)"
+            messages = []
+            for (_, _, resolved_target_style, _), count in zip(resolved, match_counts):
+                if count:
+                    messages.append(f"Reassigned {count} paragraph(s) to style '{resolved_target_style}'")
+                else:
+                    warnings.append("NOOP: No paragraphs found matching selector criteria")
+                    messages.append("No matching paragraphs found (NOOP)")
             
-            # Reassign paragraphs to target style
-            for para in matching_paragraphs:
-                para.Style = resolved_target_style
-                
-                if clear_direct_formatting:
-                    para.Range.ClearFormatting()
+            if len(operations) == 1:
+                return True, messages[0]
             
-            return True, f"Reassigned {len(matching_paragraphs)} paragraph(s) to style '{resolved_target_style}'"
+            message = f"Fused {len(operations)} reassignments in one sweep: " + "; ".join(messages)
+            if not any(match_counts):
+                message += " (NOOP)"
+            return True, message
             
         except Exception as e:
-            operation_data = operation.model_dump() if hasattr(operation, 'model_dump') else str(operation)
+            if len(operations) == 1:
+                operation = operations[0]
+                operation_data = operation.model_dump() if hasattr(operation, 'model_dump') else str(operation)
+            else:
+                operation_data = {"ops": [op.model_dump() if hasattr(op, 'model_dump') else str(op) for op in operations]}
             raise ExecutionError(
                 f"Failed to reassign paragraphs to style: {str(e)}",
                 operation_type="reassign_paragraphs_to_style",
@@ -0,0 +1,678 @@
+"""
+OOXML execution backend for style-only plans.
+
+Plans made only of SetStyleRule and ReassignParagraphsToStyle operations do
+not need Word: they change style definitions in word/styles.xml and the
+w:pStyle references of body paragraphs in word/document.xml. This backend
+applies them as a zip-to-zip transform:
+
+- styles.xml (small) is edited as a DOM that keeps namespace prefixes and
+  declarations, so mc:Ignorable references stay valid
+- document.xml is streamed through SAX one paragraph at a time; each body
+  paragraph is buffered, matched against the reassign selectors in plan
+  order (the same sweep DocumentExecutor runs over COM) and written out with
+  its w:pStyle updated
+- every other package part is copied unchanged
+
+Style and font names are resolved with the same LocalizationManager used by
+the COM executor, through a catalog object that mimics doc.Styles. Property
+values follow the COM executor: line spacing values are
+ParagraphFormat.LineSpacing points, sizes and indents are points.
+
+Plans with other operations, reassignments that clear direct formatting, or
+layout changes that would leave TOC/PAGE field results stale without a
+layout tracker to defer the refresh to the validator fall back to COM.
+"""
+
+import logging
+import os
+import re
+import shutil
+import tempfile
+import xml.etree.ElementTree as ET
+import xml.sax
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.dom import minidom
+from xml.sax.handler import feature_external_ges, feature_namespaces
+from xml.sax.saxutils import XMLGenerator
+
+from ...core.paragraph_table import display_style_name
+from ..models import (
+    PlanV1, OperationResult, SetStyleRule, ReassignParagraphsToStyle, LineSpacingMode
+)
+from ..exceptions import ExecutionError
+from ..localization import LocalizationManager
+from .plan_optimizer import operation_affects_layout
+
+
+logger = logging.getLogger(__name__)
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+STYLES_PART = "word/styles.xml"
+DOCUMENT_PART = "word/document.xml"
+
+SUPPORTED_SELECTOR_KEYS = {"style_name", "outline_level", "text_contains", "text_regex"}
+BODY_TEXT_OUTLINE_LEVEL = 10  # wdOutlineLevelBodyText
+
+# Fields whose results depend on pagination
+_PAGE_FIELD_PATTERN = re.compile(r"^\s*(TOC|PAGE|PAGEREF|NUMPAGES|SECTIONPAGES)\b", re.IGNORECASE)
+
+# Child order required by the WordprocessingML schema
+_STYLE_CHILD_ORDER = (
+    "name", "aliases", "basedOn", "next", "link", "autoRedefine", "hidden", "uiPriority",
+    "semiHidden", "unhideWhenUsed", "qFormat", "locked", "personal", "personalCompose",
+    "personalReply", "rsid", "pPr", "rPr", "tblPr", "trPr", "tcPr", "tblStylePr",
+)
+_RPR_ORDER = (
+    "rStyle", "rFonts", "b", "bCs", "i", "iCs", "caps", "smallCaps", "strike", "dstrike",
+    "outline", "shadow", "emboss", "imprint", "noProof", "snapToGrid", "vanish", "webHidden",
+    "color", "spacing", "w", "kern", "position", "sz", "szCs", "highlight", "u", "effect",
+    "bdr", "shd", "fitText", "vertAlign", "rtl", "cs", "em", "lang", "eastAsianLayout",
+    "specVanish", "oMath",
+)
+_PPR_ORDER = (
+    "pStyle", "keepNext", "keepLines", "pageBreakBefore", "framePr", "widowControl", "numPr",
+    "suppressLineNumbers", "pBdr", "shd", "tabs", "suppressAutoHyphens", "kinsoku", "wordWrap",
+    "overflowPunct", "topLinePunct", "autoSpaceDE", "autoSpaceDN", "bidi", "adjustRightInd",
+    "snapToGrid", "spacing", "ind", "contextualSpacing", "mirrorIndents", "suppressOverlap",
+    "jc", "textDirection", "textAlignment", "textboxTightWrap", "outlineLvl", "divId",
+    "cnfStyle", "rPr", "sectPr", "pPrChange",
+)
+
+
+def _twips(points: float) -> str:
+    return str(int(round(points * 20)))
+
+
+class _StyleEntry:
+    """A w:style element, exposing NameLocal like a COM Style."""
+
+    def __init__(self, element: minidom.Element, catalog: "StyleCatalog"):
+        self.element = element
+        self.catalog = catalog
+
+    @property
+    def style_id(self) -> str:
+        return self.catalog.attr(self.element, "styleId")
+
+    @property
+    def raw_name(self) -> str:
+        name = self.catalog.child(self.element, "name")
+        return self.catalog.attr(name, "val") if name is not None else self.style_id
+
+    @property
+    def NameLocal(self) -> str:
+        return display_style_name(self.raw_name)
+
+    @property
+    def style_type(self) -> str:
+        return self.catalog.attr(self.element, "type") or "paragraph"
+
+
+class StyleCatalog:
+    """
+    Editable view of word/styles.xml.
+
+    Passed to LocalizationManager in place of the COM document: it supports
+    ``catalog.Styles[name]`` and iteration over entries with ``NameLocal``.
+    """
+
+    def __init__(self, styles_xml: bytes):
+        self.dom = minidom.parseString(styles_xml)
+        self.root = self.dom.documentElement
+        self.prefix = self._prefix_for(W_NS) or "w"
+        self.entries = [_StyleEntry(element, self) for element in self.children(self.root, "style")]
+        self._by_id = {entry.style_id: entry for entry in self.entries}
+
+    @property
+    def Styles(self) -> "StyleCatalog":
+        return self
+
+    def __getitem__(self, name: str) -> _StyleEntry:
+        entry = self.find(name)
+        if entry is None:
+            raise KeyError(name)
+        return entry
+
+    def __iter__(self) -> Iterator[_StyleEntry]:
+        return iter(list(self.entries))
+
+    def find(self, name: str) -> Optional[_StyleEntry]:
+        """Find a style by display name or stored name."""
+        for entry in self.entries:
+            if name in (entry.NameLocal, entry.raw_name):
+                return entry
+        return None
+
+    def by_id(self, style_id: Optional[str]) -> Optional[_StyleEntry]:
+        return self._by_id.get(style_id) if style_id else None
+
+    def default_paragraph_style(self) -> Optional[_StyleEntry]:
+        for entry in self.entries:
+            if entry.style_type == "paragraph" and self.attr(entry.element, "default") in ("1", "true", "on"):
+                return entry
+        return self.find("Normal")
+
+    def outline_level(self, style_id: Optional[str]) -> int:
+        """Effective outline level of a paragraph style (basedOn chain), as ParagraphFormat.OutlineLevel."""
+        seen = set()
+        entry = self.by_id(style_id) or self.default_paragraph_style()
+        while entry is not None and entry.style_id not in seen:
+            seen.add(entry.style_id)
+            ppr = self.child(entry.element, "pPr")
+            level = self.child(ppr, "outlineLvl") if ppr is not None else None
+            if level is not None:
+                return _outline_level_value(self.attr(level, "val"))
+            based_on = self.child(entry.element, "basedOn")
+            entry = self.by_id(self.attr(based_on, "val")) if based_on is not None else None
+        return BODY_TEXT_OUTLINE_LEVEL
+
+    def add_paragraph_style(self, name: str) -> _StyleEntry:
+        """Add a custom paragraph style based on the default paragraph style."""
+        style_id = re.sub(r"[^0-9A-Za-z]", "", name) or "CustomStyle"
+        candidate, suffix = style_id, 1
+        while candidate in self._by_id:
+            suffix += 1
+            candidate = f"{style_id}{suffix}"
+
+        element = self.dom.createElementNS(W_NS, self.qname("style"))
+        element.setAttribute(self.qname("type"), "paragraph")
+        element.setAttribute(self.qname("customStyle"), "1")
+        element.setAttribute(self.qname("styleId"), candidate)
+        self.set_val(self.ensure_child(element, "name", _STYLE_CHILD_ORDER), name)
+        default = self.default_paragraph_style()
+        if default is not None:
+            self.set_val(self.ensure_child(element, "basedOn", _STYLE_CHILD_ORDER), default.style_id)
+        self.ensure_child(element, "qFormat", _STYLE_CHILD_ORDER)
+        self.root.appendChild(element)
+
+        entry = _StyleEntry(element, self)
+        self.entries.append(entry)
+        self._by_id[candidate] = entry
+        return entry
+
+    def to_xml(self) -> bytes:
+        return self.dom.toxml(encoding="UTF-8", standalone=True)
+
+    # DOM helpers
+
+    def _prefix_for(self, namespace: str) -> Optional[str]:
+        for name, value in self.root.attributes.items():
+            if name.startswith("xmlns:") and value == namespace:
+                return name[len("xmlns:"):]
+        return None
+
+    def qname(self, local: str) -> str:
+        return f"{self.prefix}:{local}"
+
+    def attr(self, element: Optional[minidom.Element], local: str) -> Optional[str]:
+        if element is None or not element.hasAttribute(self.qname(local)):
+            return None
+        return element.getAttribute(self.qname(local))
+
+    def set_val(self, element: minidom.Element, value: str):
+        element.setAttribute(self.qname("val"), value)
+
+    def children(self, parent: minidom.Element, local: str) -> List[minidom.Element]:
+        return [node for node in parent.childNodes
+                if node.nodeType == node.ELEMENT_NODE and node.namespaceURI == W_NS and node.localName == local]
+
+    def child(self, parent: Optional[minidom.Element], local: str) -> Optional[minidom.Element]:
+        if parent is None:
+            return None
+        found = self.children(parent, local)
+        return found[0] if found else None
+
+    def ensure_child(self, parent: minidom.Element, local: str, order: Tuple[str, ...]) -> minidom.Element:
+        """Return the child element, inserting it at its schema position if missing."""
+        existing = self.child(parent, local)
+        if existing is not None:
+            return existing
+        element = self.dom.createElementNS(W_NS, self.qname(local))
+        rank = order.index(local)
+        following = None
+        for node in parent.childNodes:
+            if (node.nodeType == node.ELEMENT_NODE and node.namespaceURI == W_NS
+                    and node.localName in order and order.index(node.localName) > rank):
+                following = node
+                break
+        parent.insertBefore(element, following)
+        return element
+
+    def remove_attrs(self, element: minidom.Element, *locals_: str):
+        for local in locals_:
+            if element.hasAttribute(self.qname(local)):
+                element.removeAttribute(self.qname(local))
+
+
+def _outline_level_value(value: Optional[str]) -> int:
+    if value is None or not value.isdigit() or int(value) >= 9:
+        return BODY_TEXT_OUTLINE_LEVEL
+    return int(value) + 1
+
+
+class _ParagraphRewriter(xml.sax.handler.ContentHandler):
+    """
+    Stream document.xml, buffering one body paragraph at a time.
+
+    Namespace processing is off so element and attribute names, including
+    xmlns declarations, are written back exactly as read.
+    """
+
+    def __init__(self, output, decide):
+        super().__init__()
+        self.output = output
+        self.decide = decide  # callable(paragraph info) -> new styleId or None
+        self.generator = None
+        self.prefixes: List[Dict[str, str]] = [{}]
+        self.w = "w"
+        self.buffer: Optional[List[tuple]] = None
+        self.depth = 0  # Element depth inside the buffered paragraph
+        self.textbox_depth = 0
+        self.info: Dict[str, Any] = {}
+
+    def startDocument(self):
+        self.output.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n')
+        self.generator = XMLGenerator(self.output, encoding="UTF-8", short_empty_elements=True)
+
+    def endDocument(self):
+        self.generator.endDocument()
+
+    def _local(self, name: str) -> Tuple[Optional[str], str]:
+        prefix, _, local = name.rpartition(":")
+        return self.prefixes[-1].get(prefix or None), local
+
+    def startElement(self, name, attrs):
+        declared = {key[6:] or None: value for key, value in attrs.items()
+                    if key == "xmlns" or key.startswith("xmlns:")}
+        if declared:
+            scope = dict(self.prefixes[-1])
+            scope.update(declared)
+            for prefix, uri in declared.items():
+                if uri == W_NS and prefix:
+                    self.w = prefix
+        else:
+            scope = self.prefixes[-1]
+        self.prefixes.append(scope)
+
+        namespace, local = self._local(name)
+        is_w = namespace == W_NS
+        if self.buffer is None:
+            if is_w and local == "p" and not self.textbox_depth:
+                self.buffer = [("start", name, dict(attrs))]
+                self.depth = 0
+                self.info = {"style_id": None, "outline": None, "text": [], "ppr": None, "pstyle": None}
+                return
+            if is_w and local == "txbxContent":
+                self.textbox_depth += 1
+            self.generator.startElement(name, attrs)
+            return
+
+        self.depth += 1
+        self.buffer.append(("start", name, dict(attrs)))
+        if not is_w:
+            return
+        if local == "txbxContent":
+            self.textbox_depth += 1
+        elif self.depth == 1 and local == "pPr":
+            self.info["ppr"] = len(self.buffer) - 1
+        elif self.depth == 2 and self.info["ppr"] is not None and local == "pStyle":
+            self.info["pstyle"] = len(self.buffer) - 1
+            self.info["style_id"] = attrs.get(f"{self.w}:val")
+        elif self.depth == 2 and self.info["ppr"] is not None and local == "outlineLvl":
+            self.info["outline"] = _outline_level_value(attrs.get(f"{self.w}:val"))
+        elif not self.textbox_depth and local == "t":
+            self.info["in_text"] = True
+        elif not self.textbox_depth and local == "tab" and self.depth > 2:
+            self.info["text"].append("\t")
+        elif not self.textbox_depth and local == "br":
+            self.info["text"].append("\v")
+
+    def endElement(self, name):
+        self.prefixes.pop()
+        namespace, local = self._local(name) if self.prefixes else (None, name)
+        is_w = namespace == W_NS
+        if self.buffer is None:
+            if is_w and local == "txbxContent":
+                self.textbox_depth -= 1
+            self.generator.endElement(name)
+            return
+
+        if self.depth == 0:
+            self.buffer.append(("end", name))
+            self._flush_paragraph()
+            return
+        self.depth -= 1
+        self.buffer.append(("end", name))
+        if is_w and local == "txbxContent":
+            self.textbox_depth -= 1
+        elif is_w and local == "t":
+            self.info["in_text"] = False
+
+    def characters(self, content):
+        if self.buffer is None:
+            self.generator.characters(content)
+            return
+        self.buffer.append(("chars", content))
+        if self.info.get("in_text") and not self.textbox_depth:
+            self.info["text"].append(content)
+
+    def ignorableWhitespace(self, whitespace):
+        self.characters(whitespace)
+
+    def processingInstruction(self, target, data):
+        if self.buffer is None:
+            self.generator.processingInstruction(target, data)
+        else:
+            self.buffer.append(("pi", target, data))
+
+    def _flush_paragraph(self):
+        buffer, info = self.buffer, self.info
+        self.buffer = None
+        new_style_id = self.decide({
+            "style_id": info["style_id"],
+            "outline": info["outline"],
+            "text": "".join(info["text"]),
+        })
+        if new_style_id is not None and new_style_id != info["style_id"]:
+            val = f"{self.w}:val"
+            pstyle = [("start", f"{self.w}:pStyle", {val: new_style_id}), ("end", f"{self.w}:pStyle")]
+            if info["pstyle"] is not None:
+                attrs = dict(buffer[info["pstyle"]][2])
+                attrs[val] = new_style_id
+                buffer[info["pstyle"]] = ("start", buffer[info["pstyle"]][1], attrs)
+            elif info["ppr"] is not None:
+                buffer[info["ppr"] + 1:info["ppr"] + 1] = pstyle
+            else:
+                buffer[1:1] = [("start", f"{self.w}:pPr", {})] + pstyle + [("end", f"{self.w}:pPr")]
+
+        for event in buffer:
+            if event[0] == "start":
+                self.generator.startElement(event[1], event[2])
+            elif event[0] == "end":
+                self.generator.endElement(event[1])
+            elif event[0] == "chars":
+                self.generator.characters(event[1])
+            else:
+                self.generator.processingInstruction(event[1], event[2])
+
+
+class OoxmlStyleExecutor:
+    """Execute style-only plans by rewriting the DOCX package."""
+
+    def __init__(self, localization_manager: Optional[LocalizationManager] = None):
+        """
+        Initialize OOXML style executor.
+
+        Args:
+            localization_manager: Style alias and font fallback resolver
+                (shared with the COM executor so warnings end up in one log)
+        """
+        self.localization_manager = localization_manager or LocalizationManager()
+
+    def fallback_reason(self, plan: PlanV1, docx_path: str, layout_deferred: bool) -> Optional[str]:
+        """
+        Check whether the plan can run without Word.
+
+        Args:
+            plan: Execution plan
+            docx_path: Source DOCX path
+            layout_deferred: Whether a layout tracker defers field update and
+                repagination to the validator
+
+        Returns:
+            Optional[str]: Why the plan needs COM, or None if it can run here
+        """
+        layout_changed = False
+        for op in plan.ops:
+            if not isinstance(op, (SetStyleRule, ReassignParagraphsToStyle)):
+                return f"{op.operation_type} needs Word"
+            if isinstance(op, ReassignParagraphsToStyle):
+                if op.clear_direct_formatting:
+                    return "clearing direct formatting needs Word"
+                unknown = set(op.selector) - SUPPORTED_SELECTOR_KEYS
+                if unknown:
+                    return f"unsupported selector keys: {', '.join(sorted(unknown))}"
+            layout_changed = layout_changed or operation_affects_layout(op)
+
+        try:
+            with zipfile.ZipFile(docx_path) as package:
+                names = set(package.namelist())
+                if STYLES_PART not in names or DOCUMENT_PART not in names:
+                    return "package has no styles.xml or document.xml"
+                if layout_changed and not layout_deferred and self._has_page_fields(package):
+                    return "page-dependent fields need repagination in Word"
+        except (OSError, zipfile.BadZipFile) as e:
+            return f"cannot read package: {e}"
+        return None
+
+    def execute_plan(self, plan: PlanV1, docx_path: str, output_path: str) -> List[OperationResult]:
+        """
+        Apply the plan to a copy of the package.
+
+        Args:
+            plan: Style-only execution plan (see fallback_reason)
+            docx_path: Source DOCX path
+            output_path: Path of the modified DOCX to write
+
+        Returns:
+            List[OperationResult]: One result per operation, in plan order
+
+        Raises:
+            ExecutionError: If an operation cannot be applied
+        """
+        with zipfile.ZipFile(docx_path) as source:
+            catalog = StyleCatalog(source.read(STYLES_PART))
+            self.apply_localization_fallbacks(catalog)
+            results: List[Optional[OperationResult]] = [None] * len(plan.ops)
+            reassignments = []
+            for index, op in enumerate(plan.ops):
+                if isinstance(op, SetStyleRule):
+                    warnings: List[str] = []
+                    message = self._set_style_rule(op, catalog, warnings)
+                    results[index] = OperationResult(success=True, operation_type=op.operation_type,
+                                                     message=message, warnings=warnings)
+                else:
+                    reassignments.append((index, op, self._resolve_reassignment(op, catalog)))
+
+            counts = [0] * len(reassignments)
+            default_style = catalog.default_paragraph_style()
+
+            def decide(paragraph: Dict[str, Any]) -> Optional[str]:
+                style_id = paragraph["style_id"]
+                text = None
+                for k, (_, _, (expected_style, selector, target)) in enumerate(reassignments):
+                    entry = catalog.by_id(style_id) or default_style
+                    if expected_style is not None and (entry is None or entry.NameLocal != expected_style):
+                        continue
+                    if "outline_level" in selector:
+                        level = paragraph["outline"] or catalog.outline_level(style_id)
+                        if level != selector["outline_level"]:
+                            continue
+                    if "text_contains" in selector or "text_regex" in selector:
+                        if text is None:
+                            text = paragraph["text"].strip()
+                        if "text_contains" in selector and selector["text_contains"] not in text:
+                            continue
+                        if "text_regex" in selector and not re.search(selector["text_regex"], text):
+                            continue
+                    if isinstance(target, ExecutionError):
+                        raise target
+                    style_id = target.style_id
+                    counts[k] += 1
+                return style_id if style_id != paragraph["style_id"] else None
+
+            self._write_package(source, output_path, catalog, decide)
+
+        for (index, op, (_, _, target)), count in zip(reassignments, counts):
+            if count:
+                results[index] = OperationResult(
+                    success=True, operation_type=op.operation_type,
+                    message=f"Reassigned {count} paragraph(s) to style '{target.NameLocal}'")
+            else:
+                results[index] = OperationResult(
+                    success=True, operation_type=op.operation_type,
+                    message="No matching paragraphs found (NOOP)",
+                    warnings=["NOOP: No paragraphs found matching selector criteria"])
+        return results
+
+    def apply_localization_fallbacks(self, catalog: StyleCatalog):
+        """
+        Apply font fallbacks to the fonts of existing styles.
+
+        Mirrors DocumentExecutor.apply_localization_fallbacks (Font.NameFarEast
+        is w:eastAsia, Font.Name is w:ascii/w:hAnsi).
+
+        Args:
+            catalog: Style catalog to update
+        """
+        for entry in catalog.entries:
+            fonts = catalog.child(catalog.child(entry.element, "rPr"), "rFonts")
+            if fonts is None:
+                continue
+            for local, targets in (("eastAsia", ("eastAsia",)), ("ascii", ("ascii", "hAnsi"))):
+                original = catalog.attr(fonts, local)
+                if not original:
+                    continue
+                resolved = self.localization_manager.resolve_font_name(original, catalog)
+                if resolved != original:
+                    for target in targets:
+                        fonts.setAttribute(catalog.qname(target), resolved)
+
+    def _has_page_fields(self, package: zipfile.ZipFile) -> bool:
+        with package.open(DOCUMENT_PART) as stream:
+            for _, element in ET.iterparse(stream, events=("end",)):
+                if element.tag == f"{{{W_NS}}}instrText" and _PAGE_FIELD_PATTERN.match(element.text or ""):
+                    return True
+                if element.tag == f"{{{W_NS}}}fldSimple" and _PAGE_FIELD_PATTERN.match(
+                        element.get(f"{{{W_NS}}}instr") or ""):
+                    return True
+                if element.tag == f"{{{W_NS}}}p":
+                    element.clear()
+        return False
+
+    def _resolve_reassignment(self, op: ReassignParagraphsToStyle, catalog: StyleCatalog):
+        selector = op.selector
+        target_name = self.localization_manager.resolve_style_name(op.target_style_name, catalog)
+        target = catalog.find(target_name)
+        if target is None:
+            # Like assigning an unknown style over COM, this only fails once a paragraph matches
+            target = ExecutionError(
+                f"Failed to reassign paragraphs to style: style '{target_name}' does not exist",
+                operation_type=op.operation_type,
+                operation_data=op.model_dump()
+            )
+        expected_style = None
+        if "style_name" in selector:
+            expected_style = self.localization_manager.resolve_style_name(selector["style_name"], catalog)
+        return expected_style, selector, target
+
+    def _set_style_rule(self, op: SetStyleRule, catalog: StyleCatalog, warnings: List[str]) -> str:
+        resolved_name = self.localization_manager.resolve_style_name(op.target_style_name, catalog)
+        entry = catalog.find(resolved_name)
+        if entry is None:
+            entry = catalog.add_paragraph_style(resolved_name)
+            warnings.append(f"Created new style: {resolved_name}")
+
+        font = op.font
+        if font:
+            rpr = catalog.ensure_child(entry.element, "rPr", _STYLE_CHILD_ORDER)
+            if font.east_asian or font.latin:
+                fonts = catalog.ensure_child(rpr, "rFonts", _RPR_ORDER)
+                if font.east_asian:
+                    name = self.localization_manager.resolve_font_name(font.east_asian, catalog)
+                    fonts.setAttribute(catalog.qname("eastAsia"), name)
+                    catalog.remove_attrs(fonts, "eastAsiaTheme")
+                if font.latin:
+                    name = self.localization_manager.resolve_font_name(font.latin, catalog)
+                    fonts.setAttribute(catalog.qname("ascii"), name)
+                    fonts.setAttribute(catalog.qname("hAnsi"), name)
+                    catalog.remove_attrs(fonts, "asciiTheme", "hAnsiTheme")
+            if font.size_pt is not None:
+                for local in ("sz", "szCs"):
+                    catalog.set_val(catalog.ensure_child(rpr, local, _RPR_ORDER), str(int(round(font.size_pt * 2))))
+            for flag, locals_ in ((font.bold, ("b", "bCs")), (font.italic, ("i", "iCs"))):
+                if flag is not None:
+                    for local in locals_:
+                        catalog.set_val(catalog.ensure_child(rpr, local, _RPR_ORDER), "1" if flag else "0")
+            if font.color_hex:
+                color = catalog.ensure_child(rpr, "color", _RPR_ORDER)
+                catalog.set_val(color, font.color_hex.lstrip("#").upper())
+                catalog.remove_attrs(color, "themeColor", "themeShade", "themeTint")
+
+        paragraph = op.paragraph
+        if paragraph:
+            ppr = catalog.ensure_child(entry.element, "pPr", _STYLE_CHILD_ORDER)
+            spacing_values = {}
+            if paragraph.line_spacing_mode and paragraph.line_spacing_value is not None:
+                if paragraph.line_spacing_mode == LineSpacingMode.SINGLE:
+                    spacing_values.update(line="240", lineRule="auto")
+                elif paragraph.line_spacing_mode == LineSpacingMode.MULTIPLE:
+                    spacing_values.update(line=_twips(paragraph.line_spacing_value), lineRule="auto")
+                elif paragraph.line_spacing_mode == LineSpacingMode.EXACTLY:
+                    spacing_values.update(line=_twips(paragraph.line_spacing_value), lineRule="exact")
+            if paragraph.space_before_pt is not None:
+                spacing_values["before"] = _twips(paragraph.space_before_pt)
+            if paragraph.space_after_pt is not None:
+                spacing_values["after"] = _twips(paragraph.space_after_pt)
+            if spacing_values:
+                spacing = catalog.ensure_child(ppr, "spacing", _PPR_ORDER)
+                for name, value in spacing_values.items():
+                    spacing.setAttribute(catalog.qname(name), value)
+                # Line-unit and auto spacing take precedence over point values
+                if "before" in spacing_values:
+                    catalog.remove_attrs(spacing, "beforeLines", "beforeAutospacing")
+                if "after" in spacing_values:
+                    catalog.remove_attrs(spacing, "afterLines", "afterAutospacing")
+
+            indent_values = {}
+            if paragraph.indent_left_pt is not None:
+                indent_values["left"] = _twips(paragraph.indent_left_pt)
+            if paragraph.indent_right_pt is not None:
+                indent_values["right"] = _twips(paragraph.indent_right_pt)
+            if indent_values or paragraph.indent_first_line_pt is not None:
+                ind = catalog.ensure_child(ppr, "ind", _PPR_ORDER)
+                for name, value in indent_values.items():
+                    ind.setAttribute(catalog.qname(name), value)
+                if "left" in indent_values:
+                    catalog.remove_attrs(ind, "start", "leftChars", "startChars")
+                if "right" in indent_values:
+                    catalog.remove_attrs(ind, "end", "rightChars", "endChars")
+                first_line = paragraph.indent_first_line_pt
+                if first_line is not None:
+                    catalog.remove_attrs(ind, "firstLine", "hanging", "firstLineChars", "hangingChars")
+                    if first_line >= 0:
+                        ind.setAttribute(catalog.qname("firstLine"), _twips(first_line))
+                    else:
+                        ind.setAttribute(catalog.qname("hanging"), _twips(-first_line))
+
+        return f"Style rule applied to '{resolved_name}'"
+
+    def _write_package(self, source: zipfile.ZipFile, output_path: str, catalog: StyleCatalog, decide):
+        """Copy the package, replacing styles.xml and streaming document.xml."""
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, temp_path = tempfile.mkstemp(suffix=".docx", dir=directory)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_DEFLATED) as target:
+                for item in source.infolist():
+                    if item.filename == STYLES_PART:
+                        target.writestr(item, catalog.to_xml(), compress_type=zipfile.ZIP_DEFLATED)
+                    elif item.filename == DOCUMENT_PART:
+                        with source.open(item) as reader, target.open(item.filename, "w") as writer:
+                            parser = xml.sax.make_parser()
+                            parser.setFeature(feature_namespaces, False)
+                            parser.setFeature(feature_external_ges, False)
+                            parser.setContentHandler(_ParagraphRewriter(writer, decide))
+                            parser.parse(reader)
+                    else:
+                        with source.open(item) as reader, target.open(item, "w") as writer:
+                            shutil.copyfileobj(reader, writer)
+            os.replace(temp_path, output_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -0,0 +1,313 @@
+"""
+Plan optimizer for DocumentExecutor.
+
+Plans are executed strictly in order, and every operation pays for its own
+full pass over the document through COM. This module rewrites a PlanV1 into
+an equivalent, cheaper sequence of execution steps before it reaches Word:
+
+- SetStyleRule operations on the same style are merged into one rule
+- successive ReassignParagraphsToStyle operations are fused into a single
+  paragraph sweep (FusedReassignment)
+- UpdateToc operations whose result is overwritten before anything reads it
+  (a later UpdateToc or DeleteToc(mode="all")) are eliminated
+- DeleteSectionByHeading operations followed by a higher-level delete are
+  marked so the executor can skip them when the later delete removes the
+  whole section anyway (checked against the live document)
+
+Everything the optimizer did is recorded in a PlanOptimizationReport.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from ..models import (
+    PlanV1, AtomicOperationUnion, DeleteSectionByHeading, UpdateToc, DeleteToc,
+    SetStyleRule, ReassignParagraphsToStyle, FontSpec, ParagraphSpec
+)
+from ..localization import LocalizationManager
+
+
+# Font fields applied only when truthy; the others are applied when not None
+_TRUTHY_FONT_FIELDS = {"east_asian", "latin", "color_hex"}
+
+# Operation types that modify fields directly
+FIELD_OPERATION_TYPES = {"update_toc", "delete_toc", "delete_section_by_heading"}
+
+
+def _style_alias_groups() -> Dict[str, str]:
+    groups = {}
+    for english, localized in LocalizationManager.STYLE_ALIASES.items():
+        groups[english.lower()] = localized.lower()
+        groups[localized.lower()] = localized.lower()
+    return groups
+
+
+_STYLE_ALIAS_GROUPS = _style_alias_groups()
+
+
+def style_key(style_name: str) -> str:
+    """
+    Return a key shared by all names that may resolve to the same Word style.
+
+    Style names are resolved against the live document (aliases, then
+    case-insensitive matching), so names are grouped conservatively.
+    """
+    name = style_name.strip().lower()
+    return _STYLE_ALIAS_GROUPS.get(name, name)
+
+
+def operation_touches_fields(operation: Any) -> bool:
+    """Whether an operation changes field results (TOC, page references)."""
+    return getattr(operation, 'operation_type', None) in FIELD_OPERATION_TYPES
+
+
+def operation_affects_layout(operation: Any) -> bool:
+    """Whether an operation can change pagination."""
+    if isinstance(operation, SetStyleRule):
+        # Colour changes are the only style changes that never reflow text
+        if operation.paragraph is not None:
+            return True
+        if operation.font is None:
+            return False
+        font = operation.font.model_dump(exclude={"color_hex"})
+        return any(_font_field_applies(name, value) for name, value in font.items())
+    return True
+
+
+def _font_field_applies(name: str, value: Any) -> bool:
+    return bool(value) if name in _TRUTHY_FONT_FIELDS else value is not None
+
+
+def _line_spacing_applies(spec: Optional[ParagraphSpec]) -> bool:
+    return bool(spec and spec.line_spacing_mode and spec.line_spacing_value is not None)
+
+
+def can_merge_style_rules(first: SetStyleRule, second: SetStyleRule) -> bool:
+    """
+    Whether second can be folded into first without changing the result.
+
+    Line spacing rule and value are applied together, so two rules that set
+    different line spacing modes are kept apart.
+    """
+    if first.target_style_name != second.target_style_name:
+        return False
+    if _line_spacing_applies(first.paragraph) and _line_spacing_applies(second.paragraph):
+        return first.paragraph.line_spacing_mode == second.paragraph.line_spacing_mode
+    return True
+
+
+def merge_style_rules(first: SetStyleRule, second: SetStyleRule) -> SetStyleRule:
+    """
+    Merge two SetStyleRule operations on the same style.
+
+    Every property the second rule would apply overrides the first; properties
+    it leaves unset keep the value from the first rule.
+    """
+    font = first.font
+    if second.font is not None:
+        merged = first.font.model_dump() if first.font else {}
+        for name, value in second.font.model_dump().items():
+            if _font_field_applies(name, value):
+                merged[name] = value
+        font = FontSpec(**merged)
+
+    paragraph = first.paragraph
+    if second.paragraph is not None:
+        merged = first.paragraph.model_dump() if first.paragraph else {}
+        update = second.paragraph.model_dump()
+        if _line_spacing_applies(second.paragraph):
+            merged["line_spacing_mode"] = update["line_spacing_mode"]
+            merged["line_spacing_value"] = update["line_spacing_value"]
+        for name, value in update.items():
+            if name not in ("line_spacing_mode", "line_spacing_value") and value is not None:
+                merged[name] = value
+        paragraph = ParagraphSpec(**merged)
+
+    return SetStyleRule(target_style_name=first.target_style_name, font=font, paragraph=paragraph)
+
+
+@dataclass
+class FusedReassignment:
+    """Successive reassign operations executed in one paragraph sweep."""
+    operations: List[ReassignParagraphsToStyle]
+    operation_type: str = "fused_reassign_paragraphs_to_style"
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {
+            "operation_type": self.operation_type,
+            "ops": [op.model_dump() for op in self.operations]
+        }
+
+
+ExecutionStep = Union[AtomicOperationUnion, FusedReassignment]
+
+
+@dataclass
+class PlanOptimizationReport:
+    """What the optimizer and executor changed relative to the original plan."""
+    original_operation_count: int = 0
+    step_count: int = 0
+    merged_style_rules: List[Dict[str, Any]] = field(default_factory=list)
+    fused_reassignments: List[Dict[str, Any]] = field(default_factory=list)
+    eliminated_operations: List[Dict[str, Any]] = field(default_factory=list)
+    field_update_skipped: bool = False
+    repagination_skipped: bool = False
+
+    def record_elimination(self, op_index: int, operation: Any, reason: str):
+        """Record an operation that was not executed."""
+        self.eliminated_operations.append({
+            "op_index": op_index,
+            "operation_type": operation.operation_type,
+            "reason": reason
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "original_operation_count": self.original_operation_count,
+            "step_count": self.step_count,
+            "merged_style_rules": self.merged_style_rules,
+            "fused_reassignments": self.fused_reassignments,
+            "eliminated_operations": self.eliminated_operations,
+            "field_update_skipped": self.field_update_skipped,
+            "repagination_skipped": self.repagination_skipped
+        }
+
+    def summary(self) -> str:
+        return (f"{self.original_operation_count} ops -> {self.step_count} steps "
+                f"({len(self.merged_style_rules)} style merges, "
+                f"{len(self.fused_reassignments)} reassign fusions, "
+                f"{len(self.eliminated_operations)} eliminated)")
+
+
+@dataclass
+class OptimizedPlan:
+    """Execution steps produced from a PlanV1."""
+    steps: List[ExecutionStep]
+    step_op_indexes: List[List[int]]
+    report: PlanOptimizationReport
+    # step index -> later higher-level delete that may supersede the step
+    superseding_deletes: Dict[int, DeleteSectionByHeading] = field(default_factory=dict)
+    optimized: bool = True
+
+
+class PlanOptimizer:
+    """Rewrite plans into equivalent, cheaper execution steps."""
+
+    def optimize(self, plan: PlanV1) -> OptimizedPlan:
+        """
+        Optimize a plan.
+
+        Args:
+            plan: Plan to optimize
+
+        Returns:
+            OptimizedPlan: Execution steps, original op indexes and report
+        """
+        report = PlanOptimizationReport(original_operation_count=len(plan.ops))
+        entries = [([i], op) for i, op in enumerate(plan.ops)]
+
+        entries = self._eliminate_dead_toc_updates(entries, report)
+        entries = self._merge_style_rules(entries, report)
+        entries = self._fuse_reassignments(entries, report)
+
+        steps = [op for _, op in entries]
+        optimized = OptimizedPlan(
+            steps=steps,
+            step_op_indexes=[indexes for indexes, _ in entries],
+            report=report,
+            superseding_deletes=self._find_superseding_deletes(steps)
+        )
+        report.step_count = len(steps)
+        return optimized
+
+    @staticmethod
+    def passthrough(plan: PlanV1) -> OptimizedPlan:
+        """Return the plan unchanged as execution steps."""
+        report = PlanOptimizationReport(original_operation_count=len(plan.ops), step_count=len(plan.ops))
+        return OptimizedPlan(
+            steps=list(plan.ops),
+            step_op_indexes=[[i] for i in range(len(plan.ops))],
+            report=report,
+            optimized=False
+        )
+
+    def _eliminate_dead_toc_updates(self, entries, report: PlanOptimizationReport):
+        result = []
+        for position, (indexes, op) in enumerate(entries):
+            if isinstance(op, UpdateToc):
+                # Dead if the TOC is rewritten or removed before anything reads it
+                for _, later in entries[position + 1:]:
+                    if isinstance(later, SetStyleRule):
+                        continue
+                    if isinstance(later, UpdateToc) or (isinstance(later, DeleteToc) and later.mode == "all"):
+                        report.record_elimination(indexes[0], op, f"superseded by later {later.operation_type}")
+                        break
+                    result.append((indexes, op))
+                    break
+                else:
+                    result.append((indexes, op))
+                continue
+            result.append((indexes, op))
+        return result
+
+    def _merge_style_rules(self, entries, report: PlanOptimizationReport):
+        result = []
+        open_rules: Dict[str, int] = {}
+        for indexes, op in entries:
+            if not isinstance(op, SetStyleRule):
+                result.append((indexes, op))
+                continue
+
+            key = style_key(op.target_style_name)
+            position = open_rules.get(key)
+            if position is not None and can_merge_style_rules(result[position][1], op):
+                target_indexes, target = result[position]
+                result[position] = (target_indexes + indexes, merge_style_rules(target, op))
+                continue
+
+            # Rules on possibly-aliased names stay ordered: start a new merge target
+            open_rules[key] = len(result)
+            result.append((list(indexes), op))
+
+        for indexes, op in result:
+            if isinstance(op, SetStyleRule) and len(indexes) > 1:
+                report.merged_style_rules.append({"style": op.target_style_name, "op_indexes": indexes})
+        return result
+
+    def _fuse_reassignments(self, entries, report: PlanOptimizationReport):
+        result = []
+        run: List = []
+
+        def flush():
+            if len(run) > 1:
+                indexes = [i for run_indexes, _ in run for i in run_indexes]
+                result.append((indexes, FusedReassignment([op for _, op in run])))
+                report.fused_reassignments.append({
+                    "op_indexes": indexes,
+                    "target_styles": [op.target_style_name for _, op in run]
+                })
+            else:
+                result.extend(run)
+            run.clear()
+
+        for indexes, op in entries:
+            if isinstance(op, ReassignParagraphsToStyle):
+                run.append((indexes, op))
+            else:
+                flush()
+                result.append((indexes, op))
+        flush()
+        return result
+
+    def _find_superseding_deletes(self, steps: List[ExecutionStep]) -> Dict[int, DeleteSectionByHeading]:
+        superseding = {}
+        for position, step in enumerate(steps):
+            if not isinstance(step, DeleteSectionByHeading):
+                continue
+            for later in steps[position + 1:]:
+                if isinstance(later, SetStyleRule):
+                    continue
+                if isinstance(later, DeleteSectionByHeading) and later.level < step.level:
+                    superseding[position] = later
+                break
+        return superseding
@@ -17,6 +17,7 @@ import pythoncom
 import win32com.client as win32
 from win32com.client import constants as win32_constants
 
+from ...core.paragraph_table import ParagraphTable, load_paragraph_table
 from ..models import (
     StructureV1, InventoryFullV1, DocumentMetadata, StyleDefinition, 
     ParagraphSkeleton, HeadingReference, FieldReference, TableSkeleton,
@@ -25,6 +26,7 @@ from ..models import (
     CrossReference, StyleType, LineSpacingMode
 )
 from ..exceptions import ExtractionError
+from ..watchdog import ComWatchdog, com_deadline
 
 
 logger = logging.getLogger(__name__)
@@ -33,16 +35,21 @@ logger = logging.getLogger(__name__)
 class DocumentExtractor:
     """Extract document structure and inventory with zero information loss."""
     
-    def __init__(self, visible: bool = False):
+    def __init__(self, visible: bool = False, watchdog: Optional[ComWatchdog] = None):
         """
         Initialize document extractor.
         
         Args:
             visible: Whether to show Word application window
+            watchdog: Puts Word startup and Documents.Open under operation
+                deadlines and kills this Word instance when one expires
         """
         self.visible = visible
+        self.watchdog = watchdog
         self._word_app = None
+        self._word_pid: Optional[int] = None
         self._com_initialized = False
+        self._paragraph_table: Optional[ParagraphTable] = None
     
     def __enter__(self):
         """Enter context manager for COM resource management."""
@@ -53,10 +60,13 @@ class DocumentExtractor:
             logger.debug("COM initialized for extraction")
             
             # Create Word application instance
-            self._word_app = win32.gencache.EnsureDispatch('Word.Application')
-            self._word_app.Visible = self.visible
-            self._word_app.DisplayAlerts = 0  # Disable alerts
-            self._word_app.ScreenUpdating = False  # Improve performance
+            with com_deadline(self.watchdog, "Word.Application"):
+                self._word_app = win32.gencache.EnsureDispatch('Word.Application')
+                if self.watchdog is not None:
+                    self._word_pid = self.watchdog.attach_word_app(self._word_app)
+                self._word_app.Visible = self.visible
+                self._word_app.DisplayAlerts = 0  # Disable alerts
+                self._word_app.ScreenUpdating = False  # Improve performance
             
             logger.info(f"Word application started for extraction (visible={self.visible})")
             return self
@@ -77,6 +87,10 @@ class DocumentExtractor:
                 self._word_app.DisplayAlerts = -1
                 self._word_app.Quit(SaveChanges=0)
                 self._word_app = None
+                if self.watchdog is not None:
+                    # The PID may be reused once Word has exited
+                    self.watchdog.detach_process(self._word_pid)
+                self._word_pid = None
                 logger.info("Word application closed after extraction")
         except Exception as e:
             logger.warning(f"Error during Word cleanup: {e}")
@@ -110,9 +124,13 @@ class DocumentExtractor:
             logger.info(f"Extracting structure from: {docx_path}")
             
             # Open document
-            doc = self._word_app.Documents.Open(docx_path, ReadOnly=True)
+            with com_deadline(self.watchdog, "Documents.Open"):
+                doc = self._word_app.Documents.Open(docx_path, ReadOnly=True)
             
             try:
+                # Read paragraph text, styles, outline levels and offsets in one call
+                self._paragraph_table = load_paragraph_table(doc)
+                
                 # Extract metadata
                 metadata = self._extract_metadata(doc)
                 
@@ -145,6 +163,7 @@ class DocumentExtractor:
                 return structure
                 
             finally:
+                self._paragraph_table = None
                 doc.Close(SaveChanges=0)
                 
         except Exception as e:
@@ -182,9 +201,13 @@ class DocumentExtractor:
             media_indexes = self._extract_media_indexes(docx_path)
             
             # Open document for COM-based extraction
-            doc = self._word_app.Documents.Open(docx_path, ReadOnly=True)
+            with com_deadline(self.watchdog, "Documents.Open"):
+                doc = self._word_app.Documents.Open(docx_path, ReadOnly=True)
             
             try:
+                # Paragraph offsets for locating objects without scanning paragraphs
+                self._paragraph_table = load_paragraph_table(doc)
+                
                 # Extract content controls
                 content_controls = self._extract_content_controls(doc)
                 
@@ -221,6 +244,7 @@ class DocumentExtractor:
                 return inventory
                 
             finally:
+                self._paragraph_table = None
                 doc.Close(SaveChanges=0)
                 
         except Exception as e:
@@ -454,12 +478,17 @@ class DocumentExtractor:
         """Extract paragraph skeletons with preview text only."""
         paragraphs = []
         
+        table = self._paragraph_table
+        if table is not None:
+            for row in table:
+                paragraphs.append(self._paragraph_skeleton(row.index, row.range_text, row.style_name,
+                                                           row.outline_level))
+            return paragraphs
+        
         try:
             for i, para in enumerate(doc.Paragraphs):
                 try:
-                    # Get paragraph text and truncate to 120 characters
-                    text = para.Range.Text.strip()
-                    preview_text = text[:120] if len(text) > 120 else text
+                    text = para.Range.Text
                     
                     # Get style name
                     style_name = None
@@ -468,36 +497,13 @@ class DocumentExtractor:
                     except:
                         pass
                     
-                    # Check if it's a heading
-                    is_heading = False
-                    heading_level = None
-                    
+                    outline_level = None
                     try:
-                        if para.OutlineLevel != 10:  # wdOutlineLevelBodyText
-                            is_heading = True
-                            heading_level = para.OutlineLevel
+                        outline_level = para.OutlineLevel
                     except:
                         pass
                     
-                    # Alternative heading detection by style name
-                    if not is_heading and style_name:
-                        if any(heading_name in style_name.lower() for heading_name in ['heading', '标题']):
-                            is_heading = True
-                            # Try to extract level from style name
-                            for level in range(1, 10):
-                                if str(level) in style_name:
-                                    heading_level = level
-                                    break
-                    
-                    paragraph = ParagraphSkeleton(
-                        index=i,
-                        style_name=style_name,
-                        preview_text=preview_text,
-                        is_heading=is_heading,
-                        heading_level=heading_level
-                    )
-                    
-                    paragraphs.append(paragraph)
+                    paragraphs.append(self._paragraph_skeleton(i, text, style_name, outline_level))
                     
                 except Exception as e:
                     logger.warning(f"Failed to extract paragraph {i}: {e}")
@@ -508,6 +514,59 @@ class DocumentExtractor:
         
         return paragraphs
     
+    def _paragraph_skeleton(self, index: int, text: str, style_name: Optional[str],
+                            outline_level: Optional[int]) -> ParagraphSkeleton:
+        """Build a paragraph skeleton from Range.Text, Style.NameLocal and OutlineLevel."""
+        # Truncate text to 120 characters
+        text = text.strip()
+        preview_text = text[:120] if len(text) > 120 else text
+        
+        # Check if it's a heading
+        is_heading = False
+        heading_level = None
+        if outline_level is not None and outline_level != 10:  # wdOutlineLevelBodyText
+            is_heading = True
+            heading_level = outline_level
+        
+        # Alternative heading detection by style name
+        if not is_heading and style_name:
+            if any(heading_name in style_name.lower() for heading_name in ['heading', '标题']):
+                is_heading = True
+                # Try to extract level from style name
+                for level in range(1, 10):
+                    if str(level) in style_name:
+                        heading_level = level
+                        break
+        
+        return ParagraphSkeleton(
+            index=index,
+            style_name=style_name,
+            preview_text=preview_text,
+            is_heading=is_heading,
+            heading_level=heading_level
+        )
+    
+    def _paragraph_index(self, doc, position: int, default: Optional[int] = 0) -> Optional[int]:
+        """
+        Find the first paragraph whose range contains a position.
+        
+        Args:
+            doc: Word document COM object
+            position: Character position (Range.Start)
+            default: Value returned if no paragraph contains the position
+            
+        Returns:
+            Optional[int]: Index of the first paragraph with Start <= position <= End
+        """
+        table = self._paragraph_table
+        if table is not None and table.offsets_verified:
+            row = table.paragraph_at(position, include_end=True)
+            return row.index if row is not None else default
+        for i, para in enumerate(doc.Paragraphs):
+            if para.Range.Start <= position <= para.Range.End:
+                return i
+        return default
+    
     def _extract_headings(self, doc, paragraphs: List[ParagraphSkeleton]) -> List[HeadingReference]:
         """Extract heading references from paragraphs."""
         headings = []
@@ -538,13 +597,18 @@ class DocumentExtractor:
                     # Find the paragraph containing this field
                     paragraph_index = 0
                     try:
-                        # Get the paragraph containing the field
-                        field_para = field.Range.Paragraphs(1)
-                        # Find the index of this paragraph in the document
-                        for i, para in enumerate(doc.Paragraphs):
-                            if para.Range.Start == field_para.Range.Start:
-                                paragraph_index = i
-                                break
+                        table = self._paragraph_table
+                        if table is not None and table.offsets_verified:
+                            row = table.paragraph_at(field.Range.Start)
+                            paragraph_index = row.index if row is not None else 0
+                        else:
+                            # Get the paragraph containing the field
+                            field_para = field.Range.Paragraphs(1)
+                            # Find the index of this paragraph in the document
+                            for i, para in enumerate(doc.Paragraphs):
+                                if para.Range.Start == field_para.Range.Start:
+                                    paragraph_index = i
+                                    break
                     except:
                         pass
                     
@@ -593,6 +657,9 @@ class DocumentExtractor:
     def _extract_tables(self, doc) -> List[TableSkeleton]:
         """Extract table skeletons with basic structure."""
         tables = []
+        paragraph_table = self._paragraph_table
+        if paragraph_table is not None and not paragraph_table.offsets_verified:
+            paragraph_table = None
         
         try:
             for table in doc.Tables:
@@ -601,10 +668,15 @@ class DocumentExtractor:
                     paragraph_index = 0
                     try:
                         table_range = table.Range
-                        for i, para in enumerate(doc.Paragraphs):
-                            if para.Range.Start >= table_range.Start and para.Range.End <= table_range.End:
-                                paragraph_index = i
-                                break
+                        if paragraph_table is not None:
+                            rows_in_table = paragraph_table.paragraphs_in(table_range.Start, table_range.End)
+                            if rows_in_table:
+                                paragraph_index = rows_in_table[0].index
+                        else:
+                            for i, para in enumerate(doc.Paragraphs):
+                                if para.Range.Start >= table_range.Start and para.Range.End <= table_range.End:
+                                    paragraph_index = i
+                                    break
                     except:
                         pass
                     
@@ -634,14 +706,21 @@ class DocumentExtractor:
                                     cell_paragraphs = []
                                     
                                     # Find all paragraphs in this cell
-                                    for para in cell.Range.Paragraphs:
-                                        for i, doc_para in enumerate(doc.Paragraphs):
-                                            if (doc_para.Range.Start <= para.Range.Start and 
-                                                doc_para.Range.End >= para.Range.End):
-                                                cell_paragraphs.append(i)
-                                                if i not in cell_references:
-                                                    cell_references.append(i)
-                                                break
+                                    if paragraph_table is not None:
+                                        cell_range = cell.Range
+                                        for row in paragraph_table.paragraphs_in(cell_range.Start, cell_range.End):
+                                            cell_paragraphs.append(row.index)
+                                            if row.index not in cell_references:
+                                                cell_references.append(row.index)
+                                    else:
+                                        for para in cell.Range.Paragraphs:
+                                            for i, doc_para in enumerate(doc.Paragraphs):
+                                                if (doc_para.Range.Start <= para.Range.Start and 
+                                                    doc_para.Range.End >= para.Range.End):
+                                                    cell_paragraphs.append(i)
+                                                    if i not in cell_references:
+                                                        cell_references.append(i)
+                                                    break
                                     
                                     if cell_paragraphs:
                                         cell_paragraph_map[f"{row_idx},{col_idx}"] = cell_paragraphs
@@ -850,10 +929,7 @@ class DocumentExtractor:
                     paragraph_index = 0
                     try:
                         cc_range = cc.Range
-                        for i, para in enumerate(doc.Paragraphs):
-                            if para.Range.Start <= cc_range.Start <= para.Range.End:
-                                paragraph_index = i
-                                break
+                        paragraph_index = self._paragraph_index(doc, cc_range.Start, paragraph_index)
                     except:
                         pass
                     
@@ -909,10 +985,7 @@ class DocumentExtractor:
                         paragraph_index = 0
                         try:
                             shape_range = shape.Range
-                            for i, para in enumerate(doc.Paragraphs):
-                                if para.Range.Start <= shape_range.Start <= para.Range.End:
-                                    paragraph_index = i
-                                    break
+                            paragraph_index = self._paragraph_index(doc, shape_range.Start, paragraph_index)
                         except:
                             pass
                         
@@ -965,10 +1038,7 @@ class DocumentExtractor:
                         paragraph_index = 0
                         try:
                             math_range = range_obj.Range
-                            for i, para in enumerate(doc.Paragraphs):
-                                if para.Range.Start <= math_range.Start <= para.Range.End:
-                                    paragraph_index = i
-                                    break
+                            paragraph_index = self._paragraph_index(doc, math_range.Start, paragraph_index)
                         except:
                             pass
                         
@@ -1068,10 +1138,7 @@ class DocumentExtractor:
                         paragraph_index = 0
                         try:
                             shape_range = shape.Range
-                            for i, para in enumerate(doc.Paragraphs):
-                                if para.Range.Start <= shape_range.Start <= para.Range.End:
-                                    paragraph_index = i
-                                    break
+                            paragraph_index = self._paragraph_index(doc, shape_range.Start, paragraph_index)
                         except:
                             pass
                         
@@ -1131,10 +1198,7 @@ class DocumentExtractor:
                             try:
                                 if hasattr(shape, 'Anchor'):
                                     anchor_range = shape.Anchor
-                                    for i, para in enumerate(doc.Paragraphs):
-                                        if para.Range.Start <= anchor_range.Start <= para.Range.End:
-                                            paragraph_index = i
-                                            break
+                                    paragraph_index = self._paragraph_index(doc, anchor_range.Start, paragraph_index)
                             except:
                                 pass
                             
@@ -1179,10 +1243,7 @@ class DocumentExtractor:
                     paragraph_index = 0
                     try:
                         footnote_range = footnote.Reference
-                        for i, para in enumerate(doc.Paragraphs):
-                            if para.Range.Start <= footnote_range.Start <= para.Range.End:
-                                paragraph_index = i
-                                break
+                        paragraph_index = self._paragraph_index(doc, footnote_range.Start, paragraph_index)
                     except:
                         pass
                     
@@ -1228,10 +1289,7 @@ class DocumentExtractor:
                     paragraph_index = 0
                     try:
                         endnote_range = endnote.Reference
-                        for i, para in enumerate(doc.Paragraphs):
-                            if para.Range.Start <= endnote_range.Start <= para.Range.End:
-                                paragraph_index = i
-                                break
+                        paragraph_index = self._paragraph_index(doc, endnote_range.Start, paragraph_index)
                     except:
                         pass
                     
@@ -1279,10 +1337,7 @@ class DocumentExtractor:
                         source_paragraph_index = 0
                         try:
                             field_range = field.Range
-                            for i, para in enumerate(doc.Paragraphs):
-                                if para.Range.Start <= field_range.Start <= para.Range.End:
-                                    source_paragraph_index = i
-                                    break
+                            source_paragraph_index = self._paragraph_index(doc, field_range.Start, source_paragraph_index)
                         except:
                             pass
                         
@@ -1328,10 +1383,7 @@ class DocumentExtractor:
                                 for bookmark in doc.Bookmarks:
                                     if bookmark.Name == target_id:
                                         bookmark_range = bookmark.Range
-                                        for i, para in enumerate(doc.Paragraphs):
-                                            if para.Range.Start <= bookmark_range.Start <= para.Range.End:
-                                                target_paragraph_index = i
-                                                break
+                                        target_paragraph_index = self._paragraph_index(doc, bookmark_range.Start, target_paragraph_index)
                                         break
                             except:
                                 pass
@@ -1358,10 +1410,7 @@ class DocumentExtractor:
                         source_paragraph_index = 0
                         try:
                             hyperlink_range = hyperlink.Range
-                            for i, para in enumerate(doc.Paragraphs):
-                                if para.Range.Start <= hyperlink_range.Start <= para.Range.End:
-                                    source_paragraph_index = i
-                                    break
+                            source_paragraph_index = self._paragraph_index(doc, hyperlink_range.Start, source_paragraph_index)
                         except:
                             pass
                         
@@ -1382,10 +1431,7 @@ class DocumentExtractor:
                                 for bookmark in doc.Bookmarks:
                                     if bookmark.Name == target_id:
                                         bookmark_range = bookmark.Range
-                                        for i, para in enumerate(doc.Paragraphs):
-                                            if para.Range.Start <= bookmark_range.Start <= para.Range.End:
-                                                target_paragraph_index = i
-                                                break
+                                        target_paragraph_index = self._paragraph_index(doc, bookmark_range.Start, target_paragraph_index)
                                         break
                             except:
                                 pass
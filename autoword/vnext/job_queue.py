@@ -0,0 +1,217 @@
+"""
+Persistent job queue for the vNext processing service.
+
+Jobs (a DOCX path and a user intent) are stored in a local SQLite database,
+so submissions survive service restarts and several processes on the same
+machine can submit to and work from one queue. Workers claim the queued job
+with the highest priority (oldest first within a priority) in a single
+write transaction, record the run audit directory as soon as the run starts
+and keep the ProcessingResult of the run. Jobs left RUNNING by a service that
+died are requeued on startup and continue from their run checkpoints.
+"""
+
+import json
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .models import ProcessingResult
+
+
+SCHEMA_VERSION = 1
+
+# Job states before a ProcessingResult status is recorded
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+CANCELLED = "CANCELLED"
+
+# Job finished without a pipeline result (the worker raised)
+ERROR = "ERROR"
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    docx_path TEXT NOT NULL,
+    user_intent TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    submitted_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    audit_directory TEXT,
+    result_json TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, priority DESC, seq);
+"""
+
+_COLUMNS = ("job_id", "docx_path", "user_intent", "priority", "status", "submitted_at", "started_at",
+            "finished_at", "worker", "attempts", "audit_directory", "error")
+
+
+class JobQueue:
+    """SQLite-backed priority queue of processing jobs."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Open or create a job queue.
+
+        Args:
+            db_path: SQLite database path (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            # executescript() manages its own transaction
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _connect(self):
+        # isolation_level=None: transactions are opened explicitly, so a claim
+        # can take the write lock before reading the next job
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _job(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = {column: row[column] for column in _COLUMNS}
+        job["result"] = json.loads(row["result_json"]) if row["result_json"] else None
+        return job
+
+    def submit(self, docx_path: Union[str, Path], user_intent: str, priority: int = 0) -> Dict[str, Any]:
+        """
+        Queue a document for processing.
+
+        Args:
+            docx_path: Input DOCX path (stored as absolute path)
+            user_intent: User intent for planning
+            priority: Higher priorities are processed first
+
+        Returns:
+            Dict[str, Any]: The queued job
+        """
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, docx_path, user_intent, priority, status, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, os.path.abspath(docx_path), user_intent, int(priority), QUEUED,
+                 datetime.now().isoformat())
+            )
+            return self._job(conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone())
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Take the next queued job and mark it RUNNING.
+
+        Args:
+            worker: Name of the claiming worker
+
+        Returns:
+            Optional[Dict[str, Any]]: The claimed job, or None if the queue is empty
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT seq FROM jobs WHERE status = ? ORDER BY priority DESC, seq LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, worker = ?, attempts = attempts + 1 WHERE seq = ?",
+                (RUNNING, datetime.now().isoformat(), worker, row["seq"])
+            )
+            return self._job(conn.execute("SELECT * FROM jobs WHERE seq = ?", (row["seq"],)).fetchone())
+
+    def complete(self, job_id: str, result: ProcessingResult):
+        """Record the result of a finished job."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, audit_directory = ?, result_json = ?, error = ? "
+                "WHERE job_id = ?",
+                (result.status, datetime.now().isoformat(), result.audit_directory,
+                 result.model_dump_json(), "; ".join(result.errors) or None, job_id)
+            )
+
+    def fail(self, job_id: str, error: str):
+        """Record a job whose worker failed without a pipeline result."""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE job_id = ?",
+                         (ERROR, datetime.now().isoformat(), error, job_id))
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job that has not started yet.
+
+        Returns:
+            bool: True if the job was cancelled
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ? AND status = ?",
+                                  (CANCELLED, datetime.now().isoformat(), job_id, QUEUED))
+            return cursor.rowcount == 1
+
+    def set_audit_directory(self, job_id: str, audit_directory: str):
+        """Record the run directory of a running job, so it can be resumed after a crash."""
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET audit_directory = ? WHERE job_id = ?", (audit_directory, job_id))
+
+    def requeue_running(self) -> int:
+        """
+        Requeue jobs left RUNNING by a service that stopped without finishing them.
+
+        Only call this when no other service works from the same queue.
+
+        Returns:
+            int: Number of requeued jobs
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("UPDATE jobs SET status = ?, worker = NULL WHERE status = ?", (QUEUED, RUNNING))
+            return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            return self._job(conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone())
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recently submitted jobs, optionally with one status."""
+        query = "SELECT * FROM jobs"
+        params: List[Any] = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY seq DESC LIMIT ?"
+        params.append(int(limit))
+        with self._connect() as conn:
+            return [self._job(row) for row in conn.execute(query, params)]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        with self._connect() as conn:
+            return {row["status"]: row["count"]
+                    for row in conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")}
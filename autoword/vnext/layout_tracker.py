@@ -0,0 +1,169 @@
+"""
+Layout dependency tracking for deferred field updates and repagination.
+
+Full repagination is one of the slowest Word operations. Instead of having the
+executor and the validator both run Fields.Update() and Repaginate(), the
+executor records what its operations made stale (field results, layout) and
+the validator refreshes the document once, only as far as the enabled
+assertions require:
+
+- field updates are scoped to page-dependent fields (TOC, PAGEREF)
+- repagination only runs when layout changed and an assertion reads page
+  numbers (pagination checks)
+
+Every decision is kept on the tracker so the pipeline can write it to the
+audit trail.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+
+logger = logging.getLogger(__name__)
+
+
+# Word field type constants (WdFieldType)
+WD_FIELD_TOC = 13
+WD_FIELD_PAGE_REF = 37
+
+PAGE_DEPENDENT_FIELD_TYPES = {
+    WD_FIELD_TOC: "TOC",
+    WD_FIELD_PAGE_REF: "PAGEREF",
+}
+
+# What each validator assertion reads from the document layout:
+# "fields" - current TOC/PAGEREF results, "pages" - up-to-date pagination
+ASSERTION_LAYOUT_DEPENDENCIES = {
+    "chapter": frozenset(),
+    "style": frozenset(),
+    "toc": frozenset({"fields"}),
+    "pagination": frozenset({"fields", "pages"}),
+}
+
+
+@dataclass
+class RefreshDecision:
+    """Whether to update page-dependent fields and/or repaginate, and why."""
+    update_fields: bool
+    repaginate: bool
+    reason: str
+
+    @property
+    def is_noop(self) -> bool:
+        return not (self.update_fields or self.repaginate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "update_fields": self.update_fields,
+            "repaginate": self.repaginate,
+            "reason": self.reason
+        }
+
+
+class LayoutDependencyTracker:
+    """Track stale field results and layout between executor and validator."""
+
+    def __init__(self):
+        self.fields_dirty = False
+        self.layout_dirty = False
+        self.field_sources: List[str] = []
+        self.layout_sources: List[str] = []
+        self.decisions: List[Dict[str, Any]] = []
+
+    def mark_fields_dirty(self, source: str):
+        """Record that source changed field results (TOC, page references)."""
+        self.fields_dirty = True
+        if source not in self.field_sources:
+            self.field_sources.append(source)
+
+    def mark_layout_dirty(self, source: str):
+        """Record that source changed layout, invalidating page numbers."""
+        self.layout_dirty = True
+        if source not in self.layout_sources:
+            self.layout_sources.append(source)
+
+    def plan_refresh(self, assertions: Iterable[str]) -> RefreshDecision:
+        """
+        Decide how much refreshing the given assertions need.
+
+        Args:
+            assertions: Names of the assertions about to run (unknown names are
+                treated as needing fields and pages)
+
+        Returns:
+            RefreshDecision: What to refresh and the reason
+        """
+        assertions = list(assertions)
+        if not (self.fields_dirty or self.layout_dirty):
+            return RefreshDecision(False, False, "no executed operation changed fields or layout")
+
+        needs_pages = [
+            name for name in assertions
+            if "pages" in ASSERTION_LAYOUT_DEPENDENCIES.get(name, {"fields", "pages"})
+        ]
+
+        changed_by = sorted(set(self.field_sources) | set(self.layout_sources))
+        reason = f"changed by {', '.join(changed_by)}; TOC/PAGEREF results are stale"
+        if not self.layout_dirty:
+            reason += "; layout unchanged, repagination not needed"
+            return RefreshDecision(True, False, reason)
+        if not needs_pages:
+            reason += "; no enabled assertion reads page numbers, repagination skipped"
+            return RefreshDecision(True, False, reason)
+        reason += f"; page numbers needed by {', '.join(needs_pages)} assertions"
+        return RefreshDecision(True, True, reason)
+
+    def mark_refreshed(self, decision: RefreshDecision):
+        """Clear the dirty state covered by an applied refresh."""
+        if decision.update_fields:
+            self.fields_dirty = False
+        if decision.repaginate:
+            self.layout_dirty = False
+
+    def record(self, stage: str, decision: RefreshDecision, **details):
+        """Record a refresh decision for the audit trail."""
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "stage": stage,
+            **decision.to_dict(),
+            **details
+        }
+        self.decisions.append(entry)
+        logger.info(f"Layout refresh decision ({stage}): fields={decision.update_fields}, "
+                    f"repaginate={decision.repaginate} - {decision.reason}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fields_dirty": self.fields_dirty,
+            "layout_dirty": self.layout_dirty,
+            "field_sources": list(self.field_sources),
+            "layout_sources": list(self.layout_sources),
+            "decisions": list(self.decisions)
+        }
+
+
+def refresh_page_dependent_fields(doc: object, decision: RefreshDecision) -> Dict[str, int]:
+    """
+    Apply a refresh decision to an open Word document.
+
+    Only TOC and PAGEREF fields are updated; other fields keep their results.
+
+    Args:
+        doc: Word document COM object
+        decision: Refresh decision to apply
+
+    Returns:
+        Dict[str, int]: Number of updated fields per field type
+    """
+    updated = {name: 0 for name in PAGE_DEPENDENT_FIELD_TYPES.values()}
+    if decision.update_fields:
+        for field in doc.Fields:
+            field_name = PAGE_DEPENDENT_FIELD_TYPES.get(field.Type)
+            if field_name:
+                field.Update()
+                updated[field_name] += 1
+    if decision.repaginate:
+        doc.Repaginate()
+    return updated
@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Set
 from pathlib import Path
 
 from .exceptions import LocalizationError
+from .log_sink import get_log_sink
 
 
 logger = logging.getLogger(__name__)
@@ -207,9 +208,10 @@ class LocalizationManager:
                 warnings_to_write.extend(additional_warnings)
                 
             if warnings_to_write:
-                with open(self.warnings_log_path, 'a', encoding='utf-8') as f:
-                    for warning in warnings_to_write:
-                        f.write(f"{warning}\n")
+                # Shared with WarningsLogger writing the same file
+                sink = get_log_sink(self.warnings_log_path)
+                sink.write_many(warnings_to_write)
+                sink.flush(raise_errors=True)
                         
                 logger.info(f"Wrote {len(warnings_to_write)} warnings to {self.warnings_log_path}")
                 
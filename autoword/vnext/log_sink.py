@@ -0,0 +1,226 @@
+"""
+Buffered log sink for warnings.log and other audit logs.
+
+Warnings used to be written by opening the log file, appending one line and
+closing it again. Font fallbacks, NOOPs and localization fallbacks can emit
+thousands of warnings per document, so writers now hand lines to a
+BufferedLogSink instead:
+
+- lines are buffered in memory and written by a background flush thread,
+  one file open per batch
+- the buffer is bounded: a writer that fills it flushes synchronously
+- flush()/close() write everything pending; sinks are also flushed at
+  interpreter exit
+- optional deduplication writes a repeated line once and appends occurrence
+  counts when the sink is closed
+
+All writers of the same file share one sink through get_log_sink(), so lines
+from WarningsLogger, LocalizationManager and DocumentAuditor keep their order.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_BUFFERED_LINES = 1000
+DEFAULT_MAX_TRACKED_KEYS = 10000
+
+
+class BufferedLogSink:
+    """Append-only line sink with background flushing."""
+
+    def __init__(self, path: str, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 max_buffered_lines: int = DEFAULT_MAX_BUFFERED_LINES,
+                 deduplicate: bool = False,
+                 max_tracked_keys: int = DEFAULT_MAX_TRACKED_KEYS):
+        """
+        Initialize log sink.
+
+        Args:
+            path: Log file path
+            flush_interval: Seconds between background flushes
+            max_buffered_lines: Pending lines that trigger a synchronous flush
+            deduplicate: Write repeated lines once and count occurrences
+            max_tracked_keys: Distinct lines tracked for deduplication; lines
+                beyond the limit are written without deduplication
+        """
+        self.path = os.path.abspath(path)
+        self.flush_interval = flush_interval
+        self.max_buffered_lines = max_buffered_lines
+        self.deduplicate = deduplicate
+        self.max_tracked_keys = max_tracked_keys
+
+        self.lines_written = 0
+        self.flush_count = 0
+        self.closed = False
+
+        self._pending: List[str] = []
+        self._occurrences: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, line: str, key: Optional[str] = None) -> bool:
+        """
+        Buffer a line for writing.
+
+        Args:
+            line: Line to write (without trailing newline)
+            key: Deduplication key; defaults to the line itself. Pass the line
+                without its timestamp so repeats are recognized.
+
+        Returns:
+            bool: False if the line was a duplicate and only counted
+        """
+        with self._lock:
+            if self.closed:
+                # Late writers after close still reach the file
+                self._pending.append(line)
+                must_flush = True
+            else:
+                if self.deduplicate and not self._count_occurrence(key if key is not None else line):
+                    return False
+                self._pending.append(line)
+                must_flush = len(self._pending) >= self.max_buffered_lines
+                self._ensure_flush_thread()
+
+        if must_flush:
+            self.flush()
+        return True
+
+    def write_many(self, lines: Iterable[str]):
+        """Buffer several lines."""
+        for line in lines:
+            self.write(line)
+
+    def flush(self, raise_errors: bool = False):
+        """
+        Write all pending lines to the log file.
+
+        Args:
+            raise_errors: Re-raise write errors instead of logging them
+        """
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if not lines:
+                return
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write("\n".join(lines) + "\n")
+                self.lines_written += len(lines)
+                self.flush_count += 1
+            except Exception as e:
+                logger.error(f"Failed to write to {self.path}: {e}")
+                if raise_errors:
+                    raise
+
+    def occurrence_counts(self) -> Dict[str, int]:
+        """Occurrences per deduplication key seen so far."""
+        with self._lock:
+            return dict(self._occurrences)
+
+    def close(self):
+        """Append occurrence counts, flush and stop the flush thread."""
+        with self._lock:
+            if self.closed:
+                thread = None
+            else:
+                self.closed = True
+                thread = self._thread
+                repeated = [(key, count) for key, count in self._occurrences.items() if count > 1]
+                if repeated:
+                    timestamp = datetime.now().isoformat()
+                    self._pending.extend(
+                        f"[{timestamp}] REPEATED: {key} (x{count})" for key, count in repeated
+                    )
+        self._wakeup.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _count_occurrence(self, key: str) -> bool:
+        count = self._occurrences.get(key)
+        if count is not None:
+            self._occurrences[key] = count + 1
+            return False
+        if len(self._occurrences) < self.max_tracked_keys:
+            self._occurrences[key] = 1
+        return True
+
+    def _ensure_flush_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._flush_loop, name=f"log-sink:{os.path.basename(self.path)}", daemon=True
+            )
+            self._thread.start()
+
+    def _flush_loop(self):
+        while not self.closed:
+            self._wakeup.wait(self.flush_interval)
+            self.flush()
+
+
+_sinks: Dict[str, BufferedLogSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_log_sink(path: str, deduplicate: bool = False) -> BufferedLogSink:
+    """
+    Return the shared sink for a log file, creating it if needed.
+
+    Args:
+        path: Log file path
+        deduplicate: Whether the sink deduplicates repeated lines (only
+            used when the sink is created)
+
+    Returns:
+        BufferedLogSink: Open sink shared by all writers of the file
+    """
+    key = os.path.abspath(path)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None or sink.closed:
+            sink = BufferedLogSink(path, deduplicate=deduplicate)
+            _sinks[key] = sink
+        return sink
+
+
+def flush_log_sinks(directory: Optional[str] = None):
+    """Flush all open sinks, or only those writing below directory."""
+    for sink in _matching_sinks(directory):
+        sink.flush()
+
+
+def close_log_sinks(directory: Optional[str] = None):
+    """Close all open sinks, or only those writing below directory."""
+    sinks = _matching_sinks(directory)
+    with _sinks_lock:
+        for key in [key for key, sink in _sinks.items() if sink in sinks]:
+            del _sinks[key]
+    for sink in sinks:
+        sink.close()
+
+
+def _matching_sinks(directory: Optional[str]) -> List[BufferedLogSink]:
+    prefix = os.path.join(os.path.abspath(directory), "") if directory else ""
+    with _sinks_lock:
+        return [sink for sink in _sinks.values() if sink.path.startswith(prefix)]
+
+
+atexit.register(close_log_sinks)
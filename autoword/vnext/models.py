@@ -308,7 +308,7 @@ class OperationResult(BaseModel):
 
 class ProcessingResult(BaseModel):
     """Final processing result."""
-    status: str = Field(..., pattern=r"^(SUCCESS|ROLLBACK|FAILED_VALIDATION|INVALID_PLAN)$")
+    status: str = Field(..., pattern=r"^(SUCCESS|ROLLBACK|FAILED_VALIDATION|INVALID_PLAN|TIMEOUT)$")
     message: Optional[str] = None
     errors: List[str] = Field(default_factory=list)
     warnings: List[str] = Field(default_factory=list)
@@ -12,6 +12,7 @@ import time
 import psutil
 import logging
 import threading
+import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Callable, Union
 from pathlib import Path
@@ -65,6 +66,9 @@ class PipelineStageMetrics:
     operations: List[PerformanceMetrics] = field(default_factory=list)
     memory_peak_mb: Optional[float] = None
     memory_average_mb: Optional[float] = None
+    word_rss_peak_mb: Optional[float] = None
+    word_handle_peak: Optional[int] = None
+    word_cpu_peak_percent: Optional[float] = None
     success: bool = True
     error_message: Optional[str] = None
 
@@ -78,14 +82,59 @@ class MemoryAlert:
     operation_name: str
     alert_level: str  # WARNING, CRITICAL
     message: str
+    source: str = "python"  # python, word
+
+
+
+@dataclass
+class WordProcessSample:
+    """Resource usage of the Word process tree (summed over processes)."""
+    timestamp: datetime
+    process_count: int
+    rss_mb: float
+    handle_count: int
+    cpu_percent: float
+    
+    def peak_with(self, other: Optional["WordProcessSample"]) -> "WordProcessSample":
+        """Field-wise maximum of two samples."""
+        if other is None:
+            return self
+        return WordProcessSample(
+            timestamp=max(self.timestamp, other.timestamp),
+            process_count=max(self.process_count, other.process_count),
+            rss_mb=max(self.rss_mb, other.rss_mb),
+            handle_count=max(self.handle_count, other.handle_count),
+            cpu_percent=max(self.cpu_percent, other.cpu_percent)
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "process_count": self.process_count,
+            "rss_mb": self.rss_mb,
+            "handle_count": self.handle_count,
+            "cpu_percent": self.cpu_percent
+        }
 
 
 class MemoryMonitor:
-    """Memory usage monitoring with alerts."""
+    """Memory usage monitoring with alerts.
+    
+    Besides the Python interpreter, the monitor tracks the Word process trees
+    attached for this run (the Word.Application instances the ComWatchdog
+    resolved a PID for): RSS, handle count and CPU, with peaks per pipeline
+    stage. Other Word instances, such as other workers' or the user's, are
+    never counted. When Word crosses the recycle thresholds, recycle_event is set so
+    the caller can restart Word between documents.
+    """
     
     def __init__(self, warning_threshold_mb: float = 1024, 
                  critical_threshold_mb: float = 2048,
-                 check_interval_seconds: float = 1.0):
+                 check_interval_seconds: float = 1.0,
+                 track_word_processes: bool = True,
+                 word_warning_threshold_mb: float = 1536,
+                 word_recycle_threshold_mb: float = 3072,
+                 word_recycle_handle_count: int = 20000):
         """
         Initialize memory monitor.
         
@@ -93,6 +142,10 @@ class MemoryMonitor:
             warning_threshold_mb: Memory threshold for warnings (MB)
             critical_threshold_mb: Memory threshold for critical alerts (MB)
             check_interval_seconds: Monitoring check interval
+            track_word_processes: Whether to track the Word process tree
+            word_warning_threshold_mb: Word tree RSS threshold for warnings (MB)
+            word_recycle_threshold_mb: Word tree RSS that requests a recycle (MB)
+            word_recycle_handle_count: Word tree handle count that requests a recycle
         """
         self.warning_threshold_mb = warning_threshold_mb
         self.critical_threshold_mb = critical_threshold_mb
@@ -105,6 +158,22 @@ class MemoryMonitor:
         self.monitor_thread: Optional[threading.Thread] = None
         self.current_operation = "Unknown"
         
+        self.track_word_processes = track_word_processes
+        self.word_warning_threshold_mb = word_warning_threshold_mb
+        self.word_recycle_threshold_mb = word_recycle_threshold_mb
+        self.word_recycle_handle_count = word_recycle_handle_count
+        
+        self.word_peak: Optional[WordProcessSample] = None
+        self.last_word_sample: Optional[WordProcessSample] = None
+        self.recycle_event = threading.Event()
+        self.recycle_reason: Optional[str] = None
+        
+        # Attached Word processes; psutil.Process remembers the creation time,
+        # so a PID reused after Word exited is not taken for this run's Word
+        self._word_roots: Dict[int, psutil.Process] = {}
+        self._word_processes: Dict[int, psutil.Process] = {}
+        self._stage_word_peaks: Dict[str, Optional[WordProcessSample]] = {}
+        
         self._lock = threading.Lock()
     
     def start_monitoring(self):
@@ -149,50 +218,233 @@ class MemoryMonitor:
         with self._lock:
             self.alerts.clear()
     
+    def attach_word_process(self, pid: int):
+        """Track a Word process (and its children) started for this run."""
+        if not self.track_word_processes:
+            return
+        try:
+            proc = psutil.Process(pid)
+        except psutil.Error:
+            return
+        with self._lock:
+            self._word_roots[pid] = proc
+    
+    def detach_word_process(self, pid: Optional[int]):
+        """Stop tracking a Word process, e.g. after it was quit."""
+        if pid is None:
+            return
+        with self._lock:
+            self._word_roots.pop(pid, None)
+    
+    def sample_word_processes(self) -> Optional[WordProcessSample]:
+        """
+        Sample the tracked Word process tree and check recycle thresholds.
+        
+        Returns:
+            WordProcessSample: Summed usage, or None if no Word process is tracked
+        """
+        processes = self._refresh_word_tree()
+        if not processes:
+            return None
+        
+        rss_mb = 0.0
+        handle_count = 0
+        cpu_percent = 0.0
+        for proc in processes:
+            try:
+                with proc.oneshot():
+                    rss_mb += proc.memory_info().rss / (1024 * 1024)
+                    handle_count += _handle_count(proc)
+                    cpu_percent += proc.cpu_percent(interval=None)
+            except psutil.Error:
+                continue
+        
+        sample = WordProcessSample(
+            timestamp=datetime.now(),
+            process_count=len(processes),
+            rss_mb=rss_mb,
+            handle_count=handle_count,
+            cpu_percent=cpu_percent
+        )
+        
+        with self._lock:
+            self.last_word_sample = sample
+            self.word_peak = sample.peak_with(self.word_peak)
+            for stage_name, peak in self._stage_word_peaks.items():
+                self._stage_word_peaks[stage_name] = sample.peak_with(peak)
+            self._check_word_thresholds(sample)
+        return sample
+    
+    def get_word_peak(self) -> Optional[WordProcessSample]:
+        """Get peak Word process tree usage since monitoring started."""
+        return self.word_peak
+    
+    def begin_stage_window(self, stage_name: str):
+        """Start collecting Word peaks for a pipeline stage."""
+        with self._lock:
+            self._stage_word_peaks[stage_name] = None
+    
+    def end_stage_window(self, stage_name: str) -> Optional[WordProcessSample]:
+        """
+        Stop collecting Word peaks for a pipeline stage.
+        
+        Returns:
+            WordProcessSample: Peak usage during the stage, or None if no Word
+            process was tracked
+        """
+        if self.track_word_processes:
+            # Short stages may finish between two background samples
+            try:
+                self.sample_word_processes()
+            except Exception:
+                pass
+        with self._lock:
+            return self._stage_word_peaks.pop(stage_name, None)
+    
+    def needs_word_recycle(self) -> bool:
+        """Whether Word crossed a recycle threshold since the last acknowledge."""
+        return self.recycle_event.is_set()
+    
+    def acknowledge_recycle(self):
+        """
+        Reset the recycle signal after Word was restarted.
+        
+        The old instance is detached or drops out once it has exited, and the
+        new one is attached when it starts, so tracked processes are kept.
+        """
+        with self._lock:
+            self.recycle_event.clear()
+            self.recycle_reason = None
+    
+    def get_word_stats(self) -> Dict[str, Any]:
+        """Get Word process tree statistics."""
+        return {
+            "tracked_pids": sorted(self._word_processes),
+            "peak": self.word_peak.to_dict() if self.word_peak else None,
+            "last_sample": self.last_word_sample.to_dict() if self.last_word_sample else None,
+            "warning_threshold_mb": self.word_warning_threshold_mb,
+            "recycle_threshold_mb": self.word_recycle_threshold_mb,
+            "recycle_handle_count": self.word_recycle_handle_count,
+            "recycle_requested": self.needs_word_recycle(),
+            "recycle_reason": self.recycle_reason
+        }
+    
+    def _refresh_word_tree(self) -> List[psutil.Process]:
+        """Resolve tracked roots and their children, dropping exited processes."""
+        with self._lock:
+            roots = dict(self._word_roots)
+        
+        tree: Dict[int, psutil.Process] = {}
+        exited = set()
+        for pid, proc in roots.items():
+            # Root Process objects are kept, so cpu_percent() measures since the last sample
+            try:
+                if not proc.is_running():
+                    exited.add(pid)
+                    continue
+                tree[pid] = proc
+                for child in proc.children(recursive=True):
+                    tree[child.pid] = self._word_processes.get(child.pid, child)
+            except psutil.Error:
+                exited.add(pid)
+        
+        with self._lock:
+            for pid in exited:
+                self._word_roots.pop(pid, None)
+            self._word_processes = tree
+        return list(tree.values())
+    
+    def _check_word_thresholds(self, sample: WordProcessSample):
+        """Raise Word alerts and the recycle signal (caller holds the lock)."""
+        reason = None
+        if sample.rss_mb > self.word_recycle_threshold_mb:
+            reason = f"Word memory {sample.rss_mb:.1f}MB > {self.word_recycle_threshold_mb}MB"
+        elif sample.handle_count > self.word_recycle_handle_count:
+            reason = f"Word handles {sample.handle_count} > {self.word_recycle_handle_count}"
+        
+        if reason:
+            if not self.recycle_event.is_set():
+                self.recycle_reason = reason
+                self.recycle_event.set()
+                self.alerts.append(MemoryAlert(
+                    timestamp=sample.timestamp,
+                    current_memory_mb=sample.rss_mb,
+                    threshold_mb=self.word_recycle_threshold_mb,
+                    operation_name=self.current_operation,
+                    alert_level="CRITICAL",
+                    message=f"Word recycle requested: {reason}",
+                    source="word"
+                ))
+        elif sample.rss_mb > self.word_warning_threshold_mb:
+            recent_warnings = [a for a in self.alerts
+                               if a.source == "word" and a.alert_level == "WARNING" and
+                               (datetime.now() - a.timestamp).seconds < 30]
+            if not recent_warnings:
+                self.alerts.append(MemoryAlert(
+                    timestamp=sample.timestamp,
+                    current_memory_mb=sample.rss_mb,
+                    threshold_mb=self.word_warning_threshold_mb,
+                    operation_name=self.current_operation,
+                    alert_level="WARNING",
+                    message=f"High Word memory usage: {sample.rss_mb:.1f}MB > {self.word_warning_threshold_mb}MB",
+                    source="word"
+                ))
+    
     def _monitor_loop(self):
         """Background monitoring loop."""
         while self.monitoring_active:
             try:
-                current_memory = self.get_current_memory_mb()
-                
-                with self._lock:
-                    # Update peak memory
-                    if current_memory > self.peak_memory_mb:
-                        self.peak_memory_mb = current_memory
-                    
-                    # Check thresholds
-                    if current_memory > self.critical_threshold_mb:
-                        alert = MemoryAlert(
-                            timestamp=datetime.now(),
-                            current_memory_mb=current_memory,
-                            threshold_mb=self.critical_threshold_mb,
-                            operation_name=self.current_operation,
-                            alert_level="CRITICAL",
-                            message=f"Critical memory usage: {current_memory:.1f}MB > {self.critical_threshold_mb}MB"
-                        )
-                        self.alerts.append(alert)
-                        
-                    elif current_memory > self.warning_threshold_mb:
-                        # Only add warning if we don't already have recent warnings
-                        recent_warnings = [a for a in self.alerts 
-                                         if a.alert_level == "WARNING" and 
-                                         (datetime.now() - a.timestamp).seconds < 30]
-                        if not recent_warnings:
-                            alert = MemoryAlert(
-                                timestamp=datetime.now(),
-                                current_memory_mb=current_memory,
-                                threshold_mb=self.warning_threshold_mb,
-                                operation_name=self.current_operation,
-                                alert_level="WARNING",
-                                message=f"High memory usage: {current_memory:.1f}MB > {self.warning_threshold_mb}MB"
-                            )
-                            self.alerts.append(alert)
-                
-                time.sleep(self.check_interval_seconds)
-                
+                self._check_python_memory()
+                if self.track_word_processes:
+                    self.sample_word_processes()
             except Exception:
                 # Silently continue monitoring even if there are errors
-                time.sleep(self.check_interval_seconds)
+                pass
+            time.sleep(self.check_interval_seconds)
+    
+    def _check_python_memory(self):
+        """Sample interpreter memory, update the peak and raise alerts."""
+        current_memory = self.get_current_memory_mb()
+        
+        with self._lock:
+            # Update peak memory
+            if current_memory > self.peak_memory_mb:
+                self.peak_memory_mb = current_memory
+            
+            # Check thresholds
+            if current_memory > self.critical_threshold_mb:
+                alert = MemoryAlert(
+                    timestamp=datetime.now(),
+                    current_memory_mb=current_memory,
+                    threshold_mb=self.critical_threshold_mb,
+                    operation_name=self.current_operation,
+                    alert_level="CRITICAL",
+                    message=f"Critical memory usage: {current_memory:.1f}MB > {self.critical_threshold_mb}MB"
+                )
+                self.alerts.append(alert)
+                
+            elif current_memory > self.warning_threshold_mb:
+                # Only add warning if we don't already have recent warnings
+                recent_warnings = [a for a in self.alerts 
+                                 if a.alert_level == "WARNING" and a.source == "python" and
+                                 (datetime.now() - a.timestamp).seconds < 30]
+                if not recent_warnings:
+                    alert = MemoryAlert(
+                        timestamp=datetime.now(),
+                        current_memory_mb=current_memory,
+                        threshold_mb=self.warning_threshold_mb,
+                        operation_name=self.current_operation,
+                        alert_level="WARNING",
+                        message=f"High memory usage: {current_memory:.1f}MB > {self.warning_threshold_mb}MB"
+                    )
+                    self.alerts.append(alert)
+
+
+def _handle_count(proc: psutil.Process) -> int:
+    """Handle count on Windows, open file descriptors elsewhere."""
+    if hasattr(proc, 'num_handles'):
+        return proc.num_handles()
+    return proc.num_fds()
 
 
 class PerformanceTracker:
@@ -287,6 +539,9 @@ class PerformanceTracker:
         with self._lock:
             self.stage_metrics[stage_name] = stage_metrics
         
+        if self.memory_monitor:
+            self.memory_monitor.begin_stage_window(stage_name)
+        
         # Track memory during stage
         memory_samples = []
         
@@ -327,6 +582,12 @@ class PerformanceTracker:
                                if op.memory_after_mb is not None]
                 if memory_values:
                     stage_metrics.memory_average_mb = sum(memory_values) / len(memory_values)
+                
+                word_peak = self.memory_monitor.end_stage_window(stage_name)
+                if word_peak:
+                    stage_metrics.word_rss_peak_mb = word_peak.rss_mb
+                    stage_metrics.word_handle_peak = word_peak.handle_count
+                    stage_metrics.word_cpu_peak_percent = word_peak.cpu_percent
     
     def get_operation_stats(self) -> Dict[str, Any]:
         """Get operation performance statistics."""
@@ -404,6 +665,9 @@ class PerformanceTracker:
                 "success": stage.success,
                 "memory_peak_mb": stage.memory_peak_mb,
                 "memory_average_mb": stage.memory_average_mb,
+                "word_rss_peak_mb": stage.word_rss_peak_mb,
+                "word_handle_peak": stage.word_handle_peak,
+                "word_cpu_peak_percent": stage.word_cpu_peak_percent,
             }
         
         stats["stage_breakdown"] = stage_breakdown
@@ -421,7 +685,8 @@ class VNextLogger:
                  file_level: LogLevel = LogLevel.DEBUG,
                  enable_memory_monitoring: bool = True,
                  memory_warning_threshold_mb: float = 1024,
-                 memory_critical_threshold_mb: float = 2048):
+                 memory_critical_threshold_mb: float = 2048,
+                 history_path: Optional[str] = None):
         """
         Initialize vNext logger.
         
@@ -433,11 +698,16 @@ class VNextLogger:
             enable_memory_monitoring: Whether to enable memory monitoring
             memory_warning_threshold_mb: Memory warning threshold
             memory_critical_threshold_mb: Memory critical threshold
+            history_path: Optional cross-run performance history database;
+                the final report of each run is appended to it
         """
         self.audit_directory = Path(audit_directory)
         self.monitoring_level = monitoring_level
         self.console_level = console_level
         self.file_level = file_level
+        self.history_path = history_path
+        # Document features and status recorded with the run in the history
+        self.run_context: Dict[str, Any] = {}
         
         # Create audit directory
         self.audit_directory.mkdir(parents=True, exist_ok=True)
@@ -462,10 +732,13 @@ class VNextLogger:
     
     def _setup_loggers(self):
         """Setup logging configuration."""
+        # Loggers are per run: concurrent runs (service or watch-folder workers)
+        # must not write into or close each other's log files
+        self.run_id = uuid.uuid4().hex[:12]
+        
         # Main logger
-        self.logger = logging.getLogger("vnext_pipeline")
+        self.logger = logging.getLogger(f"vnext_pipeline.{self.run_id}")
         self.logger.setLevel(logging.DEBUG)
-        self.logger.handlers.clear()  # Clear any existing handlers
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
@@ -487,9 +760,8 @@ class VNextLogger:
         self.logger.addHandler(file_handler)
         
         # Debug logger for detailed debugging
-        self.debug_logger = logging.getLogger("vnext_debug")
+        self.debug_logger = logging.getLogger(f"vnext_debug.{self.run_id}")
         self.debug_logger.setLevel(logging.DEBUG)
-        self.debug_logger.handlers.clear()
         
         debug_file = self.audit_directory / "debug.log"
         debug_handler = logging.FileHandler(debug_file, mode='w', encoding='utf-8')
@@ -503,9 +775,8 @@ class VNextLogger:
         self.debug_logger.addHandler(debug_handler)
         
         # Performance logger
-        self.perf_logger = logging.getLogger("vnext_performance")
+        self.perf_logger = logging.getLogger(f"vnext_performance.{self.run_id}")
         self.perf_logger.setLevel(logging.INFO)
-        self.perf_logger.handlers.clear()
         
         perf_file = self.audit_directory / "performance.log"
         perf_handler = logging.FileHandler(perf_file, mode='w', encoding='utf-8')
@@ -636,18 +907,63 @@ class VNextLogger:
                         "level": alert.alert_level,
                         "memory_mb": alert.current_memory_mb,
                         "operation": alert.operation_name,
-                        "message": alert.message
+                        "message": alert.message,
+                        "source": alert.source
                     }
                     for alert in self.memory_monitor.get_alerts()
                 ]
             }
+            if self.memory_monitor.track_word_processes:
+                report["word_process_stats"] = self.memory_monitor.get_word_stats()
         
         return report
     
+    def update_run_context(self, **context):
+        """Record run features (document size, paragraph count, status) for the history."""
+        self.run_context.update(context)
+    
+    def record_performance_history(self, report: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Append the run to the performance history and check for regressions.
+        
+        Args:
+            report: Performance report of this run
+            
+        Returns:
+            List of stage regressions flagged after recording the run
+        """
+        from . import __version__
+        from .perf_history import PerformanceHistoryStore
+        
+        with self.performance_tracker._lock:
+            operations = [
+                {
+                    "operation_name": m.operation_name,
+                    "duration_ms": m.duration_ms,
+                    "success": m.success,
+                    "memory_delta_mb": m.memory_delta_mb
+                }
+                for m in self.performance_tracker.completed_metrics
+            ]
+        
+        store = PerformanceHistoryStore(self.history_path)
+        store.record_run(report, {"pipeline_version": __version__, **self.run_context}, operations)
+        regressions = store.detect_regressions()
+        for regression in regressions:
+            self.logger.warning(f"Performance regression: {regression.describe()}")
+            self.perf_logger.info(f"REGRESSION - {regression.describe()}")
+        return [regression.to_dict() for regression in regressions]
+    
     def save_performance_report(self):
         """Save performance report to file."""
         report = self.generate_performance_report()
         
+        if self.history_path:
+            try:
+                report["regressions"] = self.record_performance_history(report)
+            except Exception as e:
+                self.logger.error(f"Failed to record performance history: {e}")
+        
         report_file = self.audit_directory / "performance_report.json"
         with open(report_file, 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
@@ -672,6 +988,10 @@ class VNextLogger:
                 self.logger.warning(f"Total memory alerts during execution: {len(alerts)}")
                 for alert in alerts[-5:]:  # Log last 5 alerts
                     self.log_memory_alert(alert)
+            
+            if self.memory_monitor.needs_word_recycle():
+                self.logger.warning(f"Word should be recycled before the next document: "
+                                    f"{self.memory_monitor.recycle_reason}")
         
         # Close all file handlers to release file locks
         try:
@@ -692,6 +1012,10 @@ class VNextLogger:
         except Exception as e:
             # Don't raise exceptions during cleanup
             pass
+        
+        # Per-run loggers would otherwise accumulate in a long-running service
+        for run_logger in (self.logger, self.debug_logger, self.perf_logger):
+            logging.Logger.manager.loggerDict.pop(run_logger.name, None)
 
 
 # Convenience functions for easy integration
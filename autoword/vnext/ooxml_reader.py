@@ -0,0 +1,449 @@
+"""
+COM-free OOXML reader for DOCX structure and inventory.
+
+DocumentExtractor reads documents through Word COM, which is only available
+on Windows with Word installed. This module reads the same StructureV1 and
+InventoryFullV1 models straight from the DOCX package so that everything
+downstream of extraction (schema validation, planning, diffing, auditing) can
+run, and be benchmarked, without Word:
+
+- paragraphs are read in document order, including table cell paragraphs,
+  the way Word's Paragraphs collection enumerates them
+- headings come from outline levels (paragraph or style) or from
+  "heading N" / "标题 N" style names, as in DocumentExtractor
+- fields are read from simple fields and from complex fields, which may
+  span several paragraphs (TOC)
+
+Values that only Word can compute (page count, rendered field results after
+repagination) are taken from docProps/app.xml and the stored field results.
+"""
+
+import logging
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .models import (
+    StructureV1, InventoryFullV1, DocumentMetadata, StyleDefinition,
+    ParagraphSkeleton, HeadingReference, FieldReference, TableSkeleton,
+    FontSpec, ParagraphSpec, MediaReference, FootnoteReference, EndnoteReference,
+    StyleType
+)
+from .exceptions import ExtractionError
+
+
+logger = logging.getLogger(__name__)
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+NAMESPACES = {
+    "w": W_NS,
+    "cp": "http://schemas.openxmlformats.org/package/2006/metadata/core-properties",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "dcterms": "http://purl.org/dc/terms/",
+    "ep": "http://schemas.openxmlformats.org/officeDocument/2006/extended-properties",
+}
+
+W = f"{{{W_NS}}}"
+
+PREVIEW_LENGTH = 120
+BODY_TEXT_OUTLINE_LEVEL = 9  # w:outlineLvl 9 is body text; 0-8 are levels 1-9
+
+MEDIA_CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+    ".wmf": "image/wmf",
+    ".emf": "image/emf",
+}
+
+_HEADING_STYLE_PATTERN = re.compile(r"^(?:heading|标题)\s*([1-9])$", re.IGNORECASE)
+
+
+def read_structure(docx_path: str) -> StructureV1:
+    """
+    Read the document skeleton from a DOCX package.
+
+    Args:
+        docx_path: Path to the DOCX file
+
+    Returns:
+        StructureV1: Document structure
+
+    Raises:
+        ExtractionError: If the package or document.xml cannot be read
+    """
+    with _open_package(docx_path, "structure") as package:
+        styles_root = _parse_part(package, "word/styles.xml")
+        document_root = _parse_part(package, "word/document.xml")
+        if document_root is None:
+            raise ExtractionError("word/document.xml not found in package",
+                                  docx_path=str(docx_path), extraction_stage="structure")
+
+        styles, style_info = _read_styles(styles_root)
+        paragraphs, fields, tables = _read_body(document_root, style_info)
+        headings = [
+            HeadingReference(
+                paragraph_index=para.index,
+                level=para.heading_level,
+                text=para.preview_text,
+                style_name=para.style_name
+            )
+            for para in paragraphs
+            if para.is_heading and para.heading_level and para.preview_text
+        ]
+        metadata = _read_metadata(
+            _parse_part(package, "docProps/core.xml"),
+            _parse_part(package, "docProps/app.xml"),
+            len(paragraphs)
+        )
+
+    return StructureV1(
+        metadata=metadata,
+        styles=styles,
+        paragraphs=paragraphs,
+        headings=headings,
+        fields=fields,
+        tables=tables
+    )
+
+
+def read_inventory(docx_path: str) -> InventoryFullV1:
+    """
+    Read the full inventory (OOXML parts, media, notes) from a DOCX package.
+
+    Args:
+        docx_path: Path to the DOCX file
+
+    Returns:
+        InventoryFullV1: Document inventory
+
+    Raises:
+        ExtractionError: If the package cannot be read
+    """
+    with _open_package(docx_path, "inventory") as package:
+        fragments: Dict[str, str] = {}
+        media: Dict[str, MediaReference] = {}
+        for info in package.infolist():
+            name = info.filename
+            if name.endswith(".xml") or name.endswith(".rels"):
+                fragments[name] = package.read(name).decode("utf-8")
+            elif name.startswith("word/media/"):
+                extension = Path(name).suffix.lower()
+                media[name] = MediaReference(
+                    media_id=Path(name).stem,
+                    content_type=MEDIA_CONTENT_TYPES.get(extension, "application/octet-stream"),
+                    file_extension=extension,
+                    size_bytes=info.file_size
+                )
+
+        document_root = _parse_fragment(fragments.get("word/document.xml"))
+        note_paragraphs = _note_reference_paragraphs(document_root)
+        footnotes = [
+            FootnoteReference(paragraph_index=note_paragraphs.get(("footnote", note_id), 0),
+                              footnote_id=note_id, reference_mark=str(number), text_preview=text)
+            for number, (note_id, text) in enumerate(
+                _read_notes(_parse_fragment(fragments.get("word/footnotes.xml")), "footnote"), 1)
+        ]
+        endnotes = [
+            EndnoteReference(paragraph_index=note_paragraphs.get(("endnote", note_id), 0),
+                             endnote_id=note_id, reference_mark=str(number), text_preview=text)
+            for number, (note_id, text) in enumerate(
+                _read_notes(_parse_fragment(fragments.get("word/endnotes.xml")), "endnote"), 1)
+        ]
+
+    return InventoryFullV1(
+        ooxml_fragments=fragments,
+        media_indexes=media,
+        footnotes=footnotes,
+        endnotes=endnotes
+    )
+
+
+def _open_package(docx_path: str, stage: str) -> zipfile.ZipFile:
+    try:
+        return zipfile.ZipFile(docx_path, "r")
+    except (OSError, zipfile.BadZipFile) as e:
+        raise ExtractionError(f"Cannot open DOCX package: {e}",
+                              docx_path=str(docx_path), extraction_stage=stage)
+
+
+def _parse_part(package: zipfile.ZipFile, name: str) -> Optional[ET.Element]:
+    try:
+        data = package.read(name)
+    except KeyError:
+        return None
+    try:
+        return ET.fromstring(data)
+    except ET.ParseError as e:
+        raise ExtractionError(f"Malformed OOXML part {name}: {e}",
+                              docx_path=package.filename, extraction_stage="structure")
+
+
+def _parse_fragment(content: Optional[str]) -> Optional[ET.Element]:
+    if not content:
+        return None
+    return ET.fromstring(content.encode("utf-8"))
+
+
+def _val(element: Optional[ET.Element], tag: str) -> Optional[str]:
+    if element is None:
+        return None
+    child = element.find(W + tag)
+    return child.get(W + "val") if child is not None else None
+
+
+def _on_off(element: Optional[ET.Element], tag: str) -> Optional[bool]:
+    if element is None:
+        return None
+    child = element.find(W + tag)
+    if child is None:
+        return None
+    return child.get(W + "val", "true") not in ("0", "false", "off")
+
+
+def _outline_level(ppr: Optional[ET.Element]) -> Optional[int]:
+    value = _val(ppr, "outlineLvl")
+    if value is None or not value.isdigit() or int(value) >= BODY_TEXT_OUTLINE_LEVEL:
+        return None
+    return int(value) + 1
+
+
+def _read_font(rpr: Optional[ET.Element]) -> Optional[FontSpec]:
+    if rpr is None:
+        return None
+    fonts = rpr.find(W + "rFonts")
+    size = _val(rpr, "sz")
+    color = _val(rpr, "color")
+    size_pt = round(int(size) / 2) if size and size.isdigit() else None
+    font = FontSpec(
+        east_asian=fonts.get(W + "eastAsia") if fonts is not None else None,
+        latin=fonts.get(W + "ascii") if fonts is not None else None,
+        size_pt=size_pt if size_pt and 1 <= size_pt <= 72 else None,
+        bold=_on_off(rpr, "b"),
+        italic=_on_off(rpr, "i"),
+        color_hex=f"#{color.upper()}" if color and re.fullmatch(r"[0-9A-Fa-f]{6}", color) else None
+    )
+    return font if font.model_dump(exclude_none=True) else None
+
+
+def _twips_to_pt(value: Optional[str]) -> Optional[float]:
+    if value is None or not value.lstrip("-").isdigit():
+        return None
+    return int(value) / 20
+
+
+def _read_paragraph_spec(ppr: Optional[ET.Element]) -> Optional[ParagraphSpec]:
+    if ppr is None:
+        return None
+    spacing = ppr.find(W + "spacing")
+    indent = ppr.find(W + "ind")
+    values = {}
+    if spacing is not None:
+        values["space_before_pt"] = _twips_to_pt(spacing.get(W + "before"))
+        values["space_after_pt"] = _twips_to_pt(spacing.get(W + "after"))
+    if indent is not None:
+        values["indent_left_pt"] = _twips_to_pt(indent.get(W + "left") or indent.get(W + "start"))
+        values["indent_right_pt"] = _twips_to_pt(indent.get(W + "right") or indent.get(W + "end"))
+        values["indent_first_line_pt"] = _twips_to_pt(indent.get(W + "firstLine"))
+    minimum = {"indent_first_line_pt": -1000}
+    values = {key: value for key, value in values.items()
+              if value is not None and minimum.get(key, 0) <= value <= 1000}
+    return ParagraphSpec(**values) if values else None
+
+
+def _read_styles(styles_root: Optional[ET.Element]) -> Tuple[List[StyleDefinition], Dict[str, Tuple[str, Optional[int]]]]:
+    """Read style definitions and a styleId -> (name, outline level) map."""
+    styles: List[StyleDefinition] = []
+    style_info: Dict[str, Tuple[str, Optional[int]]] = {}
+    if styles_root is None:
+        return styles, style_info
+
+    style_types = {item.value for item in StyleType}
+    for style in styles_root.findall(W + "style"):
+        style_id = style.get(W + "styleId")
+        name = _val(style, "name") or style_id
+        if not style_id or not name:
+            continue
+        ppr = style.find(W + "pPr")
+        style_info[style_id] = (name, _outline_level(ppr))
+
+        style_type = style.get(W + "type", "paragraph")
+        if style_type not in style_types:
+            continue
+        styles.append(StyleDefinition(
+            name=name[:255],
+            type=StyleType(style_type),
+            font=_read_font(style.find(W + "rPr")),
+            paragraph=_read_paragraph_spec(ppr),
+            based_on=_val(style, "basedOn"),
+            next_style=_val(style, "next")
+        ))
+
+    # basedOn/next hold style ids; report names as DocumentExtractor does
+    for style in styles:
+        if style.based_on in style_info:
+            style.based_on = style_info[style.based_on][0]
+        if style.next_style in style_info:
+            style.next_style = style_info[style.next_style][0]
+    return styles, style_info
+
+
+def _heading_level(style_name: Optional[str], style_level: Optional[int],
+                   ppr: Optional[ET.Element]) -> Optional[int]:
+    level = _outline_level(ppr) or style_level
+    if level is None and style_name:
+        match = _HEADING_STYLE_PATTERN.match(style_name.strip())
+        if match:
+            level = int(match.group(1))
+    return level
+
+
+def _read_body(document_root: ET.Element, style_info: Dict[str, Tuple[str, Optional[int]]]
+               ) -> Tuple[List[ParagraphSkeleton], List[FieldReference], List[TableSkeleton]]:
+    """Read paragraphs, fields and tables from document.xml in document order."""
+    body = document_root.find(W + "body")
+    if body is None:
+        return [], [], []
+
+    paragraphs: List[ParagraphSkeleton] = []
+    fields: List[FieldReference] = []
+    open_fields: List[Dict] = []
+    first_paragraph_of: Dict[int, int] = {}
+
+    for index, para in enumerate(body.iter(W + "p")):
+        first_paragraph_of.setdefault(id(para), index)
+        text_parts: List[str] = []
+
+        for element in para.iter():
+            tag = element.tag
+            if tag == W + "t":
+                text = element.text or ""
+                text_parts.append(text)
+                if open_fields and open_fields[-1]["in_result"]:
+                    open_fields[-1]["result"].append(text)
+            elif tag == W + "tab":
+                text_parts.append("\t")
+            elif tag == W + "fldChar":
+                char_type = element.get(W + "fldCharType")
+                if char_type == "begin":
+                    open_fields.append({"paragraph_index": index, "code": [], "result": [], "in_result": False})
+                elif char_type == "separate" and open_fields:
+                    open_fields[-1]["in_result"] = True
+                elif char_type == "end" and open_fields:
+                    field = open_fields.pop()
+                    fields.append(_field_reference(field["paragraph_index"], "".join(field["code"]),
+                                                   "".join(field["result"])))
+            elif tag == W + "instrText" and open_fields:
+                open_fields[-1]["code"].append(element.text or "")
+            elif tag == W + "fldSimple":
+                result = "".join(t.text or "" for t in element.iter(W + "t"))
+                fields.append(_field_reference(index, element.get(W + "instr", ""), result))
+
+        ppr = para.find(W + "pPr")
+        style_id = _val(ppr, "pStyle") or "Normal"
+        style_name, style_level = style_info.get(style_id, (style_id, None))
+        level = _heading_level(style_name, style_level, ppr)
+        preview = "".join(text_parts).strip()[:PREVIEW_LENGTH]
+
+        paragraphs.append(ParagraphSkeleton(
+            index=index,
+            style_name=style_name,
+            preview_text=preview,
+            is_heading=level is not None,
+            heading_level=level
+        ))
+
+    tables = []
+    for table in body.iter(W + "tbl"):
+        rows = table.findall(W + "tr")
+        first_para = table.find(f".//{W}p")
+        if not rows or first_para is None:
+            continue
+        header_props = rows[0].find(W + "trPr")
+        tables.append(TableSkeleton(
+            paragraph_index=first_paragraph_of.get(id(first_para), 0),
+            rows=len(rows),
+            columns=max(len(row.findall(W + "tc")) for row in rows) or 1,
+            has_header=header_props is not None and header_props.find(W + "tblHeader") is not None
+        ))
+
+    return paragraphs, fields, tables
+
+
+def _field_reference(paragraph_index: int, code: str, result: str) -> FieldReference:
+    code = code.strip()
+    field_type = code.split()[0].upper() if code else "UNKNOWN"
+    return FieldReference(
+        paragraph_index=paragraph_index,
+        field_type=field_type,
+        field_code=code or None,
+        result_text=result.strip()[:PREVIEW_LENGTH] or None
+    )
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _int_text(root: Optional[ET.Element], path: str) -> Optional[int]:
+    if root is None:
+        return None
+    text = root.findtext(path, namespaces=NAMESPACES)
+    return int(text) if text and text.strip().isdigit() else None
+
+
+def _read_metadata(core_root: Optional[ET.Element], app_root: Optional[ET.Element],
+                   paragraph_count: int) -> DocumentMetadata:
+    def core_text(path: str) -> Optional[str]:
+        if core_root is None:
+            return None
+        return core_root.findtext(path, namespaces=NAMESPACES) or None
+
+    return DocumentMetadata(
+        title=core_text("dc:title"),
+        author=core_text("dc:creator"),
+        creation_time=_parse_datetime(core_text("dcterms:created")),
+        modified_time=_parse_datetime(core_text("dcterms:modified")),
+        word_version=app_root.findtext("ep:AppVersion", namespaces=NAMESPACES) if app_root is not None else None,
+        page_count=_int_text(app_root, "ep:Pages"),
+        paragraph_count=paragraph_count,
+        word_count=_int_text(app_root, "ep:Words")
+    )
+
+
+def _note_reference_paragraphs(document_root: Optional[ET.Element]) -> Dict[Tuple[str, str], int]:
+    """Map (note kind, note id) to the index of the paragraph referencing it."""
+    references: Dict[Tuple[str, str], int] = {}
+    body = document_root.find(W + "body") if document_root is not None else None
+    if body is None:
+        return references
+    for index, para in enumerate(body.iter(W + "p")):
+        for kind in ("footnote", "endnote"):
+            for reference in para.iter(f"{W}{kind}Reference"):
+                references.setdefault((kind, reference.get(W + "id", "")), index)
+    return references
+
+
+def _read_notes(notes_root: Optional[ET.Element], kind: str) -> List[Tuple[str, Optional[str]]]:
+    """Read (id, preview text) of regular notes, skipping separator notes."""
+    if notes_root is None:
+        return []
+    notes = []
+    for note in notes_root.findall(W + kind):
+        note_id = note.get(W + "id")
+        if not note_id or note.get(W + "type", "normal") != "normal":
+            continue
+        text = "".join(t.text or "" for t in note.iter(W + "t")).strip()
+        notes.append((note_id, text[:PREVIEW_LENGTH] or None))
+    return notes
@@ -0,0 +1,346 @@
+"""
+Cross-run performance history for the vNext pipeline.
+
+Every run writes its own performance_report.json inside its audit directory.
+PerformanceHistoryStore additionally appends the stage and operation stats
+of each run, with document size features and the pipeline version, to a
+local SQLite database shared by all runs. The store answers percentile
+queries per stage, document size bucket and pipeline version, and flags
+stages whose p95 duration regressed against a baseline window of earlier
+runs.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+SCHEMA_VERSION = 1
+
+# (upper bound in MB, bucket name); documents at or above the last bound are "20MB+"
+SIZE_BUCKETS = [
+    (1.0, "<1MB"),
+    (5.0, "1-5MB"),
+    (20.0, "5-20MB"),
+]
+LARGEST_SIZE_BUCKET = "20MB+"
+
+GROUP_COLUMNS = {
+    "stage": "s.stage_name",
+    "size": "r.size_bucket",
+    "version": "r.pipeline_version",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at TEXT NOT NULL,
+    pipeline_version TEXT,
+    status TEXT,
+    document_path TEXT,
+    document_size_mb REAL,
+    paragraph_count INTEGER,
+    size_bucket TEXT,
+    total_duration_ms REAL,
+    peak_memory_mb REAL
+);
+CREATE TABLE IF NOT EXISTS stage_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    stage_name TEXT NOT NULL,
+    duration_ms REAL,
+    success INTEGER,
+    operations_count INTEGER,
+    memory_peak_mb REAL,
+    word_rss_peak_mb REAL
+);
+CREATE TABLE IF NOT EXISTS operation_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    operation_name TEXT NOT NULL,
+    duration_ms REAL,
+    success INTEGER,
+    memory_delta_mb REAL
+);
+CREATE INDEX IF NOT EXISTS idx_stage_metrics_stage ON stage_metrics(stage_name, run_id);
+CREATE INDEX IF NOT EXISTS idx_operation_metrics_name ON operation_metrics(operation_name, run_id);
+"""
+
+
+def size_bucket(document_size_mb: Optional[float]) -> Optional[str]:
+    """Return the size bucket name for a document size."""
+    if document_size_mb is None:
+        return None
+    for upper_bound, name in SIZE_BUCKETS:
+        if document_size_mb < upper_bound:
+            return name
+    return LARGEST_SIZE_BUCKET
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """
+    Percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Sample values
+        q: Percentile in [0, 100]
+
+    Returns:
+        float: Percentile value, or None for an empty sample
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+@dataclass
+class StageRegression:
+    """A stage whose recent p95 duration exceeds its baseline p95."""
+    stage_name: str
+    size_bucket: Optional[str]
+    baseline_p95_ms: float
+    recent_p95_ms: float
+    ratio: float
+    baseline_count: int
+    recent_count: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def describe(self) -> str:
+        bucket = f" [{self.size_bucket}]" if self.size_bucket else ""
+        return (f"{self.stage_name}{bucket}: p95 {self.recent_p95_ms:.1f}ms vs baseline "
+                f"{self.baseline_p95_ms:.1f}ms (x{self.ratio:.2f}, {self.recent_count}/{self.baseline_count} runs)")
+
+
+class PerformanceHistoryStore:
+    """Append-only SQLite store of per-run pipeline metrics."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize history store.
+
+        Args:
+            db_path: SQLite database path (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @contextmanager
+    def _connect(self):
+        # Several pipelines may append to the same history concurrently
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record_run(self, report: Dict[str, Any], run_context: Optional[Dict[str, Any]] = None,
+                   operations: Optional[List[Dict[str, Any]]] = None) -> int:
+        """
+        Append one run from a VNextLogger performance report.
+
+        Args:
+            report: Report from VNextLogger.generate_performance_report()
+            run_context: Run features: pipeline_version, status, document_path,
+                document_size_mb, paragraph_count
+            operations: Completed operations (operation_name, duration_ms,
+                success, memory_delta_mb)
+
+        Returns:
+            int: ID of the recorded run
+        """
+        context = run_context or {}
+        stage_stats = report.get("stage_stats", {})
+        memory_stats = report.get("memory_stats", {})
+        stage_breakdown = stage_stats.get("stage_breakdown", {})
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (recorded_at, pipeline_version, status, document_path, document_size_mb, "
+                "paragraph_count, size_bucket, total_duration_ms, peak_memory_mb) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    report.get("timestamp") or datetime.now().isoformat(),
+                    context.get("pipeline_version"),
+                    context.get("status"),
+                    context.get("document_path"),
+                    context.get("document_size_mb"),
+                    context.get("paragraph_count"),
+                    size_bucket(context.get("document_size_mb")),
+                    stage_stats.get("total_pipeline_duration_ms"),
+                    memory_stats.get("peak_memory_mb"),
+                )
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO stage_metrics (run_id, stage_name, duration_ms, success, operations_count, "
+                "memory_peak_mb, word_rss_peak_mb) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, stage_name, stage.get("duration_ms"), int(bool(stage.get("success", True))),
+                     stage.get("operations_count"), stage.get("memory_peak_mb"), stage.get("word_rss_peak_mb"))
+                    for stage_name, stage in stage_breakdown.items()
+                ]
+            )
+            conn.executemany(
+                "INSERT INTO operation_metrics (run_id, operation_name, duration_ms, success, memory_delta_mb) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, op.get("operation_name"), op.get("duration_ms"), int(bool(op.get("success", True))),
+                     op.get("memory_delta_mb"))
+                    for op in operations or []
+                ]
+            )
+        return run_id
+
+    def run_count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def stage_percentiles(self, group_by: Iterable[str] = ("stage",),
+                          percentiles: Sequence[float] = (50, 90, 95, 99),
+                          stage_name: Optional[str] = None,
+                          last_runs: Optional[int] = None,
+                          successful_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        Stage duration percentiles grouped by stage, size bucket and/or version.
+
+        Args:
+            group_by: Grouping keys from GROUP_COLUMNS ("stage", "size", "version")
+            percentiles: Percentiles to compute
+            stage_name: Restrict to one stage
+            last_runs: Restrict to the most recent N runs
+            successful_only: Ignore failed stages
+
+        Returns:
+            List[Dict[str, Any]]: One row per group with count and p<q> values
+        """
+        group_by = list(group_by)
+        unknown = [key for key in group_by if key not in GROUP_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown group keys {unknown}. Expected: {', '.join(GROUP_COLUMNS)}")
+
+        conditions, params = self._window_conditions(stage_name, last_runs, successful_only)
+        columns = ", ".join(GROUP_COLUMNS[key] for key in group_by)
+        query = (f"SELECT {columns + ', ' if columns else ''}s.duration_ms AS duration_ms "
+                 f"FROM stage_metrics s JOIN runs r ON r.run_id = s.run_id "
+                 f"WHERE s.duration_ms IS NOT NULL{conditions}")
+
+        groups: Dict[Tuple, List[float]] = {}
+        with self._connect() as conn:
+            for row in conn.execute(query, params):
+                key = tuple(row[i] for i in range(len(group_by)))
+                groups.setdefault(key, []).append(row["duration_ms"])
+
+        rows = []
+        for key in sorted(groups, key=lambda k: tuple("" if v is None else str(v) for v in k)):
+            values = groups[key]
+            row = dict(zip(group_by, key))
+            row["count"] = len(values)
+            for q in percentiles:
+                row[f"p{q:g}"] = percentile(values, q)
+            rows.append(row)
+        return rows
+
+    def detect_regressions(self, recent_runs: int = 20, baseline_runs: int = 100,
+                           threshold: float = 1.2, min_samples: int = 5,
+                           by_size_bucket: bool = True) -> List[StageRegression]:
+        """
+        Flag stages whose recent p95 duration regressed against a baseline.
+
+        The recent window is the last recent_runs runs; the baseline window is
+        the baseline_runs runs before it. Stages are compared per document size
+        bucket unless by_size_bucket is False.
+
+        Args:
+            recent_runs: Size of the recent window (runs)
+            baseline_runs: Size of the baseline window (runs)
+            threshold: Ratio of recent to baseline p95 that counts as regression
+            min_samples: Minimum stage samples required in each window
+
+        Returns:
+            List[StageRegression]: Regressed stages, worst first
+        """
+        with self._connect() as conn:
+            run_ids = [row[0] for row in conn.execute(
+                "SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?", (recent_runs + baseline_runs,))]
+            if len(run_ids) <= recent_runs:
+                return []
+            recent_ids = set(run_ids[:recent_runs])
+
+            samples: Dict[Tuple[str, Optional[str]], Tuple[List[float], List[float]]] = {}
+            placeholders = ", ".join("?" for _ in run_ids)
+            for row in conn.execute(
+                    f"SELECT s.run_id, s.stage_name, r.size_bucket, s.duration_ms "
+                    f"FROM stage_metrics s JOIN runs r ON r.run_id = s.run_id "
+                    f"WHERE s.run_id IN ({placeholders}) AND s.success = 1 AND s.duration_ms IS NOT NULL",
+                    run_ids):
+                key = (row["stage_name"], row["size_bucket"] if by_size_bucket else None)
+                recent, baseline = samples.setdefault(key, ([], []))
+                (recent if row["run_id"] in recent_ids else baseline).append(row["duration_ms"])
+
+        regressions = []
+        for (stage_name, bucket), (recent, baseline) in samples.items():
+            if len(recent) < min_samples or len(baseline) < min_samples:
+                continue
+            recent_p95 = percentile(recent, 95)
+            baseline_p95 = percentile(baseline, 95)
+            if baseline_p95 <= 0:
+                continue
+            ratio = recent_p95 / baseline_p95
+            if ratio > threshold:
+                regressions.append(StageRegression(
+                    stage_name=stage_name,
+                    size_bucket=bucket,
+                    baseline_p95_ms=baseline_p95,
+                    recent_p95_ms=recent_p95,
+                    ratio=ratio,
+                    baseline_count=len(baseline),
+                    recent_count=len(recent)
+                ))
+        regressions.sort(key=lambda r: r.ratio, reverse=True)
+        return regressions
+
+    def _window_conditions(self, stage_name: Optional[str], last_runs: Optional[int],
+                           successful_only: bool) -> Tuple[str, List[Any]]:
+        conditions, params = "", []
+        if stage_name:
+            conditions += " AND s.stage_name = ?"
+            params.append(stage_name)
+        if successful_only:
+            conditions += " AND s.success = 1"
+        if last_runs:
+            conditions += " AND s.run_id IN (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)"
+            params.append(last_runs)
+        return conditions, params
+
+
+def format_percentile_table(rows: List[Dict[str, Any]]) -> str:
+    """Render stage_percentiles() rows as a plain text table."""
+    if not rows:
+        return "No runs recorded."
+    headers = list(rows[0].keys())
+    cells = [[_format_cell(row.get(header)) for header in headers] for row in rows]
+    widths = [max(len(header), *(len(cell[i]) for cell in cells)) for i, header in enumerate(headers)]
+    lines = ["  ".join(header.ljust(width) for header, width in zip(headers, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    lines.extend("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in cells)
+    return "\n".join(lines)
+
+
+def _format_cell(value: Any) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
@@ -10,18 +10,28 @@ import os
 import logging
 import tempfile
 import shutil
+import threading
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable
 
 from .models import StructureV1, InventoryFullV1, PlanV1, ProcessingResult
-from .exceptions import VNextError, ExtractionError, PlanningError, ExecutionError, ValidationError, AuditError
+from .exceptions import (
+    VNextError, ExtractionError, PlanningError, ExecutionError, ValidationError, AuditError, WordTimeoutError
+)
 from .extractor.document_extractor import DocumentExtractor
 from .planner.document_planner import DocumentPlanner
 from .executor.document_executor import DocumentExecutor
+from .executor.plan_optimizer import PlanOptimizationReport
+from .layout_tracker import LayoutDependencyTracker
 from .validator.document_validator import DocumentValidator
 from .auditor.document_auditor import DocumentAuditor
 from .error_handler import PipelineErrorHandler, ErrorContext, ProcessingStatus
+from .log_sink import close_log_sinks
+from .stage_graph import StageGraph
+from .checkpoint import CheckpointStore
+from .watchdog import ComWatchdog, DeadlineExpiry, DEFAULT_OPERATION_TIMEOUT_SECONDS, WORD_STAGES
 from .monitoring import VNextLogger, MonitoringLevel, create_vnext_logger, log_large_document_warning, log_complex_document_scenario
 from ..core.llm_client import LLMClient
 
@@ -43,24 +53,28 @@ class ProgressReporter:
         self.current_stage = ""
         self.total_stages = 5
         self.completed_stages = 0
+        self._lock = threading.Lock()  # Stages may run concurrently
     
     def start_stage(self, stage_name: str):
         """Start a new pipeline stage."""
-        self.current_stage = stage_name
-        progress_percent = int((self.completed_stages / self.total_stages) * 100)
-        logger.info(f"Starting stage: {stage_name} ({progress_percent}%)")
-        
-        if self.progress_callback:
-            self.progress_callback(stage_name, progress_percent)
+        with self._lock:
+            self.current_stage = stage_name
+            progress_percent = int((self.completed_stages / self.total_stages) * 100)
+            logger.info(f"Starting stage: {stage_name} ({progress_percent}%)")
+            
+            if self.progress_callback:
+                self.progress_callback(stage_name, progress_percent)
     
-    def complete_stage(self):
-        """Complete the current stage."""
-        self.completed_stages += 1
-        progress_percent = int((self.completed_stages / self.total_stages) * 100)
-        logger.info(f"Completed stage: {self.current_stage} ({progress_percent}%)")
-        
-        if self.progress_callback:
-            self.progress_callback(self.current_stage, progress_percent)
+    def complete_stage(self, stage_name: Optional[str] = None):
+        """Complete a stage (the most recently started one if not given)."""
+        with self._lock:
+            stage_name = stage_name or self.current_stage
+            self.completed_stages += 1
+            progress_percent = int((self.completed_stages / self.total_stages) * 100)
+            logger.info(f"Completed stage: {stage_name} ({progress_percent}%)")
+            
+            if self.progress_callback:
+                self.progress_callback(stage_name, progress_percent)
     
     def report_substep(self, substep: str):
         """Report a substep within the current stage."""
@@ -78,7 +92,13 @@ class VNextPipeline:
                  monitoring_level: MonitoringLevel = MonitoringLevel.DETAILED,
                  enable_memory_monitoring: bool = True,
                  memory_warning_threshold_mb: float = 1024,
-                 memory_critical_threshold_mb: float = 2048):
+                 memory_critical_threshold_mb: float = 2048,
+                 artifact_format: str = "json",
+                 performance_history_path: Optional[str] = None,
+                 parallel_stages: bool = True,
+                 checkpoints: bool = True,
+                 stage_timeouts: Optional[Dict[str, Optional[float]]] = None,
+                 operation_timeout_seconds: Optional[float] = DEFAULT_OPERATION_TIMEOUT_SECONDS):
         """
         Initialize vNext pipeline.
         
@@ -91,6 +111,19 @@ class VNextPipeline:
             enable_memory_monitoring: Whether to enable memory monitoring
             memory_warning_threshold_mb: Memory warning threshold in MB
             memory_critical_threshold_mb: Memory critical threshold in MB
+            artifact_format: Audit artifact format ("json", "json-stream" or "binary")
+            performance_history_path: Cross-run performance history database
+                (defaults to performance_history.sqlite in base_audit_dir)
+            parallel_stages: Start planning and the before-audit snapshot as soon
+                as the structure is extracted, concurrently with inventory
+                extraction (False runs every stage on the calling thread)
+            checkpoints: Persist stage outputs to the audit directory so an
+                interrupted run can be continued with resume()
+            stage_timeouts: Deadlines in seconds of the Word stages (Extract,
+                Execute, Validate), merged over the watchdog defaults; None or 0
+                disables a deadline
+            operation_timeout_seconds: Deadline of a single Word call; when a
+                deadline expires Word is killed and the run ends with TIMEOUT
         """
         self.llm_client = llm_client
         self.base_audit_dir = base_audit_dir or "./audit_trails"
@@ -100,6 +133,14 @@ class VNextPipeline:
         self.enable_memory_monitoring = enable_memory_monitoring
         self.memory_warning_threshold_mb = memory_warning_threshold_mb
         self.memory_critical_threshold_mb = memory_critical_threshold_mb
+        self.artifact_format = artifact_format
+        self.performance_history_path = performance_history_path or os.path.join(
+            self.base_audit_dir, "performance_history.sqlite")
+        self.parallel_stages = parallel_stages
+        self.checkpoints = checkpoints
+        self.stage_timeouts = stage_timeouts
+        self.operation_timeout_seconds = operation_timeout_seconds
+        self.last_stage_timeline: Optional[Dict[str, Any]] = None
         
         # Initialize components (will be created per run)
         self.extractor: Optional[DocumentExtractor] = None
@@ -107,8 +148,14 @@ class VNextPipeline:
         self.executor: Optional[DocumentExecutor] = None
         self.validator: Optional[DocumentValidator] = None
         self.auditor: Optional[DocumentAuditor] = None
+        self.layout_tracker: Optional[LayoutDependencyTracker] = None
         self.error_handler: Optional[PipelineErrorHandler] = None
         self.vnext_logger: Optional[VNextLogger] = None
+        self.checkpoint_store: Optional[CheckpointStore] = None
+        self.watchdog: Optional[ComWatchdog] = None
+        
+        # Kept across runs, so long-lived pipelines (the job service) plan without setup
+        self._warm_planner: Optional[DocumentPlanner] = None
         
         # Run state
         self.current_audit_dir: Optional[str] = None
@@ -129,10 +176,43 @@ class VNextPipeline:
         """
         logger.info(f"Starting vNext pipeline processing for: {docx_path}")
         logger.info(f"User intent: {user_intent}")
+        return self._run(docx_path, user_intent)
+    
+    def resume(self, audit_directory: str) -> ProcessingResult:
+        """
+        Continue an interrupted run from the checkpoints in its audit directory.
+        
+        Stages whose inputs (source document, user intent and upstream
+        checkpoints) are unchanged are restored instead of rerun; a run that
+        already finished returns its recorded result unless the source
+        document has changed since.
+        
+        Args:
+            audit_directory: Run directory of the interrupted run
+            
+        Returns:
+            ProcessingResult with status and details
+            
+        Raises:
+            AuditError: If the directory has no checkpoint
+        """
+        store = CheckpointStore.open(audit_directory)
+        if store.result is not None and store.document_unchanged():
+            logger.info(f"Run already finished with status {store.result['status']}: {audit_directory}")
+            return ProcessingResult(**store.result)
         
+        logger.info(f"Resuming vNext pipeline run: {audit_directory}")
+        return self._run(store.document_path, store.user_intent, audit_directory=audit_directory)
+    
+    def _run(self, docx_path: str, user_intent: str, audit_directory: Optional[str] = None) -> ProcessingResult:
+        """Run the pipeline in a new run directory, or in audit_directory to resume it."""
         try:
             # Setup run environment (includes logger initialization)
-            self._setup_run_environment(docx_path)
+            if audit_directory is None:
+                self._setup_run_environment(docx_path)
+            else:
+                self._setup_run_environment(docx_path, audit_directory=audit_directory)
+            self._start_checkpoints(user_intent)
             
             # Log pipeline start
             self.vnext_logger.log_debug("Pipeline processing started", 
@@ -140,31 +220,15 @@ class VNextPipeline:
                                       user_intent=user_intent,
                                       monitoring_level=self.monitoring_level.value)
             
-            # Stage 1: Extract
-            self.progress_reporter.start_stage("Extract")
-            with self.vnext_logger.track_stage("Extract"):
-                structure, inventory = self._extract_document()
-            self.progress_reporter.complete_stage()
-            
-            # Stage 2: Plan
-            self.progress_reporter.start_stage("Plan")
-            with self.vnext_logger.track_stage("Plan"):
-                plan = self._generate_plan(structure, user_intent)
-            self.progress_reporter.complete_stage()
-            
-            # Stage 3: Execute
-            self.progress_reporter.start_stage("Execute")
-            with self.vnext_logger.track_stage("Execute"):
-                modified_docx_path = self._execute_plan(plan)
-            self.progress_reporter.complete_stage()
-            
-            # Stage 4: Validate
-            self.progress_reporter.start_stage("Validate")
-            with self.vnext_logger.track_stage("Validate"):
-                validation_result = self._validate_modifications(structure, modified_docx_path)
-                if not validation_result.is_valid:
-                    return self._handle_validation_failure(validation_result)
-            self.progress_reporter.complete_stage()
+            # Stages 1-4: Extract, Plan, Execute and Validate as a stage DAG
+            values = self._run_stage_graph(user_intent)
+            structure = values["structure"]
+            inventory = values["inventory"]
+            plan = values["plan"]
+            modified_docx_path = values["modified_docx_path"]
+            validation_result = values["validation_result"]
+            if not validation_result.is_valid:
+                return self._finish_run(self._handle_validation_failure(validation_result), completed=True)
             
             # Stage 5: Audit
             self.progress_reporter.start_stage("Audit")
@@ -176,24 +240,215 @@ class VNextPipeline:
             self.vnext_logger.log_debug("Pipeline processing completed successfully")
             
             logger.info("Pipeline processing completed successfully")
-            return ProcessingResult(
+            return self._finish_run(ProcessingResult(
                 status="SUCCESS",
                 message="Document processed successfully",
                 audit_directory=self.current_audit_dir,
                 warnings=self.error_handler.warnings_logger.get_warnings() if self.error_handler else []
-            )
+            ), completed=True)
             
         except Exception as e:
             logger.error(f"Pipeline processing failed: {str(e)}")
             if self.vnext_logger:
                 self.vnext_logger.log_error(e, {"pipeline_stage": "overall", "docx_path": docx_path})
-            return self._handle_pipeline_error(e)
+            return self._finish_run(self._handle_pipeline_error(e))
         
         finally:
             self._cleanup_run_environment()
     
-    def _setup_run_environment(self, docx_path: str):
-        """Setup run environment with timestamped directories and working copies."""
+    def _run_stage_graph(self, user_intent: str) -> Dict[str, Any]:
+        """
+        Run Extract, Plan, Execute and Validate as a dependency graph.
+        
+        Planning only needs the structure, so it starts on a worker thread as
+        soon as structure extraction finishes, while inventory extraction
+        continues on this thread. The before-audit snapshot is written
+        concurrently in the same way. Word stages (Extract, Execute,
+        Validate) stay on this thread because COM objects are
+        apartment-threaded; Execute also waits for the inventory so the
+        extractor has closed the working copy before it is modified.
+        
+        With checkpoints enabled, Extract, Plan and Execute first try to
+        restore their outputs from the run directory (see resume()) and
+        checkpoint them when they do run.
+        
+        The Word stages run under the watchdog's stage deadlines (Plan is
+        bounded by the LLM client's own timeout).
+        
+        Args:
+            user_intent: User's intent description for LLM planning
+            
+        Returns:
+            Dict[str, Any]: structure, inventory, plan, modified_docx_path and
+                validation_result
+        """
+        def tracked(stage_name: str, func: Callable[[], Any]) -> Any:
+            self.progress_reporter.start_stage(stage_name)
+            with self.vnext_logger.track_stage(stage_name), self._stage_deadline(stage_name):
+                result = func()
+            self.progress_reporter.complete_stage(stage_name)
+            return result
+        
+        def extract(values, emit):
+            def run():
+                structure = self._restore_checkpoint("structure")
+                inventory = self._restore_checkpoint("inventory")
+                if structure is not None:
+                    # Planning starts from the checkpointed structure
+                    emit("structure", structure)
+                if inventory is None:
+                    structure_saved = False
+                    
+                    def on_structure(extracted):
+                        nonlocal structure_saved
+                        if structure is None:
+                            # Checkpoint before planning starts, the plan checkpoint depends on it
+                            self._save_checkpoint("structure", extracted)
+                            structure_saved = True
+                            emit("structure", extracted)
+                    extracted, inventory = self._extract_document(on_structure=on_structure)
+                    if structure is None:
+                        structure = extracted
+                        if not structure_saved:
+                            self._save_checkpoint("structure", structure)
+                    self._save_checkpoint("inventory", inventory)
+                self.vnext_logger.update_run_context(paragraph_count=len(structure.paragraphs))
+                return structure, inventory
+            return tracked("Extract", run)
+        
+        def plan(values, emit):
+            def run():
+                restored = self._restore_checkpoint("plan")
+                if restored is not None:
+                    return restored
+                generated = self._generate_plan(values["structure"], user_intent)
+                self._save_checkpoint("plan", generated)
+                return generated
+            return tracked("Plan", run)
+        
+        def execute(values, emit):
+            def run():
+                restored = self._restore_checkpoint("modified_docx", destination=self.working_docx_path)
+                if restored is not None:
+                    return restored
+                modified_docx_path = self._execute_plan(values["plan"])
+                self._save_checkpoint("modified_docx", file_path=modified_docx_path)
+                return modified_docx_path
+            return tracked("Execute", run)
+        
+        def snapshot_before(values, emit):
+            with self.vnext_logger.track_operation("audit_before_snapshot"):
+                self.auditor.save_before_snapshot(self.original_docx_path, values["structure"])
+        
+        graph = StageGraph(max_workers=2 if self.parallel_stages else 0)
+        graph.add_stage("Extract", extract, provides=("structure", "inventory"))
+        graph.add_stage("Plan", plan, requires=("structure",), provides=("plan",), affinity="worker")
+        if self.auditor is not None:
+            graph.add_stage("Snapshot", snapshot_before, requires=("structure",), affinity="worker")
+        graph.add_stage("Execute", execute, requires=("plan", "inventory"), provides=("modified_docx_path",))
+        graph.add_stage("Validate",
+                        lambda values, emit: tracked("Validate", lambda: self._validate_modifications(
+                            values["structure"], values["modified_docx_path"])),
+                        requires=("structure", "modified_docx_path"), provides=("validation_result",))
+        
+        try:
+            return graph.run()
+        finally:
+            self.last_stage_timeline = {"stages": graph.timeline(), "overlaps": graph.overlaps()}
+            if self.vnext_logger:
+                self.vnext_logger.log_debug("Stage timeline", **self.last_stage_timeline)
+    
+    def _finish_run(self, result: ProcessingResult, completed: bool = False) -> ProcessingResult:
+        """
+        Record the final status of the run for the performance history.
+        
+        Args:
+            result: Final processing result
+            completed: The run went through all stages (resume() returns the
+                result instead of rerunning); False after a pipeline error,
+                which leaves the run resumable
+        """
+        if self.vnext_logger:
+            self.vnext_logger.update_run_context(status=result.status)
+        if completed and self.checkpoint_store is not None:
+            try:
+                self.checkpoint_store.finish(result)
+            except Exception as e:
+                logger.warning(f"Failed to record run result in checkpoint: {e}")
+        return result
+    
+    def _start_checkpoints(self, user_intent: str):
+        """Open the checkpoint store of the current run directory."""
+        if not self.checkpoints or not self.current_audit_dir:
+            return
+        try:
+            store = CheckpointStore(self.current_audit_dir, self.artifact_format)
+            store.start_run(self.original_docx_path, user_intent)
+            self.checkpoint_store = store
+        except Exception as e:
+            # Checkpoints only make runs resumable; never fail a run over them
+            logger.warning(f"Checkpoints disabled for this run: {e}")
+            self.checkpoint_store = None
+    
+    def _restore_checkpoint(self, name: str, destination: Optional[str] = None) -> Any:
+        """
+        Checkpointed artifact with unchanged inputs, or None.
+        
+        Args:
+            name: Checkpoint name
+            destination: Copy a file checkpoint here (returns the path)
+        """
+        if self.checkpoint_store is None:
+            return None
+        try:
+            if destination is not None:
+                artifact = destination if self.checkpoint_store.restore_file(name, destination) else None
+            else:
+                artifact = self.checkpoint_store.restore_model(name)
+        except Exception as e:
+            logger.warning(f"Failed to restore checkpoint {name}: {e}")
+            return None
+        if artifact is not None:
+            logger.info(f"Restored {name} from checkpoint")
+        return artifact
+    
+    def _save_checkpoint(self, name: str, artifact: Any = None, file_path: Optional[str] = None):
+        """Persist a stage output; failures only disable resuming from it."""
+        if self.checkpoint_store is None:
+            return
+        try:
+            if file_path is not None:
+                self.checkpoint_store.save_file(name, file_path)
+            else:
+                self.checkpoint_store.save_model(name, artifact)
+        except Exception as e:
+            logger.warning(f"Failed to write checkpoint {name}: {e}")
+    
+    def _stage_deadline(self, stage_name: str):
+        """Watchdog deadline of a Word stage; Plan does not drive Word."""
+        if self.watchdog is None or stage_name not in WORD_STAGES:
+            return nullcontext()
+        return self.watchdog.stage(stage_name)
+    
+    def _on_word_timeout(self, expiry: DeadlineExpiry):
+        """Record a killed Word instance (called on the watchdog thread)."""
+        if self.vnext_logger is None:
+            return
+        self.vnext_logger.log_warning(f"Word {expiry.kind} '{expiry.name}' timed out, Word killed",
+                                      expiry.to_dict())
+        # The killed Word drops out of tracking; the next Word stage attaches a new instance
+        memory_monitor = getattr(self.vnext_logger, "memory_monitor", None)
+        if memory_monitor is not None:
+            memory_monitor.acknowledge_recycle()
+    
+    def _setup_run_environment(self, docx_path: str, audit_directory: Optional[str] = None):
+        """
+        Setup run environment with timestamped directories and working copies.
+        
+        Args:
+            docx_path: Path to input DOCX file
+            audit_directory: Existing run directory to reuse when resuming
+        """
         self.progress_reporter.report_substep("Setting up run environment")
         
         # Validate input file
@@ -203,8 +458,11 @@ class VNextPipeline:
         self.original_docx_path = os.path.abspath(docx_path)
         
         # Create timestamped audit directory
-        self.auditor = DocumentAuditor(self.base_audit_dir)
-        self.current_audit_dir = self.auditor.create_audit_directory()
+        self.auditor = DocumentAuditor(self.base_audit_dir, artifact_format=self.artifact_format)
+        if audit_directory is None:
+            self.current_audit_dir = self.auditor.create_audit_directory()
+        else:
+            self.current_audit_dir = self.auditor.open_audit_directory(audit_directory)
         
         # Initialize comprehensive logging and monitoring
         self.vnext_logger = create_vnext_logger(
@@ -212,12 +470,22 @@ class VNextPipeline:
             monitoring_level=self.monitoring_level,
             enable_memory_monitoring=self.enable_memory_monitoring,
             memory_warning_threshold_mb=self.memory_warning_threshold_mb,
-            memory_critical_threshold_mb=self.memory_critical_threshold_mb
+            memory_critical_threshold_mb=self.memory_critical_threshold_mb,
+            history_path=self.performance_history_path
         )
         
         # Initialize error handler
         self.error_handler = PipelineErrorHandler(self.current_audit_dir)
         
+        # Hard deadlines for Word calls; an expired one kills Word
+        memory_monitor = getattr(self.vnext_logger, "memory_monitor", None)
+        self.watchdog = ComWatchdog(stage_timeouts=self.stage_timeouts,
+                                    operation_timeout_seconds=self.operation_timeout_seconds,
+                                    on_timeout=self._on_word_timeout,
+                                    # Memory monitoring covers only this run's Word instances
+                                    on_attach=memory_monitor.attach_word_process if memory_monitor else None,
+                                    on_detach=memory_monitor.detach_word_process if memory_monitor else None)
+        
         # Create temporary working directory
         self.temp_dir = tempfile.mkdtemp(prefix="vnext_pipeline_")
         
@@ -229,6 +497,8 @@ class VNextPipeline:
         # Log document size for large document warnings
         try:
             file_size_mb = os.path.getsize(self.original_docx_path) / (1024 * 1024)
+            self.vnext_logger.update_run_context(document_path=self.original_docx_path,
+                                                 document_size_mb=file_size_mb)
             log_large_document_warning(self.vnext_logger, file_size_mb, 0)  # paragraph count will be updated after extraction
         except Exception:
             pass
@@ -245,19 +515,28 @@ class VNextPipeline:
         logger.debug(f"  Audit directory: {self.current_audit_dir}")
         logger.debug(f"  Temp directory: {self.temp_dir}")
     
-    def _extract_document(self) -> tuple[StructureV1, InventoryFullV1]:
-        """Extract document structure and inventory."""
+    def _extract_document(self, on_structure: Optional[Callable[[StructureV1], None]] = None
+                          ) -> tuple[StructureV1, InventoryFullV1]:
+        """
+        Extract document structure and inventory.
+        
+        Args:
+            on_structure: Called with the structure before inventory extraction
+                starts, so dependent stages can begin early
+        """
         with self.vnext_logger.track_operation("document_extraction") as metrics:
             self.progress_reporter.report_substep("Initializing extractor")
             
             try:
                 with self.vnext_logger.track_operation("extractor_initialization"):
-                    self.extractor = DocumentExtractor(visible=self.visible)
+                    self.extractor = DocumentExtractor(visible=self.visible, watchdog=self.watchdog)
                 
                 with self.extractor:
                     self.progress_reporter.report_substep("Extracting document structure")
                     with self.vnext_logger.track_operation("structure_extraction"):
                         structure = self.extractor.extract_structure(self.working_docx_path)
+                    if on_structure is not None:
+                        on_structure(structure)
                     
                     self.progress_reporter.report_substep("Extracting document inventory")
                     with self.vnext_logger.track_operation("inventory_extraction"):
@@ -326,15 +605,23 @@ class VNextPipeline:
             self.progress_reporter.report_substep("Initializing planner")
             
             try:
-                with self.vnext_logger.track_operation("planner_initialization"):
-                    self.planner = DocumentPlanner(
-                        llm_client=self.llm_client,
-                        schema_path=None  # Use default schema
-                    )
+                # The planner only depends on the LLM client, so it stays warm across runs
+                if self._warm_planner is None:
+                    with self.vnext_logger.track_operation("planner_initialization"):
+                        self._warm_planner = DocumentPlanner(
+                            llm_client=self.llm_client,
+                            schema_path=None  # Use default schema
+                        )
+                self.planner = self._warm_planner
                 
                 self.progress_reporter.report_substep("Generating plan through LLM")
-                with self.vnext_logger.track_operation("llm_plan_generation"):
-                    plan = self.planner.generate_plan(structure, user_intent)
+                with self.vnext_logger.track_operation("llm_plan_generation") as llm_metrics:
+                    try:
+                        plan = self.planner.generate_plan(structure, user_intent)
+                    finally:
+                        # Streaming clients report time-to-first-op and cancellation
+                        if getattr(self.planner, "last_llm_metrics", None):
+                            llm_metrics.metadata.update(self.planner.last_llm_metrics)
                 
                 self.progress_reporter.report_substep("Validating plan schema and constraints")
                 with self.vnext_logger.track_operation("plan_validation"):
@@ -382,7 +669,10 @@ class VNextPipeline:
             try:
                 with self.vnext_logger.track_operation("executor_initialization"):
                     warnings_log_path = os.path.join(self.current_audit_dir, "warnings.log")
-                    self.executor = DocumentExecutor(warnings_log_path=warnings_log_path)
+                    self.layout_tracker = LayoutDependencyTracker()
+                    self.executor = DocumentExecutor(warnings_log_path=warnings_log_path,
+                                                     layout_tracker=self.layout_tracker,
+                                                     watchdog=self.watchdog)
                 
                 self.progress_reporter.report_substep(f"Executing {len(plan.ops)} atomic operations")
                 
@@ -405,6 +695,9 @@ class VNextPipeline:
                     "result_docx_path": result_docx_path,
                     "warnings_log": warnings_log_path
                 }
+                optimization_report = getattr(self.executor, 'last_optimization_report', None)
+                if isinstance(optimization_report, PlanOptimizationReport):
+                    execution_stats["plan_optimization"] = optimization_report.to_dict()
                 
                 self.vnext_logger.log_debug("Plan execution completed", **execution_stats)
                 
@@ -432,7 +725,9 @@ class VNextPipeline:
             
             try:
                 with self.vnext_logger.track_operation("validator_initialization"):
-                    self.validator = DocumentValidator(visible=self.visible)
+                    self.validator = DocumentValidator(visible=self.visible,
+                                                       layout_tracker=self.layout_tracker,
+                                                       watchdog=self.watchdog)
                 
                 with self.validator:
                     self.progress_reporter.report_substep("Running validation assertions")
@@ -490,6 +785,9 @@ class VNextPipeline:
                         after_structure=validation_result.modified_structure,
                         plan=plan
                     )
+                    self.auditor.save_inventory(inventory)
+                    if self.layout_tracker is not None:
+                        self.auditor.save_layout_decisions(self.layout_tracker.to_dict())
                 
                 self.progress_reporter.report_substep("Generating diff report")
                 with self.vnext_logger.track_operation("diff_report_generation"):
@@ -539,6 +837,8 @@ class VNextPipeline:
             )
             
             # Create audit trail for failed validation
+            if self.layout_tracker is not None:
+                self.auditor.save_layout_decisions(self.layout_tracker.to_dict())
             self.auditor.write_status("FAILED_VALIDATION", 
                                     f"Validation failed: {'; '.join(validation_result.errors)}")
             
@@ -564,7 +864,9 @@ class VNextPipeline:
         
         try:
             # Determine pipeline stage from error type
-            if isinstance(error, ExtractionError):
+            if isinstance(error, WordTimeoutError):
+                stage = error.details.get("stage") or "Unknown"
+            elif isinstance(error, ExtractionError):
                 stage = "Extract"
             elif isinstance(error, PlanningError):
                 stage = "Plan"
@@ -589,7 +891,8 @@ class VNextPipeline:
                 
                 # Create audit trail for error
                 if self.auditor:
-                    self.auditor.write_status("ROLLBACK", f"Pipeline error: {str(error)}")
+                    status = "TIMEOUT" if recovery_result.status is ProcessingStatus.TIMEOUT else "ROLLBACK"
+                    self.auditor.write_status(status, f"Pipeline error: {str(error)}")
                 
                 return ProcessingResult(
                     status=recovery_result.status.value,
@@ -618,6 +921,15 @@ class VNextPipeline:
     
     def _cleanup_run_environment(self):
         """Cleanup temporary files and resources."""
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        
+        # Buffered warnings of this run must reach disk, also after errors
+        if self.error_handler:
+            self.error_handler.warnings_logger.close()
+        if self.current_audit_dir:
+            close_log_sinks(self.current_audit_dir)
+        
         try:
             # Cleanup monitoring and save final reports
             if self.vnext_logger:
@@ -640,6 +952,8 @@ class VNextPipeline:
         self.temp_dir = None
         
         # Clear component references
+        self.checkpoint_store = None
+        self.watchdog = None
         self.extractor = None
         self.planner = None
         self.executor = None
@@ -6,5 +6,6 @@ with whitelist operation enforcement.
 """
 
 from .document_planner import DocumentPlanner
+from .prompt_compaction import PromptCompactionConfig, CompactPrompt, compact_structure, estimate_tokens
 
-__all__ = ["DocumentPlanner"]
\ No newline at end of file
+__all__ = ["DocumentPlanner", "PromptCompactionConfig", "CompactPrompt", "compact_structure", "estimate_tokens"]
\ No newline at end of file
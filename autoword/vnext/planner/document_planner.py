@@ -19,6 +19,7 @@ from ..models import (
 )
 from ..exceptions import PlanningError, SchemaValidationError, WhitelistViolationError
 from ..constraints import RuntimeConstraintEnforcer
+from .prompt_compaction import PromptCompactionConfig, compact_structure
 from ...core.llm_client import LLMClient, ModelType, LLMResponse
 
 
@@ -40,7 +41,8 @@ class DocumentPlanner:
     
     def __init__(self, llm_client: Optional[LLMClient] = None, 
                  schema_path: Optional[str] = None,
-                 constraint_enforcer: Optional[RuntimeConstraintEnforcer] = None):
+                 constraint_enforcer: Optional[RuntimeConstraintEnforcer] = None,
+                 prompt_compaction: Optional[PromptCompactionConfig] = None):
         """
         Initialize document planner.
         
@@ -48,9 +50,14 @@ class DocumentPlanner:
             llm_client: LLM client instance (creates default if None)
             schema_path: Path to plan.v1.json schema file
             constraint_enforcer: Runtime constraint enforcer (creates default if None)
+            prompt_compaction: Structure prompt compaction settings (compacts with
+                the default token budget if None; pass enabled=False for full JSON)
         """
         self.llm_client = llm_client or LLMClient()
         self.constraint_enforcer = constraint_enforcer or RuntimeConstraintEnforcer()
+        self.prompt_compaction = prompt_compaction or PromptCompactionConfig()
+        self.last_llm_metrics: Optional[Dict[str, Any]] = None
+        self.last_prompt_stats: Optional[Dict[str, Any]] = None
         
         # Load JSON schema for validation
         if schema_path is None:
@@ -83,14 +90,19 @@ class DocumentPlanner:
             # Build user prompt with structure and intent
             user_prompt = self._build_user_prompt(structure, user_intent)
             
-            # Call LLM with JSON retry logic
+            # Call LLM with JSON retry logic; streaming clients validate ops as they arrive
             logger.info("Generating plan through LLM...")
+            call_kwargs = {}
+            if getattr(self.llm_client, "stream", False):
+                call_kwargs["item_validator"] = self.validate_streamed_operation
             response = self.llm_client.call_with_json_retry(
                 ModelType.GPT5,
                 system_prompt,
                 user_prompt,
-                max_json_retries=3
+                max_json_retries=3,
+                **call_kwargs
             )
+            self.last_llm_metrics = getattr(response, "metrics", None)
             
             if not response.success:
                 raise PlanningError(
@@ -200,6 +212,37 @@ class DocumentPlanner:
             warnings=warnings
         )
     
+    def validate_streamed_operation(self, op: Any, index: int) -> Optional[str]:
+        """
+        Validate a single operation while the plan is still streaming.
+        
+        Used as the LLM client's item validator so that generation is cancelled
+        at the first non-whitelisted or malformed operation.
+        
+        Args:
+            op: Parsed operation object
+            index: Position of the operation in the ops array
+            
+        Returns:
+            Error message, or None if the operation is valid
+        """
+        if not isinstance(op, dict):
+            return f"Operation {index}: Must be an object"
+        
+        op_type = op.get("operation_type")
+        if op_type not in self.WHITELISTED_OPERATIONS:
+            return f"Operation {index}: {op_type}: Operation type not whitelisted"
+        
+        try:
+            jsonschema.validate(op, self.plan_schema["properties"]["ops"]["items"])
+        except jsonschema.ValidationError as e:
+            return f"Operation {index}: Schema validation error: {e.message}"
+        
+        errors = self._validate_operation_constraints(op, op_type)
+        if errors:
+            return f"Operation {index}: {'; '.join(errors)}"
+        return None
+    
     def check_whitelist_compliance(self, plan: PlanV1) -> ValidationResult:
         """
         Ensure only whitelisted operations.
@@ -285,11 +328,15 @@ Return only the JSON plan, no explanations or markdown formatting."""
         Returns:
             User prompt string
         """
-        # Convert structure to JSON for LLM
-        structure_json = structure.model_dump_json(indent=2)
+        # Compact the structure for the LLM (full JSON when compaction is disabled)
+        compacted = compact_structure(structure, self.prompt_compaction)
+        self.last_prompt_stats = compacted.to_dict()
+        if compacted.truncated_sections or compacted.dropped_sections:
+            logger.warning(f"Structure prompt exceeded token budget; truncated "
+                           f"{compacted.truncated_sections}, dropped {compacted.dropped_sections}")
         
         return f"""Document Structure:
-{structure_json}
+{compacted.text}
 
 User Intent:
 {user_intent}
@@ -0,0 +1,316 @@
+"""
+Structure-aware prompt compaction for plan generation.
+
+Serializing a whole StructureV1 into the planner prompt is dominated by
+paragraph skeletons that repeat the same style name thousands of times.
+This module renders the structure as a compact, line-oriented view instead:
+
+- metadata: one line of non-empty document properties
+- outline: every heading with its level, style, paragraph index and the
+  number of paragraphs in its section
+- styles: the style table deduplicated by name, with styles sharing an
+  identical definition grouped on one line and per-style usage counts
+- fields and tables: identical fields (same type and code) and tables of the
+  same shape grouped on one line with their paragraph positions
+- paragraph_runs: consecutive paragraphs with the same style collapsed into
+  one run line with a short preview of the first paragraph
+
+Sections are emitted in priority order under a configurable token budget.
+When a section does not fit it is truncated line by line, and lower
+priority sections are dropped. Heading texts and style names are copied
+verbatim so that plans referencing them stay valid.
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+SECTION_PRIORITY = ("metadata", "outline", "styles", "fields", "tables", "paragraph_runs")
+MAX_LISTED_POSITIONS = 8
+
+_SECTION_TITLES = {
+    "metadata": "Metadata",
+    "outline": "Heading outline (level, text, style, paragraph index, section paragraphs)",
+    "fields": "Fields (paragraph positions, type, code)",
+    "styles": "Styles (name(s): definition, paragraphs using it)",
+    "tables": "Tables (paragraph positions, rows x columns)",
+    "paragraph_runs": "Paragraph runs (paragraph range, style, count, first preview)",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the LLM token count of a text.
+
+    CJK characters count as one token each, other characters as one token
+    per four characters, which tracks common BPE tokenizers closely enough
+    for budgeting.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    wide = sum(1 for ch in text if ch >= "⺀")
+    return wide + math.ceil((len(text) - wide) / 4)
+
+
+@dataclass
+class PromptCompactionConfig:
+    """Configuration for structure prompt compaction."""
+    enabled: bool = True
+    token_budget: Optional[int] = 6000  # Budget for the structure section; None for unlimited
+    preview_chars: int = 40
+    section_priority: Tuple[str, ...] = SECTION_PRIORITY
+
+
+@dataclass
+class CompactPrompt:
+    """Compacted structure text with size measurements."""
+    text: str
+    original_tokens: int
+    compact_tokens: int
+    included_sections: List[str] = field(default_factory=list)
+    truncated_sections: List[str] = field(default_factory=list)
+    dropped_sections: List[str] = field(default_factory=list)
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of estimated tokens saved relative to the full JSON."""
+        if not self.original_tokens:
+            return 0.0
+        return 1.0 - self.compact_tokens / self.original_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "original_tokens": self.original_tokens,
+            "compact_tokens": self.compact_tokens,
+            "reduction": self.reduction,
+            "included_sections": self.included_sections,
+            "truncated_sections": self.truncated_sections,
+            "dropped_sections": self.dropped_sections,
+        }
+
+
+def _structure_dict(structure: Any) -> Dict[str, Any]:
+    if isinstance(structure, dict):
+        return structure
+    if hasattr(structure, "to_structure"):
+        structure = structure.to_structure()
+    return structure.model_dump(mode="json")
+
+
+def _quote(text: Any) -> str:
+    return json.dumps(text, ensure_ascii=False)
+
+
+def _preview(text: Optional[str], limit: int) -> str:
+    text = (text or "").strip()
+    return _quote(text if len(text) <= limit else text[:limit] + "…")
+
+
+def _render_metadata(data: Dict[str, Any], config: PromptCompactionConfig) -> List[str]:
+    metadata = {key: value for key, value in (data.get("metadata") or {}).items() if value not in (None, "")}
+    metadata["paragraphs_extracted"] = len(data.get("paragraphs") or [])
+    return [json.dumps(metadata, ensure_ascii=False, separators=(",", ":"))]
+
+
+def _render_outline(data: Dict[str, Any], config: PromptCompactionConfig) -> List[str]:
+    headings = sorted(data.get("headings") or [], key=lambda h: h.get("paragraph_index", 0))
+    paragraph_indexes = sorted(p.get("index", i) for i, p in enumerate(data.get("paragraphs") or []))
+    last_index = paragraph_indexes[-1] if paragraph_indexes else None
+
+    lines = []
+    for position, heading in enumerate(headings):
+        start = heading.get("paragraph_index", 0)
+        level = heading.get("level") or 1
+        # Section ends at the next heading of the same or a higher level
+        end = None
+        for following in headings[position + 1:]:
+            if (following.get("level") or 1) <= level:
+                end = following.get("paragraph_index")
+                break
+        if end is None:
+            end = last_index + 1 if last_index is not None and last_index >= start else start + 1
+        lines.append(f"{'  ' * (level - 1)}H{level} {_quote(heading.get('text', ''))} "
+                     f"[{heading.get('style_name') or '-'}] p{start} +{max(end - start - 1, 0)}")
+    return lines
+
+
+def _positions(indexes: List[Any]) -> str:
+    listed = ",".join(f"p{index}" for index in indexes[:MAX_LISTED_POSITIONS])
+    if len(indexes) > MAX_LISTED_POSITIONS:
+        listed += f",…(+{len(indexes) - MAX_LISTED_POSITIONS})"
+    return listed
+
+
+def _render_fields(data: Dict[str, Any], config: PromptCompactionConfig) -> List[str]:
+    groups: Dict[Tuple[Any, Any], List[Dict[str, Any]]] = {}
+    for item in data.get("fields") or []:
+        groups.setdefault((item.get("field_type"), (item.get("field_code") or "").strip()), []).append(item)
+
+    lines = []
+    for (field_type, code), items in groups.items():
+        line = f"{_positions([item.get('paragraph_index') for item in items])} {field_type}"
+        if code:
+            line += f" code={_quote(code)}"
+        if len(items) > 1:
+            line += f" ×{len(items)}"
+        elif items[0].get("result_text"):
+            line += f" result={_preview(items[0]['result_text'], config.preview_chars)}"
+        lines.append(line)
+    return lines
+
+
+def _describe_style(style: Dict[str, Any]) -> str:
+    parts = [style.get("type") or "paragraph"]
+    for key in ("font", "paragraph"):
+        spec = {name: value for name, value in (style.get(key) or {}).items() if value is not None}
+        if spec:
+            parts.append(f"{key}=" + json.dumps(spec, ensure_ascii=False, separators=(",", ":")))
+    if style.get("based_on"):
+        parts.append(f"based_on={_quote(style['based_on'])}")
+    return " ".join(parts)
+
+
+def _render_styles(data: Dict[str, Any], config: PromptCompactionConfig) -> List[str]:
+    usage: Dict[str, int] = {}
+    for paragraph in data.get("paragraphs") or []:
+        name = paragraph.get("style_name")
+        if name:
+            usage[name] = usage.get(name, 0) + 1
+
+    groups: Dict[str, List[str]] = {}
+    seen = set()
+    for style in data.get("styles") or []:
+        name = style.get("name")
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        groups.setdefault(_describe_style(style), []).append(name)
+
+    # Styles used by paragraphs but missing from the style table
+    for name in usage:
+        if name not in seen:
+            groups.setdefault("(definition not extracted)", []).append(name)
+
+    ordered = sorted(groups.items(), key=lambda item: -max(usage.get(name, 0) for name in item[1]))
+    lines = []
+    for description, names in ordered:
+        named = ", ".join(f"{_quote(name)}×{usage[name]}" if usage.get(name) else _quote(name) for name in names)
+        lines.append(f"{named}: {description}")
+    return lines
+
+
+def _render_tables(data: Dict[str, Any], config: PromptCompactionConfig) -> List[str]:
+    groups: Dict[Tuple[Any, Any, bool], List[Any]] = {}
+    for table in data.get("tables") or []:
+        shape = (table.get("rows"), table.get("columns"), bool(table.get("has_header")))
+        groups.setdefault(shape, []).append(table.get("paragraph_index"))
+    return [f"{_positions(indexes)} {rows}x{columns}" + (" header" if header else "")
+            + (f" ×{len(indexes)}" if len(indexes) > 1 else "")
+            for (rows, columns, header), indexes in groups.items()]
+
+
+def _render_paragraph_runs(data: Dict[str, Any], config: PromptCompactionConfig) -> List[str]:
+    lines = []
+    run: List[Dict[str, Any]] = []
+
+    def flush():
+        if not run:
+            return
+        first, last = run[0], run[-1]
+        span = f"p{first.get('index')}" if len(run) == 1 else f"p{first.get('index')}-{last.get('index')}"
+        heading = f" H{first.get('heading_level')}" if first.get("is_heading") else ""
+        lines.append(f"{span} [{first.get('style_name') or '-'}]{heading} ×{len(run)} "
+                     f"{_preview(first.get('preview_text'), config.preview_chars)}")
+
+    for paragraph in data.get("paragraphs") or []:
+        key = (paragraph.get("style_name"), paragraph.get("is_heading", False), paragraph.get("heading_level"))
+        if run and (key != (run[0].get("style_name"), run[0].get("is_heading", False), run[0].get("heading_level"))
+                    or paragraph.get("index", 0) != run[-1].get("index", 0) + 1):
+            flush()
+            run = []
+        run.append(paragraph)
+    flush()
+    return lines
+
+
+_RENDERERS = {
+    "metadata": _render_metadata,
+    "outline": _render_outline,
+    "fields": _render_fields,
+    "styles": _render_styles,
+    "tables": _render_tables,
+    "paragraph_runs": _render_paragraph_runs,
+}
+
+
+def compact_structure(structure: Any, config: Optional[PromptCompactionConfig] = None) -> CompactPrompt:
+    """
+    Render a document structure as a compact prompt section.
+
+    Args:
+        structure: StructureV1, CompactStructureV1 or an equivalent dict
+        config: Compaction settings (defaults to PromptCompactionConfig())
+
+    Returns:
+        CompactPrompt: Prompt text and size measurements
+    """
+    config = config or PromptCompactionConfig()
+    data = _structure_dict(structure)
+    original = json.dumps(data, ensure_ascii=False, indent=2, default=str)
+    original_tokens = estimate_tokens(original)
+
+    if not config.enabled:
+        return CompactPrompt(text=original, original_tokens=original_tokens, compact_tokens=original_tokens,
+                             included_sections=["full_json"])
+
+    header = f"schema_version: {data.get('schema_version', 'structure.v1')} (compact view)"
+    parts = [header]
+    remaining = None if config.token_budget is None else config.token_budget - estimate_tokens(header)
+    result = CompactPrompt(text="", original_tokens=original_tokens, compact_tokens=0)
+
+    for name in config.section_priority:
+        renderer = _RENDERERS.get(name)
+        if renderer is None:
+            raise ValueError(f"Unknown prompt section: {name}")
+        lines = renderer(data, config)
+        if not lines:
+            continue
+
+        title = f"## {_SECTION_TITLES[name]}"
+        if remaining is not None and remaining <= estimate_tokens(title) + 1:
+            result.dropped_sections.append(name)
+            continue
+
+        kept = [title]
+        used = estimate_tokens(title) + 1
+        for position, line in enumerate(lines):
+            cost = estimate_tokens(line) + 1
+            # Reserve room for the omission marker when truncating
+            marker_cost = 0 if position == len(lines) - 1 else 8
+            if remaining is not None and used + cost + marker_cost > remaining:
+                if position == 0:
+                    break
+                kept.append(f"... {len(lines) - position} more omitted")
+                used += estimate_tokens(kept[-1]) + 1
+                result.truncated_sections.append(name)
+                break
+            kept.append(line)
+            used += cost
+
+        if len(kept) == 1:
+            result.dropped_sections.append(name)
+            continue
+        parts.append("\n".join(kept))
+        result.included_sections.append(name)
+        if remaining is not None:
+            remaining -= used
+
+    result.text = "\n\n".join(parts)
+    result.compact_tokens = estimate_tokens(result.text)
+    return result
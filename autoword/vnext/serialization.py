@@ -0,0 +1,604 @@
+"""
+Pluggable serialization for structure, inventory and plan artifacts.
+
+The audit trail used to write every artifact with model_dump() followed by a
+pretty-printed json.dump(), building the whole dictionary tree in memory first.
+This module provides interchangeable serializers:
+
+- "json": the original pretty-printed JSON (default, backward compatible)
+- "json-stream": compact JSON written incrementally, one list item at a time
+- "binary": a compact MessagePack-encoded format with a versioned header
+
+and lazy readers that sniff the format of an existing artifact, so either
+format can be loaded in full or streamed item by item (e.g. paragraphs).
+"""
+
+import json
+import re
+import struct
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from .models import SchemaVersion, StructureV1, PlanV1, InventoryFullV1
+from .compact import CompactStructureV1
+from .exceptions import AuditError
+
+
+# Binary artifact header: magic + format version byte, then the schema version
+BINARY_MAGIC = b"AWB"
+BINARY_FORMAT_VERSION = 1
+
+ARTIFACT_MODELS: Dict[str, Type[BaseModel]] = {
+    SchemaVersion.STRUCTURE_V1.value: StructureV1,
+    SchemaVersion.PLAN_V1.value: PlanV1,
+    SchemaVersion.INVENTORY_FULL_V1.value: InventoryFullV1,
+}
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class _ItemStream:
+    """Marker for a top-level list whose items are dumped one at a time."""
+
+    __slots__ = ("length", "items")
+
+    def __init__(self, length: int, items: Iterator[Any]):
+        self.length = length
+        self.items = items
+
+
+def _dump_item(item: Any) -> Any:
+    return item.model_dump() if isinstance(item, BaseModel) else item
+
+
+def iter_artifact_fields(artifact: Any) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (key, value) pairs for the top-level fields of an artifact.
+
+    List fields are yielded as _ItemStream objects so serializers can write
+    them incrementally; everything else is yielded already dumped.
+    """
+    if isinstance(artifact, CompactStructureV1):
+        paragraphs = artifact.paragraphs
+        yield 'schema_version', artifact.schema_version
+        yield 'metadata', artifact.metadata.model_dump()
+        yield 'styles', _ItemStream(len(artifact.styles), (s.model_dump() for s in artifact.styles))
+        yield 'paragraphs', _ItemStream(len(paragraphs), (paragraphs.row_dict(i) for i in range(len(paragraphs))))
+        yield 'headings', _ItemStream(len(artifact.headings), (h.model_dump() for h in artifact.headings))
+        yield 'fields', _ItemStream(len(artifact.fields), (f.model_dump() for f in artifact.fields))
+        yield 'tables', _ItemStream(len(artifact.tables), (t.model_dump() for t in artifact.tables))
+        return
+
+    if not isinstance(artifact, BaseModel):
+        raise TypeError(f"Unsupported artifact type: {type(artifact).__name__}")
+
+    for name in type(artifact).model_fields:
+        value = getattr(artifact, name)
+        if isinstance(value, list):
+            yield name, _ItemStream(len(value), (_dump_item(item) for item in value))
+        elif isinstance(value, dict):
+            yield name, {k: _dump_item(v) for k, v in value.items()}
+        else:
+            yield name, _dump_item(value)
+
+
+def _artifact_schema_version(artifact: Any) -> str:
+    version = getattr(artifact, 'schema_version', None)
+    if version not in ARTIFACT_MODELS:
+        raise ValueError(f"Unsupported artifact schema version: {version!r}")
+    return version
+
+
+# Serializers
+
+class ArtifactSerializer:
+    """Base class for artifact serializers."""
+
+    name = ""
+    extension = ".json"
+
+    def dump(self, artifact: Any, path: Union[str, Path]) -> Path:
+        """
+        Write an artifact to path.
+
+        Args:
+            artifact: StructureV1, CompactStructureV1, PlanV1 or InventoryFullV1
+            path: Destination path (written as-is)
+
+        Returns:
+            Path: The written file path
+        """
+        raise NotImplementedError
+
+
+class PrettyJsonSerializer(ArtifactSerializer):
+    """Original pretty-printed JSON format."""
+
+    name = "json"
+    extension = ".json"
+
+    def dump(self, artifact: Any, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(artifact.model_dump(), f, indent=2, ensure_ascii=False, default=str)
+        return path
+
+
+class StreamingJsonSerializer(ArtifactSerializer):
+    """Compact JSON written incrementally without building the full dict tree."""
+
+    name = "json-stream"
+    extension = ".json"
+
+    def dump(self, artifact: Any, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        encoder = json.JSONEncoder(ensure_ascii=False, default=str, separators=(',', ':'))
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("{")
+            first_field = True
+            for key, value in iter_artifact_fields(artifact):
+                if not first_field:
+                    f.write(",\n")
+                first_field = False
+                f.write(encoder.encode(key))
+                f.write(":")
+                if isinstance(value, _ItemStream):
+                    f.write("[")
+                    first_item = True
+                    for item in value.items:
+                        f.write("\n" if first_item else ",\n")
+                        first_item = False
+                        f.write(encoder.encode(item))
+                    f.write("]")
+                else:
+                    f.write(encoder.encode(value))
+            f.write("}\n")
+        return path
+
+
+class BinaryArtifactSerializer(ArtifactSerializer):
+    """Compact MessagePack-encoded artifacts with a versioned header."""
+
+    name = "binary"
+    extension = ".msgpack"
+
+    def dump(self, artifact: Any, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        schema_version = _artifact_schema_version(artifact)
+        fields = list(iter_artifact_fields(artifact))
+        with open(path, 'wb') as f:
+            f.write(BINARY_MAGIC + bytes([BINARY_FORMAT_VERSION]))
+            writer = _MsgpackWriter(f)
+            writer.write(schema_version)
+            writer.write_map_header(len(fields))
+            for key, value in fields:
+                writer.write(key)
+                if isinstance(value, _ItemStream):
+                    writer.write_array_header(value.length)
+                    for item in value.items:
+                        writer.write(item)
+                else:
+                    writer.write(value)
+            writer.flush()
+        return path
+
+
+SERIALIZERS: Dict[str, Type[ArtifactSerializer]] = {}
+
+
+def register_serializer(serializer_class: Type[ArtifactSerializer]) -> Type[ArtifactSerializer]:
+    """Register a serializer class under its name."""
+    SERIALIZERS[serializer_class.name] = serializer_class
+    return serializer_class
+
+
+for _serializer_class in (PrettyJsonSerializer, StreamingJsonSerializer, BinaryArtifactSerializer):
+    register_serializer(_serializer_class)
+
+
+def get_serializer(name_or_serializer: Union[str, ArtifactSerializer, None] = None) -> ArtifactSerializer:
+    """
+    Resolve a serializer by name ("json", "json-stream", "binary").
+
+    Args:
+        name_or_serializer: Serializer name, instance, or None for the default
+
+    Raises:
+        ValueError: If the name is not registered
+    """
+    if isinstance(name_or_serializer, ArtifactSerializer):
+        return name_or_serializer
+    name = name_or_serializer or PrettyJsonSerializer.name
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown artifact format '{name}'. Available: {', '.join(sorted(SERIALIZERS))}")
+    return SERIALIZERS[name]()
+
+
+# Lazy readers
+
+class ArtifactReader:
+    """Lazy reader for a serialized artifact."""
+
+    format_name = ""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    @property
+    def schema_version(self) -> str:
+        raise NotImplementedError
+
+    def load(self) -> Dict[str, Any]:
+        """Load the complete artifact as a dictionary."""
+        raise NotImplementedError
+
+    def iter_items(self, key: str) -> Iterator[Any]:
+        """Stream the items of a top-level list field without loading the rest."""
+        raise NotImplementedError
+
+    def to_model(self) -> BaseModel:
+        """Load and validate the artifact as its Pydantic model."""
+        model_class = ARTIFACT_MODELS.get(self.schema_version)
+        if model_class is None:
+            raise AuditError(
+                f"Unsupported artifact schema version: {self.schema_version!r}",
+                audit_stage="artifact_loading",
+                artifact_path=str(self.path)
+            )
+        return model_class.model_validate(self.load())
+
+
+class JsonArtifactReader(ArtifactReader):
+    """Lazy reader for pretty or streaming JSON artifacts."""
+
+    format_name = "json"
+    _SCHEMA_VERSION_PATTERN = re.compile(r'"schema_version"\s*:\s*"([^"]+)"')
+
+    def __init__(self, path: Union[str, Path]):
+        super().__init__(path)
+        self._schema_version: Optional[str] = None
+
+    @property
+    def schema_version(self) -> str:
+        if self._schema_version is None:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                head = f.read(4096)
+            match = self._SCHEMA_VERSION_PATTERN.search(head)
+            self._schema_version = match.group(1) if match else self.load().get('schema_version', "")
+        return self._schema_version
+
+    def load(self) -> Dict[str, Any]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def iter_items(self, key: str) -> Iterator[Any]:
+        decoder = json.JSONDecoder()
+        pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        overlap = len(key) + 32
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            buffer = ""
+            while True:
+                match = pattern.search(buffer)
+                if match:
+                    pos = match.end()
+                    break
+                chunk = f.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    return
+                buffer = buffer[-overlap:] + chunk
+
+            eof = False
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos >= len(buffer):
+                    if eof:
+                        raise AuditError(f"Truncated JSON artifact: {self.path}", audit_stage="artifact_loading")
+                    chunk = f.read(_READ_CHUNK_SIZE)
+                    eof = not chunk
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                if buffer[pos] == "]":
+                    return
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    # A scalar at the buffer edge may continue in the next chunk
+                    complete = end < len(buffer) or eof
+                except json.JSONDecodeError:
+                    complete = False
+                if not complete:
+                    if eof:
+                        raise AuditError(f"Truncated JSON artifact: {self.path}", audit_stage="artifact_loading")
+                    chunk = f.read(_READ_CHUNK_SIZE)
+                    eof = not chunk
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                yield item
+                pos = end
+
+
+class BinaryArtifactReader(ArtifactReader):
+    """Lazy reader for binary artifacts."""
+
+    format_name = "binary"
+
+    def __init__(self, path: Union[str, Path]):
+        super().__init__(path)
+        self._schema_version: Optional[str] = None
+
+    def _open(self) -> Tuple[BinaryIO, "_MsgpackReader", str]:
+        f = open(self.path, 'rb')
+        header = f.read(len(BINARY_MAGIC) + 1)
+        if header[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            f.close()
+            raise AuditError(f"Not a binary artifact: {self.path}", audit_stage="artifact_loading")
+        if header[len(BINARY_MAGIC)] != BINARY_FORMAT_VERSION:
+            f.close()
+            raise AuditError(
+                f"Unsupported binary artifact format version {header[len(BINARY_MAGIC)]}: {self.path}",
+                audit_stage="artifact_loading"
+            )
+        reader = _MsgpackReader(f)
+        schema_version = reader.read()
+        return f, reader, schema_version
+
+    @property
+    def schema_version(self) -> str:
+        if self._schema_version is None:
+            f, _, self._schema_version = self._open()
+            f.close()
+        return self._schema_version
+
+    def load(self) -> Dict[str, Any]:
+        f, reader, _ = self._open()
+        with f:
+            return reader.read()
+
+    def iter_items(self, key: str) -> Iterator[Any]:
+        f, reader, _ = self._open()
+        with f:
+            for _ in range(reader.read_map_header()):
+                field_name = reader.read()
+                if field_name != key:
+                    reader.skip()
+                    continue
+                for _ in range(reader.read_array_header()):
+                    yield reader.read()
+                return
+
+
+def open_artifact(path: Union[str, Path]) -> ArtifactReader:
+    """
+    Open an artifact lazily, detecting its format from the file contents.
+
+    Args:
+        path: Path to a JSON or binary artifact
+
+    Returns:
+        ArtifactReader: Reader for the detected format
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(len(BINARY_MAGIC))
+    if magic == BINARY_MAGIC:
+        return BinaryArtifactReader(path)
+    return JsonArtifactReader(path)
+
+
+def load_artifact(path: Union[str, Path]) -> BaseModel:
+    """Load an artifact of either format as its Pydantic model."""
+    return open_artifact(path).to_model()
+
+
+# MessagePack encoding (subset: nil, bool, int, float, str, array, map)
+
+class _MsgpackWriter:
+    """Buffered MessagePack encoder."""
+
+    def __init__(self, stream: BinaryIO, buffer_size: int = 256 * 1024):
+        self._stream = stream
+        self._buffer = bytearray()
+        self._buffer_size = buffer_size
+        # Encoded form of short strings (keys, style names) that repeat per item
+        self._short_strings: Dict[str, bytes] = {}
+
+    def flush(self):
+        if self._buffer:
+            self._stream.write(self._buffer)
+            self._buffer = bytearray()
+
+    def write_array_header(self, length: int):
+        buf = self._buffer
+        if length < 16:
+            buf.append(0x90 | length)
+        elif length < 0x10000:
+            buf += struct.pack(">BH", 0xdc, length)
+        else:
+            buf += struct.pack(">BI", 0xdd, length)
+
+    def write_map_header(self, length: int):
+        buf = self._buffer
+        if length < 16:
+            buf.append(0x80 | length)
+        elif length < 0x10000:
+            buf += struct.pack(">BH", 0xde, length)
+        else:
+            buf += struct.pack(">BI", 0xdf, length)
+
+    def write(self, value: Any):
+        self._write(value)
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def _write(self, value: Any):
+        buf = self._buffer
+        if value.__class__ is str:
+            encoded = self._short_strings.get(value)
+            if encoded is not None:
+                buf += encoded
+                return
+        if isinstance(value, Enum):
+            value = value.value
+        if value is None:
+            buf.append(0xc0)
+        elif value is True:
+            buf.append(0xc3)
+        elif value is False:
+            buf.append(0xc2)
+        elif isinstance(value, int):
+            if 0 <= value < 0x80:
+                buf.append(value)
+            elif -32 <= value < 0:
+                buf.append(value & 0xff)
+            elif 0 <= value <= 0xffffffff:
+                buf += struct.pack(">BI", 0xce, value)
+            elif 0 <= value <= 0xffffffffffffffff:
+                buf += struct.pack(">BQ", 0xcf, value)
+            elif -0x80000000 <= value < 0:
+                buf += struct.pack(">Bi", 0xd2, value)
+            else:
+                buf += struct.pack(">Bq", 0xd3, value)
+        elif isinstance(value, float):
+            buf += struct.pack(">Bd", 0xcb, value)
+        elif isinstance(value, str):
+            data = value.encode('utf-8')
+            length = len(data)
+            if length < 32:
+                buf.append(0xa0 | length)
+            elif length < 0x100:
+                buf += struct.pack(">BB", 0xd9, length)
+            elif length < 0x10000:
+                buf += struct.pack(">BH", 0xda, length)
+            else:
+                buf += struct.pack(">BI", 0xdb, length)
+            buf += data
+            if length < 32 and len(self._short_strings) < 4096:
+                self._short_strings[value] = bytes([0xa0 | length]) + data
+        elif isinstance(value, (list, tuple)):
+            self.write_array_header(len(value))
+            for item in value:
+                self._write(item)
+        elif isinstance(value, dict):
+            self.write_map_header(len(value))
+            for k, v in value.items():
+                self._write(k)
+                self._write(v)
+        elif isinstance(value, (datetime, date)):
+            # Same textual form as json.dump(..., default=str)
+            self._write(str(value))
+        elif isinstance(value, BaseModel):
+            self._write(value.model_dump())
+        else:
+            self._write(str(value))
+
+
+class _MsgpackReader:
+    """Streaming MessagePack decoder over a binary file."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._buffer = b""
+        self._pos = 0
+
+    def _take(self, n: int) -> bytes:
+        end = self._pos + n
+        if end > len(self._buffer):
+            remaining = self._buffer[self._pos:]
+            chunk = self._stream.read(max(n - len(remaining), _READ_CHUNK_SIZE))
+            self._buffer = remaining + chunk
+            self._pos = 0
+            end = n
+            if end > len(self._buffer):
+                raise AuditError("Truncated binary artifact", audit_stage="artifact_loading")
+        data = self._buffer[self._pos:end]
+        self._pos = end
+        return data
+
+    def _byte(self) -> int:
+        return self._take(1)[0]
+
+    def read_array_header(self) -> int:
+        code = self._byte()
+        if 0x90 <= code <= 0x9f:
+            return code & 0x0f
+        if code == 0xdc:
+            return struct.unpack(">H", self._take(2))[0]
+        if code == 0xdd:
+            return struct.unpack(">I", self._take(4))[0]
+        raise AuditError(f"Expected array in binary artifact, got 0x{code:02x}", audit_stage="artifact_loading")
+
+    def read_map_header(self) -> int:
+        code = self._byte()
+        if 0x80 <= code <= 0x8f:
+            return code & 0x0f
+        if code == 0xde:
+            return struct.unpack(">H", self._take(2))[0]
+        if code == 0xdf:
+            return struct.unpack(">I", self._take(4))[0]
+        raise AuditError(f"Expected map in binary artifact, got 0x{code:02x}", audit_stage="artifact_loading")
+
+    def skip(self):
+        self.read()
+
+    def read(self) -> Any:
+        code = self._byte()
+        if code <= 0x7f:
+            return code
+        if code >= 0xe0:
+            return code - 0x100
+        if 0xa0 <= code <= 0xbf:
+            return self._take(code & 0x1f).decode('utf-8')
+        if 0x90 <= code <= 0x9f:
+            return [self.read() for _ in range(code & 0x0f)]
+        if 0x80 <= code <= 0x8f:
+            return self._read_map(code & 0x0f)
+        if code == 0xc0:
+            return None
+        if code == 0xc2:
+            return False
+        if code == 0xc3:
+            return True
+        if code == 0xcb:
+            return struct.unpack(">d", self._take(8))[0]
+        if code == 0xca:
+            return struct.unpack(">f", self._take(4))[0]
+        if code in _INT_FORMATS:
+            fmt, size = _INT_FORMATS[code]
+            return struct.unpack(fmt, self._take(size))[0]
+        if code in (0xd9, 0xda, 0xdb):
+            fmt, size = _LENGTH_FORMATS[code]
+            length = struct.unpack(fmt, self._take(size))[0]
+            return self._take(length).decode('utf-8')
+        if code in (0xdc, 0xdd):
+            fmt, size = _LENGTH_FORMATS[code]
+            length = struct.unpack(fmt, self._take(size))[0]
+            return [self.read() for _ in range(length)]
+        if code in (0xde, 0xdf):
+            fmt, size = _LENGTH_FORMATS[code]
+            return self._read_map(struct.unpack(fmt, self._take(size))[0])
+        raise AuditError(f"Unsupported binary artifact type code 0x{code:02x}", audit_stage="artifact_loading")
+
+    def _read_map(self, length: int) -> Dict[Any, Any]:
+        result = {}
+        for _ in range(length):
+            key = self.read()
+            result[key] = self.read()
+        return result
+
+
+_INT_FORMATS = {
+    0xcc: (">B", 1), 0xcd: (">H", 2), 0xce: (">I", 4), 0xcf: (">Q", 8),
+    0xd0: (">b", 1), 0xd1: (">h", 2), 0xd2: (">i", 4), 0xd3: (">q", 8),
+}
+
+_LENGTH_FORMATS = {
+    0xd9: (">B", 1), 0xda: (">H", 2), 0xdb: (">I", 4),
+    0xdc: (">H", 2), 0xdd: (">I", 4),
+    0xde: (">H", 2), 0xdf: (">I", 4),
+}
@@ -0,0 +1,380 @@
+"""
+Long-running job service for the vNext pipeline.
+
+The CLI, SimplePipeline and the GUI pay for imports, configuration loading
+and planner/LLM client setup on every invocation. JobService instead runs
+worker threads that take jobs from a persistent JobQueue and keep one warm
+VNextPipeline each (with its planner and LLM client) across jobs. The number
+of workers is the concurrency limit; a single worker processes jobs strictly
+in priority order.
+
+A small JSON API over HTTP (bound to localhost) or a Unix socket submits and
+inspects jobs:
+
+    GET    /health               Queue counts and worker activity
+    GET    /jobs?status=&limit=  Recent jobs
+    POST   /jobs                 {"docx_path", "intent", "priority"} -> 201 job
+    GET    /jobs/<id>            Job with live stage progress while running
+    GET    /jobs/<id>/result     Result and artifacts read from the run audit directory
+    GET    /jobs/<id>/output     Modified DOCX of a successful job
+    DELETE /jobs/<id>            Cancel a queued job
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .batch_manifest import output_path
+from .checkpoint import CHECKPOINT_FILE
+from .job_queue import ACTIVE_STATES, JobQueue
+from .watchdog import com_initialized
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_POLL_INTERVAL_SECONDS = 2.0
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Creates a worker's pipeline; receives the worker's progress callback
+PipelineFactory = Callable[[Callable[[str, int], None]], Any]
+
+
+class _Worker:
+    """State of one worker thread."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.thread: Optional[threading.Thread] = None
+        self.pipeline = None
+        self.job_id: Optional[str] = None
+        self.stage: Optional[str] = None
+        self.progress = 0
+        self.audit_directory_recorded = False
+        self.jobs_processed = 0
+
+
+class JobService:
+    """Worker threads processing jobs from a JobQueue with warm pipelines."""
+
+    def __init__(self, queue: JobQueue, pipeline_factory: PipelineFactory, workers: int = 1,
+                 poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS):
+        """
+        Initialize the service.
+
+        Args:
+            queue: Job queue to work from
+            pipeline_factory: Creates a VNextPipeline for a worker, passing the
+                worker's progress callback; called once per worker and again
+                only after a job raised out of the pipeline
+            workers: Number of jobs processed concurrently
+            poll_interval_seconds: How often idle workers check the queue for
+                jobs submitted by other processes
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.queue = queue
+        self.pipeline_factory = pipeline_factory
+        self.poll_interval_seconds = poll_interval_seconds
+        self.workers = [_Worker(f"worker-{i}") for i in range(1, workers + 1)]
+        self._condition = threading.Condition()
+        self._stopping = False
+
+    def start(self):
+        """Requeue jobs interrupted by an earlier service and start the workers."""
+        requeued = self.queue.requeue_running()
+        if requeued:
+            logger.info(f"Requeued {requeued} interrupted jobs")
+        self._stopping = False
+        for worker in self.workers:
+            worker.thread = threading.Thread(target=self._work, args=(worker,), name=worker.name, daemon=True)
+            worker.thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the workers once their current jobs are finished."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for worker in self.workers:
+            if worker.thread is not None:
+                worker.thread.join(timeout)
+
+    def submit(self, docx_path: str, user_intent: str, priority: int = 0) -> Dict[str, Any]:
+        """
+        Queue a document and wake an idle worker.
+
+        Raises:
+            ValueError: If the document does not exist or the intent is empty
+        """
+        if not docx_path or not os.path.isfile(docx_path):
+            raise ValueError(f"Document not found: {docx_path}")
+        if not docx_path.lower().endswith(".docx"):
+            raise ValueError(f"Not a DOCX file: {docx_path}")
+        if not user_intent or not user_intent.strip():
+            raise ValueError("Intent must not be empty")
+        job = self.queue.submit(docx_path, user_intent, priority=priority)
+        with self._condition:
+            self._condition.notify()
+        return job
+
+    def job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job from the queue, with the stage and progress of its worker while running."""
+        job = self.queue.get(job_id)
+        if job is None:
+            return None
+        with self._condition:
+            for worker in self.workers:
+                if worker.job_id == job_id:
+                    job["progress"] = {"stage": worker.stage, "percent": worker.progress}
+        return job
+
+    def job_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Result of a finished job, with the artifacts of its run audit directory.
+
+        Returns:
+            Optional[Dict[str, Any]]: None for unknown jobs
+        """
+        job = self.queue.get(job_id)
+        if job is None:
+            return None
+        audit_directory = job["audit_directory"]
+        artifacts: List[str] = []
+        status_text = None
+        if audit_directory and os.path.isdir(audit_directory):
+            root = Path(audit_directory)
+            artifacts = sorted(str(path.relative_to(root)).replace(os.sep, "/")
+                               for path in root.rglob("*") if path.is_file())
+            status_file = root / "result.status.txt"
+            if status_file.exists():
+                status_text = status_file.read_text(encoding="utf-8")
+        return {
+            "job_id": job_id,
+            "status": job["status"],
+            "finished": job["status"] not in ACTIVE_STATES,
+            "result": job["result"],
+            "error": job["error"],
+            "audit_directory": audit_directory,
+            "output_path": output_path(audit_directory) if job["status"] == "SUCCESS" else None,
+            "status_file": status_text,
+            "artifacts": artifacts,
+        }
+
+    def health(self) -> Dict[str, Any]:
+        with self._condition:
+            workers = [{"name": worker.name, "job_id": worker.job_id, "stage": worker.stage,
+                        "jobs_processed": worker.jobs_processed,
+                        "warm": worker.pipeline is not None,
+                        "alive": worker.thread is not None and worker.thread.is_alive()}
+                       for worker in self.workers]
+        return {"status": "stopping" if self._stopping else "ok", "jobs": self.queue.counts(), "workers": workers}
+
+    def _work(self, worker: _Worker):
+        # The pipeline drives Word on this thread
+        with com_initialized():
+            while True:
+                with self._condition:
+                    if self._stopping:
+                        return
+                job = self.queue.claim(worker.name)
+                if job is None:
+                    with self._condition:
+                        if not self._stopping:
+                            self._condition.wait(self.poll_interval_seconds)
+                    continue
+                self._process(worker, job)
+
+    def _process(self, worker: _Worker, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        with self._condition:
+            worker.job_id = job_id
+            worker.stage = None
+            worker.progress = 0
+            worker.audit_directory_recorded = False
+        logger.info(f"{worker.name} processing job {job_id}: {job['docx_path']}")
+        try:
+            if worker.pipeline is None:
+                worker.pipeline = self.pipeline_factory(
+                    lambda stage, percent: self._on_progress(worker, stage, percent))
+            # Jobs interrupted by a crashed service continue from their checkpoints
+            audit_directory = job["audit_directory"]
+            if audit_directory and os.path.exists(os.path.join(audit_directory, CHECKPOINT_FILE)):
+                result = worker.pipeline.resume(audit_directory)
+            else:
+                result = worker.pipeline.process_document(job["docx_path"], job["user_intent"])
+            self.queue.complete(job_id, result)
+            logger.info(f"Job {job_id} finished with status {result.status}")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.queue.fail(job_id, str(e))
+            # A pipeline that raised may hold broken state
+            worker.pipeline = None
+        finally:
+            with self._condition:
+                worker.job_id = None
+                worker.stage = None
+                worker.jobs_processed += 1
+
+    def _on_progress(self, worker: _Worker, stage: str, percent: int):
+        """Progress callback of a worker's pipeline (may run on stage threads)."""
+        record = None
+        with self._condition:
+            worker.stage = stage
+            worker.progress = percent
+            audit_directory = getattr(worker.pipeline, "current_audit_dir", None)
+            if worker.job_id and audit_directory and not worker.audit_directory_recorded:
+                worker.audit_directory_recorded = True
+                record = (worker.job_id, audit_directory)
+        if record is not None:
+            try:
+                self.queue.set_audit_directory(*record)
+            except Exception as e:
+                logger.warning(f"Could not record audit directory of job {record[0]}: {e}")
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """JSON API of a JobService (the server's ``service`` attribute)."""
+
+    server_version = "AutoWordVNext"
+
+    @property
+    def service(self) -> JobService:
+        return self.server.service
+
+    def address_string(self) -> str:
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: HTTPStatus, data: Any):
+        body = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        self._send_json(status, {"error": message})
+
+    def _route(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        url = urlparse(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+
+    def do_GET(self):
+        parts, query = self._route()
+        if parts == ["health"]:
+            return self._send_json(HTTPStatus.OK, self.service.health())
+        if parts == ["jobs"]:
+            try:
+                limit = int(query.get("limit", ["100"])[0])
+            except ValueError:
+                return self._send_error(HTTPStatus.BAD_REQUEST, "limit must be an integer")
+            status = query.get("status", [None])[0]
+            return self._send_json(HTTPStatus.OK, {"jobs": self.service.queue.list_jobs(status=status, limit=limit)})
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.service.job_status(parts[1])
+            if job is None:
+                return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job: {parts[1]}")
+            return self._send_json(HTTPStatus.OK, job)
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+            result = self.service.job_result(parts[1])
+            if result is None:
+                return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job: {parts[1]}")
+            return self._send_json(HTTPStatus.OK if result["finished"] else HTTPStatus.ACCEPTED, result)
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "output":
+            return self._send_output(parts[1])
+        self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+
+    def _send_output(self, job_id: str):
+        result = self.service.job_result(job_id)
+        if result is None or not result["output_path"]:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"No output for job: {job_id}")
+        with open(result["output_path"], "rb") as f:
+            body = f.read()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", DOCX_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        parts, _ = self._route()
+        if parts != ["jobs"]:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(data, dict):
+                raise ValueError("Request body must be a JSON object")
+            docx_path, intent = data.get("docx_path"), data.get("intent")
+            if not isinstance(docx_path, str) or not isinstance(intent, str):
+                raise ValueError("'docx_path' and 'intent' must be strings")
+            priority = data.get("priority", 0)
+            if isinstance(priority, bool) or not isinstance(priority, (int, str)):
+                raise ValueError("'priority' must be an integer")
+            job = self.service.submit(docx_path, intent, priority=int(priority))
+        except (ValueError, TypeError, AttributeError) as e:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+        self._send_json(HTTPStatus.CREATED, job)
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != "jobs":
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {self.path}")
+        if self.service.queue.get(parts[1]) is None:
+            return self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job: {parts[1]}")
+        if not self.service.queue.cancel(parts[1]):
+            return self._send_error(HTTPStatus.CONFLICT, "Only queued jobs can be cancelled")
+        self._send_json(HTTPStatus.OK, self.service.queue.get(parts[1]))
+
+
+def create_http_server(service: JobService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """HTTP server for the job API (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+if hasattr(socket, "AF_UNIX"):
+    class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """HTTP server for the job API on a Unix domain socket."""
+        daemon_threads = True
+
+        def server_close(self):
+            super().server_close()
+            try:
+                os.unlink(self.server_address)
+            except OSError:
+                pass
+
+
+def create_unix_server(service: JobService, socket_path: str):
+    """
+    Unix socket server for the job API.
+
+    Raises:
+        OSError: If the platform has no Unix domain sockets
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix domain sockets are not supported on this platform")
+    # A socket file left by a killed service would block binding
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = UnixHTTPServer(socket_path, JobRequestHandler)
+    server.service = service
+    return server
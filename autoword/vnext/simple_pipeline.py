@@ -10,6 +10,7 @@ import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from ..core.paragraph_table import load_paragraph_table
 from .core import VNextConfig, CustomLLMClient, load_config
 from .models import ProcessingResult, StructureV1, PlanV1
 from .exceptions import VNextError, ExtractionError, PlanningError, ExecutionError
@@ -793,19 +794,23 @@ class SimplePipeline:
         
         return False
     
-    def _find_first_content_section(self, doc):
-        """查找第一个正文节的开始位置"""
+    def _find_first_content_section(self, doc, table=None):
+        """查找第一个正文节的开始位置（table 为段落表时从中读取文本和分页设置）"""
         try:
             # 方法1: 查找分页符
-            for i, para in enumerate(doc.Paragraphs):
+            if table is not None:
+                paragraphs = ((row.range_text, row.page_break_before) for row in table)
+            else:
+                paragraphs = ((para.Range.Text, para) for para in doc.Paragraphs)
+            for i, (text, page_break) in enumerate(paragraphs):
                 # 检查段落是否包含分页符
-                if '\f' in para.Range.Text:  # \f 是分页符字符
+                if '\f' in text:  # \f 是分页符字符
                     logger.info(f"找到分页符在段落 {i}")
                     return i + 1  # 返回分页符后的段落索引
                 
                 # 检查段落后是否有分页符
                 try:
-                    if para.Range.ParagraphFormat.PageBreakBefore:
+                    if page_break if table is not None else page_break.Range.ParagraphFormat.PageBreakBefore:
                         logger.info(f"找到分页符设置在段落 {i}")
                         return i
                 except:
@@ -823,8 +828,10 @@ class SimplePipeline:
                     continue
             
             # 方法3: 查找典型的正文开始标志
-            for i, para in enumerate(doc.Paragraphs):
-                text = para.Range.Text.strip().lower()
+            texts = ((row.range_text for row in table) if table is not None
+                     else (para.Range.Text for para in doc.Paragraphs))
+            for i, text in enumerate(texts):
+                text = text.strip().lower()
                 # 查找正文开始的典型标志
                 if any(keyword in text for keyword in [
                     "摘要", "abstract", "引言", "前言", "第一章", "第1章", 
@@ -838,8 +845,12 @@ class SimplePipeline:
                 if doc.Sections.Count > 1:
                     # 如果有多个节，第二个节通常是正文开始
                     second_section_start = doc.Sections[2].Range.Start
-                    for i, para in enumerate(doc.Paragraphs):
-                        if para.Range.Start >= second_section_start:
+                    if table is not None and table.offsets_verified:
+                        starts = (row.start for row in table)
+                    else:
+                        starts = (para.Range.Start for para in doc.Paragraphs)
+                    for i, start in enumerate(starts):
+                        if start >= second_section_start:
                             logger.info(f"基于节判断，正文开始于段落 {i}")
                             return i
             except:
@@ -1233,8 +1244,11 @@ class SimplePipeline:
         try:
             logger.info("强制应用样式到文档内容...")
             
+            # 一次读取段落文本、样式和大纲级别，循环中只在写入时访问 COM
+            table = load_paragraph_table(doc)
+            
             # 首先找到第一个正文节的位置
-            first_content_index = self._find_first_content_section(doc)
+            first_content_index = self._find_first_content_section(doc, table)
             logger.info(f"正文开始位置: 段落索引 {first_content_index}")
             
             # Process shapes with cover protection
@@ -1243,33 +1257,35 @@ class SimplePipeline:
             # NEW: Enhanced paragraph reassignment logic
             reassignment_count = 0
             protected_count = 0
+            # 样式集合遍历开销大，循环中不会新建样式，只检查一次
+            body_text_exists = self._body_text_style_exists(doc)
             
             # 遍历所有段落，基于outline level识别和应用样式
             for i, para in enumerate(doc.Paragraphs):
                 try:
                     # 获取段落的大纲级别和页码信息
-                    outline_level = para.OutlineLevel
-                    style_name = para.Style.NameLocal
-                    text_preview = para.Range.Text.strip()[:30]
-                    
-                    # 获取段落所在页码（可能为0，表示无页码）
-                    try:
-                        page_number = para.Range.Information(3)  # wdActiveEndPageNumber
-                    except:
-                        page_number = 0  # 无页码
+                    if table is not None:
+                        row = table[i]
+                        outline_level = row.outline_level
+                        style_name = row.style_name or ""
+                        text_preview = row.range_text.strip()[:30]
+                    else:
+                        outline_level = para.OutlineLevel
+                        style_name = para.Style.NameLocal
+                        text_preview = para.Range.Text.strip()[:30]
                     
                     # Enhanced cover/TOC detection using existing _is_cover_or_toc_content filtering
                     is_cover_or_toc = self._is_cover_or_toc_content(i, first_content_index, text_preview, style_name)
                     if is_cover_or_toc:
                         # 封面或目录内容，跳过格式应用和段落重新分配
                         if text_preview and len(text_preview) > 2:  # 只对有实际内容的段落记录
-                            logger.debug(f"🛡️ 保护封面/目录内容: {text_preview}... (段落={i}, 页码={page_number})")
+                            logger.debug(f"🛡️ 保护封面/目录内容: {text_preview}... (段落={i})")
                             protected_count += 1
                         continue
                     
                     # NEW: Enhanced paragraph reassignment logic for main content
                     # Reassign Normal/正文 paragraphs to BodyText (AutoWord) style if it exists
-                    if style_name in ["Normal", "正文"] and self._body_text_style_exists(doc):
+                    if style_name in ["Normal", "正文"] and body_text_exists:
                         try:
                             para.Range.Style = doc.Styles("BodyText (AutoWord)")
                             logger.debug(f"段落已重新分配到BodyText样式: {text_preview}... (段落={i})")
@@ -1307,13 +1323,18 @@ class SimplePipeline:
                         
                     elif outline_level == 10 or outline_level == 0:  # 正文级别
                         # 再次确认不是封面内容（双重保护）
+                        # 获取段落所在页码（可能为0，表示无页码）；需要分页，只在这里读取
+                        try:
+                            page_number = para.Range.Information(3)  # wdActiveEndPageNumber
+                        except:
+                            page_number = 0  # 无页码
                         if page_number == 1:
                             logger.debug(f"跳过封面正文内容: {text_preview}... (page={page_number}, outline_level={outline_level})")
                             protected_count += 1
                             continue
                             
                         # Apply formatting to body text paragraphs
-                        if self._body_text_style_exists(doc):
+                        if body_text_exists:
                             try:
                                 para.Range.Style = doc.Styles("BodyText (AutoWord)")
                                 logger.debug(f"正文段落已重新分配到BodyText样式: {text_preview}... (outline_level={outline_level})")
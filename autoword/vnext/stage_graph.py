@@ -0,0 +1,262 @@
+"""
+Small dependency graph scheduler for pipeline stages.
+
+Stages declare the values they require and provide. A stage becomes ready as
+soon as every required value is available, so independent work overlaps:
+the LLM planning request can start while inventory extraction is still
+reading the document.
+
+Word COM objects are apartment-threaded, so stages touching Word run with
+``affinity="main"`` on the thread calling run(), in insertion order. Stages
+that only do I/O or CPU work on plain data (LLM calls, audit file writes)
+use ``affinity="worker"`` and run on a thread pool.
+
+A stage may publish values before it returns by calling ``emit``. Extraction
+emits the structure as soon as it is read, which releases the planner
+before the inventory is done. Values a stage returns are published when it
+finishes, except values it has already emitted.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+StageFunction = Callable[[Dict[str, Any], Callable[[str, Any], None]], Any]
+
+
+@dataclass
+class Stage:
+    """A node of the stage graph."""
+    name: str
+    func: StageFunction
+    requires: Tuple[str, ...] = ()
+    provides: Tuple[str, ...] = ()
+    affinity: str = "main"  # "main" (caller thread, COM-safe) or "worker"
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock interval of one stage, relative to the start of the run."""
+    name: str
+    affinity: str
+    thread: str
+    start_ms: float
+    end_ms: Optional[float] = None
+    status: str = "running"  # running, completed, failed
+    emitted_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return None if self.end_ms is None else self.end_ms - self.start_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "affinity": self.affinity,
+            "thread": self.thread,
+            "start_ms": self.start_ms,
+            "end_ms": self.end_ms,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "emitted_ms": dict(self.emitted_ms),
+        }
+
+
+class StageGraph:
+    """Runs stages as soon as their inputs are available."""
+
+    def __init__(self, max_workers: int = 2):
+        """
+        Initialize stage graph.
+
+        Args:
+            max_workers: Worker threads for worker stages (0 runs every stage
+                on the calling thread, in insertion order)
+        """
+        self.max_workers = max_workers
+        self.stages: List[Stage] = []
+        self.timings: Dict[str, StageTiming] = {}
+        self.values: Dict[str, Any] = {}
+
+        self._condition = threading.Condition()
+        self._started: set = set()
+        self._finished: set = set()
+        self._error: Optional[BaseException] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._origin = 0.0
+
+    def add_stage(self, name: str, func: StageFunction, requires: Tuple[str, ...] = (),
+                  provides: Tuple[str, ...] = (), affinity: str = "main") -> "StageGraph":
+        """
+        Add a stage.
+
+        Args:
+            name: Unique stage name
+            func: Callable(values, emit) returning the provided value (or a
+                tuple of values when providing several)
+            requires: Value names the stage needs
+            provides: Value names the stage publishes
+            affinity: "main" for the calling thread, "worker" for the pool
+
+        Returns:
+            StageGraph: self, for chaining
+        """
+        if affinity not in ("main", "worker"):
+            raise ValueError(f"Invalid stage affinity: {affinity}")
+        if any(stage.name == name for stage in self.stages):
+            raise ValueError(f"Duplicate stage name: {name}")
+        self.stages.append(Stage(name, func, tuple(requires), tuple(provides), affinity))
+        return self
+
+    def run(self, inputs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run all stages.
+
+        Args:
+            inputs: Initial values
+
+        Returns:
+            Dict[str, Any]: All published values
+
+        Raises:
+            Exception: The first exception raised by a stage, after running
+                worker stages have finished; stages that were not started
+                yet are skipped
+            RuntimeError: If some stage can never become ready
+        """
+        self._check_graph(inputs or {})
+        self.values = dict(inputs or {})
+        self._origin = time.perf_counter()
+        if self.max_workers > 0:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="vnext-stage")
+        try:
+            self._run_loop()
+        finally:
+            if self._pool:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+        if self._error is not None:
+            raise self._error
+        return dict(self.values)
+
+    def timeline(self) -> List[Dict[str, Any]]:
+        """Stage timings ordered by start time."""
+        return [timing.to_dict() for timing in sorted(self.timings.values(), key=lambda t: t.start_ms)]
+
+    def overlap_ms(self, first: str, second: str) -> float:
+        """Milliseconds during which two stages were running at the same time."""
+        a, b = self.timings.get(first), self.timings.get(second)
+        if not a or not b or a.end_ms is None or b.end_ms is None:
+            return 0.0
+        return max(0.0, min(a.end_ms, b.end_ms) - max(a.start_ms, b.start_ms))
+
+    def overlaps(self) -> List[Dict[str, Any]]:
+        """All pairs of stages that ran concurrently, with the overlap duration."""
+        names = [timing["name"] for timing in self.timeline()]
+        result = []
+        for i, first in enumerate(names):
+            for second in names[i + 1:]:
+                overlap = self.overlap_ms(first, second)
+                if overlap > 0:
+                    result.append({"stages": [first, second], "overlap_ms": overlap})
+        return result
+
+    def _check_graph(self, inputs: Dict[str, Any]):
+        available = set(inputs)
+        for stage in self.stages:
+            available.update(stage.provides)
+        for stage in self.stages:
+            missing = [name for name in stage.requires if name not in available]
+            if missing:
+                raise RuntimeError(f"Stage {stage.name} requires values nobody provides: {', '.join(missing)}")
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._origin) * 1000
+
+    def _ready(self, stage: Stage) -> bool:
+        return stage.name not in self._started and all(name in self.values for name in stage.requires)
+
+    def _run_loop(self):
+        while True:
+            with self._condition:
+                if self._error is None:
+                    self._submit_ready_workers()
+                main_stage = None
+                if self._error is None:
+                    main_stage = next((stage for stage in self.stages
+                                       if self._ready(stage) and self._runs_inline(stage)), None)
+                if main_stage is None:
+                    running = self._started - self._finished
+                    if not running:
+                        unstarted = [stage.name for stage in self.stages if stage.name not in self._started]
+                        if unstarted and self._error is None:
+                            self._error = RuntimeError(
+                                f"Stage graph stalled; stages never became ready: {', '.join(unstarted)}")
+                        return
+                    self._condition.wait()
+                    continue
+                self._started.add(main_stage.name)
+            self._execute(main_stage)
+
+    def _runs_inline(self, stage: Stage) -> bool:
+        return stage.affinity == "main" or self._pool is None
+
+    def _submit_ready_workers(self):
+        # Called with the condition held
+        if self._pool is None:
+            return
+        for stage in self.stages:
+            if stage.affinity == "worker" and self._ready(stage):
+                self._started.add(stage.name)
+                self._pool.submit(self._execute, stage)
+
+    def _emit(self, stage: Stage, name: str, value: Any):
+        with self._condition:
+            if name in self.values:
+                return
+            self.values[name] = value
+            self.timings[stage.name].emitted_ms[name] = self._now_ms()
+            if self._error is None:
+                self._submit_ready_workers()
+            self._condition.notify_all()
+
+    def _execute(self, stage: Stage):
+        timing = StageTiming(stage.name, stage.affinity, threading.current_thread().name, self._now_ms())
+        with self._condition:
+            self.timings[stage.name] = timing
+            values = {name: self.values[name] for name in stage.requires}
+
+        try:
+            result = stage.func(values, lambda name, value: self._emit(stage, name, value))
+            if len(stage.provides) == 1:
+                outputs = {stage.provides[0]: result}
+            elif stage.provides:
+                outputs = dict(zip(stage.provides, result))
+            else:
+                outputs = {}
+        except BaseException as e:
+            with self._condition:
+                timing.end_ms = self._now_ms()
+                timing.status = "failed"
+                if self._error is None:
+                    self._error = e
+                self._finished.add(stage.name)
+                self._condition.notify_all()
+            logger.debug(f"Stage {stage.name} failed: {e}")
+            return
+
+        for name, value in outputs.items():
+            self._emit(stage, name, value)
+
+        with self._condition:
+            timing.end_ms = self._now_ms()
+            timing.status = "completed"
+            self._finished.add(stage.name)
+            self._condition.notify_all()
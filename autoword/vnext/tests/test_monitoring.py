@@ -11,6 +11,7 @@ import time
 import json
 import tempfile
 import threading
+import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
@@ -21,7 +22,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
 from autoword.vnext.monitoring import (
     VNextLogger, MemoryMonitor, PerformanceTracker, MonitoringLevel, LogLevel,
-    PerformanceMetrics, PipelineStageMetrics, MemoryAlert,
+    PerformanceMetrics, PipelineStageMetrics, MemoryAlert, WordProcessSample,
     create_vnext_logger, log_large_document_warning, log_complex_document_scenario
 )
 
@@ -130,6 +131,105 @@ class TestMemoryMonitor:
         assert len(monitor.get_alerts()) == 0
 
 
+@pytest.fixture
+def fake_word_process():
+    """A child process standing in for WINWORD.EXE, holding ~64MB."""
+    child = subprocess.Popen([
+        sys.executable, "-c",
+        "import sys, time; data = bytearray(64 * 1024 * 1024); print('ready', flush=True); time.sleep(60)"
+    ], stdout=subprocess.PIPE)
+    child.stdout.readline()
+    try:
+        yield child
+    finally:
+        child.kill()
+        child.wait()
+
+
+class TestWordProcessMonitoring:
+    """Test Word process tree tracking with a fake child process."""
+    
+    def test_attach_and_sample(self, fake_word_process):
+        """Test that only attached Word processes are sampled."""
+        child = fake_word_process
+        monitor = MemoryMonitor()
+        
+        # A running Word that was not attached belongs to someone else
+        assert monitor.sample_word_processes() is None
+        
+        monitor.attach_word_process(child.pid)
+        sample = monitor.sample_word_processes()
+        
+        assert sample.process_count == 1
+        assert sample.rss_mb > 50
+        assert sample.handle_count > 0
+        assert monitor.get_word_peak().rss_mb == sample.rss_mb
+        assert not monitor.needs_word_recycle()
+        
+        monitor.detach_word_process(child.pid)
+        assert monitor.sample_word_processes() is None
+    
+    def test_recycle_signal(self, fake_word_process):
+        """Test recycle signal and alert when Word crosses the threshold."""
+        child = fake_word_process
+        monitor = MemoryMonitor(word_warning_threshold_mb=16,
+                                word_recycle_threshold_mb=32)
+        monitor.attach_word_process(child.pid)
+        monitor.set_current_operation("execute_plan")
+        monitor.sample_word_processes()
+        monitor.sample_word_processes()
+        
+        assert monitor.needs_word_recycle()
+        assert "Word memory" in monitor.recycle_reason
+        word_alerts = [a for a in monitor.get_alerts() if a.source == "word"]
+        assert len(word_alerts) == 1
+        assert word_alerts[0].alert_level == "CRITICAL"
+        assert word_alerts[0].operation_name == "execute_plan"
+        
+        monitor.acknowledge_recycle()
+        assert not monitor.needs_word_recycle()
+        
+        # Word was not restarted, so the next sample signals again
+        monitor.sample_word_processes()
+        assert monitor.needs_word_recycle()
+    
+    def test_stage_peaks_in_performance_tracker(self, fake_word_process):
+        """Test per-stage Word peaks recorded by PerformanceTracker."""
+        child = fake_word_process
+        monitor = MemoryMonitor()
+        monitor.attach_word_process(child.pid)
+        tracker = PerformanceTracker(monitor)
+        
+        with tracker.track_stage("execute") as stage_metrics:
+            pass
+        
+        assert stage_metrics.word_rss_peak_mb > 50
+        assert stage_metrics.word_handle_peak > 0
+        breakdown = tracker.get_stage_stats()["stage_breakdown"]["execute"]
+        assert breakdown["word_rss_peak_mb"] == stage_metrics.word_rss_peak_mb
+    
+    def test_exited_process_dropped(self, fake_word_process):
+        """Test that exited Word processes stop being tracked."""
+        child = fake_word_process
+        monitor = MemoryMonitor()
+        monitor.attach_word_process(child.pid)
+        assert monitor.sample_word_processes() is not None
+        
+        child.kill()
+        child.wait()
+        
+        assert monitor.sample_word_processes() is None
+        assert monitor.get_word_stats()["tracked_pids"] == []
+    
+    def test_peak_with(self):
+        """Test field-wise peak of Word samples."""
+        first = WordProcessSample(datetime.now(), 1, 100.0, 500, 80.0)
+        second = WordProcessSample(datetime.now(), 2, 50.0, 900, 10.0)
+        peak = first.peak_with(second)
+        
+        assert (peak.process_count, peak.rss_mb, peak.handle_count, peak.cpu_percent) == (2, 100.0, 900, 80.0)
+
+
 class TestPerformanceTracker:
     """Test performance tracking functionality."""
     
@@ -343,6 +443,25 @@ class TestVNextLogger:
             
             logger.cleanup()
     
+    def test_concurrent_runs_keep_separate_logs(self):
+        """Test that overlapping runs write and close only their own log files."""
+        with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+            run_a = VNextLogger(audit_directory=dir_a, enable_memory_monitoring=False)
+            run_b = VNextLogger(audit_directory=dir_b, enable_memory_monitoring=False)
+            
+            run_a.log_stage_start("Extract A")
+            run_b.log_stage_start("Extract B")
+            run_a.cleanup()
+            run_b.log_stage_complete("Extract B", 1.0)
+            run_b.cleanup()
+            
+            log_a = (Path(dir_a) / "pipeline.log").read_text(encoding='utf-8')
+            log_b = (Path(dir_b) / "pipeline.log").read_text(encoding='utf-8')
+            assert "Extract A" in log_a and "Extract B" not in log_a
+            assert "Starting pipeline stage: Extract B" in log_b
+            assert "Completed pipeline stage: Extract B" in log_b
+            assert "Extract A" not in log_b
+    
     def test_track_operation_context_manager(self):
         """Test operation tracking context manager."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -0,0 +1,193 @@
+"""
+Tests for the columnar quality scoring engine.
+
+These tests verify that QualityRuleEngine produces exactly the same scores,
+issue lists and check counts as AdvancedValidator's per-metric helpers, and
+that quality reports on very large structures stay fast.
+"""
+
+import random
+import time
+
+import pytest
+
+from autoword.vnext.validator.advanced_validator import AdvancedValidator, QualityMetrics
+from autoword.vnext.validator.quality_engine import StructureColumns, QualityRuleEngine
+from autoword.vnext.models import (
+    StructureV1, DocumentMetadata, StyleDefinition, FontSpec, ParagraphSpec,
+    ParagraphSkeleton, HeadingReference, FieldReference, TableSkeleton,
+    LineSpacingMode, StyleType
+)
+
+
+def build_random_structure(seed: int, paragraph_count: int = 200) -> StructureV1:
+    """Build a randomized structure exercising every quality rule branch."""
+    rng = random.Random(seed)
+    style_names = ["Normal", "Heading 1", "Heading 2", "标题 3", "Caption", "Body Text"]
+
+    styles = []
+    for _ in range(rng.randint(0, 9)):
+        name = rng.choice(style_names)
+        font = None
+        if rng.random() < 0.8:
+            font = FontSpec(
+                east_asian=rng.choice([None, "宋体", "楷体", "黑体", "仿宋", "微软雅黑"]),
+                latin=rng.choice([None, "Times New Roman", "Arial"]),
+                size_pt=rng.choice([None, 6, 8, 10, 11, 12, 14, 16, 22])
+            )
+        paragraph = None
+        if rng.random() < 0.7:
+            paragraph = ParagraphSpec(
+                line_spacing_mode=LineSpacingMode.MULTIPLE,
+                line_spacing_value=rng.choice([None, 1.0, 1.15, 1.5, 2.0, 2.5])
+            )
+        styles.append(StyleDefinition(
+            name=name,
+            type=rng.choice([StyleType.PARAGRAPH, StyleType.CHARACTER]),
+            font=font,
+            paragraph=paragraph
+        ))
+
+    paragraphs = []
+    headings = []
+    for i in range(rng.randint(0, paragraph_count)):
+        is_heading = rng.random() < 0.15
+        level = rng.randint(1, 4) if is_heading else None
+        text = rng.choice(["A", "Intro", "  x ", "Chapter heading", "正文内容"])
+        paragraphs.append(ParagraphSkeleton(
+            index=i,
+            style_name=rng.choice(style_names + [None]),
+            preview_text=text,
+            is_heading=is_heading,
+            heading_level=level
+        ))
+        if is_heading:
+            headings.append(HeadingReference(paragraph_index=i, level=level, text=text))
+
+    fields = []
+    for _ in range(rng.randint(0, 8)):
+        fields.append(FieldReference(
+            paragraph_index=rng.randint(0, 50),
+            field_type=rng.choice(["TOC", "REF", "PAGE"]),
+            field_code=rng.choice([None, "TOC \\o \"1-3\"", "REF _Ref1", "PAGEREF _Toc1", "PAGE"]),
+            result_text=rng.choice([None, "", "1", "Error! Reference source not found."])
+        ))
+
+    tables = []
+    for _ in range(rng.randint(0, 5)):
+        tables.append(TableSkeleton(
+            paragraph_index=rng.randint(0, 50),
+            rows=rng.randint(1, 30),
+            columns=rng.randint(1, 14),
+            has_header=rng.random() < 0.5
+        ))
+
+    return StructureV1(
+        metadata=DocumentMetadata(title="Random"),
+        styles=styles,
+        paragraphs=paragraphs,
+        headings=headings,
+        fields=fields,
+        tables=tables
+    )
+
+
+class TestQualityRuleEngine:
+    """Equivalence tests against AdvancedValidator's per-metric helpers."""
+
+    @pytest.mark.parametrize("seed", range(60))
+    def test_matches_legacy_helpers(self, seed):
+        """Engine results are identical to the _calculate/_collect/_count helpers."""
+        validator = AdvancedValidator()
+        structure = build_random_structure(seed)
+
+        evaluation = QualityRuleEngine.from_validator(validator).evaluate(structure)
+
+        assert evaluation.style_consistency_score == validator._calculate_enhanced_style_consistency_score(structure)
+        assert evaluation.cross_reference_integrity_score == validator._calculate_enhanced_cross_reference_score(structure)
+        assert evaluation.accessibility_score == validator._calculate_enhanced_accessibility_score(structure)
+        assert evaluation.formatting_quality_score == validator._calculate_enhanced_formatting_quality_score(structure)
+        assert evaluation.total_styles_checked == len(structure.styles)
+        assert evaluation.total_cross_references_checked == len(structure.fields)
+        assert evaluation.total_accessibility_checks == validator._count_enhanced_accessibility_checks(structure)
+        assert evaluation.total_formatting_checks == validator._count_enhanced_formatting_checks(structure)
+        assert evaluation.inconsistent_styles == validator._collect_enhanced_inconsistent_styles(structure)
+        assert evaluation.broken_cross_references == validator._collect_enhanced_broken_cross_references(structure)
+        assert evaluation.accessibility_issues == validator._collect_enhanced_accessibility_issues(structure)
+        assert evaluation.formatting_issues == validator._collect_enhanced_formatting_issues(structure)
+
+    def test_custom_thresholds_are_honoured(self):
+        """Validator thresholds flow into the engine."""
+        validator = AdvancedValidator()
+        validator.min_font_size_accessibility = 12
+        validator.max_table_size_warning = (2, 2)
+        structure = build_random_structure(7)
+
+        evaluation = QualityRuleEngine.from_validator(validator).evaluate(structure)
+
+        assert evaluation.accessibility_issues == validator._collect_enhanced_accessibility_issues(structure)
+        assert evaluation.accessibility_score == validator._calculate_enhanced_accessibility_score(structure)
+
+    def test_generate_quality_metrics_uses_engine(self):
+        """generate_quality_metrics produces the same report as the legacy helpers."""
+        validator = AdvancedValidator()
+        structure = build_random_structure(3)
+
+        metrics = validator.generate_quality_metrics(structure, "test.docx")
+
+        assert isinstance(metrics, QualityMetrics)
+        assert metrics.inconsistent_styles == validator._collect_enhanced_inconsistent_styles(structure)
+        assert metrics.quality_grade == validator._calculate_quality_grade(metrics.overall_score)
+        assert metrics.improvement_recommendations
+
+    def test_large_structure_is_fast(self):
+        """Quality metrics on a 50k-paragraph structure complete quickly."""
+        validator = AdvancedValidator()
+        base = build_random_structure(11, paragraph_count=0)
+        paragraphs = [
+            ParagraphSkeleton(index=i, style_name="Normal", preview_text="Body text")
+            for i in range(50000)
+        ]
+        headings = [
+            HeadingReference(paragraph_index=i, level=1 + (i // 100) % 3, text=f"Section {i}")
+            for i in range(0, 50000, 100)
+        ]
+        structure = base.model_copy(update={'paragraphs': paragraphs, 'headings': headings})
+
+        start = time.perf_counter()
+        metrics = validator.generate_quality_metrics(structure, "test.docx")
+        elapsed = time.perf_counter() - start
+
+        assert metrics.total_formatting_checks >= 50000
+        assert elapsed < 0.5
+
+
+class TestStructureColumns:
+    """Tests for the columnar structure view."""
+
+    def test_columns_mirror_structure(self):
+        """Columns contain one entry per source element."""
+        structure = build_random_structure(5)
+        columns = StructureColumns(structure)
+
+        assert columns.style_count == len(structure.styles)
+        assert columns.heading_count == len(structure.headings)
+        assert columns.table_count == len(structure.tables)
+        assert columns.field_count == len(structure.fields)
+        assert list(columns.heading_levels) == [h.level for h in structure.headings]
+
+    def test_paragraph_columns_are_lazy(self):
+        """Paragraph columns are only built on first access."""
+        structure = build_random_structure(9)
+        columns = StructureColumns(structure)
+
+        assert columns._paragraph_columns_built is False
+        assert len(columns.paragraph_text_lengths) == len(structure.paragraphs)
+        assert columns._paragraph_columns_built is True
+
+        for i, para in enumerate(structure.paragraphs):
+            assert columns.paragraph_heading_levels[i] == (para.heading_level or 0)
+            if para.style_name is None:
+                assert columns.paragraph_style_ids[i] == -1
+            else:
+                assert columns.style_id_table[para.style_name] == columns.paragraph_style_ids[i]
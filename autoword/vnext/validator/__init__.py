@@ -8,8 +8,9 @@ validation, accessibility compliance, and quality metrics.
 """
 
 from .document_validator import DocumentValidator
+from .toc_alignment import TocAlignment, TocMatch, align_toc
 
-__all__ = ["DocumentValidator"]
+__all__ = ["DocumentValidator", "TocAlignment", "TocMatch", "align_toc"]
 
 # Import advanced validator separately to avoid circular imports
 def get_advanced_validator():
@@ -23,6 +23,7 @@ from ..models import (
 )
 from ..exceptions import ValidationError
 from ..extractor.document_extractor import DocumentExtractor
+from .quality_engine import QualityRuleEngine
 
 
 logger = logging.getLogger(__name__)
@@ -446,21 +447,10 @@ class AdvancedValidator:
         try:
             logger.info("Generating comprehensive document quality metrics")
             
-            # 1. Calculate style consistency score with detailed analysis
-            metrics.style_consistency_score = self._calculate_enhanced_style_consistency_score(structure)
-            metrics.total_styles_checked = len(structure.styles)
-            
-            # 2. Calculate cross-reference integrity score with repair analysis
-            metrics.cross_reference_integrity_score = self._calculate_enhanced_cross_reference_score(structure)
-            metrics.total_cross_references_checked = len(structure.fields)
-            
-            # 3. Calculate accessibility score with comprehensive checks
-            metrics.accessibility_score = self._calculate_enhanced_accessibility_score(structure)
-            metrics.total_accessibility_checks = self._count_enhanced_accessibility_checks(structure)
-            
-            # 4. Calculate formatting quality score with advanced metrics
-            metrics.formatting_quality_score = self._calculate_enhanced_formatting_quality_score(structure)
-            metrics.total_formatting_checks = self._count_enhanced_formatting_checks(structure)
+            # 1-4. Evaluate style, cross-reference, accessibility and formatting
+            # rules in a single traversal over a columnar view of the structure
+            evaluation = QualityRuleEngine.from_validator(self).evaluate(structure)
+            evaluation.apply_to(metrics)
             
             # 5. Calculate weighted overall score
             weights = self.quality_weights
@@ -471,16 +461,10 @@ class AdvancedValidator:
                 metrics.formatting_quality_score * weights['formatting_quality']
             )
             
-            # 6. Collect detailed issues with enhanced analysis
-            metrics.inconsistent_styles = self._collect_enhanced_inconsistent_styles(structure)
-            metrics.broken_cross_references = self._collect_enhanced_broken_cross_references(structure)
-            metrics.accessibility_issues = self._collect_enhanced_accessibility_issues(structure)
-            metrics.formatting_issues = self._collect_enhanced_formatting_issues(structure)
-            
-            # 7. Generate quality improvement recommendations
+            # 6. Generate quality improvement recommendations
             metrics.improvement_recommendations = self._generate_quality_improvement_recommendations(structure, metrics)
             
-            # 8. Calculate quality grade
+            # 7. Calculate quality grade
             metrics.quality_grade = self._calculate_quality_grade(metrics.overall_score)
             
             logger.info(f"Enhanced quality metrics generated: overall score {metrics.overall_score:.2f} (Grade: {metrics.quality_grade})")
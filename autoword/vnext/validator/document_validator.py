@@ -9,7 +9,7 @@ and providing rollback functionality when validation fails.
 import os
 import shutil
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 from pathlib import Path
 
 import pythoncom
@@ -18,6 +18,9 @@ import win32com.client as win32
 from ..models import StructureV1, ValidationResult, StyleDefinition, FontSpec, ParagraphSpec, LineSpacingMode
 from ..exceptions import ValidationError, RollbackError
 from ..extractor.document_extractor import DocumentExtractor
+from ..layout_tracker import LayoutDependencyTracker, RefreshDecision, refresh_page_dependent_fields
+from ..watchdog import ComWatchdog, com_deadline
+from .toc_alignment import SIMILARITY_THRESHOLD, align_toc, normalize_toc_text, text_similarity
 
 
 logger = logging.getLogger(__name__)
@@ -26,15 +29,26 @@ logger = logging.getLogger(__name__)
 class DocumentValidator:
     """Validate document modifications against strict assertions with rollback capability."""
     
-    def __init__(self, visible: bool = False):
+    # Assertion groups run by validate_modifications
+    ASSERTIONS = ("chapter", "style", "toc", "pagination")
+    
+    def __init__(self, visible: bool = False, layout_tracker: Optional[LayoutDependencyTracker] = None,
+                 watchdog: Optional[ComWatchdog] = None):
         """
         Initialize document validator.
         
         Args:
             visible: Whether to show Word application window during validation
+            layout_tracker: Tracker of stale fields/layout from the executor; when
+                given, fields and pagination are refreshed only as far as needed
+            watchdog: Puts Word calls (Documents.Open, Fields.Update,
+                Repaginate, Save) under operation deadlines
         """
         self.visible = visible
+        self.layout_tracker = layout_tracker
+        self.watchdog = watchdog
         self._word_app = None
+        self._word_pid: Optional[int] = None
         self._com_initialized = False
     
     def __enter__(self):
@@ -46,10 +60,13 @@ class DocumentValidator:
             logger.debug("COM initialized for validation")
             
             # Create Word application instance
-            self._word_app = win32.gencache.EnsureDispatch('Word.Application')
-            self._word_app.Visible = self.visible
-            self._word_app.DisplayAlerts = 0  # Disable alerts
-            self._word_app.ScreenUpdating = False  # Improve performance
+            with com_deadline(self.watchdog, "Word.Application"):
+                self._word_app = win32.gencache.EnsureDispatch('Word.Application')
+                if self.watchdog is not None:
+                    self._word_pid = self.watchdog.attach_word_app(self._word_app)
+                self._word_app.Visible = self.visible
+                self._word_app.DisplayAlerts = 0  # Disable alerts
+                self._word_app.ScreenUpdating = False  # Improve performance
             
             logger.info(f"Word application started for validation (visible={self.visible})")
             return self
@@ -70,6 +87,10 @@ class DocumentValidator:
                 self._word_app.DisplayAlerts = -1
                 self._word_app.Quit(SaveChanges=0)
                 self._word_app = None
+                if self.watchdog is not None:
+                    # The PID may be reused once Word has exited
+                    self.watchdog.detach_process(self._word_pid)
+                self._word_pid = None
                 logger.info("Word application closed after validation")
         except Exception as e:
             logger.warning(f"Error during Word cleanup: {e}")
@@ -84,7 +105,8 @@ class DocumentValidator:
                     logger.warning(f"Error during COM cleanup: {e}")
     
     def validate_modifications(self, original_structure: StructureV1, modified_docx: str, 
-                             original_docx: Optional[str] = None) -> ValidationResult:
+                             original_docx: Optional[str] = None,
+                             assertions: Optional[Iterable[str]] = None) -> ValidationResult:
         """
         Validate all assertions and generate comparison structure.
         
@@ -92,6 +114,7 @@ class DocumentValidator:
             original_structure: Original document structure
             modified_docx: Path to modified DOCX file
             original_docx: Path to original DOCX file for rollback
+            assertions: Assertion groups to run (defaults to all of ASSERTIONS)
             
         Returns:
             ValidationResult: Validation result with detailed errors
@@ -102,32 +125,45 @@ class DocumentValidator:
         if not os.path.exists(modified_docx):
             raise ValidationError(f"Modified DOCX file not found: {modified_docx}")
         
+        assertions = list(self.ASSERTIONS if assertions is None else assertions)
+        unknown = [name for name in assertions if name not in self.ASSERTIONS]
+        if unknown:
+            raise ValidationError(f"Unknown assertions: {', '.join(unknown)}",
+                                  validation_stage="setup")
+        
         try:
             logger.info(f"Validating modifications in: {modified_docx}")
             
-            # First, update fields and repaginate the document
-            self._update_fields_and_repaginate(modified_docx)
+            # First, update fields and repaginate the document as far as needed
+            if self.layout_tracker is None:
+                self._update_fields_and_repaginate(modified_docx)
+            else:
+                self._update_fields_and_repaginate(modified_docx, self.layout_tracker.plan_refresh(assertions))
             
             # Extract structure from modified document
-            with DocumentExtractor(visible=self.visible) as extractor:
+            with DocumentExtractor(visible=self.visible, watchdog=self.watchdog) as extractor:
                 modified_structure = extractor.extract_structure(modified_docx)
             
             # Collect all validation errors
             all_errors = []
             all_warnings = []
             
-            # Run all assertion checks
-            chapter_errors = self.check_chapter_assertions(modified_structure)
-            all_errors.extend(chapter_errors)
+            # Run enabled assertion checks
+            if "chapter" in assertions:
+                chapter_errors = self.check_chapter_assertions(modified_structure)
+                all_errors.extend(chapter_errors)
             
-            style_errors = self.check_style_assertions(modified_structure)
-            all_errors.extend(style_errors)
+            if "style" in assertions:
+                style_errors = self.check_style_assertions(modified_structure)
+                all_errors.extend(style_errors)
             
-            toc_errors = self.check_toc_assertions(modified_structure)
-            all_errors.extend(toc_errors)
+            if "toc" in assertions:
+                toc_errors = self.check_toc_assertions(modified_structure)
+                all_errors.extend(toc_errors)
             
-            pagination_errors = self.check_pagination_assertions(original_structure, modified_structure)
-            all_errors.extend(pagination_errors)
+            if "pagination" in assertions:
+                pagination_errors = self.check_pagination_assertions(original_structure, modified_structure)
+                all_errors.extend(pagination_errors)
             
             # Check if validation passed
             is_valid = len(all_errors) == 0
@@ -315,6 +351,10 @@ class DocumentValidator:
         """
         Verify TOC consistency with heading tree.
         
+        TOC entries are aligned with the headings (see toc_alignment), so
+        each missing, extra, reordered or level-mismatched entry is reported
+        once instead of shifting every later comparison.
+        
         Args:
             structure: Document structure to validate
             
@@ -346,34 +386,10 @@ class DocumentValidator:
                     # Parse TOC entries (simplified parsing)
                     toc_entries = self._parse_toc_entries(toc_field.result_text)
                     
-                    # Compare with actual headings
+                    # Align TOC entries with the heading tree
                     heading_entries = [(h.text.strip(), h.level) for h in structure.headings]
-                    
-                    # Check if TOC entries match headings
-                    if len(toc_entries) != len(heading_entries):
-                        errors.append(
-                            f"TOC assertion failed: TOC has {len(toc_entries)} entries, "
-                            f"but document has {len(heading_entries)} headings"
-                        )
-                    
-                    # Check individual entries (simplified check)
-                    for i, (toc_text, toc_level) in enumerate(toc_entries):
-                        if i < len(heading_entries):
-                            heading_text, heading_level = heading_entries[i]
-                            
-                            # Check if heading text matches (allowing for minor differences)
-                            if not self._text_matches_approximately(toc_text, heading_text):
-                                errors.append(
-                                    f"TOC assertion failed: TOC entry '{toc_text}' does not match "
-                                    f"heading '{heading_text}' at position {i}"
-                                )
-                            
-                            # Check if levels match
-                            if toc_level != heading_level:
-                                errors.append(
-                                    f"TOC assertion failed: TOC entry '{toc_text}' has level {toc_level}, "
-                                    f"but heading has level {heading_level}"
-                                )
+                    alignment = align_toc(toc_entries, heading_entries)
+                    errors.extend(alignment.errors())
                 
                 except Exception as e:
                     errors.append(f"TOC assertion failed: Error processing TOC field: {e}")
@@ -486,28 +502,48 @@ class DocumentValidator:
                 rollback_exception=e
             )
     
-    def _update_fields_and_repaginate(self, docx_path: str):
+    def _update_fields_and_repaginate(self, docx_path: str, decision: Optional[RefreshDecision] = None):
         """
-        Update all fields and repaginate the document.
+        Update fields and repaginate the document.
         
         Args:
             docx_path: Path to DOCX file to update
+            decision: Scoped refresh from the layout tracker; None updates all
+                fields and repaginates unconditionally
         """
+        if decision is not None and decision.is_noop:
+            logger.info(f"Skipping field update and repagination: {decision.reason}")
+            if self.layout_tracker is not None:
+                self.layout_tracker.record("validate", decision)
+            return
+        
         try:
             logger.info(f"Updating fields and repaginating: {docx_path}")
             
             # Open document
-            doc = self._word_app.Documents.Open(docx_path)
+            with com_deadline(self.watchdog, "Documents.Open"):
+                doc = self._word_app.Documents.Open(docx_path)
             
             try:
-                # Update all fields
-                doc.Fields.Update()
-                
-                # Repaginate document
-                doc.Repaginate()
+                if decision is None:
+                    # Update all fields
+                    with com_deadline(self.watchdog, "Fields.Update"):
+                        doc.Fields.Update()
+                    
+                    # Repaginate document
+                    with com_deadline(self.watchdog, "Repaginate"):
+                        doc.Repaginate()
+                else:
+                    with com_deadline(self.watchdog, "refresh_page_dependent_fields"):
+                        updated_fields = refresh_page_dependent_fields(doc, decision)
                 
                 # Save changes
-                doc.Save()
+                with com_deadline(self.watchdog, "Document.Save"):
+                    doc.Save()
+                
+                if decision is not None and self.layout_tracker is not None:
+                    self.layout_tracker.mark_refreshed(decision)
+                    self.layout_tracker.record("validate", decision, updated_fields=updated_fields)
                 
                 logger.info("Fields updated and document repaginated")
                 
@@ -571,23 +607,4 @@ class DocumentValidator:
         Returns:
             True if texts match approximately
         """
-        # Normalize texts
-        norm1 = text1.strip().lower()
-        norm2 = text2.strip().lower()
-        
-        # Exact match
-        if norm1 == norm2:
-            return True
-        
-        # Check if one contains the other (for cases where TOC might have truncated text)
-        if norm1 in norm2 or norm2 in norm1:
-            return True
-        
-        # Check similarity (simple approach - could be enhanced with fuzzy matching)
-        if len(norm1) > 0 and len(norm2) > 0:
-            # Calculate simple similarity ratio
-            common_chars = sum(1 for c in norm1 if c in norm2)
-            similarity = common_chars / max(len(norm1), len(norm2))
-            return similarity > 0.8
-        
-        return False
\ No newline at end of file
+        return text_similarity(normalize_toc_text(text1), normalize_toc_text(text2)) >= SIMILARITY_THRESHOLD
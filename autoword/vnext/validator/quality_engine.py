@@ -0,0 +1,511 @@
+"""
+Columnar quality scoring engine for AutoWord vNext.
+
+This module provides a columnar view of StructureV1 and a single-traversal
+rule engine that computes every quality score and issue list used by
+AdvancedValidator.generate_quality_metrics. The Pydantic models are walked
+exactly once to build compact array-backed columns; all rules are then
+evaluated against those columns instead of re-walking the structure in each
+_calculate_* / _collect_* helper.
+"""
+
+import logging
+from array import array
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..models import StructureV1, StyleType
+
+
+logger = logging.getLogger(__name__)
+
+
+# Field code keywords whose empty result indicates a stale reference
+REFERENCE_FIELD_KEYWORDS = ("REF", "PAGEREF", "TOC")
+
+
+class StructureColumns:
+    """
+    Columnar, array-backed view of a StructureV1 document.
+
+    Styles, headings, tables and fields are decomposed into parallel arrays
+    built in a single pass over each collection. Missing numeric values are
+    stored as 0, which matches the truthiness checks used by the quality rules.
+    Paragraph columns are only materialized on first access because the quality
+    rules need nothing beyond the paragraph count.
+    """
+
+    def __init__(self, structure: StructureV1):
+        self._structure = structure
+        self.paragraph_count = len(structure.paragraphs)
+
+        # Style columns
+        self.style_names: List[str] = []
+        self.style_is_paragraph = array('B')
+        self.style_has_font = array('B')
+        self.style_has_paragraph = array('B')
+        self.style_has_font_family = array('B')
+        self.style_font_size = array('i')
+        self.style_line_spacing = array('d')
+        self.style_east_asian: List[Optional[str]] = []
+
+        for style in structure.styles:
+            font = style.font
+            para = style.paragraph
+            self.style_names.append(style.name)
+            self.style_is_paragraph.append(style.type == StyleType.PARAGRAPH)
+            self.style_has_font.append(bool(font))
+            self.style_has_paragraph.append(bool(para))
+            self.style_has_font_family.append(bool(font and (font.east_asian or font.latin)))
+            self.style_font_size.append((font.size_pt or 0) if font else 0)
+            self.style_line_spacing.append((para.line_spacing_value or 0.0) if para else 0.0)
+            self.style_east_asian.append(font.east_asian if font else None)
+
+        # Heading columns
+        self.heading_levels = array('i')
+        self.heading_text_lengths = array('i')
+        self.heading_texts: List[str] = []
+
+        for heading in structure.headings:
+            self.heading_levels.append(heading.level)
+            self.heading_text_lengths.append(len(heading.text.strip()))
+            self.heading_texts.append(heading.text)
+
+        # Table columns
+        self.table_paragraph_indexes = array('i')
+        self.table_rows = array('i')
+        self.table_columns = array('i')
+        self.table_has_header = array('B')
+
+        for table in structure.tables:
+            self.table_paragraph_indexes.append(table.paragraph_index)
+            self.table_rows.append(table.rows)
+            self.table_columns.append(table.columns)
+            self.table_has_header.append(bool(table.has_header))
+
+        # Field columns
+        self.field_paragraph_indexes = array('i')
+        self.field_codes: List[Optional[str]] = []
+        self.field_is_error = array('B')
+        self.field_is_empty_reference = array('B')
+        self.field_is_toc = array('B')
+        self.field_has_result = array('B')
+
+        for fld in structure.fields:
+            code_upper = fld.field_code.upper() if fld.field_code else ""
+            result = fld.result_text
+            self.field_paragraph_indexes.append(fld.paragraph_index)
+            self.field_codes.append(fld.field_code)
+            self.field_is_error.append(bool(result and "Error!" in result))
+            self.field_is_empty_reference.append(
+                bool(not result and fld.field_code and
+                     any(keyword in code_upper for keyword in REFERENCE_FIELD_KEYWORDS))
+            )
+            self.field_is_toc.append("TOC" in code_upper)
+            self.field_has_result.append(bool(result))
+
+        self._paragraph_columns_built = False
+        self._style_ids: Dict[str, int] = {}
+
+    @property
+    def style_count(self) -> int:
+        return len(self.style_names)
+
+    @property
+    def heading_count(self) -> int:
+        return len(self.heading_levels)
+
+    @property
+    def table_count(self) -> int:
+        return len(self.table_rows)
+
+    @property
+    def field_count(self) -> int:
+        return len(self.field_codes)
+
+    def _build_paragraph_columns(self):
+        """Materialize paragraph columns (style id, heading level, font size, text length)."""
+        style_sizes: Dict[str, int] = {}
+        for name, size in zip(self.style_names, self.style_font_size):
+            style_sizes.setdefault(name, size)
+
+        style_ids = self._style_ids
+        self._paragraph_style_ids = array('i')
+        self._paragraph_heading_levels = array('b')
+        self._paragraph_font_sizes = array('i')
+        self._paragraph_text_lengths = array('i')
+
+        for para in self._structure.paragraphs:
+            name = para.style_name
+            if name is None:
+                style_id = -1
+            else:
+                style_id = style_ids.get(name)
+                if style_id is None:
+                    style_id = style_ids[name] = len(style_ids)
+            self._paragraph_style_ids.append(style_id)
+            self._paragraph_heading_levels.append(para.heading_level or 0)
+            self._paragraph_font_sizes.append(style_sizes.get(name, 0) if name else 0)
+            self._paragraph_text_lengths.append(len(para.preview_text))
+
+        self._paragraph_columns_built = True
+
+    @property
+    def paragraph_style_ids(self) -> array:
+        if not self._paragraph_columns_built:
+            self._build_paragraph_columns()
+        return self._paragraph_style_ids
+
+    @property
+    def paragraph_heading_levels(self) -> array:
+        if not self._paragraph_columns_built:
+            self._build_paragraph_columns()
+        return self._paragraph_heading_levels
+
+    @property
+    def paragraph_font_sizes(self) -> array:
+        if not self._paragraph_columns_built:
+            self._build_paragraph_columns()
+        return self._paragraph_font_sizes
+
+    @property
+    def paragraph_text_lengths(self) -> array:
+        if not self._paragraph_columns_built:
+            self._build_paragraph_columns()
+        return self._paragraph_text_lengths
+
+    @property
+    def style_id_table(self) -> Dict[str, int]:
+        """Interned paragraph style name to id mapping."""
+        if not self._paragraph_columns_built:
+            self._build_paragraph_columns()
+        return self._style_ids
+
+
+@dataclass
+class QualityEvaluation:
+    """Scores, issue lists and check counts produced by QualityRuleEngine."""
+    style_consistency_score: float = 0.0
+    cross_reference_integrity_score: float = 0.0
+    accessibility_score: float = 0.0
+    formatting_quality_score: float = 0.0
+    inconsistent_styles: List[str] = field(default_factory=list)
+    broken_cross_references: List[str] = field(default_factory=list)
+    accessibility_issues: List[str] = field(default_factory=list)
+    formatting_issues: List[str] = field(default_factory=list)
+    total_styles_checked: int = 0
+    total_cross_references_checked: int = 0
+    total_accessibility_checks: int = 0
+    total_formatting_checks: int = 0
+
+    def apply_to(self, metrics: Any):
+        """Copy evaluation results onto a QualityMetrics instance."""
+        metrics.style_consistency_score = self.style_consistency_score
+        metrics.cross_reference_integrity_score = self.cross_reference_integrity_score
+        metrics.accessibility_score = self.accessibility_score
+        metrics.formatting_quality_score = self.formatting_quality_score
+        metrics.inconsistent_styles = self.inconsistent_styles
+        metrics.broken_cross_references = self.broken_cross_references
+        metrics.accessibility_issues = self.accessibility_issues
+        metrics.formatting_issues = self.formatting_issues
+        metrics.total_styles_checked = self.total_styles_checked
+        metrics.total_cross_references_checked = self.total_cross_references_checked
+        metrics.total_accessibility_checks = self.total_accessibility_checks
+        metrics.total_formatting_checks = self.total_formatting_checks
+
+
+class QualityRuleEngine:
+    """
+    Single-traversal rule engine for document quality metrics.
+
+    Produces results identical to AdvancedValidator's _calculate_enhanced_*,
+    _count_enhanced_* and _collect_enhanced_* helpers, evaluating each rule
+    family in one pass over the corresponding column set.
+    """
+
+    def __init__(self, max_style_variations_per_type: int = 3,
+                 min_font_size_accessibility: int = 9,
+                 max_heading_level_skip: int = 1,
+                 min_heading_text_length: int = 3,
+                 max_table_size_warning: tuple = (20, 10)):
+        self.max_style_variations_per_type = max_style_variations_per_type
+        self.min_font_size_accessibility = min_font_size_accessibility
+        self.max_heading_level_skip = max_heading_level_skip
+        self.min_heading_text_length = min_heading_text_length
+        self.max_table_size_warning = max_table_size_warning
+
+    @classmethod
+    def from_validator(cls, validator: Any) -> "QualityRuleEngine":
+        """Create an engine using an AdvancedValidator's configured thresholds."""
+        return cls(
+            max_style_variations_per_type=validator.max_style_variations_per_type,
+            min_font_size_accessibility=validator.min_font_size_accessibility,
+            max_heading_level_skip=validator.max_heading_level_skip,
+            min_heading_text_length=validator.min_heading_text_length,
+            max_table_size_warning=validator.max_table_size_warning
+        )
+
+    def evaluate(self, structure: StructureV1,
+                 columns: Optional[StructureColumns] = None) -> QualityEvaluation:
+        """
+        Evaluate all quality rules against a document structure.
+
+        Args:
+            structure: Document structure to analyze
+            columns: Pre-built columnar view (built from structure if omitted)
+
+        Returns:
+            QualityEvaluation: Scores, issues and check counts
+        """
+        cols = columns if columns is not None else StructureColumns(structure)
+        result = QualityEvaluation()
+
+        style_stats = self._evaluate_styles(cols)
+        heading_stats = self._evaluate_headings(cols)
+        table_stats = self._evaluate_tables(cols)
+        field_stats = self._evaluate_fields(cols)
+
+        n_styles = cols.style_count
+        n_headings = cols.heading_count
+        n_tables = cols.table_count
+        n_fields = cols.field_count
+        n_paragraphs = cols.paragraph_count
+
+        font_size_variations = len(style_stats['font_sizes']) > self.max_style_variations_per_type
+        line_spacing_variations = len(style_stats['line_spacings']) > self.max_style_variations_per_type
+
+        # Style consistency score
+        if not n_styles:
+            result.style_consistency_score = 0.0
+        else:
+            score = 1.0
+            score -= (style_stats['duplicates'] * 0.15)
+            score -= (style_stats['incomplete'] / n_styles) * 0.4
+            if font_size_variations:
+                score -= 0.25
+            if style_stats['heading_styles'] < 3:
+                score -= 0.1
+            if len(style_stats['font_families']) > 3:
+                score -= 0.1
+            result.style_consistency_score = max(0.0, min(1.0, score))
+
+        # Cross-reference integrity score
+        if not n_fields:
+            result.cross_reference_integrity_score = 1.0
+        else:
+            score = (1.0 - (field_stats['broken'] / n_fields)
+                     - (field_stats['empty_references'] / n_fields * 0.5))
+            if field_stats['toc'] and field_stats['toc_all_ok']:
+                score += 0.1
+            result.cross_reference_integrity_score = max(0.0, min(1.0, score))
+
+        # Accessibility score
+        score = 1.0
+        if not n_headings:
+            score -= 0.4
+        else:
+            if heading_stats['violations'] > 0:
+                score -= (heading_stats['violations'] / n_headings) * 0.2
+            score -= (heading_stats['short'] / n_headings) * 0.1
+            if cols.heading_levels[0] != 1:
+                score -= 0.1
+        if n_styles > 0:
+            score -= (style_stats['small_fonts'] / n_styles) * 0.25
+        if n_tables:
+            score -= (table_stats['without_header'] / n_tables) * 0.2
+            score -= (table_stats['oversized'] / n_tables) * 0.1
+        if n_paragraphs:
+            heading_density = n_headings / n_paragraphs
+            if heading_density < 0.05:
+                score -= 0.1
+            elif heading_density > 0.3:
+                score -= 0.05
+        result.accessibility_score = max(0.0, min(1.0, score))
+
+        # Formatting quality score
+        score = 1.0
+        if n_styles:
+            if line_spacing_variations:
+                score -= 0.2
+            if font_size_variations:
+                score -= 0.2
+        if not n_headings:
+            score -= 0.3
+        elif n_headings < 3:
+            score -= 0.15
+        if n_paragraphs < 5:
+            score -= 0.2
+        if n_fields:
+            score -= (field_stats['broken'] / n_fields) * 0.1
+        result.formatting_quality_score = max(0.0, min(1.0, score))
+
+        # Check counts
+        result.total_styles_checked = n_styles
+        result.total_cross_references_checked = n_fields
+        result.total_accessibility_checks = n_headings * 3 + n_tables * 2 + n_styles * 2 + 5
+        result.total_formatting_checks = n_styles * 3 + n_paragraphs + n_headings * 2 + n_fields + 10
+
+        # Issue lists
+        result.inconsistent_styles = [f"Duplicate style: {name}" for name in style_stats['duplicate_names']]
+        result.inconsistent_styles.extend(style_stats['issues'])
+        if style_stats['heading_styles'] < 3:
+            result.inconsistent_styles.append("Insufficient heading styles (should have at least H1, H2, H3)")
+
+        result.broken_cross_references = field_stats['issues']
+        if not field_stats['toc'] and n_headings > 5:
+            result.broken_cross_references.append("Missing table of contents for document with multiple headings")
+
+        result.accessibility_issues = heading_stats['issues']
+        result.accessibility_issues.extend(style_stats['small_font_issues'])
+        result.accessibility_issues.extend(table_stats['issues'])
+
+        formatting_issues = []
+        if font_size_variations:
+            formatting_issues.append(f"Too many font size variations: {sorted(style_stats['font_sizes'])}")
+        if line_spacing_variations:
+            formatting_issues.append(f"Too many line spacing variations: {sorted(style_stats['line_spacings'])}")
+        if not n_headings:
+            formatting_issues.append("No document headings for structure")
+        elif n_headings < 3:
+            formatting_issues.append("Insufficient document structure (fewer than 3 headings)")
+        if n_paragraphs < 5:
+            formatting_issues.append("Very short document (fewer than 5 paragraphs)")
+        if field_stats['broken']:
+            formatting_issues.append(f"{field_stats['broken']} broken fields need updating")
+        result.formatting_issues = formatting_issues
+
+        return result
+
+    def _evaluate_styles(self, cols: StructureColumns) -> Dict[str, Any]:
+        """Single pass over style columns."""
+        name_counts = Counter(cols.style_names)
+        duplicate_names = [name for name, count in name_counts.items() if count > 1]
+
+        incomplete = 0
+        heading_styles = 0
+        small_fonts = 0
+        font_sizes = set()
+        line_spacings = set()
+        font_families = defaultdict(int)
+        issues = []
+        small_font_issues = []
+        min_size = self.min_font_size_accessibility
+
+        for i, name in enumerate(cols.style_names):
+            has_font = cols.style_has_font[i]
+            is_paragraph = cols.style_is_paragraph[i]
+            has_paragraph = cols.style_has_paragraph[i]
+            size = cols.style_font_size[i]
+            spacing = cols.style_line_spacing[i]
+
+            if not has_font or (is_paragraph and not has_paragraph):
+                incomplete += 1
+            if not has_font:
+                issues.append(f"Missing font specification: {name}")
+            if is_paragraph and not has_paragraph:
+                issues.append(f"Missing paragraph specification: {name}")
+            if has_font:
+                if not cols.style_has_font_family[i]:
+                    issues.append(f"No font family specified: {name}")
+                if size and (size < 8 or size > 72):
+                    issues.append(f"Unusual font size: {name} ({size}pt)")
+                east_asian = cols.style_east_asian[i]
+                if east_asian:
+                    font_families[east_asian] += 1
+            if size:
+                font_sizes.add(size)
+                if size < min_size:
+                    small_fonts += 1
+                    small_font_issues.append(f"Small font in style: {name} ({size}pt)")
+            if spacing:
+                line_spacings.add(spacing)
+
+            lowered = name.lower()
+            if 'heading' in lowered or '标题' in lowered:
+                heading_styles += 1
+
+        return {
+            'duplicates': len(cols.style_names) - len(name_counts),
+            'duplicate_names': duplicate_names,
+            'incomplete': incomplete,
+            'heading_styles': heading_styles,
+            'small_fonts': small_fonts,
+            'font_sizes': font_sizes,
+            'line_spacings': line_spacings,
+            'font_families': font_families,
+            'issues': issues,
+            'small_font_issues': small_font_issues
+        }
+
+    def _evaluate_headings(self, cols: StructureColumns) -> Dict[str, Any]:
+        """Single pass over heading columns."""
+        issues = []
+        violations = 0
+        short_texts = []
+
+        if not cols.heading_count:
+            issues.append("No headings for navigation")
+        else:
+            prev_level = 0
+            max_skip = self.max_heading_level_skip
+            min_length = self.min_heading_text_length
+            for i, level in enumerate(cols.heading_levels):
+                if level > prev_level + max_skip:
+                    violations += 1
+                    issues.append(f"Heading level skip: '{cols.heading_texts[i]}' (H{level} after H{prev_level})")
+                prev_level = level
+                if cols.heading_text_lengths[i] < min_length:
+                    short_texts.append(cols.heading_texts[i])
+            issues.extend([f"Short heading text: '{text}'" for text in short_texts[:3]])
+
+        return {'violations': violations, 'short': len(short_texts), 'issues': issues}
+
+    def _evaluate_tables(self, cols: StructureColumns) -> Dict[str, Any]:
+        """Single pass over table columns."""
+        issues = []
+        without_header = 0
+        oversized = 0
+        max_rows, max_columns = self.max_table_size_warning
+
+        for i, para_index in enumerate(cols.table_paragraph_indexes):
+            rows = cols.table_rows[i]
+            columns = cols.table_columns[i]
+            if not cols.table_has_header[i]:
+                without_header += 1
+                issues.append(f"Table without header at paragraph {para_index}")
+            if rows > max_rows or columns > max_columns:
+                oversized += 1
+                issues.append(f"Oversized table at paragraph {para_index} ({rows}x{columns})")
+
+        return {'without_header': without_header, 'oversized': oversized, 'issues': issues}
+
+    def _evaluate_fields(self, cols: StructureColumns) -> Dict[str, Any]:
+        """Single pass over field columns."""
+        issues = []
+        broken = 0
+        empty_references = 0
+        toc = 0
+        toc_all_ok = True
+
+        for i, para_index in enumerate(cols.field_paragraph_indexes):
+            code = cols.field_codes[i]
+            is_error = cols.field_is_error[i]
+            if is_error:
+                broken += 1
+                issues.append(f"Broken field at paragraph {para_index}: {code or 'Unknown field'}")
+            elif cols.field_is_empty_reference[i]:
+                empty_references += 1
+                issues.append(f"Empty field result at paragraph {para_index}: {code}")
+            if cols.field_is_toc[i]:
+                toc += 1
+                if not cols.field_has_result[i] or is_error:
+                    toc_all_ok = False
+
+        return {
+            'broken': broken,
+            'empty_references': empty_references,
+            'toc': toc,
+            'toc_all_ok': toc_all_ok,
+            'issues': issues
+        }
@@ -0,0 +1,228 @@
+"""
+Sequence alignment of TOC entries against the document heading tree.
+
+Comparing TOC entries with headings position by position turns one missing
+entry into a mismatch for every later position. Instead, both sequences are
+normalized and aligned:
+
+1. Entry texts are normalized (Unicode NFKC, case folded, whitespace
+   collapsed, dot leaders and trailing page numbers removed) and the
+   normalized strings are used as hash keys.
+2. difflib.SequenceMatcher aligns the two key sequences, anchoring every run
+   of identical entries.
+3. Inside each non-matching gap, entries are paired with a small
+   Needleman-Wunsch alignment scored by a linear-time character-overlap
+   similarity, so truncated or slightly edited TOC texts still match.
+4. Unpaired TOC entries and headings with the same key are reported as
+   reordered; the rest are extra TOC entries and missing headings.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Dict, List, Sequence, Tuple
+
+
+SIMILARITY_THRESHOLD = 0.8
+# Gaps larger than this (TOC entries x headings) are not fuzzily paired
+MAX_GAP_CELLS = 40_000
+
+# Dot leader or tab followed by an optional page number, at the end of an entry
+_LEADER_PATTERN = re.compile(r"(?:[.·…_]{2,}|\t)[\s.·…_]*\d*\s*$")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_toc_text(text: str) -> str:
+    """
+    Normalize a TOC entry or heading text for comparison.
+
+    Args:
+        text: Raw entry text
+
+    Returns:
+        str: Normalized text
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    text = _LEADER_PATTERN.sub("", text)
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+@dataclass
+class TocMatch:
+    """A TOC entry paired with a heading."""
+    toc_index: int
+    heading_index: int
+    similarity: float
+
+
+@dataclass
+class TocAlignment:
+    """Result of aligning TOC entries with headings."""
+    toc_entries: List[Tuple[str, int]]
+    headings: List[Tuple[str, int]]
+    matches: List[TocMatch] = field(default_factory=list)
+    missing: List[int] = field(default_factory=list)  # Heading indexes absent from the TOC
+    extra: List[int] = field(default_factory=list)  # TOC entry indexes without a heading
+    reordered: List[TocMatch] = field(default_factory=list)  # Entries present at the wrong position
+
+    @property
+    def level_mismatches(self) -> List[TocMatch]:
+        """Matched (or reordered) entries whose level differs from the heading."""
+        return [match for match in self.matches + self.reordered
+                if self.toc_entries[match.toc_index][1] != self.headings[match.heading_index][1]]
+
+    @property
+    def is_consistent(self) -> bool:
+        return not (self.missing or self.extra or self.reordered or self.level_mismatches)
+
+    def errors(self, prefix: str = "TOC assertion failed") -> List[str]:
+        """
+        Describe every inconsistency.
+
+        Args:
+            prefix: Text each message starts with
+
+        Returns:
+            List[str]: One message per missing, extra, reordered or
+                level-mismatched entry
+        """
+        messages = []
+        for heading_index in self.missing:
+            text, level = self.headings[heading_index]
+            messages.append(f"{prefix}: heading '{text}' (level {level}, heading {heading_index}) "
+                            f"is missing from the TOC")
+        for toc_index in self.extra:
+            text, level = self.toc_entries[toc_index]
+            messages.append(f"{prefix}: TOC entry '{text}' at position {toc_index} has no matching heading")
+        for match in self.reordered:
+            text = self.toc_entries[match.toc_index][0]
+            messages.append(f"{prefix}: TOC entry '{text}' at position {match.toc_index} is out of order "
+                            f"(heading {match.heading_index})")
+        for match in self.level_mismatches:
+            text, toc_level = self.toc_entries[match.toc_index]
+            messages.append(f"{prefix}: TOC entry '{text}' has level {toc_level}, "
+                            f"but heading has level {self.headings[match.heading_index][1]}")
+        return messages
+
+
+def _similarity(text1: str, counts1: Counter, text2: str, counts2: Counter) -> float:
+    if text1 == text2:
+        return 1.0
+    if not text1 or not text2:
+        return 0.0
+    if text1 in text2 or text2 in text1:
+        return 1.0
+    return sum((counts1 & counts2).values()) / max(len(text1), len(text2))
+
+
+def text_similarity(text1: str, text2: str) -> float:
+    """
+    Similarity of two normalized texts in [0, 1].
+
+    Shared characters are counted as a multiset intersection, which runs in
+    O(len(text1) + len(text2)); containment (a truncated TOC entry) counts
+    as a full match.
+
+    Args:
+        text1: First normalized text
+        text2: Second normalized text
+
+    Returns:
+        float: 1.0 for equal or contained texts, otherwise the fraction of
+            characters shared relative to the longer text
+    """
+    return _similarity(text1, Counter(text1), text2, Counter(text2))
+
+
+def _align_gap(toc_keys: Sequence[str], heading_keys: Sequence[str],
+               threshold: float) -> List[Tuple[int, int, float]]:
+    """Needleman-Wunsch over a gap; only pairs at or above the threshold score."""
+    rows, cols = len(toc_keys), len(heading_keys)
+    if not rows or not cols or rows * cols > MAX_GAP_CELLS:
+        return []
+
+    toc_counts = [Counter(key) for key in toc_keys]
+    heading_counts = [Counter(key) for key in heading_keys]
+    similarity = [[_similarity(toc_keys[i], toc_counts[i], heading_keys[j], heading_counts[j])
+                   for j in range(cols)] for i in range(rows)]
+    score = [[0.0] * (cols + 1) for _ in range(rows + 1)]
+    for i in range(1, rows + 1):
+        for j in range(1, cols + 1):
+            best = max(score[i - 1][j], score[i][j - 1])
+            if similarity[i - 1][j - 1] >= threshold:
+                best = max(best, score[i - 1][j - 1] + similarity[i - 1][j - 1])
+            score[i][j] = best
+
+    pairs = []
+    i, j = rows, cols
+    while i > 0 and j > 0:
+        pair_score = similarity[i - 1][j - 1]
+        if pair_score >= threshold and score[i][j] == score[i - 1][j - 1] + pair_score:
+            pairs.append((i - 1, j - 1, pair_score))
+            i, j = i - 1, j - 1
+        elif score[i][j] == score[i - 1][j]:
+            i -= 1
+        else:
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+
+def align_toc(toc_entries: Sequence[Tuple[str, int]], headings: Sequence[Tuple[str, int]],
+              threshold: float = SIMILARITY_THRESHOLD) -> TocAlignment:
+    """
+    Align TOC entries with the heading sequence.
+
+    Args:
+        toc_entries: (text, level) pairs parsed from the TOC result text
+        headings: (text, level) pairs of the document headings, in order
+        threshold: Minimum similarity for pairing non-identical texts
+
+    Returns:
+        TocAlignment: Matched, missing, extra and reordered entries
+    """
+    result = TocAlignment(toc_entries=list(toc_entries), headings=list(headings))
+    toc_keys = [normalize_toc_text(text) for text, _ in toc_entries]
+    heading_keys = [normalize_toc_text(text) for text, _ in headings]
+
+    matcher = SequenceMatcher(None, toc_keys, heading_keys, autojunk=False)
+    gaps = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            result.matches.extend(TocMatch(i1 + k, j1 + k, 1.0) for k in range(i2 - i1))
+        else:
+            gaps.append((list(range(i1, i2)), list(range(j1, j2))))
+
+    # An entry left over on both sides with identical text was moved
+    waiting: Dict[str, List[int]] = {}
+    for _, heading_indexes in gaps:
+        for heading_index in heading_indexes:
+            waiting.setdefault(heading_keys[heading_index], []).append(heading_index)
+    moved_toc, moved_headings = set(), set()
+    for toc_indexes, _ in gaps:
+        for toc_index in toc_indexes:
+            candidates = waiting.get(toc_keys[toc_index])
+            if candidates:
+                heading_index = candidates.pop(0)
+                moved_toc.add(toc_index)
+                moved_headings.add(heading_index)
+                result.reordered.append(TocMatch(toc_index, heading_index, 1.0))
+
+    # Pair the remaining entries of each gap by similarity
+    for toc_indexes, heading_indexes in gaps:
+        toc_indexes = [i for i in toc_indexes if i not in moved_toc]
+        heading_indexes = [j for j in heading_indexes if j not in moved_headings]
+        pairs = _align_gap([toc_keys[i] for i in toc_indexes], [heading_keys[j] for j in heading_indexes],
+                           threshold)
+        result.matches.extend(TocMatch(toc_indexes[i], heading_indexes[j], score) for i, j, score in pairs)
+        paired_toc = {toc_indexes[i] for i, _, _ in pairs}
+        paired_headings = {heading_indexes[j] for _, j, _ in pairs}
+        result.extra.extend(i for i in toc_indexes if i not in paired_toc)
+        result.missing.extend(j for j in heading_indexes if j not in paired_headings)
+
+    result.matches.sort(key=lambda match: match.toc_index)
+    result.reordered.sort(key=lambda match: match.toc_index)
+    result.missing.sort()
+    return result
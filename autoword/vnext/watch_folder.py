@@ -0,0 +1,434 @@
+"""
+Watch-folder ingestion for the vNext pipeline.
+
+FolderWatcher watches drop folders and processes every DOCX that arrives,
+each folder with its own user intent and LLM configuration. Arrivals are
+debounced: a file is picked up once its size and modification time have
+not changed for settle_seconds, it can be opened for writing and it is a
+complete ZIP package. Inputs are deduplicated by content hash through the
+batch manifest, so a document already processed with the same intent and
+configuration (in an earlier batch, or dropped twice) reuses its output
+instead of running the pipeline again. Ready documents are processed by a
+pool of worker threads, each keeping a warm pipeline per folder
+configuration.
+
+Finished inputs leave the watched folder:
+
+    <folder>_done/<name>              Modified document
+    <folder>_done/originals/<name>    Input document
+    <folder>_failed/<name>            Input document of a failed run
+    <folder>_failed/<name>.error.json Status, errors and audit directory
+
+Folders are scanned every poll_interval_seconds. With the optional
+``watchdog`` package file system events (inotify, ReadDirectoryChangesW)
+trigger a scan immediately.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .batch_manifest import BatchManifest, config_hash, output_path
+from .checkpoint import file_sha256
+from .models import ProcessingResult
+from .watchdog import com_initialized
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    FS_EVENTS_AVAILABLE = True
+except ImportError:
+    FS_EVENTS_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+DEFAULT_SETTLE_SECONDS = 2.0
+
+# Word lock files (~$name.docx) and hidden files are never inputs
+IGNORED_PREFIXES = ("~$", ".")
+
+ORIGINALS_DIR = "originals"
+
+
+@dataclass
+class WatchFolder:
+    """A watched folder and how its documents are processed."""
+    path: str
+    intent: str
+    model: Optional[str] = None
+    temperature: float = 0.1
+    output_dir: Optional[str] = None
+    failed_dir: Optional[str] = None
+
+    def __post_init__(self):
+        if not self.intent or not self.intent.strip():
+            raise ValueError(f"Watch folder {self.path} has no intent")
+        self.path = os.path.abspath(self.path)
+        base = self.path.rstrip("/\\")
+        self.output_dir = os.path.abspath(self.output_dir or f"{base}_done")
+        self.failed_dir = os.path.abspath(self.failed_dir or f"{base}_failed")
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Processing configuration, hashed like the batch command's."""
+        return {"model": self.model, "temperature": self.temperature}
+
+    @property
+    def config_hash(self) -> str:
+        return config_hash(self.config)
+
+
+def load_watch_config(config_path: Union[str, Path]) -> List[WatchFolder]:
+    """
+    Load watched folders from a JSON file.
+
+    The file holds {"folders": [{"path", "intent", "model", "temperature",
+    "output_dir", "failed_dir"}, ...]}; relative paths are resolved against
+    the directory of the file.
+
+    Raises:
+        ValueError: If the file is invalid
+    """
+    config_path = Path(config_path)
+    try:
+        with open(config_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read watch configuration {config_path}: {e}")
+
+    entries = data.get("folders") if isinstance(data, dict) else None
+    if not entries:
+        raise ValueError(f"Watch configuration {config_path} defines no folders")
+
+    folders = []
+    for entry in entries:
+        try:
+            values = dict(entry)
+            for key in ("path", "output_dir", "failed_dir"):
+                if values.get(key):
+                    values[key] = str(config_path.parent / values[key])
+            folders.append(WatchFolder(**values))
+        except TypeError as e:
+            raise ValueError(f"Invalid watch folder entry {entry}: {e}")
+    return folders
+
+
+def unique_path(directory: str, name: str) -> str:
+    """Path for name in directory that does not overwrite an existing file."""
+    path = os.path.join(directory, name)
+    stem, suffix = os.path.splitext(name)
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{stem}_{counter}{suffix}")
+        counter += 1
+    return path
+
+
+def is_complete_docx(path: str) -> bool:
+    """Whether the file is a complete ZIP package (the central directory is written last)."""
+    try:
+        with zipfile.ZipFile(path) as package:
+            return "[Content_Types].xml" in package.namelist()
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+def _writable(path: str) -> bool:
+    # Windows refuses a second writer while the copy is still open
+    try:
+        with open(path, "r+b"):
+            return True
+    except OSError:
+        return False
+
+
+@dataclass
+class _Arrival:
+    signature: Tuple[int, int]
+    stable_since: float
+
+
+@dataclass
+class WatchStats:
+    processed: int = 0
+    reused: int = 0
+    failed: int = 0
+    recent: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class FolderWatcher:
+    """Debounced, deduplicated processing of documents dropped into folders."""
+
+    def __init__(self, folders: List[WatchFolder],
+                 pipeline_factory: Callable[[WatchFolder], Any],
+                 manifest_path: Union[str, Path],
+                 workers: int = 1,
+                 poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS,
+                 settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+                 use_fs_events: bool = True):
+        """
+        Initialize the watcher.
+
+        Args:
+            folders: Watched folders
+            pipeline_factory: Creates a VNextPipeline for a folder
+                configuration; each worker thread creates one per configuration
+            manifest_path: Batch manifest used to deduplicate inputs
+            workers: Documents processed concurrently
+            poll_interval_seconds: Time between folder scans
+            settle_seconds: Time a file must stay unchanged before it is processed
+            use_fs_events: Scan on file system events if ``watchdog`` is installed
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        paths = [folder.path for folder in folders]
+        if len(set(paths)) != len(paths):
+            raise ValueError("A folder can only be watched with one configuration")
+        self.folders = folders
+        self.pipeline_factory = pipeline_factory
+        self.manifest = BatchManifest(manifest_path)
+        self.workers = workers
+        self.poll_interval_seconds = poll_interval_seconds
+        self.settle_seconds = settle_seconds
+        self.use_fs_events = use_fs_events and FS_EVENTS_AVAILABLE
+        self.stats = WatchStats()
+
+        self._arrivals: Dict[str, _Arrival] = {}
+        self._in_flight: Set[str] = set()
+        # Content keys being processed; duplicates wait and then reuse the output
+        self._in_flight_keys: Set[Tuple[str, str, str]] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._observer = None
+
+    def start(self):
+        """Create the output folders and start the workers (and file system events)."""
+        for folder in self.folders:
+            for directory in (folder.path, folder.output_dir, os.path.join(folder.output_dir, ORIGINALS_DIR),
+                              folder.failed_dir):
+                os.makedirs(directory, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch-worker")
+        if self.use_fs_events:
+            self._observer = Observer()
+            handler = _WakeupHandler(self._wakeup)
+            for folder in self.folders:
+                self._observer.schedule(handler, folder.path, recursive=False)
+            self._observer.start()
+
+    def stop(self, wait: bool = True):
+        """Stop watching; with wait, finish the documents being processed."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def run(self, stop_event: threading.Event):
+        """Scan until stop_event is set."""
+        self.start()
+        try:
+            while not stop_event.is_set():
+                self.scan()
+                self._wakeup.wait(self.poll_interval_seconds)
+                self._wakeup.clear()
+        finally:
+            self.stop()
+
+    def idle(self) -> bool:
+        """Whether no document is waiting to settle or being processed."""
+        with self._lock:
+            return not self._arrivals and not self._in_flight
+
+    def scan(self, now: Optional[float] = None) -> List[str]:
+        """
+        Scan all folders once and dispatch the documents that are ready.
+
+        Returns:
+            List[str]: Paths dispatched to workers or resolved from the manifest
+        """
+        if self._executor is None:
+            raise RuntimeError("FolderWatcher is not started")
+        now = time.monotonic() if now is None else now
+        dispatched = []
+        seen = set()
+        for folder in self.folders:
+            for path in self._candidates(folder):
+                seen.add(path)
+                try:
+                    if self._settled(path, now) and self._dispatch(folder, path):
+                        dispatched.append(path)
+                except Exception as e:
+                    # Left in the folder; a later scan tries again
+                    logger.error(f"Cannot dispatch {path}: {e}")
+        with self._lock:
+            # Files removed before they settled
+            for path in set(self._arrivals) - seen:
+                del self._arrivals[path]
+        return dispatched
+
+    def _candidates(self, folder: WatchFolder) -> List[str]:
+        try:
+            entries = list(os.scandir(folder.path))
+        except OSError as e:
+            logger.warning(f"Cannot scan watch folder {folder.path}: {e}")
+            return []
+        return sorted(entry.path for entry in entries
+                      if entry.is_file() and entry.name.lower().endswith(".docx")
+                      and not entry.name.startswith(IGNORED_PREFIXES))
+
+    def _settled(self, path: str, now: float) -> bool:
+        """Track size and mtime; True once unchanged for settle_seconds."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            if path in self._in_flight:
+                return False
+            arrival = self._arrivals.get(path)
+            if arrival is None or arrival.signature != signature:
+                self._arrivals[path] = _Arrival(signature, now)
+                return False
+            return now - arrival.stable_since >= self.settle_seconds
+
+    def _dispatch(self, folder: WatchFolder, path: str) -> bool:
+        if not _writable(path):
+            return False
+        if not is_complete_docx(path):
+            self._finish_failed(folder, path, ProcessingResult(
+                status="ROLLBACK", message="Not a complete DOCX package",
+                errors=[f"{os.path.basename(path)} is not a valid DOCX file"]))
+            return True
+
+        sha256 = file_sha256(path)
+        key = (sha256, folder.intent, folder.config_hash)
+        with self._lock:
+            if key in self._in_flight_keys:
+                return False
+            reusable = self.manifest.find(path, sha256, folder.intent, folder.config_hash)
+            if reusable is None:
+                self._in_flight_keys.add(key)
+                self._in_flight.add(path)
+                del self._arrivals[path]
+
+        if reusable is not None:
+            logger.info(f"Unchanged input {path}, reusing output of {reusable['path']}")
+            result = ProcessingResult(status="SUCCESS", message="Unchanged input, output reused",
+                                      audit_directory=reusable["audit_directory"])
+            with self._lock:
+                self.manifest.record(path, sha256, folder.intent, folder.config_hash, result,
+                                     relinked_from=reusable["path"])
+                self._save_manifest()
+                self.stats.reused += 1
+                del self._arrivals[path]
+            self._finish_succeeded(folder, path, result, action="reused")
+            return True
+
+        self._executor.submit(self._process, folder, path, key)
+        return True
+
+    def _pipeline(self, folder: WatchFolder):
+        pipelines = getattr(self._local, "pipelines", None)
+        if pipelines is None:
+            pipelines = self._local.pipelines = {}
+        if folder.config_hash not in pipelines:
+            pipelines[folder.config_hash] = self.pipeline_factory(folder)
+        return pipelines[folder.config_hash]
+
+    def _process(self, folder: WatchFolder, path: str, key: Tuple[str, str, str]):
+        try:
+            logger.info(f"Processing {path} with intent: {folder.intent}")
+            try:
+                # The pipeline drives Word on this worker thread
+                with com_initialized():
+                    result = self._pipeline(folder).process_document(path, folder.intent)
+            except Exception as e:
+                logger.error(f"Processing {path} failed: {e}")
+                # A pipeline that raised may hold broken state
+                self._local.pipelines.pop(folder.config_hash, None)
+                result = ProcessingResult(status="ROLLBACK", message="Pipeline error", errors=[str(e)])
+
+            with self._lock:
+                self.manifest.record(path, key[0], folder.intent, folder.config_hash, result)
+                self._save_manifest()
+            if result.status == "SUCCESS":
+                self._finish_succeeded(folder, path, result, action="processed")
+            else:
+                self._finish_failed(folder, path, result)
+        except Exception as e:
+            logger.error(f"Could not move {path} out of the watch folder: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(path)
+                self._in_flight_keys.discard(key)
+            # Duplicates held back while this one ran can now reuse its output
+            self._wakeup.set()
+
+    def _finish_succeeded(self, folder: WatchFolder, path: str, result: ProcessingResult, action: str):
+        name = os.path.basename(path)
+        source = output_path(result.audit_directory)
+        destination = unique_path(folder.output_dir, name)
+        if source:
+            shutil.copy2(source, destination)
+        shutil.move(path, unique_path(os.path.join(folder.output_dir, ORIGINALS_DIR), name))
+        self._record(folder, name, result, action, destination if source else None)
+
+    def _finish_failed(self, folder: WatchFolder, path: str, result: ProcessingResult):
+        name = os.path.basename(path)
+        destination = unique_path(folder.failed_dir, name)
+        shutil.move(path, destination)
+        with open(destination + ".error.json", "w", encoding="utf-8") as f:
+            json.dump({"input": path, "failed_at": datetime.now().isoformat(), **result.model_dump()},
+                      f, indent=2, ensure_ascii=False)
+        with self._lock:
+            self._arrivals.pop(path, None)
+        self._record(folder, name, result, "failed", None)
+
+    def _record(self, folder: WatchFolder, name: str, result: ProcessingResult, action: str,
+                output: Optional[str]):
+        with self._lock:
+            if action == "processed":
+                self.stats.processed += 1
+            elif action == "failed":
+                self.stats.failed += 1
+            self.stats.recent.append({"folder": folder.path, "filename": name, "action": action,
+                                      "status": result.status, "output": output,
+                                      "audit_directory": result.audit_directory})
+            del self.stats.recent[:-100]
+        logger.info(f"{name}: {action} ({result.status})")
+
+    def _save_manifest(self):
+        """Persist the manifest (caller holds the lock)."""
+        try:
+            self.manifest.save()
+        except Exception as e:
+            logger.warning(f"Could not save batch manifest: {e}")
+
+
+if FS_EVENTS_AVAILABLE:
+    class _WakeupHandler(FileSystemEventHandler):
+        """Triggers a scan on any change in a watched folder."""
+
+        def __init__(self, wakeup: threading.Event):
+            super().__init__()
+            self.wakeup = wakeup
+
+        def on_any_event(self, event):
+            self.wakeup.set()
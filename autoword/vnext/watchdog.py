@@ -0,0 +1,393 @@
+"""
+Watchdog with hard timeouts for Word COM calls.
+
+A COM call into Word blocks the calling thread until Word answers, and
+Documents.Open on a corrupted file, Fields.Update, Repaginate or a modal
+dialog can keep it from ever answering. COM objects are apartment-threaded,
+so the call cannot be handed to another thread and abandoned; instead
+ComWatchdog supervises the thread that makes the calls. Pipeline stages and
+individual Word operations run under deadlines, and when one expires a
+background thread kills the Word process tree. The blocked call then fails
+with an RPC error, and leaving the deadline raises WordTimeoutError - also
+when the caller swallowed or wrapped that error - so the stage fails with
+the TIMEOUT status instead of stalling the batch. The next Word stage or
+document dispatches a fresh Word instance.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import psutil
+
+from .exceptions import WordTimeoutError
+
+try:
+    import win32gui
+    import win32process
+    WIN32_WINDOWS_AVAILABLE = True
+except ImportError:
+    WIN32_WINDOWS_AVAILABLE = False
+
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# Pipeline stages that drive Word
+WORD_STAGES = ("Extract", "Execute", "Validate")
+
+# Deadlines of the Word stages, in seconds
+DEFAULT_STAGE_TIMEOUTS = {
+    "Extract": 600.0,
+    "Execute": 900.0,
+    "Validate": 600.0,
+}
+
+# Deadline of a single Word call (Documents.Open, one plan step, Fields.Update, ...)
+DEFAULT_OPERATION_TIMEOUT_SECONDS = 180.0
+
+# Window class of the Word application window
+WORD_WINDOW_CLASS = "OpusApp"
+
+_KILL_WAIT_SECONDS = 5.0
+
+
+def word_process_id(word_app: Any) -> Optional[int]:
+    """
+    Process ID of a Word.Application COM object.
+
+    Word does not expose its process ID, so the application caption is set
+    to a unique marker and the Word window with that caption is looked up.
+
+    Args:
+        word_app: Word.Application COM object
+
+    Returns:
+        Optional[int]: Process ID, or None if it cannot be determined
+    """
+    if not WIN32_WINDOWS_AVAILABLE:
+        return None
+    marker = f"autoword-{uuid.uuid4().hex}"
+    try:
+        original_caption = word_app.Caption
+        word_app.Caption = marker
+        try:
+            hwnd = win32gui.FindWindow(WORD_WINDOW_CLASS, marker)
+            return win32process.GetWindowThreadProcessId(hwnd)[1] if hwnd else None
+        finally:
+            word_app.Caption = original_caption
+    except Exception as e:
+        logger.debug(f"Could not determine Word process ID: {e}")
+        return None
+
+
+def kill_process_tree(pid: int, create_time: Optional[float] = None,
+                      wait_seconds: float = _KILL_WAIT_SECONDS) -> List[int]:
+    """
+    Kill a process and all its descendants.
+
+    Args:
+        pid: Process ID of the tree root
+        create_time: Creation time recorded for pid; if the process now
+            running under pid was created at another time, the PID was
+            reused and nothing is killed
+        wait_seconds: How long to wait for the killed processes to exit
+
+    Returns:
+        List[int]: IDs of the processes that were killed
+    """
+    try:
+        root = psutil.Process(pid)
+        if create_time is not None and root.create_time() != create_time:
+            logger.warning(f"Not killing process {pid}: the PID now belongs to another process")
+            return []
+        processes = root.children(recursive=True) + [root]
+    except psutil.Error:
+        return []
+
+    killed = []
+    for proc in processes:
+        try:
+            proc.kill()
+            killed.append(proc.pid)
+        except psutil.Error:
+            pass
+    psutil.wait_procs(processes, timeout=wait_seconds)
+    return killed
+
+
+@dataclass
+class DeadlineExpiry:
+    """A deadline that expired and the Word processes killed for it."""
+    name: str
+    kind: str
+    timeout_seconds: float
+    elapsed_seconds: float
+    stage: Optional[str] = None
+    killed_pids: List[int] = field(default_factory=list)
+
+    def to_error(self) -> WordTimeoutError:
+        """Exception raised to the supervised thread."""
+        where = f" in stage {self.stage}" if self.stage and self.stage != self.name else ""
+        return WordTimeoutError(
+            f"Word {self.kind} '{self.name}' did not finish within {self.timeout_seconds:g}s{where}; "
+            f"Word process tree killed",
+            stage=self.stage, operation=self.name if self.kind == "operation" else None,
+            timeout_seconds=self.timeout_seconds, killed_pids=self.killed_pids
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "stage": self.stage,
+            "timeout_seconds": self.timeout_seconds,
+            "elapsed_seconds": self.elapsed_seconds,
+            "killed_pids": self.killed_pids
+        }
+
+
+class _Deadline:
+    __slots__ = ("name", "kind", "timeout_seconds", "started", "expires_at", "expiry")
+
+    def __init__(self, name: str, kind: str, timeout_seconds: float):
+        self.name = name
+        self.kind = kind
+        self.timeout_seconds = timeout_seconds
+        self.started = time.monotonic()
+        self.expires_at = self.started + timeout_seconds
+        self.expiry: Optional[DeadlineExpiry] = None
+
+
+class ComWatchdog:
+    """
+    Per-stage and per-operation deadlines for Word COM work.
+
+    Word processes to kill are only the ones attached with attach_word_app()
+    or attach_process() and not yet detached: other pipelines in the same
+    process (service or watch-folder workers) run their own Word instances.
+    Each attached PID is recorded with its creation time, so a PID reused by
+    an unrelated process after Word exited is never killed.
+    """
+
+    def __init__(self,
+                 stage_timeouts: Optional[Dict[str, Optional[float]]] = None,
+                 operation_timeout_seconds: Optional[float] = DEFAULT_OPERATION_TIMEOUT_SECONDS,
+                 process_finder: Optional[Callable[[], Iterable[int]]] = None,
+                 on_timeout: Optional[Callable[[DeadlineExpiry], None]] = None,
+                 on_attach: Optional[Callable[[int], None]] = None,
+                 on_detach: Optional[Callable[[int], None]] = None):
+        """
+        Initialize the watchdog.
+
+        Args:
+            stage_timeouts: Stage deadlines in seconds, merged over
+                DEFAULT_STAGE_TIMEOUTS (None or 0 disables a stage deadline)
+            operation_timeout_seconds: Deadline of a single Word call
+                (None or 0 disables operation deadlines)
+            process_finder: Returns the process IDs to kill on expiry,
+                replacing the attached Word processes
+            on_timeout: Called on the watchdog thread after Word was killed
+            on_attach: Called with the PID of each attached Word process
+            on_detach: Called with the PID of each detached Word process
+        """
+        self.stage_timeouts = {**DEFAULT_STAGE_TIMEOUTS, **(stage_timeouts or {})}
+        self.operation_timeout_seconds = operation_timeout_seconds
+        self.process_finder = process_finder
+        self.on_timeout = on_timeout
+        self.on_attach = on_attach
+        self.on_detach = on_detach
+        self.expiries: List[DeadlineExpiry] = []
+
+        # Attached Word processes: PID -> creation time
+        self._word_processes: Dict[int, float] = {}
+        self._active: List[_Deadline] = []
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def attach_word_app(self, word_app: Any) -> Optional[int]:
+        """Kill the process of this Word.Application on expiry."""
+        pid = word_process_id(word_app)
+        if pid is not None:
+            self.attach_process(pid)
+        return pid
+
+    def attach_process(self, pid: int):
+        """Kill this process tree on expiry."""
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except psutil.Error as e:
+            logger.warning(f"Cannot attach Word process {pid}: {e}")
+            return
+        with self._condition:
+            self._word_processes[pid] = create_time
+        if self.on_attach is not None:
+            self.on_attach(pid)
+
+    def detach_process(self, pid: Optional[int]):
+        """Stop killing this process on expiry, e.g. after Word was quit."""
+        if pid is None:
+            return
+        with self._condition:
+            self._word_processes.pop(pid, None)
+        if self.on_detach is not None:
+            self.on_detach(pid)
+
+    def stage(self, name: str, timeout_seconds: Optional[float] = None):
+        """Deadline for a pipeline stage (defaults to stage_timeouts[name])."""
+        if timeout_seconds is None:
+            timeout_seconds = self.stage_timeouts.get(name)
+        return self.deadline(name, timeout_seconds, kind="stage")
+
+    def operation(self, name: str, timeout_seconds: Optional[float] = None):
+        """Deadline for a single Word call (defaults to operation_timeout_seconds)."""
+        if timeout_seconds is None:
+            timeout_seconds = self.operation_timeout_seconds
+        return self.deadline(name, timeout_seconds, kind="operation")
+
+    @contextmanager
+    def deadline(self, name: str, timeout_seconds: Optional[float], kind: str = "operation"):
+        """
+        Run the enclosed Word work under a deadline.
+
+        Raises:
+            WordTimeoutError: If this deadline, or one expiring while it was
+                active, killed Word
+        """
+        if not timeout_seconds or timeout_seconds <= 0:
+            yield
+            return
+
+        entry = _Deadline(name, kind, timeout_seconds)
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Watchdog is stopped")
+            self._active.append(entry)
+            self._ensure_thread()
+            self._condition.notify_all()
+        try:
+            yield
+        except WordTimeoutError:
+            raise
+        except Exception as e:
+            # The call killed under us fails with whatever COM reports
+            if entry.expiry is not None:
+                raise entry.expiry.to_error() from e
+            raise
+        finally:
+            with self._condition:
+                self._active.remove(entry)
+        # Errors swallowed after the kill must not pass as a finished stage
+        if entry.expiry is not None:
+            raise entry.expiry.to_error()
+
+    def kill_word(self) -> List[int]:
+        """
+        Kill the Word process trees of this run.
+
+        Returns:
+            List[int]: IDs of the processes that were killed
+        """
+        if self.process_finder is not None:
+            processes = {pid: None for pid in self.process_finder()}
+        else:
+            with self._condition:
+                processes = dict(self._word_processes)
+            if not processes:
+                logger.error("No Word process is attached to this run; nothing to kill")
+
+        killed = []
+        for pid, create_time in sorted(processes.items()):
+            killed.extend(kill_process_tree(pid, create_time))
+        with self._condition:
+            self._word_processes.clear()
+        return killed
+
+    def stop(self):
+        """Stop the watchdog thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=_KILL_WAIT_SECONDS * 2)
+
+    def _ensure_thread(self):
+        """Start the watchdog thread (caller holds the lock)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._watch, name="com-watchdog", daemon=True)
+            self._thread.start()
+
+    def _watch(self):
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                pending = [entry for entry in self._active if entry.expiry is None]
+                expired = [entry for entry in pending if entry.expires_at <= now]
+                if not expired:
+                    next_expiry = min((entry.expires_at for entry in pending), default=None)
+                    self._condition.wait(None if next_expiry is None else next_expiry - now)
+                    continue
+                expiry = self._expire(min(expired, key=lambda entry: entry.expires_at), now)
+
+            expiry.killed_pids.extend(self.kill_word())
+            logger.error(f"Killed Word processes {expiry.killed_pids} after {expiry.kind} "
+                         f"'{expiry.name}' exceeded {expiry.timeout_seconds:g}s")
+            if self.on_timeout is not None:
+                try:
+                    self.on_timeout(expiry)
+                except Exception as e:
+                    logger.warning(f"Watchdog timeout callback failed: {e}")
+
+    def _expire(self, entry: _Deadline, now: float) -> DeadlineExpiry:
+        """Record an expiry on every active deadline (caller holds the lock)."""
+        stages = [active.name for active in self._active if active.kind == "stage"]
+        expiry = DeadlineExpiry(
+            name=entry.name,
+            kind=entry.kind,
+            timeout_seconds=entry.timeout_seconds,
+            elapsed_seconds=now - entry.started,
+            stage=stages[0] if stages else None
+        )
+        self.expiries.append(expiry)
+        # Every active call depended on the Word instance that is killed
+        for active in self._active:
+            if active.expiry is None:
+                active.expiry = expiry
+        return expiry
+
+
+@contextmanager
+def com_initialized():
+    """
+    Initialize COM on the calling thread for the enclosed work.
+
+    Extractor and validator initialize COM themselves, but the executor's
+    Word path does not, so threads running pipelines (service and
+    watch-folder workers) must.
+    """
+    if pythoncom is None:
+        yield
+        return
+    pythoncom.CoInitialize()
+    try:
+        yield
+    finally:
+        pythoncom.CoUninitialize()
+
+
+def com_deadline(watchdog: Optional[ComWatchdog], operation: str):
+    """Operation deadline of watchdog, or no deadline without a watchdog."""
+    return watchdog.operation(operation) if watchdog is not None else nullcontext()
@@ -0,0 +1,154 @@
+"""
+Tests for incremental batch processing with the batch manifest.
+"""
+
+import argparse
+import json
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from autoword.vnext.batch_manifest import BatchManifest, MANIFEST_FILE, config_hash
+from autoword.vnext.checkpoint import file_sha256
+from autoword.vnext.models import ProcessingResult
+
+
+def make_run(directory):
+    """Create a run audit directory with an output document."""
+    os.makedirs(os.path.join(directory, "snapshots"), exist_ok=True)
+    with open(os.path.join(directory, "snapshots", "after.docx"), "wb") as f:
+        f.write(b"output")
+    return ProcessingResult(status="SUCCESS", audit_directory=str(directory))
+
+
+class TestBatchManifest:
+    """Test manifest lookup and recording."""
+
+    def test_find_unchanged_input(self, tmp_path):
+        """Test that an unchanged input finds its own entry after reloading."""
+        manifest = BatchManifest(tmp_path / MANIFEST_FILE)
+        manifest.record(tmp_path / "a.docx", "hash-a", "Format", "config", make_run(tmp_path / "run_a"))
+        manifest.save()
+
+        entry = BatchManifest(tmp_path / MANIFEST_FILE).find(tmp_path / "a.docx", "hash-a", "Format", "config")
+        assert entry["path"] == os.path.abspath(tmp_path / "a.docx")
+        assert entry["output_path"] == os.path.join(str(tmp_path / "run_a"), "snapshots", "after.docx")
+
+    @pytest.mark.parametrize("sha256, intent, config, version", [
+        ("changed", "Format", "config", "2.0.0"),
+        ("hash-a", "Other intent", "config", "2.0.0"),
+        ("hash-a", "Format", "other config", "2.0.0"),
+        ("hash-a", "Format", "config", "3.0.0"),
+    ])
+    def test_key_mismatch(self, tmp_path, sha256, intent, config, version):
+        """Test that content, intent, configuration and version changes are not reused."""
+        manifest = BatchManifest(tmp_path / MANIFEST_FILE, pipeline_version="2.0.0")
+        manifest.record(tmp_path / "a.docx", "hash-a", "Format", "config", make_run(tmp_path / "run_a"))
+        manifest.save()
+
+        reloaded = BatchManifest(tmp_path / MANIFEST_FILE, pipeline_version=version)
+        assert reloaded.find(tmp_path / "a.docx", sha256, intent, config) is None
+
+    def test_failed_or_missing_output_not_reused(self, tmp_path):
+        """Test that failed runs and deleted outputs are processed again."""
+        manifest = BatchManifest(tmp_path / MANIFEST_FILE)
+        manifest.record(tmp_path / "a.docx", "hash-a", "Format", "config",
+                        ProcessingResult(status="ROLLBACK", audit_directory=str(tmp_path / "run_a")))
+        assert manifest.find(tmp_path / "a.docx", "hash-a", "Format", "config") is None
+
+        manifest.record(tmp_path / "a.docx", "hash-a", "Format", "config", make_run(tmp_path / "run_a"))
+        shutil.rmtree(tmp_path / "run_a")
+        assert manifest.find(tmp_path / "a.docx", "hash-a", "Format", "config") is None
+
+    def test_same_content_under_other_path(self, tmp_path):
+        """Test that renamed or copied inputs find the run of their content."""
+        manifest = BatchManifest(tmp_path / MANIFEST_FILE)
+        manifest.record(tmp_path / "a.docx", "hash-a", "Format", "config", make_run(tmp_path / "run_a"))
+
+        entry = manifest.find(tmp_path / "copy.docx", "hash-a", "Format", "config")
+        assert entry["path"] == os.path.abspath(tmp_path / "a.docx")
+
+    def test_unreadable_manifest_starts_empty(self, tmp_path):
+        """Test that a corrupted manifest reprocesses everything instead of failing."""
+        (tmp_path / MANIFEST_FILE).write_text("{not json", encoding="utf-8")
+        assert BatchManifest(tmp_path / MANIFEST_FILE).entries == {}
+
+    def test_config_hash_is_canonical(self):
+        """Test that the configuration hash does not depend on key order."""
+        assert config_hash({"model": "gpt4", "temperature": 0.1}) == config_hash({"temperature": 0.1, "model": "gpt4"})
+        assert config_hash({"model": "gpt4"}) != config_hash({"model": "gpt35"})
+
+
+class TestIncrementalBatch:
+    """Test the batch command skipping unchanged documents."""
+
+    def make_args(self, tmp_path, **overrides):
+        values = dict(
+            batch_dir=str(tmp_path / "docs"), intent="Format", resume=None, manifest=None, force=False,
+            audit_dir=str(tmp_path / "audit"), model=None, temperature=0.1, visible=False, verbose=False,
+            monitoring_level="basic", enable_memory_monitoring=False,
+            memory_warning_threshold=1024, memory_critical_threshold=2048)
+        values.update(overrides)
+        return argparse.Namespace(**values)
+
+    def run_batch(self, args, tmp_path):
+        from autoword.vnext.cli import process_batch_documents
+
+        def process(path, intent):
+            return make_run(tmp_path / "audit" / f"run_{os.path.basename(path)}_{len(pipeline.process_document.call_args_list)}")
+
+        with patch("autoword.vnext.pipeline.VNextPipeline") as pipeline_class:
+            pipeline = pipeline_class.return_value
+            pipeline.process_document.side_effect = process
+            exit_code = process_batch_documents(args)
+        processed = sorted(os.path.basename(call.args[0]) for call in pipeline.process_document.call_args_list)
+        return exit_code, processed
+
+    def latest_summary(self, tmp_path):
+        summaries = sorted((tmp_path / "audit").glob("batch_summary_*.json"), key=os.path.getmtime)
+        return json.loads(summaries[-1].read_text(encoding="utf-8"))
+
+    def test_second_batch_processes_only_changes(self, tmp_path):
+        """Test skipping unchanged, re-linking copied and processing changed documents."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for name in ("a.docx", "b.docx", "c.docx"):
+            (docs / name).write_bytes(name.encode())
+
+        assert self.run_batch(self.make_args(tmp_path), tmp_path) == (0, ["a.docx", "b.docx", "c.docx"])
+
+        (docs / "b.docx").write_bytes(b"edited")
+        shutil.copy(docs / "a.docx", docs / "a_copy.docx")
+        (docs / "new.docx").write_bytes(b"new")
+        for old in (tmp_path / "audit").glob("batch_summary_*.json"):
+            old.unlink()
+
+        exit_code, processed = self.run_batch(self.make_args(tmp_path), tmp_path)
+        assert exit_code == 0
+        assert processed == ["b.docx", "new.docx"]
+
+        summary = self.latest_summary(tmp_path)
+        assert (summary["processed"], summary["skipped"], summary["relinked"]) == (2, 2, 1)
+        actions = {entry["filename"]: entry["action"] for entry in summary["results"]}
+        assert actions == {"a.docx": "skipped", "a_copy.docx": "relinked", "b.docx": "processed",
+                           "c.docx": "skipped", "new.docx": "processed"}
+
+        manifest = BatchManifest(tmp_path / "audit" / MANIFEST_FILE)
+        copy_entry = manifest.entries[os.path.abspath(docs / "a_copy.docx")]
+        assert copy_entry["relinked_from"] == os.path.abspath(docs / "a.docx")
+        assert copy_entry["audit_directory"] == manifest.entries[os.path.abspath(docs / "a.docx")]["audit_directory"]
+        assert manifest.entries[os.path.abspath(docs / "b.docx")]["sha256"] == file_sha256(docs / "b.docx")
+
+    def test_force_and_config_change_reprocess(self, tmp_path):
+        """Test that --force and a different model reprocess unchanged documents."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "a.docx").write_bytes(b"a")
+
+        assert self.run_batch(self.make_args(tmp_path), tmp_path)[1] == ["a.docx"]
+        assert self.run_batch(self.make_args(tmp_path), tmp_path)[1] == []
+        assert self.run_batch(self.make_args(tmp_path, force=True), tmp_path)[1] == ["a.docx"]
+        with patch("autoword.core.llm_client.LLMClient"):
+            assert self.run_batch(self.make_args(tmp_path, model="claude37"), tmp_path)[1] == ["a.docx"]
@@ -0,0 +1,307 @@
+"""
+Tests for checkpointed, resumable pipeline runs.
+"""
+
+import argparse
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from autoword.vnext.checkpoint import CHECKPOINT_FILE, CheckpointStore, file_sha256
+from autoword.vnext.exceptions import AuditError, ValidationError
+from autoword.vnext.models import (
+    DeleteSectionByHeading, DocumentMetadata, InventoryFullV1, ParagraphSkeleton,
+    PlanV1, ProcessingResult, StructureV1, ValidationResult
+)
+
+
+def make_structure(text="Introduction"):
+    return StructureV1(
+        metadata=DocumentMetadata(title="Test"),
+        paragraphs=[ParagraphSkeleton(index=0, style_name="Heading 1", preview_text=text,
+                                      is_heading=True, heading_level=1)],
+    )
+
+
+def make_plan():
+    return PlanV1(ops=[DeleteSectionByHeading(heading_text="Introduction", level=1)])
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "input.docx"
+    path.write_bytes(b"original document")
+    return str(path)
+
+
+class TestCheckpointStore:
+    """Test checkpoint persistence and input hashing."""
+
+    def test_model_round_trip(self, tmp_path, document):
+        """Test saving and restoring model checkpoints."""
+        store = CheckpointStore(tmp_path / "run")
+        store.start_run(document, "Remove introduction")
+        store.save_model("structure", make_structure())
+        store.save_model("plan", make_plan())
+
+        reopened = CheckpointStore.open(tmp_path / "run")
+        assert reopened.document_path == os.path.abspath(document)
+        assert reopened.user_intent == "Remove introduction"
+        assert reopened.restore_model("structure") == make_structure()
+        assert reopened.restore_model("plan") == make_plan()
+        assert reopened.restore_model("inventory") is None
+        assert not list((tmp_path / "run").rglob("*.tmp"))
+
+    def test_upstream_change_invalidates_downstream(self, tmp_path, document):
+        """Test that a new structure invalidates the plan computed from the old one."""
+        store = CheckpointStore(tmp_path / "run")
+        store.start_run(document, "Remove introduction")
+        store.save_model("structure", make_structure())
+        store.save_model("plan", make_plan())
+
+        store.save_model("structure", make_structure("Changed"))
+
+        assert store.restore_model("structure") == make_structure("Changed")
+        assert store.restore_model("plan") is None
+
+    def test_document_or_intent_change_invalidates(self, tmp_path, document):
+        """Test that checkpoints are keyed by source document and intent."""
+        store = CheckpointStore(tmp_path / "run")
+        store.start_run(document, "Remove introduction")
+        store.save_model("structure", make_structure())
+
+        store.start_run(document, "Something else")
+        assert store.restore_model("structure") is None
+
+        store.start_run(document, "Remove introduction")
+        assert store.restore_model("structure") is not None
+        with open(document, "wb") as f:
+            f.write(b"edited document")
+        assert not store.document_unchanged()
+        store.start_run(document, "Remove introduction")
+        assert store.restore_model("structure") is None
+
+    def test_corrupted_artifact_is_recomputed(self, tmp_path, document):
+        """Test that an artifact that no longer matches its hash is not restored."""
+        store = CheckpointStore(tmp_path / "run")
+        store.start_run(document, "intent")
+        store.save_model("structure", make_structure())
+        (tmp_path / "run" / "checkpoints" / "structure.json").write_text("{}", encoding="utf-8")
+
+        assert store.restore_model("structure") is None
+
+    def test_file_checkpoint(self, tmp_path, document):
+        """Test checkpointing and restoring the modified document."""
+        store = CheckpointStore(tmp_path / "run")
+        store.start_run(document, "intent")
+        store.save_model("structure", make_structure())
+        store.save_model("plan", make_plan())
+        modified = tmp_path / "modified.docx"
+        modified.write_bytes(b"modified document")
+        store.save_file("modified_docx", modified)
+
+        destination = tmp_path / "restored.docx"
+        assert store.restore_file("modified_docx", destination)
+        assert destination.read_bytes() == b"modified document"
+
+        store.save_model("plan", PlanV1(ops=[]))
+        assert not store.restore_file("modified_docx", tmp_path / "other.docx")
+
+    def test_open_missing_and_invalid(self, tmp_path):
+        """Test opening directories without a readable checkpoint."""
+        with pytest.raises(AuditError):
+            CheckpointStore.open(tmp_path)
+        (tmp_path / CHECKPOINT_FILE).write_text("not json", encoding="utf-8")
+        with pytest.raises(AuditError):
+            CheckpointStore.open(tmp_path)
+
+    def test_finish_records_result(self, tmp_path, document):
+        """Test recording the final result of a run."""
+        store = CheckpointStore(tmp_path / "run")
+        store.start_run(document, "intent")
+        store.finish(ProcessingResult(status="SUCCESS", audit_directory=str(tmp_path / "run")))
+
+        assert CheckpointStore.open(tmp_path / "run").result["status"] == "SUCCESS"
+        store.start_run(document, "intent")
+        assert store.result is None
+
+
+class TestPipelineResume:
+    """Test resuming VNextPipeline runs from checkpoints."""
+
+    def make_pipeline(self, tmp_path):
+        from autoword.vnext.pipeline import VNextPipeline
+        return VNextPipeline(base_audit_dir=str(tmp_path / "audit"), enable_memory_monitoring=False,
+                             performance_history_path=str(tmp_path / "history.sqlite"))
+
+    def run_until_validate_hangs(self, tmp_path, document):
+        from autoword.vnext.pipeline import VNextPipeline
+
+        def execute(pipeline, plan):
+            with open(pipeline.working_docx_path, "wb") as f:
+                f.write(b"modified document")
+            return pipeline.working_docx_path
+
+        with patch.object(VNextPipeline, "_extract_document", return_value=(make_structure(), InventoryFullV1())), \
+                patch.object(VNextPipeline, "_generate_plan", return_value=make_plan()), \
+                patch.object(VNextPipeline, "_execute_plan", autospec=True, side_effect=execute), \
+                patch.object(VNextPipeline, "_validate_modifications", side_effect=ValidationError("Word hung")):
+            return self.make_pipeline(tmp_path).process_document(document, "Remove introduction")
+
+    def test_resume_skips_completed_stages(self, tmp_path, document):
+        """Test that resume restores Extract, Plan and Execute and reruns Validate."""
+        from autoword.vnext.pipeline import VNextPipeline
+
+        failed = self.run_until_validate_hangs(tmp_path, document)
+        assert failed.status != "SUCCESS"
+        store = CheckpointStore.open(failed.audit_directory)
+        assert store.result is None
+        assert set(store.data["checkpoints"]) == {"structure", "inventory", "plan", "modified_docx"}
+
+        validated = []
+
+        def validate(pipeline, structure, modified_docx_path):
+            with open(modified_docx_path, "rb") as f:
+                validated.append((structure, f.read()))
+            return ValidationResult(is_valid=True)
+
+        with patch.object(VNextPipeline, "_extract_document") as extract, \
+                patch.object(VNextPipeline, "_generate_plan") as plan, \
+                patch.object(VNextPipeline, "_execute_plan") as execute, \
+                patch.object(VNextPipeline, "_validate_modifications", autospec=True, side_effect=validate), \
+                patch.object(VNextPipeline, "_create_audit_trail") as audit:
+            result = self.make_pipeline(tmp_path).resume(failed.audit_directory)
+
+        assert result.status == "SUCCESS"
+        assert result.audit_directory == failed.audit_directory
+        extract.assert_not_called()
+        plan.assert_not_called()
+        execute.assert_not_called()
+        assert validated == [(make_structure(), b"modified document")]
+        assert audit.call_args[0][2] == make_plan()
+
+        # A finished run returns its recorded result without running any stage
+        with patch.object(VNextPipeline, "_setup_run_environment") as setup:
+            again = self.make_pipeline(tmp_path).resume(failed.audit_directory)
+        assert again.status == "SUCCESS"
+        setup.assert_not_called()
+
+    def test_changed_document_reruns_all_stages(self, tmp_path, document):
+        """Test that resuming after the source document changed reruns every stage."""
+        from autoword.vnext.pipeline import VNextPipeline
+
+        failed = self.run_until_validate_hangs(tmp_path, document)
+        with open(document, "wb") as f:
+            f.write(b"edited document")
+
+        with patch.object(VNextPipeline, "_extract_document", return_value=(make_structure(), InventoryFullV1())) as extract, \
+                patch.object(VNextPipeline, "_generate_plan", return_value=make_plan()) as plan, \
+                patch.object(VNextPipeline, "_execute_plan", side_effect=lambda p: document), \
+                patch.object(VNextPipeline, "_validate_modifications", return_value=ValidationResult(is_valid=True)), \
+                patch.object(VNextPipeline, "_create_audit_trail"):
+            result = self.make_pipeline(tmp_path).resume(failed.audit_directory)
+
+        assert result.status == "SUCCESS"
+        extract.assert_called_once()
+        plan.assert_called_once()
+
+    def test_checkpoints_disabled(self, tmp_path, document):
+        """Test that runs without checkpoints write no checkpoint file."""
+        from autoword.vnext.pipeline import VNextPipeline
+
+        pipeline = VNextPipeline(base_audit_dir=str(tmp_path / "audit"), enable_memory_monitoring=False,
+                                 checkpoints=False)
+        with patch.object(VNextPipeline, "_extract_document", side_effect=RuntimeError("boom")):
+            result = pipeline.process_document(document, "intent")
+        assert not os.path.exists(os.path.join(result.audit_directory, CHECKPOINT_FILE))
+
+
+class TestBatchResume:
+    """Test resuming a batch from its summary."""
+
+    def test_skips_finished_and_resumes_interrupted(self, tmp_path):
+        """Test that finished documents are skipped and interrupted runs resumed."""
+        from autoword.vnext.cli import process_batch_documents
+
+        batch_dir = tmp_path / "docs"
+        batch_dir.mkdir()
+        for name in ("done.docx", "interrupted.docx", "new.docx", "edited.docx"):
+            (batch_dir / name).write_bytes(name.encode())
+        interrupted_run = tmp_path / "audit" / "run_1"
+        interrupted_run.mkdir(parents=True)
+        (interrupted_run / CHECKPOINT_FILE).write_text("{}", encoding="utf-8")
+
+        summary_path = tmp_path / "audit" / "batch_summary.json"
+        summary_path.write_text(json.dumps({
+            "user_intent": "Format",
+            "results": [
+                {"filename": "done.docx", "status": "SUCCESS", "audit_directory": "run_0",
+                 "sha256": file_sha256(batch_dir / "done.docx")},
+                {"filename": "interrupted.docx", "status": "ROLLBACK", "audit_directory": str(interrupted_run),
+                 "sha256": file_sha256(batch_dir / "interrupted.docx")},
+                {"filename": "edited.docx", "status": "SUCCESS", "audit_directory": "run_2", "sha256": "stale"},
+            ]
+        }), encoding="utf-8")
+
+        args = argparse.Namespace(
+            batch_dir=str(batch_dir), intent="Format", resume=str(summary_path), audit_dir=str(tmp_path / "audit"),
+            model=None, temperature=0.1, visible=False, verbose=False, monitoring_level="basic",
+            enable_memory_monitoring=False, memory_warning_threshold=1024, memory_critical_threshold=2048)
+
+        with patch("autoword.vnext.pipeline.VNextPipeline") as pipeline_class:
+            pipeline = pipeline_class.return_value
+            pipeline.process_document.side_effect = lambda path, intent: ProcessingResult(
+                status="SUCCESS", audit_directory=f"run_{os.path.basename(path)}")
+            pipeline.resume.return_value = ProcessingResult(status="SUCCESS", audit_directory=str(interrupted_run))
+            exit_code = process_batch_documents(args)
+
+        assert exit_code == 0
+        processed = sorted(os.path.basename(call.args[0]) for call in pipeline.process_document.call_args_list)
+        assert processed == ["edited.docx", "new.docx"]
+        pipeline.resume.assert_called_once_with(str(interrupted_run))
+
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        entries = {entry["filename"]: entry for entry in summary["results"]}
+        assert set(entries) == {"done.docx", "interrupted.docx", "new.docx", "edited.docx"}
+        assert entries["done.docx"]["audit_directory"] == "run_0"
+        assert entries["new.docx"]["sha256"] == file_sha256(batch_dir / "new.docx")
+        assert summary["successful"] == 4
+
+    def test_run_directory_recorded_when_run_starts(self, tmp_path):
+        """Test that a document killed mid-run leaves its run directory in the summary."""
+        from autoword.vnext.cli import process_batch_documents
+
+        batch_dir = tmp_path / "docs"
+        batch_dir.mkdir()
+        (batch_dir / "slow.docx").write_bytes(b"slow")
+        summary_path = tmp_path / "audit" / "batch_summary.json"
+        summary_path.parent.mkdir()
+        summary_path.write_text(json.dumps({"user_intent": "Format", "results": []}), encoding="utf-8")
+        run_dir = str(tmp_path / "audit" / "run_slow")
+
+        args = argparse.Namespace(
+            batch_dir=str(batch_dir), intent="Format", resume=str(summary_path), audit_dir=str(tmp_path / "audit"),
+            model=None, temperature=0.1, visible=False, verbose=False, monitoring_level="basic",
+            enable_memory_monitoring=False, memory_warning_threshold=1024, memory_critical_threshold=2048)
+
+        mid_run = []
+        with patch("autoword.vnext.pipeline.VNextPipeline") as pipeline_class:
+            pipeline = pipeline_class.return_value
+
+            def process_document(path, intent):
+                pipeline.current_audit_dir = run_dir
+                pipeline_class.call_args.kwargs["progress_callback"]("Extract", 0)
+                mid_run.append(json.loads(summary_path.read_text(encoding="utf-8")))
+                return ProcessingResult(status="SUCCESS", audit_directory=run_dir)
+
+            pipeline.process_document.side_effect = process_document
+            assert process_batch_documents(args) == 0
+
+        entry, = mid_run[0]["results"]
+        assert (entry["filename"], entry["status"], entry["audit_directory"]) == ("slow.docx", "RUNNING", run_dir)
+        assert entry["sha256"] == file_sha256(batch_dir / "slow.docx")
+
+        entry, = json.loads(summary_path.read_text(encoding="utf-8"))["results"]
+        assert (entry["status"], entry["audit_directory"]) == ("SUCCESS", run_dir)
@@ -0,0 +1,225 @@
+"""
+Test AutoWord Comment Reader
+测试从 DOCX 包直接读取批注
+"""
+
+import time
+import zipfile
+from unittest.mock import Mock
+
+import pytest
+
+from autoword.core.comment_reader import read_comments
+from autoword.core.doc_inspector import DocInspector
+from autoword.core.exceptions import DocumentError
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+W15_NS = "http://schemas.microsoft.com/office/word/2012/wordml"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+DOCUMENT_BODY = """
+<w:p><w:r><w:t xml:space="preserve">Hello </w:t></w:r>
+  <w:commentRangeStart w:id="0"/><w:commentRangeStart w:id="2"/>
+  <w:r><w:t>world</w:t></w:r>
+  <w:commentRangeEnd w:id="0"/><w:commentRangeEnd w:id="2"/>
+  <w:r><w:commentReference w:id="0"/></w:r><w:r><w:commentReference w:id="2"/></w:r></w:p>
+<w:p><w:commentRangeStart w:id="1"/><w:r><w:tab/><w:t>abc</w:t></w:r>
+  <w:r><w:drawing><w:txbxContent><w:p><w:r><w:t>textbox text</w:t></w:r></w:p></w:txbxContent></w:drawing></w:r></w:p>
+<w:tbl><w:tr><w:tc><w:p><w:r><w:t>def</w:t></w:r><w:commentRangeEnd w:id="1"/>
+  <w:r><w:commentReference w:id="1"/></w:r></w:p></w:tc></w:tr></w:tbl>
+<w:p><w:r><w:t>tail</w:t></w:r><w:r><w:commentReference w:id="3"/></w:r></w:p>
+"""
+
+COMMENTS = """
+<w:comment w:id="0" w:author="张三" w:date="2024-01-01T12:00:00Z">
+  <w:p w14:paraId="00000001"><w:r><w:t>修改这个词</w:t></w:r></w:p></w:comment>
+<w:comment w:id="1" w:author="李四"><w:p><w:r><w:t>第一段</w:t></w:r></w:p>
+  <w:p w14:paraId="00000002"><w:r><w:t>第二段</w:t></w:r></w:p></w:comment>
+<w:comment w:id="2" w:author="王五"><w:p w14:paraId="00000003"><w:r><w:t>同意</w:t></w:r></w:p></w:comment>
+<w:comment w:id="3" w:author="赵六"><w:p><w:r><w:t>无范围批注</w:t></w:r></w:p></w:comment>
+<w:comment w:id="9" w:author="孤立"><w:p><w:r><w:t>没有锚点</w:t></w:r></w:p></w:comment>
+"""
+
+COMMENTS_EXTENDED = """
+<w15:commentEx w15:paraId="00000001" w15:done="1"/>
+<w15:commentEx w15:paraId="00000003" w15:paraIdParent="00000001" w15:done="0"/>
+"""
+
+
+def write_docx(path, body, comments=COMMENTS, extended=COMMENTS_EXTENDED):
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr("word/document.xml",
+                         f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>')
+        if comments is not None:
+            package.writestr("word/comments.xml",
+                             f'<w:comments xmlns:w="{W_NS}" xmlns:w14="{W14_NS}">{comments}</w:comments>')
+        if extended is not None:
+            package.writestr("word/commentsExtended.xml",
+                             f'<w15:commentsEx xmlns:w15="{W15_NS}">{extended}</w15:commentsEx>')
+    return str(path)
+
+
+class TestReadComments:
+    """测试 OOXML 批注读取"""
+
+    def test_ranges_text_and_replies(self, tmp_path):
+        """测试锚点范围、锚点文本和回复关系"""
+        comments = read_comments(write_docx(tmp_path / "doc.docx", DOCUMENT_BODY))
+
+        assert [c.author for c in comments] == ["张三", "王五", "李四", "赵六"]
+        assert [c.id for c in comments] == ["comment_1", "comment_2", "comment_3", "comment_4"]
+
+        first, reply, spanning, point = comments
+        assert (first.range_start, first.range_end) == (6, 11)
+        assert first.anchor_text == "world"
+        assert first.comment_text == "修改这个词"
+        assert first.resolved is True
+        assert first.created_date.year == 2024
+        assert first.page is None
+
+        assert reply.parent_id == "comment_1"
+        assert reply.resolved is False
+
+        # 段落1: "Hello world" + 2 个引用标记 + 段落标记 = 14
+        # 段落2: 制表符 + "abc" + 图片 + 段落标记（文本框内容不计）
+        assert spanning.range_start == 14
+        assert spanning.range_end == 14 + 6 + 3
+        assert spanning.anchor_text == "abc\rdef"
+        assert spanning.comment_text == "第一段\n第二段"
+
+        # 表格: "def" + 引用 + 单元格标记 + 行结束标记
+        assert point.range_start == point.range_end == 23 + 1 + 1 + 1 + 4
+        assert point.anchor_text == ""
+
+    def test_alternate_content_counts_choice_only(self, tmp_path):
+        """测试兼容性图形只按 mc:Choice 计 1 个字符，mc:Fallback 不计"""
+        body = f"""
+<w:p><w:r><mc:AlternateContent xmlns:mc="{MC_NS}">
+    <mc:Choice Requires="wps"><w:drawing/></mc:Choice>
+    <mc:Fallback><w:pict><w:txbxContent><w:p><w:r><w:t>备用</w:t></w:r></w:p></w:txbxContent></w:pict></mc:Fallback>
+  </mc:AlternateContent></w:r>
+  <w:commentRangeStart w:id="0"/><w:r><w:t>after</w:t></w:r><w:commentRangeEnd w:id="0"/>
+  <w:r><w:commentReference w:id="0"/></w:r></w:p>
+"""
+        comments = read_comments(write_docx(tmp_path / "doc.docx", body))
+
+        anchored = next(c for c in comments if c.author == "张三")
+        assert (anchored.range_start, anchored.range_end) == (1, 6)
+        assert anchored.anchor_text == "after"
+
+    def test_hyperlink_and_simple_field_codes_count(self, tmp_path):
+        """测试超链接和简单域的隐藏域代码计入位置"""
+        body = """
+<w:p><w:hyperlink w:anchor="_Toc1"><w:r><w:t>Intro</w:t></w:r></w:hyperlink>
+  <w:fldSimple w:instr=" PAGE "><w:r><w:t>1</w:t></w:r></w:fldSimple>
+  <w:commentRangeStart w:id="0"/><w:r><w:t>after</w:t></w:r><w:commentRangeEnd w:id="0"/>
+  <w:r><w:commentReference w:id="0"/></w:r></w:p>
+"""
+        comments = read_comments(write_docx(tmp_path / "doc.docx", body))
+
+        # 域开始符 + 域代码 + 分隔符 + 域结果 + 域结束符
+        hyperlink = 1 + len(' HYPERLINK \\l "_Toc1" ') + 1 + len("Intro") + 1
+        page = 1 + len(" PAGE ") + 1 + len("1") + 1
+        anchored = next(c for c in comments if c.author == "张三")
+        assert (anchored.range_start, anchored.range_end) == (hyperlink + page, hyperlink + page + 5)
+        assert anchored.anchor_text == "after"
+
+    def test_no_comments_part(self, tmp_path):
+        """测试没有批注的文档"""
+        path = write_docx(tmp_path / "plain.docx", "<w:p><w:r><w:t>x</w:t></w:r></w:p>",
+                          comments=None, extended=None)
+        assert read_comments(path) == []
+
+    def test_invalid_package(self, tmp_path):
+        """测试无效的文档包"""
+        path = tmp_path / "broken.docx"
+        path.write_bytes(b"not a zip")
+        with pytest.raises(DocumentError):
+            read_comments(str(path))
+
+    def test_many_comments_single_pass(self, tmp_path):
+        """测试大量批注的读取速度"""
+        count = 800
+        body = "".join(
+            f'<w:p><w:commentRangeStart w:id="{i}"/><w:r><w:t>段落{i}的锚点文本</w:t></w:r>'
+            f'<w:commentRangeEnd w:id="{i}"/><w:r><w:commentReference w:id="{i}"/></w:r></w:p>'
+            for i in range(count))
+        comments_xml = "".join(
+            f'<w:comment w:id="{i}" w:author="审阅者"><w:p><w:r><w:t>批注{i}</w:t></w:r></w:p></w:comment>'
+            for i in range(count))
+        path = write_docx(tmp_path / "many.docx", body, comments_xml, None)
+
+        start = time.perf_counter()
+        comments = read_comments(path)
+        assert time.perf_counter() - start < 2.0
+
+        assert len(comments) == count
+        assert comments[10].anchor_text == "段落10的锚点文本"
+        assert comments[1].range_start == comments[0].range_end + 2
+
+
+class TestInspectorIntegration:
+    """测试 DocumentInspector 使用 OOXML 读取批注"""
+
+    def make_document(self, path, count, last_scope=(30, 30)):
+        document = Mock()
+        document.FullName = path
+        document.Saved = True
+        document.Comments.Count = count
+        document.Comments.Item.return_value.Scope.Start, document.Comments.Item.return_value.Scope.End = last_scope
+        return document
+
+    def test_saved_document_uses_package(self, tmp_path):
+        """测试已保存文档不通过 COM 逐个读取批注"""
+        document = self.make_document(write_docx(tmp_path / "doc.docx", DOCUMENT_BODY), 4)
+        document.Comments.__iter__ = Mock(side_effect=AssertionError("COM enumeration"))
+
+        comments = DocInspector().extract_comments(document)
+
+        assert len(comments) == 4
+        assert all(comment.page is None for comment in comments)
+        document.Range.assert_not_called()
+
+    def test_count_mismatch_falls_back_to_com(self, tmp_path):
+        """测试批注数不一致时回退到 COM"""
+        document = self.make_document(write_docx(tmp_path / "doc.docx", DOCUMENT_BODY), 5)
+        com_comment = Mock(Author="张三")
+        com_comment.Range.Text = "批注"
+        com_comment.Scope.Text = "锚点"
+        com_comment.Scope.Start, com_comment.Scope.End = 0, 5
+        com_comment.Scope.Information.return_value = 3
+        document.Comments.__iter__ = Mock(return_value=iter([com_comment]))
+
+        comments = DocInspector().extract_comments(document)
+
+        assert len(comments) == 1
+        assert comments[0].page == 3
+
+    def test_position_mismatch_falls_back_to_com(self, tmp_path):
+        """测试最后一个批注的位置与 Word 不一致时回退到 COM"""
+        document = self.make_document(write_docx(tmp_path / "doc.docx", DOCUMENT_BODY), 4, last_scope=(42, 42))
+        com_comment = Mock(Author="张三")
+        com_comment.Range.Text = "批注"
+        com_comment.Scope.Text = "锚点"
+        com_comment.Scope.Start, com_comment.Scope.End = 42, 42
+        com_comment.Scope.Information.return_value = 2
+        document.Comments.__iter__ = Mock(return_value=iter([com_comment]))
+
+        comments = DocInspector().extract_comments(document)
+
+        document.Comments.Item.assert_called_once_with(4)
+        assert [(c.range_start, c.range_end) for c in comments] == [(42, 42)]
+
+    def test_resolve_pages_only_for_requested(self, tmp_path):
+        """测试只为需要的批注计算页码"""
+        document = self.make_document(write_docx(tmp_path / "doc.docx", DOCUMENT_BODY), 4)
+        document.Range.return_value.Information.return_value = 7
+        inspector = DocInspector()
+        comments = inspector.extract_comments(document)
+
+        inspector.resolve_comment_pages(document, comments, {"comment_3"})
+
+        assert [comment.page for comment in comments] == [None, None, 7, None]
+        document.Range.assert_called_once_with(14, 23)
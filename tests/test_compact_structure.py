@@ -0,0 +1,204 @@
+"""
+Tests for the compact array-backed StructureV1 representation.
+
+Covers read-API parity with StructureV1, serialization equivalence, column
+diffing in DocumentAuditor, and a memory/throughput benchmark against the
+Pydantic models.
+"""
+
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+import pytest
+
+from autoword.vnext.compact import (
+    CompactStructureV1, CompactParagraphs, ParagraphView, StringPool
+)
+from autoword.vnext.auditor.document_auditor import DocumentAuditor
+from autoword.vnext.models import (
+    StructureV1, DocumentMetadata, StyleDefinition, ParagraphSkeleton,
+    HeadingReference, FontSpec, StyleType
+)
+
+
+def build_structure(paragraph_count: int) -> StructureV1:
+    """Build a StructureV1 with repetitive styles, like real large documents."""
+    style_names = ["Normal", "Heading 1", "Heading 2", "Body Text", "Caption"]
+    paragraphs = []
+    headings = []
+    for i in range(paragraph_count):
+        is_heading = i % 40 == 0
+        level = 1 + (i // 40) % 2 if is_heading else None
+        text = f"Heading {i}" if is_heading else f"正文段落 {i} " + "lorem ipsum " * (i % 8)
+        paragraphs.append(ParagraphSkeleton(
+            index=i,
+            style_name=style_names[level] if is_heading else style_names[i % 5 and 3],
+            preview_text=text,
+            is_heading=is_heading,
+            heading_level=level
+        ))
+        if is_heading:
+            headings.append(HeadingReference(paragraph_index=i, level=level, text=text))
+    return StructureV1(
+        metadata=DocumentMetadata(title="Large", creation_time=datetime(2024, 1, 1)),
+        styles=[StyleDefinition(name=n, type=StyleType.PARAGRAPH, font=FontSpec(size_pt=12))
+                for n in style_names],
+        paragraphs=paragraphs,
+        headings=headings
+    )
+
+
+class TestStringPool:
+    """Test cases for StringPool."""
+
+    def test_intern_reuses_ids(self):
+        pool = StringPool()
+        assert pool.intern("Normal") == 0
+        assert pool.intern("Heading 1") == 1
+        assert pool.intern("Normal") == 0
+        assert pool.intern(None) == -1
+        assert pool.get(1) == "Heading 1"
+        assert pool.get(-1) is None
+        assert pool.lookup("Missing") == -1
+        assert len(pool) == 2
+
+
+class TestCompactParagraphs:
+    """Test cases for CompactParagraphs."""
+
+    def test_read_api_matches_models(self):
+        structure = build_structure(200)
+        compact = CompactStructureV1.from_structure(structure)
+
+        assert len(compact.paragraphs) == len(structure.paragraphs)
+        for view, model in zip(compact.paragraphs, structure.paragraphs):
+            assert isinstance(view, ParagraphView)
+            assert view.index == model.index
+            assert view.style_name == model.style_name
+            assert view.preview_text == model.preview_text
+            assert view.is_heading == model.is_heading
+            assert view.heading_level == model.heading_level
+            assert view == model
+
+        assert compact.paragraphs[-1].index == 199
+        assert [p.index for p in compact.paragraphs[10:13]] == [10, 11, 12]
+        with pytest.raises(IndexError):
+            compact.paragraphs[200]
+
+    def test_append_enforces_skeleton_constraints(self):
+        paragraphs = CompactParagraphs()
+        paragraphs.append(0, "Normal", "x" * 300)
+        assert len(paragraphs[0].preview_text) == 120
+
+        with pytest.raises(ValueError):
+            paragraphs.append(-1, "Normal", "text")
+        with pytest.raises(ValueError):
+            paragraphs.append(1, "Heading 1", "text", True, 10)
+
+    def test_interleaved_append_and_read(self):
+        paragraphs = CompactParagraphs()
+        paragraphs.append(0, None, "first")
+        assert paragraphs[0].preview_text == "first"
+        paragraphs.append(1, "Normal", "second")
+        assert paragraphs[1].preview_text == "second"
+        assert paragraphs[0].style_name is None
+
+    def test_model_dump_matches_structure(self):
+        structure = build_structure(150)
+        compact = CompactStructureV1.from_structure(structure)
+
+        assert compact.model_dump() == structure.model_dump()
+
+    def test_to_structure_round_trip(self):
+        structure = build_structure(100)
+        materialized = CompactStructureV1.from_structure(structure).to_structure()
+
+        assert isinstance(materialized, StructureV1)
+        assert materialized.model_dump() == structure.model_dump()
+        assert all(isinstance(p, ParagraphSkeleton) for p in materialized.paragraphs)
+
+
+class TestCompactDiff:
+    """Test cases for column-level diffing."""
+
+    def _modified_structure(self, structure: StructureV1) -> StructureV1:
+        paragraphs = [p.model_copy() for p in structure.paragraphs if p.index != 5]
+        paragraphs[10] = paragraphs[10].model_copy(update={'style_name': 'Caption'})
+        paragraphs[20] = paragraphs[20].model_copy(update={'preview_text': 'changed'})
+        paragraphs.append(ParagraphSkeleton(index=999, style_name="New Style", preview_text="added"))
+        return structure.model_copy(update={'paragraphs': paragraphs})
+
+    @pytest.mark.parametrize("shared_pool", [True, False])
+    def test_diff_indexes_matches_auditor(self, tmp_path, shared_pool):
+        before = build_structure(100)
+        after = self._modified_structure(before)
+
+        pool = StringPool() if shared_pool else None
+        compact_before = CompactStructureV1.from_structure(before, pool)
+        compact_after = CompactStructureV1.from_structure(after, pool)
+
+        auditor = DocumentAuditor(base_audit_dir=str(tmp_path))
+        expected = auditor.generate_diff_report(before, after)
+        actual = auditor.generate_diff_report(compact_before, compact_after)
+
+        assert actual.added_paragraphs == expected.added_paragraphs == [999]
+        assert actual.removed_paragraphs == expected.removed_paragraphs == [5]
+        assert actual.modified_paragraphs == expected.modified_paragraphs
+        assert actual.summary == expected.summary
+
+
+class TestCompactBenchmark:
+    """Memory and throughput benchmark against the Pydantic models."""
+
+    PARAGRAPH_COUNT = 50000
+
+    def _measure(self, build):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = build()
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return result, elapsed, current
+
+    def test_memory_and_throughput(self):
+        records = [
+            (p.index, p.style_name, p.preview_text, p.is_heading, p.heading_level)
+            for p in build_structure(self.PARAGRAPH_COUNT).paragraphs
+        ]
+
+        def build_models():
+            return [
+                ParagraphSkeleton(index=i, style_name=s, preview_text=t, is_heading=h, heading_level=l)
+                for i, s, t, h, l in records
+            ]
+
+        def build_compact():
+            table = CompactParagraphs()
+            for record in records:
+                table.append(*record)
+            table.text_at(0)  # materialize the text arena so it is measured
+            return table
+
+        models, model_seconds, model_bytes = self._measure(build_models)
+        compact, compact_seconds, compact_bytes = self._measure(build_compact)
+
+        start = time.perf_counter()
+        model_dump = [p.model_dump() for p in models]
+        model_dump_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compact_dump = compact.model_dump()
+        compact_dump_seconds = time.perf_counter() - start
+
+        print(f"\nCompact StructureV1 benchmark ({self.PARAGRAPH_COUNT} paragraphs):")
+        print(f"  build:  models {model_seconds:.3f}s / {model_bytes / 1e6:.1f}MB, "
+              f"compact {compact_seconds:.3f}s / {compact_bytes / 1e6:.1f}MB")
+        print(f"  dump:   models {model_dump_seconds:.3f}s, compact {compact_dump_seconds:.3f}s")
+
+        assert compact_dump == model_dump
+        # Text arena and arrays hold the same data in a fraction of the memory
+        assert compact_bytes < model_bytes / 3
@@ -0,0 +1,153 @@
+"""
+Tests for the synthetic DOCX corpus, the COM-free OOXML reader and the
+benchmark harness.
+"""
+
+import json
+import zipfile
+
+import pytest
+
+from autoword.vnext.benchmarks import (
+    CorpusSpec, SIZE_TIERS, generate_docx, benchmark_document, run_benchmarks,
+    load_results, compare_results
+)
+from autoword.vnext.benchmarks.harness import STAGES, build_stub_plan, preview_plan, main
+from autoword.vnext.exceptions import ExtractionError
+from autoword.vnext.ooxml_reader import read_structure, read_inventory
+
+
+@pytest.fixture
+def tiny_document(tmp_path):
+    return generate_docx(SIZE_TIERS["tiny"], tmp_path / "tiny.docx")
+
+
+class TestCorpusGenerator:
+    """Generated packages are well-formed and deterministic."""
+
+    def test_package_parts(self, tiny_document):
+        with zipfile.ZipFile(tiny_document.path) as package:
+            names = set(package.namelist())
+            assert package.testzip() is None
+        assert {"[Content_Types].xml", "_rels/.rels", "word/document.xml", "word/styles.xml",
+                "word/_rels/document.xml.rels", "word/footnotes.xml", "word/media/image1.png"} <= names
+
+    def test_same_seed_same_content(self, tmp_path):
+        spec = CorpusSpec(paragraphs=30, headings=6, seed=7)
+        first = generate_docx(spec, tmp_path / "a.docx")
+        second = generate_docx(spec, tmp_path / "b.docx")
+        other = generate_docx(CorpusSpec(paragraphs=30, headings=6, seed=8), tmp_path / "c.docx")
+
+        def document_xml(doc):
+            with zipfile.ZipFile(doc.path) as package:
+                return package.read("word/document.xml")
+
+        assert document_xml(first) == document_xml(second)
+        assert document_xml(first) != document_xml(other)
+
+    def test_cjk_ratio_controls_language(self, tmp_path):
+        latin = read_structure(str(generate_docx(
+            CorpusSpec(paragraphs=20, cjk_ratio=0.0, toc=False), tmp_path / "latin.docx").path))
+        chinese = read_structure(str(generate_docx(
+            CorpusSpec(paragraphs=20, cjk_ratio=1.0, toc=False), tmp_path / "cjk.docx").path))
+
+        def has_cjk(structure):
+            return any("一" <= ch <= "鿿" for p in structure.paragraphs
+                       if p.style_name == "Normal" for ch in p.preview_text)
+
+        assert not has_cjk(latin)
+        assert has_cjk(chinese)
+
+
+class TestOoxmlReader:
+    """The reader finds what the generator wrote."""
+
+    def test_structure_matches_generated_counts(self, tiny_document):
+        structure = read_structure(str(tiny_document.path))
+
+        assert len(structure.paragraphs) == tiny_document.paragraph_count
+        assert [h.text for h in structure.headings] == tiny_document.heading_texts
+        assert len(structure.tables) == tiny_document.table_count
+        assert len(structure.fields) == tiny_document.field_count
+        assert structure.metadata.title.startswith("Synthetic corpus tiny")
+
+    def test_headings_styles_and_fields(self, tiny_document):
+        structure = read_structure(str(tiny_document.path))
+
+        heading = structure.headings[0]
+        assert heading.level == 1
+        assert heading.style_name == "heading 1"
+        assert structure.paragraphs[heading.paragraph_index].is_heading
+
+        normal = next(s for s in structure.styles if s.name == "Normal")
+        assert normal.font.size_pt == 12
+        assert normal.font.east_asian == "宋体"
+
+        toc = next(f for f in structure.fields if f.field_type == "TOC")
+        assert toc.field_code.startswith("TOC \\o")
+        assert heading.text in toc.result_text
+
+        table = structure.tables[0]
+        assert (table.rows, table.columns, table.has_header) == (2, 2, True)
+
+    def test_inventory(self, tiny_document):
+        inventory = read_inventory(str(tiny_document.path))
+
+        assert "word/document.xml" in inventory.ooxml_fragments
+        assert len(inventory.footnotes) == tiny_document.footnote_count
+        assert inventory.footnotes[0].text_preview
+        media = inventory.media_indexes["word/media/image1.png"]
+        assert media.content_type == "image/png"
+
+    def test_invalid_package(self, tmp_path):
+        bogus = tmp_path / "bogus.docx"
+        bogus.write_bytes(b"not a zip file")
+        with pytest.raises(ExtractionError):
+            read_structure(str(bogus))
+
+
+class TestBenchmarkHarness:
+    """Benchmarks run all COM-free stages and compare results."""
+
+    def test_preview_plan_removes_last_chapter(self, tiny_document):
+        structure = read_structure(str(tiny_document.path))
+        plan = build_stub_plan(structure)
+        after = preview_plan(structure, plan)
+
+        last_chapter = [h for h in structure.headings if h.level == 1][-1]
+        assert last_chapter.text not in [h.text for h in after.headings]
+        assert len(after.paragraphs) < len(structure.paragraphs)
+        assert [p.index for p in after.paragraphs] == list(range(len(after.paragraphs)))
+
+    def test_benchmark_document_runs_all_stages(self, tiny_document):
+        results = benchmark_document(tiny_document, "tiny", rounds=2, warmup=0)
+
+        assert [r.stage for r in results] == list(STAGES)
+        for result in results:
+            assert result.name == f"{result.stage}[tiny]"
+            assert result.stats["rounds"] == 2
+            assert 0 < result.stats["min"] <= result.stats["median"] <= result.stats["max"]
+            assert result.extra_info["headings"] == len(tiny_document.heading_texts)
+
+    def test_results_file_and_comparison(self, tmp_path):
+        output = tmp_path / "results.json"
+        results = run_benchmarks(tiers=["tiny"], rounds=1, warmup=0, stages=["ooxml_parse"],
+                                 output_path=str(output))
+
+        assert load_results(str(output)) == json.loads(output.read_text(encoding="utf-8"))
+        assert results["benchmarks"][0]["name"] == "ooxml_parse[tiny]"
+
+        slower = json.loads(json.dumps(results))
+        slower["benchmarks"][0]["stats"]["median"] *= 2
+        comparison = compare_results(results, slower, threshold=0.2)
+        assert comparison[0]["regression"]
+        assert comparison[0]["change"] == pytest.approx(1.0)
+        assert not compare_results(results, results)[0]["regression"]
+
+    def test_cli_generate(self, tmp_path, capsys):
+        assert main(["generate", str(tmp_path), "--tiers", "tiny", "--count", "2"]) == 0
+        assert sorted(p.name for p in tmp_path.glob("*.docx")) == ["tiny_0.docx", "tiny_1.docx"]
+
+    def test_unknown_tier_rejected(self):
+        with pytest.raises(ValueError):
+            run_benchmarks(tiers=["huge"])
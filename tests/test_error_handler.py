@@ -18,6 +18,7 @@ from autoword.vnext.error_handler import (
     RevisionHandler, ProcessingStatus, RevisionHandlingStrategy, ErrorContext,
     RecoveryResult
 )
+from autoword.vnext.log_sink import close_log_sinks
 from autoword.vnext.exceptions import (
     SecurityViolationError, ValidationError, ExecutionError, RollbackError
 )
@@ -34,6 +35,7 @@ class TestWarningsLogger:
     
     def teardown_method(self):
         """Clean up test fixtures."""
+        self.logger.close()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_log_noop_operation(self):
@@ -43,6 +45,7 @@ class TestWarningsLogger:
         operation_data = {"heading_text": "Missing Section", "level": 1}
         
         self.logger.log_noop_operation(operation_type, reason, operation_data)
+        self.logger.flush()
         
         # Verify log file was created and contains expected content
         assert os.path.exists(self.warnings_log_path)
@@ -59,6 +62,7 @@ class TestWarningsLogger:
         fallback_chain = ["楷体", "楷体_GB2312", "STKaiti"]
         
         self.logger.log_font_fallback(original_font, fallback_font, fallback_chain)
+        self.logger.flush()
         
         with open(self.warnings_log_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -71,6 +75,7 @@ class TestWarningsLogger:
         fallback_style = "标题 1"
         
         self.logger.log_localization_fallback(original_style, fallback_style)
+        self.logger.flush()
         
         with open(self.warnings_log_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -83,6 +88,7 @@ class TestWarningsLogger:
         security_context = {"user": "test", "operation_data": {"param": "value"}}
         
         self.logger.log_security_violation(operation_type, violation_reason, security_context)
+        self.logger.flush()
         
         with open(self.warnings_log_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -96,6 +102,7 @@ class TestWarningsLogger:
         action_taken = "Accepted all 5 revisions"
         
         self.logger.log_revision_handling(strategy, revision_count, action_taken)
+        self.logger.flush()
         
         with open(self.warnings_log_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -116,6 +123,7 @@ class TestSecurityValidator:
     
     def teardown_method(self):
         """Clean up test fixtures."""
+        close_log_sinks(self.temp_dir)
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_validate_whitelisted_operation(self):
@@ -196,6 +204,7 @@ class TestRollbackManager:
     
     def teardown_method(self):
         """Clean up test fixtures."""
+        close_log_sinks(self.temp_dir)
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_perform_rollback_success(self):
@@ -266,6 +275,7 @@ class TestRevisionHandler:
     
     def teardown_method(self):
         """Clean up test fixtures."""
+        close_log_sinks(self.temp_dir)
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_handle_revisions_accept_all(self):
@@ -342,6 +352,7 @@ class TestPipelineErrorHandler:
     
     def teardown_method(self):
         """Clean up test fixtures."""
+        close_log_sinks(self.temp_dir)
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_initialization(self):
@@ -465,6 +476,7 @@ class TestPipelineErrorHandler:
             "Heading not found",
             {"heading_text": "Missing"}
         )
+        self.handler.warnings_logger.flush()
         
         warnings_log = os.path.join(self.audit_dir, "warnings.log")
         with open(warnings_log, 'r', encoding='utf-8') as f:
@@ -477,6 +489,7 @@ class TestPipelineErrorHandler:
         self.handler.log_font_fallback(
             "楷体", "楷体_GB2312", ["楷体", "楷体_GB2312", "STKaiti"]
         )
+        self.handler.warnings_logger.flush()
         
         warnings_log = os.path.join(self.audit_dir, "warnings.log")
         with open(warnings_log, 'r', encoding='utf-8') as f:
@@ -487,6 +500,7 @@ class TestPipelineErrorHandler:
     def test_log_localization_fallback(self):
         """Test localization fallback logging."""
         self.handler.log_localization_fallback("Heading 1", "标题 1")
+        self.handler.warnings_logger.flush()
         
         warnings_log = os.path.join(self.audit_dir, "warnings.log")
         with open(warnings_log, 'r', encoding='utf-8') as f:
@@ -0,0 +1,77 @@
+"""
+Import-time budget tests.
+
+Runs ``python -X importtime`` in a fresh interpreter and fails when
+``import autoword.vnext`` or the CLI module start pulling heavy dependencies
+back in at import time, or when cold start exceeds the budget. The budget can
+be raised on slow CI machines with AUTOWORD_IMPORT_BUDGET_MS.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_BUDGET_MS = float(os.environ.get("AUTOWORD_IMPORT_BUDGET_MS", "250"))
+
+# Modules that must only be imported when a command or attribute needs them
+HEAVY_MODULES = [
+    "pydantic",
+    "jsonschema",
+    "psutil",
+    "win32com",
+    "pythoncom",
+    "autoword.vnext.models",
+    "autoword.vnext.pipeline",
+    "autoword.vnext.simple_pipeline",
+    "autoword.core.llm_client",
+]
+
+
+def measure_import(module: str) -> Dict[str, int]:
+    """Import module in a fresh interpreter and return cumulative us per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(PROJECT_ROOT), capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+@pytest.mark.parametrize("module", ["autoword.vnext", "autoword.vnext.cli", "autoword.gui"])
+def test_no_heavy_imports(module):
+    timings = measure_import(module)
+    loaded = [name for name in HEAVY_MODULES if name in timings]
+    assert not loaded, f"import {module} eagerly loads {loaded}"
+
+
+@pytest.mark.parametrize("module", ["autoword.vnext", "autoword.vnext.cli"])
+def test_cold_start_budget(module):
+    # Best of three runs to keep the budget check stable on busy machines
+    cumulative_ms = min(measure_import(module)[module] for _ in range(3)) / 1000
+    assert cumulative_ms < IMPORT_BUDGET_MS, f"import {module} took {cumulative_ms:.1f}ms (budget {IMPORT_BUDGET_MS:.0f}ms)"
+
+
+def test_lazy_attributes_resolve():
+    import autoword.vnext as vnext
+    from autoword.vnext.simple_pipeline import VNextPipeline
+    from autoword.vnext.models import StructureV1
+
+    assert vnext.VNextPipeline is VNextPipeline
+    assert vnext.StructureV1 is StructureV1
+    assert "PlanV1" in dir(vnext)
+    with pytest.raises(AttributeError):
+        vnext.NoSuchName
@@ -0,0 +1,178 @@
+"""
+Test AutoWord Interval Tree
+测试区间树和基于字符范围的变更授权
+"""
+
+import random
+
+import pytest
+
+from autoword.core.interval_tree import IntervalTree, normalize_range
+from autoword.core.format_validator import AuthorizationChecker, FormatChange
+from autoword.core.models import Task, TaskType, TaskResult, Locator, LocatorType, Comment
+
+
+def make_comment(comment_id, start, end):
+    return Comment(id=comment_id, author="审阅者", page=1, anchor_text="锚点", comment_text="修改",
+                   range_start=start, range_end=end)
+
+
+def make_task(task_id, task_type, comment_id="c1", by=LocatorType.FIND, value="锚点"):
+    return Task(id=task_id, type=task_type, source_comment_id=comment_id,
+                locator=Locator(by=by, value=value), instruction="修改")
+
+
+def heading_change(start, end, change_type="heading_level_change"):
+    return FormatChange(change_type=change_type, element_type="heading",
+                        element_id=f"heading_{start}_{end}", range_start=start, range_end=end,
+                        old_value=1, new_value=2, authorized=False)
+
+
+class TestIntervalTree:
+    """测试区间树"""
+
+    def test_overlapping_matches_brute_force(self):
+        """测试重叠查询与逐个比较结果一致"""
+        rng = random.Random(7)
+        intervals = []
+        tree = IntervalTree()
+        for i in range(300):
+            start = rng.randrange(1000)
+            end = start + rng.randrange(0, 50)
+            intervals.append((start, end, i))
+            tree.add(start, end, i)
+
+        for _ in range(300):
+            start = rng.randrange(1000)
+            end = start + rng.randrange(0, 30)
+            query = normalize_range(start, end)
+            expected = [value for s, e, value in intervals
+                        if normalize_range(s, e)[0] < query[1] and normalize_range(s, e)[1] > query[0]]
+            assert tree.overlapping(start, end) == expected
+
+    def test_half_open_and_empty_ranges(self):
+        """测试半开区间和零长度区间"""
+        tree = IntervalTree()
+        tree.add(0, 10, "a")
+        tree.add(10, 10, "anchor")
+
+        assert tree.overlapping(10, 20) == ["anchor"]
+        assert tree.overlapping(9, 10) == ["a"]
+        assert tree.first_overlapping(20, 30) is None
+
+    def test_add_after_query_rebuilds(self):
+        """测试查询后继续添加区间"""
+        tree = IntervalTree()
+        tree.add(5, 8, "first")
+        assert tree.overlapping(0, 100) == ["first"]
+        tree.add(0, 3, "second")
+        assert tree.overlapping(0, 100) == ["first", "second"]
+        assert len(tree) == 2
+
+
+class TestRangeAuthorization:
+    """测试按字符范围授权格式变更"""
+
+    def setup_method(self):
+        self.checker = AuthorizationChecker()
+
+    def test_change_outside_task_range_is_unauthorized(self):
+        """测试与任务范围不重叠的变更不被授权"""
+        comments = [make_comment("c1", 100, 120)]
+        tasks = [make_task("t1", TaskType.SET_HEADING_LEVEL)]
+        changes = [heading_change(105, 130), heading_change(500, 520)]
+
+        result = self.checker.check_authorization(changes, tasks, comments)
+
+        assert result[0].authorized is True
+        assert result[0].source_comment_id == "c1"
+        assert result[1].authorized is False
+
+    def test_execution_range_overrides_comment_range(self):
+        """测试执行时解析出的范围优先于批注范围"""
+        comments = [make_comment("c1", 100, 120)]
+        tasks = [make_task("t1", TaskType.SET_HEADING_LEVEL)]
+        changes = [heading_change(105, 110), heading_change(500, 520)]
+
+        result = self.checker.check_authorization(changes, tasks, comments, task_ranges={"t1": (490, 510)})
+
+        assert result[0].authorized is False
+        assert result[1].authorized is True
+
+    def test_range_locator_used_before_comment(self):
+        """测试范围定位器优先于批注范围"""
+        comments = [make_comment("c1", 0, 5)]
+        tasks = [make_task("t1", TaskType.SET_HEADING_LEVEL, by=LocatorType.RANGE, value="200-220")]
+
+        result = self.checker.check_authorization([heading_change(210, 215)], tasks, comments)
+
+        assert result[0].authorized is True
+
+    def test_task_type_must_match(self):
+        """测试范围重叠但任务类型不相关时不授权"""
+        comments = [make_comment("c1", 0, 50)]
+        tasks = [make_task("t1", TaskType.REPLACE_HYPERLINK)]
+
+        result = self.checker.check_authorization([heading_change(10, 20)], tasks, comments)
+
+        assert result[0].authorized is False
+
+    def test_unranged_task_and_document_level_change(self):
+        """测试无范围任务和文档级变更仍按类型匹配"""
+        tasks = [make_task("t1", TaskType.SET_HEADING_LEVEL, comment_id="missing"),
+                 make_task("t2", TaskType.SET_PARAGRAPH_STYLE, comment_id="missing")]
+        style_change = FormatChange(change_type="style_usage_change", element_type="style",
+                                    element_id="style_Normal", old_value=1, new_value=2, authorized=False)
+
+        result = self.checker.check_authorization([heading_change(10, 20), style_change], tasks, [])
+
+        assert result[0].authorized is True
+        assert result[1].authorized is True
+
+    def test_earliest_task_wins(self):
+        """测试多个任务重叠时取最先执行的任务"""
+        comments = [make_comment("c1", 0, 100), make_comment("c2", 0, 100)]
+        tasks = [make_task("t1", TaskType.SET_HEADING_LEVEL, comment_id="c2"),
+                 make_task("t2", TaskType.SET_HEADING_LEVEL, comment_id="c1")]
+
+        result = self.checker.check_authorization([heading_change(10, 20)], tasks, comments)
+
+        assert result[0].source_comment_id == "c2"
+
+    def test_position_parsed_from_element_id(self):
+        """测试未显式给出范围时从元素ID解析"""
+        change = FormatChange(change_type="hyperlink_address_change", element_type="hyperlink",
+                              element_id="link_30_40", old_value="a", new_value="b", authorized=False)
+        assert change.position == (30, 40)
+        assert FormatChange(change_type="x", element_type="style", element_id="style_Normal",
+                            old_value=None, new_value=None, authorized=False).position is None
+
+    def test_validator_uses_task_result_ranges(self):
+        """测试验证器使用任务执行结果中的范围"""
+        from autoword.core.format_validator import FormatValidator
+
+        validator = FormatValidator()
+        tasks = [make_task("t1", TaskType.SET_HEADING_LEVEL)]
+        comments = [make_comment("c1", 0, 10)]
+        results = [TaskResult(task_id="t1", success=True, message="ok", execution_time=0.1,
+                              range_start=500, range_end=520)]
+        captured = {}
+
+        def check(changes, executed_tasks, comments, task_ranges=None):
+            captured["task_ranges"] = task_ranges
+            return changes
+
+        validator.auth_checker.check_authorization = check
+        validator.comparator.compare_snapshots = lambda before, after: []
+        validator.validate_execution_result(None, None, tasks, comments, task_results=results)
+
+        assert captured["task_ranges"] == {"t1": (500, 520)}
+
+
+def test_authorization_benchmark_smoke():
+    """区间树授权与逐个扫描结果一致"""
+    from autoword.vnext.benchmarks.harness import benchmark_authorization
+
+    report = benchmark_authorization(changes=300, tasks=40, rounds=1)
+    assert report["equivalent"]
+    assert report["authorized"] > 0
@@ -0,0 +1,436 @@
+"""
+Tests for the job queue and the job-queue service.
+"""
+
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from autoword.vnext.checkpoint import CHECKPOINT_FILE
+from autoword.vnext.job_queue import CANCELLED, ERROR, QUEUED, RUNNING, JobQueue
+from autoword.vnext.models import ProcessingResult
+from autoword.vnext.service import JobService, create_http_server, create_unix_server
+
+
+class FakePipeline:
+    """Pipeline writing a run directory like VNextPipeline, without Word."""
+
+    def __init__(self, audit_root, progress_callback, delay=0.0, tracker=None):
+        self.audit_root = audit_root
+        self.progress_callback = progress_callback
+        self.delay = delay
+        self.tracker = tracker
+        self.current_audit_dir = None
+        self.processed = []
+        self.resumed = []
+
+    def process_document(self, docx_path, user_intent):
+        self.processed.append(os.path.basename(docx_path))
+        run_dir = os.path.join(self.audit_root, f"run_{len(os.listdir(self.audit_root))}_{os.path.basename(docx_path)}")
+        os.makedirs(os.path.join(run_dir, "snapshots"))
+        return self._run(run_dir, docx_path)
+
+    def resume(self, audit_directory):
+        self.resumed.append(audit_directory)
+        return self._run(audit_directory, None)
+
+    def _run(self, run_dir, docx_path):
+        self.current_audit_dir = run_dir
+        if self.tracker is not None:
+            self.tracker.enter()
+        try:
+            self.progress_callback("Extract", 0)
+            time.sleep(self.delay)
+            with open(os.path.join(run_dir, "snapshots", "after.docx"), "wb") as f:
+                f.write(b"modified " + os.path.basename(docx_path or run_dir).encode())
+            with open(os.path.join(run_dir, "result.status.txt"), "w", encoding="utf-8") as f:
+                f.write("SUCCESS")
+        finally:
+            if self.tracker is not None:
+                self.tracker.leave()
+            self.current_audit_dir = None
+        return ProcessingResult(status="SUCCESS", message="Document processed successfully", audit_directory=run_dir)
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def leave(self):
+        with self.lock:
+            self.active -= 1
+
+
+@pytest.fixture
+def docs(tmp_path):
+    directory = tmp_path / "docs"
+    directory.mkdir()
+    for name in ("a.docx", "b.docx", "c.docx", "d.docx"):
+        (directory / name).write_bytes(name.encode())
+    return directory
+
+
+def make_service(tmp_path, workers=1, delay=0.0, tracker=None):
+    audit_root = tmp_path / "audit"
+    audit_root.mkdir(exist_ok=True)
+    pipelines = []
+
+    def factory(progress_callback):
+        pipeline = FakePipeline(str(audit_root), progress_callback, delay=delay, tracker=tracker)
+        pipelines.append(pipeline)
+        return pipeline
+
+    queue = JobQueue(tmp_path / "queue.sqlite")
+    return JobService(queue, factory, workers=workers, poll_interval_seconds=0.05), pipelines
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestJobQueue:
+    """Test the SQLite job queue."""
+
+    def test_claims_by_priority_then_age(self, tmp_path):
+        """Test that higher priorities are claimed first, oldest first within a priority."""
+        queue = JobQueue(tmp_path / "queue.sqlite")
+        low = queue.submit("low.docx", "intent")
+        high_old = queue.submit("high_old.docx", "intent", priority=5)
+        high_new = queue.submit("high_new.docx", "intent", priority=5)
+
+        claimed = [queue.claim("w")["job_id"] for _ in range(3)]
+        assert claimed == [high_old["job_id"], high_new["job_id"], low["job_id"]]
+        assert queue.claim("w") is None
+        assert queue.get(low["job_id"])["status"] == RUNNING
+        assert queue.get(low["job_id"])["attempts"] == 1
+
+    def test_concurrent_claims_are_exclusive(self, tmp_path):
+        """Test that each job is claimed by exactly one of several claimers."""
+        queue = JobQueue(tmp_path / "queue.sqlite")
+        submitted = {queue.submit(f"{i}.docx", "intent")["job_id"] for i in range(30)}
+        claimed = []
+        lock = threading.Lock()
+
+        def claim_all(name):
+            own = JobQueue(tmp_path / "queue.sqlite")
+            while True:
+                job = own.claim(name)
+                if job is None:
+                    return
+                with lock:
+                    claimed.append(job["job_id"])
+
+        threads = [threading.Thread(target=claim_all, args=(f"w{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(claimed) == sorted(submitted)
+
+    def test_complete_cancel_and_requeue(self, tmp_path):
+        """Test recording results, cancelling queued jobs and requeueing interrupted ones."""
+        queue = JobQueue(tmp_path / "queue.sqlite")
+        done = queue.submit("done.docx", "intent")
+        queue.claim("w")
+        queue.complete(done["job_id"], ProcessingResult(status="ROLLBACK", errors=["boom"], audit_directory="run_1"))
+        finished = queue.get(done["job_id"])
+        assert (finished["status"], finished["audit_directory"], finished["error"]) == ("ROLLBACK", "run_1", "boom")
+        assert finished["result"]["errors"] == ["boom"]
+
+        interrupted = queue.submit("interrupted.docx", "intent")
+        queue.claim("w")
+        waiting = queue.submit("waiting.docx", "intent")
+        assert queue.cancel(waiting["job_id"])
+        assert not queue.cancel(interrupted["job_id"])
+
+        assert JobQueue(tmp_path / "queue.sqlite").requeue_running() == 1
+        assert queue.get(interrupted["job_id"])["status"] == QUEUED
+        assert queue.counts() == {"ROLLBACK": 1, QUEUED: 1, CANCELLED: 1}
+
+
+class TestJobService:
+    """Test workers processing queued jobs."""
+
+    def test_workers_reuse_warm_pipelines(self, tmp_path, docs):
+        """Test that jobs are processed with one pipeline per worker and the concurrency limit holds."""
+        tracker = ConcurrencyTracker()
+        service, pipelines = make_service(tmp_path, workers=2, delay=0.1, tracker=tracker)
+        jobs = [service.submit(str(path), "Format") for path in sorted(docs.iterdir())]
+        service.start()
+        try:
+            assert wait_for(lambda: all(service.queue.get(job["job_id"])["status"] == "SUCCESS" for job in jobs))
+        finally:
+            service.stop(timeout=10)
+
+        assert len(pipelines) == 2
+        assert sorted(sum((p.processed for p in pipelines), [])) == ["a.docx", "b.docx", "c.docx", "d.docx"]
+        assert tracker.peak <= 2
+        assert sum(worker["jobs_processed"] for worker in service.health()["workers"]) == 4
+
+    def test_running_job_reports_progress_and_audit_directory(self, tmp_path, docs):
+        """Test live stage progress and early recording of the run directory."""
+        service, _ = make_service(tmp_path, delay=0.5)
+        job = service.submit(str(docs / "a.docx"), "Format")
+        service.start()
+        try:
+            assert wait_for(lambda: service.queue.get(job["job_id"])["audit_directory"] is not None)
+            running = service.job_status(job["job_id"])
+            assert running["status"] == RUNNING
+            assert running["progress"]["stage"] == "Extract"
+            assert os.path.basename(running["audit_directory"]).startswith("run_")
+        finally:
+            service.stop(timeout=10)
+
+    def test_interrupted_job_resumes_from_checkpoint(self, tmp_path, docs):
+        """Test that a job left RUNNING with a checkpoint is resumed on startup."""
+        service, pipelines = make_service(tmp_path)
+        job = service.queue.submit(str(docs / "a.docx"), "Format")
+        service.queue.claim("crashed-worker")
+        run_dir = tmp_path / "audit" / "run_crashed"
+        (run_dir / "snapshots").mkdir(parents=True)
+        (run_dir / CHECKPOINT_FILE).write_text("{}", encoding="utf-8")
+        service.queue.set_audit_directory(job["job_id"], str(run_dir))
+
+        service.start()
+        try:
+            assert wait_for(lambda: service.queue.get(job["job_id"])["status"] == "SUCCESS")
+        finally:
+            service.stop(timeout=10)
+        assert pipelines[0].resumed == [str(run_dir)]
+        assert pipelines[0].processed == []
+
+    def test_pipeline_exception_fails_job_and_replaces_pipeline(self, tmp_path, docs):
+        """Test that a job raising out of the pipeline is marked ERROR and the next job gets a new pipeline."""
+        service, pipelines = make_service(tmp_path)
+        failing = service.submit(str(docs / "a.docx"), "Format", priority=1)
+        following = service.submit(str(docs / "b.docx"), "Format")
+        original_factory = service.pipeline_factory
+
+        def factory(progress_callback):
+            pipeline = original_factory(progress_callback)
+            if len(pipelines) == 1:
+                pipeline.process_document = lambda path, intent: (_ for _ in ()).throw(RuntimeError("COM died"))
+            return pipeline
+
+        service.pipeline_factory = factory
+        service.start()
+        try:
+            assert wait_for(lambda: service.queue.get(following["job_id"])["status"] == "SUCCESS")
+        finally:
+            service.stop(timeout=10)
+        assert service.queue.get(failing["job_id"])["status"] == ERROR
+        assert service.queue.get(failing["job_id"])["error"] == "COM died"
+        assert len(pipelines) == 2
+
+    def test_workers_initialize_com(self, tmp_path, docs):
+        """Test that jobs run on worker threads with COM initialized."""
+        events = []
+
+        class FakePythoncom:
+            @staticmethod
+            def CoInitialize():
+                events.append(("init", threading.current_thread().name))
+
+            @staticmethod
+            def CoUninitialize():
+                events.append(("uninit", threading.current_thread().name))
+
+        service, pipelines = make_service(tmp_path)
+        original_factory = service.pipeline_factory
+
+        def factory(progress_callback):
+            pipeline = original_factory(progress_callback)
+            process_document = pipeline.process_document
+            pipeline.process_document = lambda path, intent: (
+                events.append(("job", threading.current_thread().name)) or process_document(path, intent))
+            return pipeline
+
+        service.pipeline_factory = factory
+        job = service.submit(str(docs / "a.docx"), "Format")
+        with patch("autoword.vnext.watchdog.pythoncom", FakePythoncom):
+            service.start()
+            try:
+                assert wait_for(lambda: service.queue.get(job["job_id"])["status"] == "SUCCESS")
+            finally:
+                service.stop(timeout=10)
+
+        worker = events[0][1]
+        assert worker != threading.current_thread().name
+        assert events == [("init", worker), ("job", worker), ("uninit", worker)]
+
+    def test_submit_validation(self, tmp_path, docs):
+        """Test that missing documents, non-DOCX files and empty intents are rejected."""
+        service, _ = make_service(tmp_path)
+        (docs / "notes.txt").write_text("notes", encoding="utf-8")
+        with pytest.raises(ValueError, match="not found"):
+            service.submit(str(docs / "missing.docx"), "Format")
+        with pytest.raises(ValueError, match="DOCX"):
+            service.submit(str(docs / "notes.txt"), "Format")
+        with pytest.raises(ValueError, match="Intent"):
+            service.submit(str(docs / "a.docx"), "  ")
+
+
+class TestJobApi:
+    """Test the HTTP and Unix socket API."""
+
+    @pytest.fixture
+    def api(self, tmp_path):
+        service, _ = make_service(tmp_path)
+        server = create_http_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield service, f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+        service.stop(timeout=10)
+
+    def request(self, url, method="GET", data=None):
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(url, data=body, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def test_submit_and_fetch_result(self, api, docs):
+        """Test submitting a job and reading its status, result and output."""
+        service, base = api
+        status, body = self.request(f"{base}/jobs", "POST",
+                                    {"docx_path": str(docs / "a.docx"), "intent": "Format", "priority": 3})
+        assert status == 201
+        job = json.loads(body)
+        assert (job["status"], job["priority"]) == (QUEUED, 3)
+
+        status, body = self.request(f"{base}/jobs/{job['job_id']}/result")
+        assert status == 202 and not json.loads(body)["finished"]
+
+        service.start()
+        assert wait_for(lambda: service.queue.get(job["job_id"])["status"] == "SUCCESS")
+
+        status, body = self.request(f"{base}/jobs/{job['job_id']}/result")
+        result = json.loads(body)
+        assert status == 200
+        assert result["result"]["status"] == "SUCCESS"
+        assert result["status_file"] == "SUCCESS"
+        assert set(result["artifacts"]) == {"result.status.txt", "snapshots/after.docx"}
+
+        status, body = self.request(f"{base}/jobs/{job['job_id']}/output")
+        assert (status, body) == (200, b"modified a.docx")
+
+        status, body = self.request(f"{base}/jobs?status=SUCCESS")
+        assert [listed["job_id"] for listed in json.loads(body)["jobs"]] == [job["job_id"]]
+        status, body = self.request(f"{base}/health")
+        assert json.loads(body)["jobs"] == {"SUCCESS": 1}
+
+    def test_errors_and_cancel(self, api, docs):
+        """Test rejected submissions, unknown jobs and cancelling queued jobs."""
+        service, base = api
+        assert self.request(f"{base}/jobs", "POST", {"docx_path": str(docs / "missing.docx"),
+                                                     "intent": "Format"})[0] == 400
+        assert self.request(f"{base}/jobs/unknown")[0] == 404
+        assert self.request(f"{base}/jobs/unknown/output")[0] == 404
+
+        _, body = self.request(f"{base}/jobs", "POST", {"docx_path": str(docs / "a.docx"), "intent": "Format"})
+        job_id = json.loads(body)["job_id"]
+        status, body = self.request(f"{base}/jobs/{job_id}", "DELETE")
+        assert status == 200 and json.loads(body)["status"] == CANCELLED
+        assert self.request(f"{base}/jobs/{job_id}", "DELETE")[0] == 409
+
+    @pytest.mark.parametrize("data", [
+        {"docx_path": ["a.docx"], "intent": "Format"},
+        {"docx_path": "a.docx", "intent": 42},
+        {"docx_path": "a.docx", "intent": "Format", "priority": [1]},
+        {"docx_path": "a.docx", "intent": "Format", "priority": "high"},
+        ["a.docx", "Format"],
+    ])
+    def test_malformed_submission_is_bad_request(self, api, docs, data):
+        """Test that wrongly typed fields are answered with 400 instead of a dropped connection."""
+        service, base = api
+        for key, value in (data.items() if isinstance(data, dict) else ()):
+            if value == "a.docx":
+                data[key] = str(docs / "a.docx")
+        status, body = self.request(f"{base}/jobs", "POST", data)
+        assert status == 400
+        assert json.loads(body)["error"]
+        assert service.queue.counts() == {}
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets not available")
+    def test_unix_socket(self, tmp_path, docs):
+        """Test the API over a Unix domain socket."""
+        service, _ = make_service(tmp_path)
+        # Socket paths are length-limited, so keep it short
+        socket_path = os.path.join("/tmp", f"autoword-{os.getpid()}.sock")
+        server = create_unix_server(service, socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        class UnixConnection(http.client.HTTPConnection):
+            def connect(self):
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(socket_path)
+
+        try:
+            connection = UnixConnection("localhost")
+            connection.request("POST", "/jobs", body=json.dumps({"docx_path": str(docs / "a.docx"),
+                                                                 "intent": "Format"}))
+            response = connection.getresponse()
+            assert response.status == 201
+            job_id = json.loads(response.read())["job_id"]
+            connection.close()
+
+            connection = UnixConnection("localhost")
+            connection.request("GET", f"/jobs/{job_id}")
+            assert json.loads(connection.getresponse().read())["status"] == QUEUED
+            connection.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert not os.path.exists(socket_path)
+
+
+class TestWarmPipeline:
+    """Test pipeline components kept across runs."""
+
+    def test_planner_created_once_across_runs(self, tmp_path, docs):
+        """Test that consecutive runs of one pipeline reuse its planner."""
+        from unittest.mock import patch
+        from autoword.vnext.models import InventoryFullV1, PlanV1, ValidationResult
+        from autoword.vnext.pipeline import VNextPipeline
+        from tests.test_checkpoint import make_structure
+
+        pipeline = VNextPipeline(base_audit_dir=str(tmp_path / "audit"), enable_memory_monitoring=False)
+        with patch("autoword.vnext.pipeline.DocumentPlanner") as planner_class, \
+                patch.object(VNextPipeline, "_extract_document", return_value=(make_structure(), InventoryFullV1())), \
+                patch.object(VNextPipeline, "_execute_plan", autospec=True,
+                             side_effect=lambda p, plan: p.working_docx_path), \
+                patch.object(VNextPipeline, "_validate_modifications", return_value=ValidationResult(is_valid=True)), \
+                patch.object(VNextPipeline, "_create_audit_trail"):
+            planner_class.return_value.generate_plan.return_value = PlanV1(ops=[])
+            planner_class.return_value.validate_plan_schema.return_value = ValidationResult(is_valid=True)
+            results = [pipeline.process_document(str(docs / name), "Format") for name in ("a.docx", "b.docx")]
+
+        assert [result.status for result in results] == ["SUCCESS", "SUCCESS"]
+        planner_class.assert_called_once()
+        assert planner_class.return_value.generate_plan.call_count == 2
+        assert pipeline.planner is None
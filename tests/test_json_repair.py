@@ -0,0 +1,136 @@
+"""
+Test AutoWord JSON Repair
+测试单遍容错 JSON 修复
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from autoword.core.json_repair import (
+    JSONRepairError, repair_json, strip_code_fence,
+    TRAILING_COMMA, MISSING_COMMA, FULLWIDTH_QUOTE, UNESCAPED_QUOTE, TRUNCATED, PREFIX_TEXT
+)
+from autoword.core.llm_client import LLMClient, LLMResponse, ModelType
+
+
+CORPUS_PATH = Path(__file__).parent / "data" / "llm_malformed_outputs.jsonl"
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.parametrize("sample", load_corpus(), ids=lambda sample: sample["name"])
+def test_corpus_sample_repaired(sample):
+    """录制的错误输出都能修复为期望值，期望值为 null 的必须拒绝"""
+    if sample["expected"] is None:
+        with pytest.raises(JSONRepairError):
+            repair_json(sample["content"])
+        return
+    result = repair_json(sample["content"])
+    assert result.value == sample["expected"]
+    assert json.loads(result.text) == sample["expected"]
+
+
+class TestRepairJson:
+    """测试修复行为和修复记录"""
+
+    def test_valid_json_untouched(self):
+        content = '{\n  "a": [1, 2],\n  "b": "x"\n}'
+        result = repair_json(content)
+        assert result.text == content
+        assert not result.repaired
+
+    def test_repair_positions(self):
+        content = 'Plan: {"a": 1,}'
+        result = repair_json(content)
+        kinds = [(repair.kind, repair.position) for repair in result.repairs]
+        assert kinds == [(PREFIX_TEXT, 0), (TRAILING_COMMA, content.index("}"))]
+
+    def test_quote_handling(self):
+        result = repair_json('{“k”: "他说"好"", "n": 1\n"m": 2}')
+        assert result.value == {"k": '他说"好"', "n": 1, "m": 2}
+        kinds = {repair.kind for repair in result.repairs}
+        assert {FULLWIDTH_QUOTE, UNESCAPED_QUOTE, MISSING_COMMA} <= kinds
+
+    def test_truncated_nested_containers(self):
+        result = repair_json('[{"a": [1, 2, {"b": "x"}, {"c"')
+        assert result.value == [{"a": [1, 2, {"b": "x"}, {}]}]
+        assert any(repair.kind == TRUNCATED for repair in result.repairs)
+
+    @pytest.mark.parametrize("content", [
+        '{"ops": [{"operation_type": "set_style_rule", "font": {"size_pt": 1',
+        '{"ops": [{"operation_type": "set_style_rule", "font": {"size_pt": 10.',
+        '{"ops": [{"operation_type": "delete_section_by_heading", "heading_text": "第',
+        '{"ops": [{"operation_type": "delete_toc", "mode": "fi',
+        '{"ops": [{"operation_type": "set_style_rule", "font": {"bold": fa',
+    ])
+    def test_truncated_value_rejected(self, content):
+        """截断在数字、字符串或字面量中间的响应不补全，修复失败"""
+        with pytest.raises(JSONRepairError) as exc_info:
+            repair_json(content)
+        assert exc_info.value.position is not None
+
+    def test_no_json_raises(self):
+        with pytest.raises(JSONRepairError):
+            repair_json("抱歉，我无法生成计划。")
+
+    def test_strip_code_fence(self):
+        assert strip_code_fence('```json\n{"a": 1}\n```') == '{"a": 1}'
+        assert strip_code_fence('{"a": 1}') == '{"a": 1}'
+
+
+class TestCallWithJsonRetry:
+    """测试修复后不再重新请求 LLM"""
+
+    def setup_method(self):
+        self.client = LLMClient(api_keys={"gpt": "test-key", "claude": "test-key"})
+
+    def respond(self, content):
+        return LLMResponse(success=True, content=content, model=ModelType.GPT5.value)
+
+    def test_malformed_output_repaired_without_retry(self):
+        malformed = "{'ops': [{'operation_type': 'update_toc'},], 'done': True"
+        with patch.object(self.client, "call_model", return_value=self.respond(malformed)) as call_model:
+            response = self.client.call_with_json_retry(ModelType.GPT5, "system", "user")
+
+        assert response.success
+        assert json.loads(response.content) == {"ops": [{"operation_type": "update_toc"}], "done": True}
+        assert call_model.call_count == 1
+        assert self.client.json_repair_stats["repaired"] == 1
+
+    def test_truncated_value_retries(self):
+        truncated = '{"ops": [{"operation_type": "set_style_rule", "font": {"size_pt": 1'
+        complete = '{"ops": [{"operation_type": "set_style_rule", "font": {"size_pt": 14}}]}'
+        with patch.object(self.client, "call_model",
+                          side_effect=[self.respond(truncated), self.respond(complete)]) as call_model:
+            response = self.client.call_with_json_retry(ModelType.GPT5, "system", "user")
+
+        assert json.loads(response.content)["ops"][0]["font"]["size_pt"] == 14
+        assert call_model.call_count == 2
+
+    def test_unrepairable_output_retries(self):
+        responses = [self.respond("没有JSON"), self.respond('{"ok": true}')]
+        with patch.object(self.client, "call_model", side_effect=responses) as call_model:
+            response = self.client.call_with_json_retry(ModelType.GPT5, "system", "user")
+
+        assert json.loads(response.content) == {"ok": True}
+        assert call_model.call_count == 2
+        assert self.client.json_repair_stats["failed"] == 1
+        assert self.client.json_repair_stats["parsed"] == 1
+
+
+def test_single_pass_beats_legacy_on_corpus():
+    """在录制语料上单遍修复恢复的响应不少于旧策略"""
+    from autoword.vnext.benchmarks.harness import benchmark_json_repair
+
+    report = benchmark_json_repair(str(CORPUS_PATH), rounds=1)
+    single_pass = report["strategies"]["single_pass"]
+    legacy = report["strategies"]["legacy"]
+
+    assert single_pass["correct"] == report["samples"]
+    assert single_pass["correct"] > legacy["correct"]
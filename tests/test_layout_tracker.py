@@ -0,0 +1,226 @@
+"""
+Tests for lazy field update and repagination.
+
+Covers LayoutDependencyTracker decisions, executor deferral, scoped refresh
+in DocumentValidator and the layout decisions written to the audit trail.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from autoword.vnext.layout_tracker import (
+    LayoutDependencyTracker, RefreshDecision, refresh_page_dependent_fields,
+    WD_FIELD_TOC, WD_FIELD_PAGE_REF
+)
+from autoword.vnext.executor import DocumentExecutor
+from autoword.vnext.validator.document_validator import DocumentValidator
+from autoword.vnext.auditor.document_auditor import DocumentAuditor
+from autoword.vnext.exceptions import ValidationError
+from autoword.vnext.models import (
+    PlanV1, StructureV1, DocumentMetadata, SetStyleRule, UpdateToc, FontSpec, OperationResult
+)
+
+
+def make_field(field_type):
+    field = Mock()
+    field.Type = field_type
+    return field
+
+
+class TestLayoutDependencyTracker:
+    """Refresh decisions for different dirty states and assertion sets."""
+
+    def test_clean_document_needs_no_refresh(self):
+        decision = LayoutDependencyTracker().plan_refresh(DocumentValidator.ASSERTIONS)
+        assert decision.is_noop
+
+    def test_fields_only_skips_repagination(self):
+        tracker = LayoutDependencyTracker()
+        tracker.mark_fields_dirty("update_toc")
+        decision = tracker.plan_refresh(DocumentValidator.ASSERTIONS)
+
+        assert decision.update_fields
+        assert not decision.repaginate
+        assert "update_toc" in decision.reason
+
+    def test_layout_change_repaginates_only_for_page_assertions(self):
+        tracker = LayoutDependencyTracker()
+        tracker.mark_layout_dirty("set_style_rule")
+
+        with_pages = tracker.plan_refresh(["chapter", "pagination"])
+        assert with_pages.update_fields and with_pages.repaginate
+        assert "pagination" in with_pages.reason
+
+        without_pages = tracker.plan_refresh(["chapter", "style", "toc"])
+        assert without_pages.update_fields
+        assert not without_pages.repaginate
+
+    def test_unknown_assertion_is_conservative(self):
+        tracker = LayoutDependencyTracker()
+        tracker.mark_layout_dirty("reassign_paragraphs_to_style")
+        assert tracker.plan_refresh(["custom_check"]).repaginate
+
+    def test_mark_refreshed_runs_refresh_once(self):
+        tracker = LayoutDependencyTracker()
+        tracker.mark_layout_dirty("delete_section_by_heading")
+        decision = tracker.plan_refresh(["pagination"])
+        tracker.mark_refreshed(decision)
+
+        assert tracker.plan_refresh(["pagination"]).is_noop
+
+    def test_refresh_scoped_to_page_dependent_fields(self):
+        doc = Mock()
+        toc, page_ref, other = make_field(WD_FIELD_TOC), make_field(WD_FIELD_PAGE_REF), make_field(33)
+        doc.Fields = [toc, page_ref, other]
+
+        updated = refresh_page_dependent_fields(doc, RefreshDecision(True, False, "test"))
+
+        assert updated == {"TOC": 1, "PAGEREF": 1}
+        toc.Update.assert_called_once()
+        page_ref.Update.assert_called_once()
+        other.Update.assert_not_called()
+        doc.Repaginate.assert_not_called()
+
+
+class TestExecutorDeferral:
+    """DocumentExecutor records stale state instead of refreshing."""
+
+    def setup_method(self):
+        self.patchers = [
+            patch('autoword.vnext.executor.document_executor.WIN32_AVAILABLE', True),
+            patch('autoword.vnext.executor.document_executor.win32com'),
+            patch('autoword.vnext.executor.document_executor.wdConstants'),
+        ]
+        _, self.mock_win32com, _ = [p.start() for p in self.patchers]
+        self.temp_dir = tempfile.mkdtemp()
+        self.docx = os.path.join(self.temp_dir, "input.docx")
+        Path(self.docx).write_bytes(b"docx")
+
+    def teardown_method(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def run_plan(self, plan, tracker):
+        doc = Mock()
+        word_app = Mock()
+        word_app.Documents.Open.return_value = doc
+        self.mock_win32com.client.Dispatch.return_value = word_app
+
+        executor = DocumentExecutor(layout_tracker=tracker)
+        with patch.object(executor, 'apply_localization_fallbacks'), \
+                patch.object(executor, 'execute_operation') as execute_operation:
+            execute_operation.side_effect = lambda op, d: OperationResult(
+                success=True, operation_type=op.operation_type, message="done")
+            executor.execute_plan(plan, self.docx)
+        return doc
+
+    def test_refresh_deferred_to_tracker(self):
+        tracker = LayoutDependencyTracker()
+        doc = self.run_plan(PlanV1(ops=[
+            SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=12)),
+            UpdateToc()
+        ]), tracker)
+
+        doc.Fields.Update.assert_not_called()
+        doc.Repaginate.assert_not_called()
+        assert tracker.fields_dirty and tracker.layout_dirty
+        assert tracker.layout_sources == ["set_style_rule", "update_toc"]
+        assert tracker.decisions[0]["stage"] == "execute"
+
+    def test_colour_only_plan_leaves_layout_clean(self):
+        tracker = LayoutDependencyTracker()
+        self.run_plan(PlanV1(ops=[
+            SetStyleRule(target_style_name="Normal", font=FontSpec(color_hex="#FF0000"))
+        ]), tracker)
+
+        assert not tracker.fields_dirty
+        assert not tracker.layout_dirty
+        assert tracker.plan_refresh(DocumentValidator.ASSERTIONS).is_noop
+
+
+class TestValidatorScopedRefresh:
+    """DocumentValidator refreshes once, as far as assertions need."""
+
+    def setup_method(self):
+        self.structure = StructureV1(metadata=DocumentMetadata(title="Doc", page_count=2))
+        handle, self.docx = tempfile.mkstemp(suffix=".docx")
+        os.close(handle)
+
+    def teardown_method(self):
+        os.unlink(self.docx)
+
+    def validate(self, tracker, assertions=None):
+        validator = DocumentValidator(layout_tracker=tracker)
+        validator._word_app = Mock()
+        doc = Mock()
+        doc.Fields = [make_field(WD_FIELD_TOC), make_field(33)]
+        validator._word_app.Documents.Open.return_value = doc
+
+        with patch('autoword.vnext.validator.document_validator.DocumentExtractor') as extractor_class:
+            extractor_class.return_value.__enter__.return_value.extract_structure.return_value = self.structure
+            result = validator.validate_modifications(self.structure, self.docx, assertions=assertions)
+        return validator, doc, result
+
+    def test_clean_tracker_skips_opening_document(self):
+        tracker = LayoutDependencyTracker()
+        validator, _, result = self.validate(tracker, assertions=["chapter", "pagination"])
+
+        assert result.is_valid
+        validator._word_app.Documents.Open.assert_not_called()
+        assert tracker.decisions[-1]["stage"] == "validate"
+        assert tracker.decisions[-1]["update_fields"] is False
+
+    def test_layout_change_repaginates_once(self):
+        tracker = LayoutDependencyTracker()
+        tracker.mark_layout_dirty("set_style_rule")
+        _, doc, _ = self.validate(tracker)
+
+        doc.Repaginate.assert_called_once()
+        doc.Fields[0].Update.assert_called_once()
+        doc.Fields[1].Update.assert_not_called()
+        assert not tracker.layout_dirty
+        assert tracker.decisions[-1]["updated_fields"] == {"TOC": 1, "PAGEREF": 0}
+
+    def test_no_repagination_without_page_assertions(self):
+        tracker = LayoutDependencyTracker()
+        tracker.mark_layout_dirty("set_style_rule")
+        _, doc, _ = self.validate(tracker, assertions=["chapter", "style", "toc"])
+
+        doc.Repaginate.assert_not_called()
+        doc.Fields[0].Update.assert_called_once()
+
+    def test_without_tracker_refreshes_everything(self):
+        validator = DocumentValidator()
+        validator._word_app = Mock()
+        doc = validator._word_app.Documents.Open.return_value
+        validator._update_fields_and_repaginate(self.docx)
+
+        doc.Fields.Update.assert_called_once()
+        doc.Repaginate.assert_called_once()
+
+    def test_unknown_assertion_rejected(self):
+        with pytest.raises(ValidationError):
+            DocumentValidator().validate_modifications(self.structure, self.docx, assertions=["bogus"])
+
+
+class TestAuditRecord:
+    """Layout decisions are written to the audit trail."""
+
+    def test_save_layout_decisions(self, tmp_path):
+        tracker = LayoutDependencyTracker()
+        tracker.mark_layout_dirty("delete_section_by_heading")
+        tracker.record("validate", tracker.plan_refresh(["pagination"]))
+
+        auditor = DocumentAuditor(base_audit_dir=str(tmp_path))
+        audit_dir = Path(auditor.create_audit_directory())
+        auditor.save_layout_decisions(tracker.to_dict())
+
+        with open(audit_dir / "reports" / "layout_decisions.json", encoding="utf-8") as f:
+            saved = json.load(f)
+        assert saved["layout_sources"] == ["delete_section_by_heading"]
+        assert saved["decisions"][0]["repaginate"] is True
@@ -0,0 +1,150 @@
+"""
+Test AutoWord LLM Streaming
+测试流式响应的增量解析、提前校验和取消
+"""
+
+import json
+
+import pytest
+
+from autoword.core.json_stream import IncrementalArrayParser
+from autoword.core.llm_client import LLMClient, ModelType
+from autoword.core.llm_stub import LLMStubServer
+
+
+VALID_OPS = [
+    {"operation_type": "update_toc"},
+    {"operation_type": "delete_section_by_heading", "heading_text": "摘要", "level": 1},
+]
+
+
+def plan_json(ops):
+    return json.dumps({"schema_version": "plan.v1", "ops": ops}, ensure_ascii=False)
+
+
+def make_client(**kwargs):
+    kwargs.setdefault("api_keys", {"gpt": "test-key", "claude": "test-key"})
+    kwargs.setdefault("max_retries", 1)
+    kwargs.setdefault("stream", True)
+    return LLMClient(**kwargs)
+
+
+class TestIncrementalArrayParser:
+    """测试增量数组解析"""
+
+    def test_items_emitted_as_they_close(self):
+        text = plan_json(VALID_OPS)
+        parser = IncrementalArrayParser("ops")
+        emitted = []
+        for ch in text:
+            emitted.append(parser.feed(ch))
+
+        first = next(i for i, items in enumerate(emitted) if items)
+        assert emitted[first] == [VALID_OPS[0]]
+        # 第一个元素在整个响应结束前就已取出
+        assert first < len(text) - 1
+        assert parser.items == VALID_OPS
+        assert parser.complete
+
+    def test_ignores_other_arrays_and_braces_in_strings(self):
+        text = '{"meta": {"ops": [{"x": 1}]}, "ops": [{"heading_text": "a}]{b"}, [1, 2]]}'
+        parser = IncrementalArrayParser("ops")
+        parser.feed(text)
+        assert parser.items == [{"heading_text": "a}]{b"}, [1, 2]]
+
+    def test_malformed_item_repaired(self):
+        parser = IncrementalArrayParser("ops")
+        parser.feed('{"ops": [{"operation_type": "update_toc",}]}')
+        assert parser.items == [{"operation_type": "update_toc"}]
+        assert not parser.errors
+
+
+class TestStreamingClient:
+    """测试 SSE 流式调用"""
+
+    def test_stream_collects_content_and_metrics(self):
+        content = plan_json(VALID_OPS)
+        with LLMStubServer(default_content=content, stream_chunk_chars=8) as server:
+            response = make_client(base_url=server.base_url).call_model(ModelType.GPT5, "s", "u")
+
+        assert response.success
+        assert json.loads(response.content) == json.loads(content)
+        metrics = response.metrics
+        assert metrics["streamed"]
+        assert metrics["ops_received"] == 2
+        assert not metrics["cancelled"]
+        assert metrics["time_to_first_token_ms"] <= metrics["time_to_first_op_ms"] <= metrics["total_ms"]
+        assert server.stats["chunks_sent"] > 1
+
+    def test_validator_violation_cancels_stream(self):
+        ops = [{"operation_type": "insert_paragraph", "text": "x"}] + [{"operation_type": "update_toc"}] * 200
+        validated = []
+
+        def validator(op, index):
+            validated.append(index)
+            return None if op["operation_type"] == "update_toc" else "not whitelisted"
+
+        with LLMStubServer(default_content=plan_json(ops), stream_chunk_chars=16,
+                           stream_delay_ms=2) as server:
+            client = make_client(base_url=server.base_url)
+            response = client.call_with_json_retry(ModelType.GPT5, "s", "u", item_validator=validator)
+            chunks_total = -(-len(plan_json(ops)) // 16)
+
+        assert not response.success
+        assert "not whitelisted" in response.error
+        assert validated == [0]
+        assert response.metrics["cancelled"]
+        assert response.metrics["ops_received"] == 1
+        assert server.stats["chunks_sent"] < chunks_total
+
+    def test_record_mode_uses_full_response(self, tmp_path):
+        from autoword.core.llm_stub import LLMFixtureStore
+
+        with LLMStubServer(default_content=plan_json(VALID_OPS)) as server:
+            client = make_client(base_url=server.base_url, fixture_mode="record",
+                                 fixture_store=LLMFixtureStore(str(tmp_path / "f.jsonl")))
+            response = client.call_model(ModelType.GPT5, "s", "u")
+        assert response.success
+        assert response.metrics is None
+        assert server.stats["chunks_sent"] == 0
+
+
+class TestPlannerStreaming:
+    """测试 DocumentPlanner 在流式模式下提前拒绝非白名单操作"""
+
+    @pytest.fixture
+    def structure(self):
+        from autoword.vnext.models import StructureV1, DocumentMetadata
+        return StructureV1(metadata=DocumentMetadata(title="Doc"))
+
+    def test_valid_plan_records_metrics(self, structure):
+        from autoword.vnext.planner import DocumentPlanner
+
+        with LLMStubServer(default_content=plan_json(VALID_OPS)) as server:
+            planner = DocumentPlanner(llm_client=make_client(base_url=server.base_url))
+            plan = planner.generate_plan(structure, "删除摘要并更新目录")
+
+        assert [op.operation_type for op in plan.ops] == ["update_toc", "delete_section_by_heading"]
+        assert planner.last_llm_metrics["ops_received"] == 2
+
+    def test_invalid_operation_cancels_generation(self, structure):
+        from autoword.vnext.exceptions import PlanningError
+        from autoword.vnext.planner import DocumentPlanner
+
+        ops = [{"operation_type": "delete_section_by_heading", "heading_text": "摘要", "level": 12}]
+        with LLMStubServer(default_content=plan_json(ops)) as server:
+            planner = DocumentPlanner(llm_client=make_client(base_url=server.base_url))
+            with pytest.raises(PlanningError):
+                planner.generate_plan(structure, "删除摘要")
+
+        assert planner.last_llm_metrics["cancelled"]
+        assert "Operation 0" in planner.last_llm_metrics["cancel_reason"]
+
+    def test_validate_streamed_operation(self):
+        from autoword.vnext.planner import DocumentPlanner
+
+        planner = DocumentPlanner(llm_client=make_client())
+        assert planner.validate_streamed_operation({"operation_type": "update_toc"}, 0) is None
+        assert "not whitelisted" in planner.validate_streamed_operation({"operation_type": "run_macro"}, 3)
+        assert planner.validate_streamed_operation(
+            {"operation_type": "clear_direct_formatting", "scope": "document"}, 1)
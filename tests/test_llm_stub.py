@@ -0,0 +1,132 @@
+"""
+Test AutoWord LLM Record/Replay
+测试 LLM 录制/回放和本地桩服务器
+"""
+
+import json
+import time
+
+import pytest
+
+from autoword.core.llm_client import LLMClient, ModelType
+from autoword.core.llm_stub import (
+    LLMFixtureStore, LLMStubServer, completion_response, measure_throughput, request_key
+)
+
+
+PLAN_JSON = json.dumps({"schema_version": "plan.v1", "ops": [{"operation_type": "update_toc"}]})
+
+
+def make_client(**kwargs):
+    kwargs.setdefault("api_keys", {"gpt": "test-key", "claude": "test-key"})
+    kwargs.setdefault("max_retries", 1)
+    return LLMClient(**kwargs)
+
+
+class TestFixtureStore:
+    """测试录制存储"""
+
+    def test_key_ignores_max_tokens(self):
+        payload = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.7}
+        assert request_key(payload) == request_key({**payload, "max_tokens": 10})
+        assert request_key(payload) != request_key({**payload, "temperature": 0.1})
+
+    def test_persisted_records_replay_in_order(self, tmp_path):
+        path = tmp_path / "fixtures.jsonl"
+        payload = {"model": "m", "messages": [], "temperature": 0.7}
+        store = LLMFixtureStore(str(path))
+        store.record(payload, completion_response("first", "m"))
+        store.record(payload, completion_response("second", "m"))
+
+        reloaded = LLMFixtureStore(str(path))
+        contents = [reloaded.lookup(payload)["response"]["choices"][0]["message"]["content"]
+                    for _ in range(3)]
+        assert contents == ["first", "second", "second"]
+        assert reloaded.lookup({**payload, "model": "other"}) is None
+
+        reloaded.rewind()
+        assert reloaded.lookup(payload)["response"]["choices"][0]["message"]["content"] == "first"
+
+
+class TestRecordReplay:
+    """测试 LLMClient 录制与回放"""
+
+    def test_record_then_replay_without_server(self, tmp_path):
+        path = str(tmp_path / "fixtures.jsonl")
+        with LLMStubServer(default_content=PLAN_JSON) as server:
+            recorder = make_client(base_url=server.base_url, fixture_store=LLMFixtureStore(path),
+                                   fixture_mode="record")
+            recorded = recorder.call_model(ModelType.GPT5, "system", "user")
+        assert recorded.success
+
+        replayer = make_client(base_url="http://127.0.0.1:9", fixture_store=LLMFixtureStore(path),
+                               fixture_mode="replay")
+        replayed = replayer.call_model(ModelType.GPT5, "system", "user")
+        assert replayed.success
+        assert replayed.content == recorded.content
+
+        missing = replayer.call_model(ModelType.GPT5, "system", "another prompt")
+        assert not missing.success
+
+    def test_replay_drives_document_planner(self, tmp_path):
+        from autoword.vnext.models import StructureV1, DocumentMetadata
+        from autoword.vnext.planner import DocumentPlanner
+
+        structure = StructureV1(metadata=DocumentMetadata(title="Doc"))
+        store = LLMFixtureStore(str(tmp_path / "plan.jsonl"))
+        with LLMStubServer(default_content=PLAN_JSON) as server:
+            DocumentPlanner(llm_client=make_client(base_url=server.base_url, fixture_store=store,
+                                                   fixture_mode="record")).generate_plan(structure, "更新目录")
+
+        planner = DocumentPlanner(llm_client=make_client(fixture_store=store, fixture_mode="replay"))
+        plan = planner.generate_plan(structure, "更新目录")
+        assert [op.operation_type for op in plan.ops] == ["update_toc"]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            make_client(fixture_mode="record")
+        with pytest.raises(ValueError):
+            make_client(fixture_store=LLMFixtureStore(), fixture_mode="bogus")
+
+
+class TestStubServer:
+    """测试桩服务器延迟、错误注入和并发"""
+
+    def test_recorded_response_and_miss(self):
+        store = LLMFixtureStore()
+        client = make_client()
+        payload = {"model": ModelType.GPT5.value, "temperature": 0.7,
+                   "messages": [{"role": "system", "content": "s"}, {"role": "user", "content": "u"}]}
+        store.record(payload, completion_response("recorded", payload["model"]))
+
+        with LLMStubServer(store=store) as server:
+            client.base_url = server.base_url
+            assert client.call_model(ModelType.GPT5, "s", "u").content == "recorded"
+            assert not client.call_model(ModelType.GPT5, "s", "other").success
+        assert server.stats["hits"] == 1
+        assert server.stats["misses"] == 1
+
+    def test_latency_and_jitter(self):
+        with LLMStubServer(default_content="{}", latency_ms=40, jitter_ms=10, seed=1) as server:
+            client = make_client(base_url=server.base_url)
+            start = time.perf_counter()
+            assert client.call_model(ModelType.GPT5, "s", "u").success
+            assert time.perf_counter() - start >= 0.04
+
+    def test_error_injection(self):
+        with LLMStubServer(default_content="{}", error_rate=1.0, error_status=429) as server:
+            response = make_client(base_url=server.base_url).call_model(ModelType.GPT5, "s", "u")
+        assert not response.success
+        assert "429" in response.error
+        assert server.stats["injected_errors"] == 1
+
+    def test_high_concurrency_throughput(self):
+        with LLMStubServer(default_content=PLAN_JSON, latency_ms=5) as server:
+            client = make_client(base_url=server.base_url)
+            result = measure_throughput(lambda: client.call_model(ModelType.GPT5, "s", "u"),
+                                        total_requests=200, concurrency=32)
+
+        assert result["errors"] == 0
+        assert server.stats["requests"] == 200
+        assert result["requests_per_s"] > 0
+        assert result["p50_ms"] <= result["p95_ms"]
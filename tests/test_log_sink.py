@@ -0,0 +1,154 @@
+"""
+Tests for the buffered warnings/audit log sink.
+
+Covers batching, bounded buffering, deduplication with occurrence counts,
+sharing one sink between writers and flushing on finalize_audit.
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from autoword.vnext.log_sink import BufferedLogSink, get_log_sink, close_log_sinks
+from autoword.vnext.error_handler import WarningsLogger
+from autoword.vnext.localization import LocalizationManager
+from autoword.vnext.auditor.document_auditor import DocumentAuditor
+
+
+@pytest.fixture(autouse=True)
+def close_sinks(tmp_path):
+    yield
+    close_log_sinks(str(tmp_path))
+
+
+def read_lines(path):
+    return Path(path).read_text(encoding="utf-8").splitlines()
+
+
+class TestBufferedLogSink:
+    """Buffering and flushing behaviour."""
+
+    def test_lines_written_in_one_batch(self, tmp_path):
+        sink = BufferedLogSink(str(tmp_path / "warnings.log"), flush_interval=60)
+        for i in range(500):
+            sink.write(f"warning {i}")
+        assert not (tmp_path / "warnings.log").exists()
+
+        sink.flush()
+        assert read_lines(tmp_path / "warnings.log") == [f"warning {i}" for i in range(500)]
+        assert sink.flush_count == 1
+        sink.close()
+
+    def test_full_buffer_flushes_synchronously(self, tmp_path):
+        sink = BufferedLogSink(str(tmp_path / "warnings.log"), flush_interval=60, max_buffered_lines=10)
+        for i in range(25):
+            sink.write(f"warning {i}")
+
+        assert len(read_lines(tmp_path / "warnings.log")) == 20
+        assert len(sink._pending) == 5
+        sink.close()
+        assert len(read_lines(tmp_path / "warnings.log")) == 25
+
+    def test_background_thread_flushes(self, tmp_path):
+        sink = BufferedLogSink(str(tmp_path / "warnings.log"), flush_interval=0.01)
+        flushed = threading.Event()
+        original_flush = sink.flush
+
+        def flush(*args, **kwargs):
+            original_flush(*args, **kwargs)
+            if sink.lines_written:
+                flushed.set()
+
+        sink.flush = flush
+        sink.write("warning")
+        assert flushed.wait(5)
+        assert read_lines(tmp_path / "warnings.log") == ["warning"]
+        sink.close()
+
+    def test_deduplication_counts_occurrences(self, tmp_path):
+        sink = BufferedLogSink(str(tmp_path / "warnings.log"), flush_interval=60, deduplicate=True)
+        assert sink.write("[t1] FONT_FALLBACK: a", key="FONT_FALLBACK: a")
+        assert not sink.write("[t2] FONT_FALLBACK: a", key="FONT_FALLBACK: a")
+        sink.write("[t3] NOOP: b", key="NOOP: b")
+        sink.close()
+
+        lines = read_lines(tmp_path / "warnings.log")
+        assert lines[:2] == ["[t1] FONT_FALLBACK: a", "[t3] NOOP: b"]
+        assert lines[2].endswith("REPEATED: FONT_FALLBACK: a (x2)")
+        assert len(lines) == 3
+
+    def test_deduplication_bounded(self, tmp_path):
+        sink = BufferedLogSink(str(tmp_path / "warnings.log"), flush_interval=60,
+                               deduplicate=True, max_tracked_keys=2)
+        for _ in range(2):
+            for name in ("a", "b", "c"):
+                sink.write(name)
+        sink.close()
+
+        lines = read_lines(tmp_path / "warnings.log")
+        assert lines[:4] == ["a", "b", "c", "c"]
+        assert len(lines) == 6
+        assert sink.occurrence_counts() == {"a": 2, "b": 2}
+
+
+class TestSharedSink:
+    """Writers of the same file share one sink."""
+
+    def test_get_log_sink_shared_per_path(self, tmp_path):
+        path = str(tmp_path / "warnings.log")
+        assert get_log_sink(path) is get_log_sink(str(Path(path)))
+
+        sink = get_log_sink(path)
+        sink.close()
+        assert get_log_sink(path) is not sink
+
+    def test_warnings_logger_and_localization_keep_order(self, tmp_path):
+        path = str(tmp_path / "warnings.log")
+        warnings_logger = WarningsLogger(path)
+        warnings_logger.log_localization_fallback("Heading 1", "标题 1")
+
+        manager = LocalizationManager(path)
+        manager.write_warnings_log(["Font fallback: 楷体 -> 楷体_GB2312"])
+
+        lines = read_lines(path)
+        assert "STYLE_FALLBACK" in lines[0]
+        assert lines[1] == "Font fallback: 楷体 -> 楷体_GB2312"
+        assert warnings_logger.get_warnings() == [lines[0]]
+
+    def test_warnings_logger_deduplicates_ignoring_timestamp(self, tmp_path):
+        path = str(tmp_path / "warnings.log")
+        warnings_logger = WarningsLogger(path, deduplicate=True)
+        for _ in range(1000):
+            warnings_logger.log_noop_operation("update_toc", "No TOC found")
+        warnings_logger.close()
+
+        lines = read_lines(path)
+        assert len(lines) == 2
+        assert lines[1].endswith("REPEATED: NOOP: update_toc - No TOC found (x1000)")
+
+    def test_finalize_audit_flushes_buffered_warnings(self, tmp_path):
+        auditor = DocumentAuditor(base_audit_dir=str(tmp_path))
+        audit_dir = Path(auditor.create_audit_directory())
+        warnings_logger = WarningsLogger(str(audit_dir / "warnings.log"))
+        warnings_logger.log_font_fallback("楷体", "STKaiti", ["楷体", "STKaiti"])
+        auditor.add_warning("NOOP operation")
+
+        auditor.finalize_audit("SUCCESS", "done")
+
+        content = (audit_dir / "warnings.log").read_text(encoding="utf-8")
+        assert "FONT_FALLBACK" in content
+        assert "NOOP operation" in content
+        assert get_log_sink(str(audit_dir / "warnings.log")) is not warnings_logger._sink
+
+    def test_auditor_does_not_rewrite_warnings(self, tmp_path):
+        auditor = DocumentAuditor(base_audit_dir=str(tmp_path))
+        audit_dir = Path(auditor.create_audit_directory())
+        auditor.add_warning("first")
+        auditor.write_warnings_log()
+        auditor.add_warning("second")
+        auditor.write_warnings_log()
+
+        lines = read_lines(audit_dir / "warnings.log")
+        assert len(lines) == 2
+        assert lines[0].endswith("first") and lines[1].endswith("second")
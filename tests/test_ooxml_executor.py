@@ -0,0 +1,506 @@
+"""
+Tests for the OOXML style executor.
+
+Covers style edits in styles.xml, paragraph reassignment in document.xml,
+package preservation, the COM fallback rules and a randomized equivalence
+test against DocumentExecutor running over the simulated Word document.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+import zipfile
+from unittest.mock import Mock
+
+from autoword.vnext.executor import DocumentExecutor, OoxmlStyleExecutor
+from autoword.vnext.exceptions import ExecutionError
+from autoword.vnext.models import (
+    PlanV1, SetStyleRule, ReassignParagraphsToStyle, ClearDirectFormatting, UpdateToc,
+    FontSpec, ParagraphSpec, LineSpacingMode
+)
+from autoword.vnext.layout_tracker import LayoutDependencyTracker
+from tests.test_plan_optimizer import ExecutorTestCase, FakeDocument
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W = f"{{{W_NS}}}"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+# Style name -> (styleId, stored name, outline level)
+STYLES = {
+    "Normal": ("Normal", "Normal", None),
+    "Body Text": ("BodyText", "Body Text", None),
+    "Caption": ("Caption", "caption", None),
+    "Title": ("Title", "Title", None),
+    "Heading 1": ("Heading1", "heading 1", 0),
+    "Heading 2": ("Heading2", "heading 2", 1),
+    "Heading 3": ("Heading3", "heading 3", 2),
+}
+STYLE_IDS = {style_id: name for name, (style_id, _, _) in STYLES.items()}
+
+# Explicit properties matching FakeFont/FakeParagraphFormat defaults
+DEFAULT_RPR = ('<w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:eastAsia="宋体"/>'
+               '<w:b w:val="0"/><w:i w:val="0"/><w:color w:val="000000"/><w:sz w:val="22"/></w:rPr>')
+DEFAULT_PPR = ('<w:spacing w:before="0" w:after="0" w:line="240" w:lineRule="auto"/>'
+               '<w:ind w:left="0" w:right="0" w:firstLine="0"/>')
+
+
+def styles_xml():
+    styles = []
+    for name, (style_id, stored, level) in STYLES.items():
+        default = ' w:default="1"' if name == "Normal" else ""
+        based_on = "" if name == "Normal" else '<w:basedOn w:val="Normal"/>'
+        outline = f'<w:outlineLvl w:val="{level}"/>' if level is not None else ""
+        styles.append(f'<w:style w:type="paragraph"{default} w:styleId="{style_id}">'
+                      f'<w:name w:val="{stored}"/>{based_on}<w:qFormat/>'
+                      f'<w:pPr>{DEFAULT_PPR}{outline}</w:pPr>{DEFAULT_RPR}</w:style>')
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            f'<w:styles xmlns:mc="{MC_NS}" xmlns:w="{W_NS}" xmlns:w14="{W14_NS}" mc:Ignorable="w14">'
+            f'<w:docDefaults/>{"".join(styles)}</w:styles>')
+
+
+def paragraph_xml(text, style_name):
+    style_id = STYLES[style_name][0]
+    ppr = "" if style_name == "Normal" else f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>'
+    return f'<w:p w14:paraId="1A2B3C4D">{ppr}<w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def document_xml(paragraphs, extra=""):
+    body = "".join(paragraph_xml(text, style) for text, style in paragraphs)
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+            f'<w:document xmlns:mc="{MC_NS}" xmlns:w="{W_NS}" xmlns:w14="{W14_NS}" mc:Ignorable="w14">'
+            f'<w:body>{body}{extra}<w:sectPr><w:pgSz w:w="11906" w:h="16838"/></w:sectPr></w:body></w:document>')
+
+
+def write_docx(path, paragraphs, extra=""):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr("word/document.xml", document_xml(paragraphs, extra))
+        package.writestr("word/styles.xml", styles_xml())
+        package.writestr("word/media/image1.png", b"\x89PNG binary")
+    return path
+
+
+def read_paragraphs(path):
+    """(text, style name) of the top-level body paragraphs."""
+    with zipfile.ZipFile(path) as package:
+        root = ET.fromstring(package.read("word/document.xml"))
+    names = read_style_names(path)
+    result = []
+    for para in root.find(f"{W}body").findall(f"{W}p"):
+        pstyle = para.find(f"{W}pPr/{W}pStyle")
+        style_id = pstyle.get(f"{W}val") if pstyle is not None else "Normal"
+        result.append(("".join(t.text or "" for t in para.iter(f"{W}t")), names[style_id]))
+    return result
+
+
+def read_style_names(path):
+    with zipfile.ZipFile(path) as package:
+        root = ET.fromstring(package.read("word/styles.xml"))
+    names = {}
+    for style in root.findall(f"{W}style"):
+        stored = style.find(f"{W}name").get(f"{W}val")
+        names[style.get(f"{W}styleId")] = STYLE_IDS.get(style.get(f"{W}styleId"), stored)
+    return names
+
+
+def read_style_properties(path):
+    """Style properties expressed as the Word COM values of FakeStyle.snapshot."""
+    with zipfile.ZipFile(path) as package:
+        root = ET.fromstring(package.read("word/styles.xml"))
+
+    def points(element, name, default=0):
+        value = element.get(f"{W}{name}") if element is not None else None
+        return int(value) / 20 if value is not None else default
+
+    snapshots = []
+    for style in root.findall(f"{W}style"):
+        name = STYLE_IDS.get(style.get(f"{W}styleId"), style.find(f"{W}name").get(f"{W}val"))
+        rpr, ppr = style.find(f"{W}rPr"), style.find(f"{W}pPr")
+        fonts = rpr.find(f"{W}rFonts")
+        font = {
+            "Name": fonts.get(f"{W}ascii"),
+            "NameFarEast": fonts.get(f"{W}eastAsia"),
+            "Size": int(rpr.find(f"{W}sz").get(f"{W}val")) / 2,
+            "Bold": rpr.find(f"{W}b").get(f"{W}val") != "0",
+            "Italic": rpr.find(f"{W}i").get(f"{W}val") != "0",
+            "Color": int(rpr.find(f"{W}color").get(f"{W}val"), 16),
+        }
+        spacing, ind = ppr.find(f"{W}spacing"), ppr.find(f"{W}ind")
+        rule = {"exact": 4}.get(spacing.get(f"{W}lineRule"), 0 if spacing.get(f"{W}line") == "240" else 5)
+        first_line = points(ind, "firstLine") if ind.get(f"{W}hanging") is None else -points(ind, "hanging")
+        paragraph = {
+            "LineSpacingRule": rule,
+            "LineSpacing": points(spacing, "line") if rule else None,
+            "SpaceBefore": points(spacing, "before"),
+            "SpaceAfter": points(spacing, "after"),
+            "LeftIndent": points(ind, "left"),
+            "RightIndent": points(ind, "right"),
+            "FirstLineIndent": first_line,
+        }
+        snapshots.append((name, font, paragraph))
+    return sorted(snapshots, key=lambda item: item[0])
+
+
+def com_style_properties(doc):
+    snapshots = []
+    for style in doc.Styles:
+        name, font, paragraph = style.snapshot()
+        font = dict(font, Size=float(font["Size"]), Bold=bool(font["Bold"]), Italic=bool(font["Italic"]))
+        paragraph = {key: float(value) for key, value in paragraph.items()}
+        paragraph["LineSpacingRule"] = int(paragraph["LineSpacingRule"])
+        if not paragraph["LineSpacingRule"]:
+            paragraph["LineSpacing"] = None  # SINGLE leaves the previous value in place
+        snapshots.append((name, font, paragraph))
+    return sorted(snapshots, key=lambda item: item[0])
+
+
+SAMPLE = [
+    ("Chapter 1", "Heading 1"),
+    ("Intro note", "Normal"),
+    ("Section 1.1", "Heading 2"),
+    ("Body 1.1 note", "Body Text"),
+    ("Figure 1", "Caption"),
+]
+
+
+class OoxmlTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = write_docx(os.path.join(self.tmp_dir, "input.docx"), SAMPLE)
+        self.output = os.path.join(self.tmp_dir, "output.docx")
+        self.executor = OoxmlStyleExecutor()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def style_element(self, style_id):
+        with zipfile.ZipFile(self.output) as package:
+            root = ET.fromstring(package.read("word/styles.xml"))
+        return root.find(f"{W}style[@{W}styleId='{style_id}']")
+
+
+class TestStyleRules(OoxmlTestCase):
+    """SetStyleRule is written to styles.xml."""
+
+    def test_font_and_paragraph_properties(self):
+        plan = PlanV1(ops=[SetStyleRule(
+            target_style_name="Heading 1",
+            font=FontSpec(east_asian="黑体", latin="Arial", size_pt=16, bold=True, color_hex="#1F3864"),
+            paragraph=ParagraphSpec(line_spacing_mode=LineSpacingMode.EXACTLY, line_spacing_value=2.0,
+                                    space_before_pt=12, indent_first_line_pt=-10.5)
+        )])
+
+        results = self.executor.execute_plan(plan, self.source, self.output)
+
+        self.assertEqual(results[0].message, "Style rule applied to 'Heading 1'")
+        style = self.style_element("Heading1")
+        fonts = style.find(f"{W}rPr/{W}rFonts")
+        self.assertEqual((fonts.get(f"{W}eastAsia"), fonts.get(f"{W}ascii"), fonts.get(f"{W}hAnsi")),
+                         ("黑体", "Arial", "Arial"))
+        self.assertEqual(style.find(f"{W}rPr/{W}sz").get(f"{W}val"), "32")
+        self.assertEqual(style.find(f"{W}rPr/{W}szCs").get(f"{W}val"), "32")
+        self.assertEqual(style.find(f"{W}rPr/{W}b").get(f"{W}val"), "1")
+        self.assertEqual(style.find(f"{W}rPr/{W}color").get(f"{W}val"), "1F3864")
+        spacing = style.find(f"{W}pPr/{W}spacing")
+        self.assertEqual((spacing.get(f"{W}line"), spacing.get(f"{W}lineRule"), spacing.get(f"{W}before")),
+                         ("40", "exact", "240"))
+        ind = style.find(f"{W}pPr/{W}ind")
+        self.assertEqual(ind.get(f"{W}hanging"), "210")
+        self.assertIsNone(ind.get(f"{W}firstLine"))
+
+    def test_schema_order_of_inserted_elements(self):
+        plan = PlanV1(ops=[SetStyleRule(target_style_name="Caption",
+                                        font=FontSpec(size_pt=9, italic=True))])
+
+        self.executor.execute_plan(plan, self.source, self.output)
+
+        rpr = [child.tag[len(W):] for child in self.style_element("Caption").find(f"{W}rPr")]
+        self.assertEqual(rpr, ["rFonts", "b", "i", "iCs", "color", "sz", "szCs"])
+
+    def test_missing_style_is_created(self):
+        plan = PlanV1(ops=[
+            SetStyleRule(target_style_name="Quote Block", font=FontSpec(italic=True)),
+            ReassignParagraphsToStyle(selector={"text_contains": "Intro"}, target_style_name="Quote Block"),
+        ])
+
+        results = self.executor.execute_plan(plan, self.source, self.output)
+
+        self.assertEqual(results[0].warnings, ["Created new style: Quote Block"])
+        style = self.style_element("QuoteBlock")
+        self.assertEqual(style.get(f"{W}type"), "paragraph")
+        self.assertEqual(style.find(f"{W}basedOn").get(f"{W}val"), "Normal")
+        self.assertIn(("Intro note", "Quote Block"), read_paragraphs(self.output))
+
+    def test_style_alias_resolution(self):
+        plan = PlanV1(ops=[SetStyleRule(target_style_name="正文", font=FontSpec(size_pt=12))])
+
+        results = self.executor.execute_plan(plan, self.source, self.output)
+
+        self.assertEqual(results[0].message, "Style rule applied to 'Normal'")
+        self.assertEqual(self.style_element("Normal").find(f"{W}rPr/{W}sz").get(f"{W}val"), "24")
+
+
+class TestParagraphReassignment(OoxmlTestCase):
+    """ReassignParagraphsToStyle rewrites w:pStyle in document.xml."""
+
+    def test_selectors_and_plan_order(self):
+        plan = PlanV1(ops=[
+            ReassignParagraphsToStyle(selector={"style_name": "Body Text"}, target_style_name="Normal"),
+            ReassignParagraphsToStyle(selector={"outline_level": 2}, target_style_name="Heading 3"),
+            ReassignParagraphsToStyle(selector={"style_name": "Normal", "text_regex": r"^Body \d"},
+                                      target_style_name="Caption"),
+            ReassignParagraphsToStyle(selector={"text_contains": "missing"}, target_style_name="Title"),
+        ])
+
+        results = self.executor.execute_plan(plan, self.source, self.output)
+
+        self.assertEqual(read_paragraphs(self.output), [
+            ("Chapter 1", "Heading 1"),
+            ("Intro note", "Normal"),
+            ("Section 1.1", "Heading 3"),
+            ("Body 1.1 note", "Caption"),
+            ("Figure 1", "Caption"),
+        ])
+        self.assertEqual(results[0].message, "Reassigned 1 paragraph(s) to style 'Normal'")
+        self.assertEqual(results[3].message, "No matching paragraphs found (NOOP)")
+        self.assertEqual(results[3].warnings, ["NOOP: No paragraphs found matching selector criteria"])
+
+    def test_paragraph_without_ppr_gets_pstyle(self):
+        plan = PlanV1(ops=[ReassignParagraphsToStyle(selector={"style_name": "Normal"},
+                                                     target_style_name="Title")])
+
+        self.executor.execute_plan(plan, self.source, self.output)
+
+        with zipfile.ZipFile(self.output) as package:
+            root = ET.fromstring(package.read("word/document.xml"))
+        para = root.find(f"{W}body").findall(f"{W}p")[1]
+        self.assertEqual(para[0].tag, f"{W}pPr")
+        self.assertEqual(para[0][0].get(f"{W}val"), "Title")
+
+    def test_textbox_paragraphs_untouched(self):
+        textbox = ('<w:p><w:r><w:drawing><w:txbxContent><w:p><w:r><w:t>Boxed note</w:t></w:r></w:p>'
+                   '</w:txbxContent></w:drawing></w:r></w:p>')
+        source = write_docx(os.path.join(self.tmp_dir, "textbox.docx"), SAMPLE, textbox)
+        plan = PlanV1(ops=[ReassignParagraphsToStyle(selector={"text_contains": "Boxed"},
+                                                     target_style_name="Title")])
+
+        results = self.executor.execute_plan(plan, source, self.output)
+
+        self.assertTrue(results[0].message.endswith("(NOOP)"))
+        with zipfile.ZipFile(self.output) as package:
+            self.assertNotIn(b'"Title"', package.read("word/document.xml"))
+
+    def test_unknown_target_fails_only_when_matched(self):
+        noop = PlanV1(ops=[ReassignParagraphsToStyle(selector={"text_contains": "nothing"},
+                                                     target_style_name="Nonexistent")])
+        self.assertTrue(self.executor.execute_plan(noop, self.source, self.output)[0].message.endswith("(NOOP)"))
+
+        matching = PlanV1(ops=[ReassignParagraphsToStyle(selector={"text_contains": "Intro"},
+                                                         target_style_name="Nonexistent")])
+        with self.assertRaises(ExecutionError):
+            self.executor.execute_plan(matching, self.source, os.path.join(self.tmp_dir, "failed.docx"))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, "failed.docx")))
+
+
+class TestPackagePreservation(OoxmlTestCase):
+    """Parts and namespace declarations survive the rewrite."""
+
+    def test_other_parts_and_namespaces(self):
+        plan = PlanV1(ops=[
+            SetStyleRule(target_style_name="Normal", font=FontSpec(latin="Times New Roman")),
+            ReassignParagraphsToStyle(selector={"style_name": "Caption"}, target_style_name="Body Text"),
+        ])
+
+        self.executor.execute_plan(plan, self.source, self.output)
+
+        with zipfile.ZipFile(self.source) as before, zipfile.ZipFile(self.output) as after:
+            self.assertEqual(before.namelist(), after.namelist())
+            self.assertEqual(before.read("word/media/image1.png"), after.read("word/media/image1.png"))
+            for part in ("word/document.xml", "word/styles.xml"):
+                data = after.read(part)
+                self.assertTrue(data.startswith(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'))
+                # Unused prefixes referenced by mc:Ignorable must stay declared
+                self.assertIn(f'xmlns:w14="{W14_NS}"'.encode(), data)
+                self.assertIn(b'mc:Ignorable="w14"', data)
+            self.assertIn(b'w14:paraId="1A2B3C4D"', after.read("word/document.xml"))
+            self.assertIn(b'<w:pgSz w:w="11906" w:h="16838"/>', after.read("word/document.xml"))
+
+
+class TestFallback(OoxmlTestCase):
+    """Plans the package backend cannot run go to Word."""
+
+    def test_style_only_plan_is_supported(self):
+        plan = PlanV1(ops=[SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=12))])
+        self.assertIsNone(self.executor.fallback_reason(plan, self.source, layout_deferred=False))
+
+    def test_other_operations(self):
+        plan = PlanV1(ops=[UpdateToc()])
+        self.assertIn("update_toc", self.executor.fallback_reason(plan, self.source, True))
+
+    def test_clear_direct_formatting(self):
+        plan = PlanV1(ops=[ReassignParagraphsToStyle(selector={"style_name": "Normal"},
+                                                     target_style_name="Title", clear_direct_formatting=True)])
+        self.assertIsNotNone(self.executor.fallback_reason(plan, self.source, True))
+        plan = PlanV1(ops=[ClearDirectFormatting(scope="document")])
+        self.assertIsNotNone(self.executor.fallback_reason(plan, self.source, True))
+
+    def test_unsupported_selector(self):
+        plan = PlanV1(ops=[ReassignParagraphsToStyle(selector={"page": 2}, target_style_name="Title")])
+        self.assertIn("page", self.executor.fallback_reason(plan, self.source, True))
+
+    def test_page_fields_need_repagination(self):
+        toc = ('<w:p><w:r><w:fldChar w:fldCharType="begin"/></w:r>'
+               '<w:r><w:instrText xml:space="preserve"> TOC \\o "1-3" </w:instrText></w:r>'
+               '<w:r><w:fldChar w:fldCharType="end"/></w:r></w:p>')
+        source = write_docx(os.path.join(self.tmp_dir, "toc.docx"), SAMPLE, toc)
+        layout = PlanV1(ops=[SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=14))])
+        color = PlanV1(ops=[SetStyleRule(target_style_name="Normal", font=FontSpec(color_hex="#FF0000"))])
+
+        self.assertIn("repagination", self.executor.fallback_reason(layout, source, layout_deferred=False))
+        self.assertIsNone(self.executor.fallback_reason(layout, source, layout_deferred=True))
+        self.assertIsNone(self.executor.fallback_reason(color, source, layout_deferred=False))
+
+    def test_not_a_package(self):
+        path = os.path.join(self.tmp_dir, "broken.docx")
+        with open(path, "wb") as f:
+            f.write(b"docx")
+        plan = PlanV1(ops=[SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=12))])
+        self.assertIn("cannot read package", self.executor.fallback_reason(plan, path, True))
+
+
+class TestDocumentExecutorIntegration(ExecutorTestCase):
+    """DocumentExecutor routes style-only plans to the package backend."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.source = write_docx(os.path.join(self.tmp_dir, "input.docx"), SAMPLE)
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_style_plan_does_not_start_word(self):
+        tracker = LayoutDependencyTracker()
+        executor = DocumentExecutor(layout_tracker=tracker)
+        plan = PlanV1(ops=[SetStyleRule(target_style_name="Heading 1", font=FontSpec(size_pt=18))])
+
+        output = executor.execute_plan(plan, self.source)
+
+        self.mock_win32com.client.Dispatch.assert_not_called()
+        self.assertEqual(os.path.basename(output), "modified_document.docx")
+        self.assertTrue(tracker.layout_dirty)
+        self.assertTrue(executor.last_optimization_report.repagination_skipped)
+        self.assertTrue(executor.last_optimization_report.field_update_skipped)
+        with zipfile.ZipFile(self.source) as package:
+            self.assertNotIn(b'w:val="36"', package.read("word/styles.xml"))
+
+    def test_disabled_or_unsupported_plan_uses_word(self):
+        word_app = Mock()
+        word_app.Documents.Open.return_value = FakeDocument([("Text", "Normal", False)])
+        self.mock_win32com.client.Dispatch.return_value = word_app
+        plan = PlanV1(ops=[SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=12))])
+
+        DocumentExecutor(ooxml_styles=False).execute_plan(plan, self.source)
+        DocumentExecutor().execute_plan(PlanV1(ops=plan.ops + [UpdateToc()]), self.source)
+
+        self.assertEqual(self.mock_win32com.client.Dispatch.call_count, 2)
+
+
+def random_style_operation(rng: random.Random):
+    if rng.random() < 0.5:
+        font = FontSpec(
+            latin=rng.choice([None, "Arial", "Times New Roman"]),
+            east_asian=rng.choice([None, "黑体", "楷体"]),
+            size_pt=rng.choice([None, 10, 12, 14]),
+            bold=rng.choice([None, True, False]),
+            italic=rng.choice([None, True, False]),
+            color_hex=rng.choice([None, "#FF0000", "#1f3864"])
+        ) if rng.random() < 0.8 else None
+        paragraph = ParagraphSpec(
+            line_spacing_mode=rng.choice([None, LineSpacingMode.SINGLE, LineSpacingMode.MULTIPLE,
+                                          LineSpacingMode.EXACTLY]),
+            line_spacing_value=rng.choice([None, 1.5, 2.0]),
+            space_before_pt=rng.choice([None, 0, 6]),
+            space_after_pt=rng.choice([None, 6, 12]),
+            indent_left_pt=rng.choice([None, 0, 21]),
+            indent_first_line_pt=rng.choice([None, 0, 24, -12])
+        ) if rng.random() < 0.6 else None
+        target = rng.choice(["Normal", "正文", "Heading 1", "heading 2", "Caption", "Body Text"])
+        return SetStyleRule(target_style_name=target, font=font, paragraph=paragraph)
+    selector = rng.choice([
+        {"style_name": rng.choice(["Normal", "Body Text", "Caption", "Heading 2", "正文"])},
+        {"text_contains": rng.choice(["note", "Section", "1."])},
+        {"outline_level": rng.choice([1, 2, 10])},
+        {"text_regex": r"Body \d\.1", "style_name": "Normal"},
+    ])
+    target = rng.choice(["Normal", "Body Text", "Caption", "Heading 2", "Heading 3", "Missing Style"])
+    return ReassignParagraphsToStyle(selector=selector, target_style_name=target)
+
+
+class TestComEquivalence(ExecutorTestCase):
+    """The package backend produces what the COM executor produces."""
+
+    SEEDS = range(60)
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def run_com(self, plan, doc, source):
+        word_app = Mock()
+        word_app.Documents.Open.return_value = doc
+        self.mock_win32com.client.Dispatch.return_value = word_app
+        try:
+            DocumentExecutor(optimize_plan=False, ooxml_styles=False).execute_plan(plan, source)
+            return "ok"
+        except Exception as e:
+            return type(e).__name__
+
+    def test_random_style_plans_equivalent(self):
+        compared = 0
+        for seed in self.SEEDS:
+            rng = random.Random(seed)
+            plan = PlanV1(ops=[random_style_operation(rng) for _ in range(rng.randint(1, 8))])
+            paragraphs = []
+            for chapter in range(rng.randint(1, 3)):
+                paragraphs.append((f"Chapter {chapter}", "Heading 1"))
+                for section in range(rng.randint(0, 3)):
+                    paragraphs.append((f"Section {chapter}.{section}", "Heading 2"))
+                    for body in range(rng.randint(0, 3)):
+                        paragraphs.append((f"Body {chapter}.{section}.{body} note",
+                                           rng.choice(["Normal", "Body Text", "Caption"])))
+
+            source = write_docx(os.path.join(self.tmp_dir, f"input_{seed}.docx"), paragraphs)
+            com_doc = FakeDocument([(text, style, False) for text, style in paragraphs], toc_count=0)
+            com_outcome = self.run_com(plan, com_doc, source)
+
+            ooxml = DocumentExecutor(layout_tracker=LayoutDependencyTracker())
+            try:
+                output = ooxml.execute_plan(plan, source)
+                ooxml_outcome = "ok"
+            except Exception as e:
+                ooxml_outcome = type(e).__name__
+
+            with self.subTest(seed=seed):
+                self.assertEqual(ooxml_outcome, com_outcome)
+                if com_outcome == "ok":
+                    compared += 1
+                    self.assertEqual(read_paragraphs(output),
+                                     [(p.text, p.style_name) for p in com_doc.Paragraphs])
+                    self.assertEqual(read_style_properties(output), com_style_properties(com_doc))
+
+        self.assertGreater(compared, len(self.SEEDS) // 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
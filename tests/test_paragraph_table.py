@@ -0,0 +1,238 @@
+"""
+Test AutoWord Paragraph Table
+测试通过一次 WordOpenXML 读取段落表
+"""
+
+import zipfile
+from unittest.mock import Mock, PropertyMock
+
+import pytest
+
+from autoword.core.exceptions import DocumentError
+from autoword.core.paragraph_table import (
+    ParagraphTable, display_style_name, load_paragraph_table, BODY_TEXT_OUTLINE_LEVEL
+)
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+PKG_NS = "http://schemas.microsoft.com/office/2006/xmlPackage"
+
+STYLES = """
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>
+  <w:pPr><w:pageBreakBefore/><w:outlineLvl w:val="0"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Chapter"><w:name w:val="Chapter"/><w:basedOn w:val="Heading1"/></w:style>
+<w:style w:type="paragraph" w:styleId="TOC1"><w:name w:val="toc 1"/></w:style>
+<w:style w:type="character" w:styleId="Strong"><w:name w:val="Strong"/></w:style>
+"""
+
+BODY = """
+<w:p><w:pPr><w:pStyle w:val="Chapter"/></w:pPr><w:r><w:t>第一章</w:t></w:r></w:p>
+<w:p><w:r><w:t xml:space="preserve">A </w:t></w:r><w:r><w:tab/><w:t>B</w:t><w:br/><w:br w:type="page"/></w:r>
+  <w:r><w:fldChar w:fldCharType="begin"/></w:r><w:r><w:instrText> PAGE </w:instrText></w:r>
+  <w:r><w:fldChar w:fldCharType="separate"/></w:r><w:r><w:t>3</w:t></w:r>
+  <w:r><w:fldChar w:fldCharType="end"/></w:r>
+  <w:r><w:drawing><w:txbxContent><w:p><w:r><w:t>文本框</w:t></w:r></w:p></w:txbxContent></w:drawing></w:r></w:p>
+<w:tbl><w:tr><w:tc><w:p><w:r><w:t>a</w:t></w:r></w:p><w:p><w:r><w:t>b</w:t></w:r></w:p></w:tc>
+  <w:tc><w:p><w:r><w:t>c</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+<w:sdt><w:sdtContent><w:p><w:pPr><w:pStyle w:val="Heading1"/><w:outlineLvl w:val="9"/></w:pPr>
+  <w:r><w:t>控件</w:t></w:r></w:p></w:sdtContent></w:sdt>
+<w:p><w:pPr><w:pStyle w:val="Missing"/></w:pPr><w:r><w:t>end</w:t></w:r></w:p>
+"""
+
+
+def document_xml(body=BODY):
+    return f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+
+
+def styles_xml(styles=STYLES):
+    return f'<w:styles xmlns:w="{W_NS}">{styles}</w:styles>'
+
+
+def flat_opc(body=BODY):
+    return (f'<pkg:package xmlns:pkg="{PKG_NS}">'
+            f'<pkg:part pkg:name="/word/document.xml"><pkg:xmlData>{document_xml(body)}</pkg:xmlData></pkg:part>'
+            f'<pkg:part pkg:name="/word/styles.xml"><pkg:xmlData>{styles_xml()}</pkg:xmlData></pkg:part>'
+            f'</pkg:package>')
+
+
+def write_docx(path, body=BODY):
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr("word/document.xml", document_xml(body))
+        package.writestr("word/styles.xml", styles_xml())
+    return str(path)
+
+
+def make_document(table_source=None, paragraph_count=None, content_end=None):
+    """模拟 Word 文档：WordOpenXML 返回 Flat OPC，样式本地化名加前缀"""
+    document = Mock()
+    document.Content.WordOpenXML = table_source or flat_opc()
+    table = ParagraphTable.from_flat_opc(document.Content.WordOpenXML)
+    document.Paragraphs.Count = len(table) if paragraph_count is None else paragraph_count
+    document.Content.End = table.end if content_end is None else content_end
+    document.Styles.side_effect = lambda name: Mock(NameLocal=f"本地:{name}")
+    return document
+
+
+class TestParagraphTable:
+    """测试段落表解析"""
+
+    def test_text_and_offsets(self):
+        """测试文本与 Range.Text 一致、位置按 Word 计数"""
+        table = ParagraphTable.from_flat_opc(flat_opc())
+
+        assert [row.text for row in table] == [
+            "第一章", "A \tB\v\f3\x01", "a", "b", "c", "", "控件", "end"]
+        first, mixed = table[0], table[1]
+        assert (first.start, first.end) == (0, 4)
+        # 文本 8 个字符 + 域字符 3 个 + 域代码 6 个 + 段落标记
+        assert (mixed.start, mixed.end) == (4, 4 + 8 + 3 + 6 + 1)
+        assert mixed.range_text.endswith("\r")
+        assert table.end == table[-1].end
+
+    def test_table_cells_and_row_end(self):
+        """测试单元格标记和行结束标记"""
+        table = ParagraphTable.from_flat_opc(flat_opc())
+        a, b, c, row_end = table[2], table[3], table[4], table[5]
+
+        assert a.in_table and not a.cell_end
+        assert b.cell_end and b.range_text == "b\r\x07"
+        assert c.cell_end
+        assert row_end.row_end and row_end.range_text == "\r\x07"
+        assert row_end.start == c.end and row_end.end == c.end + 1
+
+    def test_style_inheritance(self):
+        """测试样式名、大纲级别和段前分页沿基准样式解析"""
+        table = ParagraphTable.from_flat_opc(flat_opc())
+        chapter, body, control, unknown = table[0], table[1], table[6], table[7]
+
+        assert chapter.style_name == "Chapter"
+        assert chapter.outline_level == 1
+        assert chapter.page_break_before is True
+        assert body.style_name == "Normal"
+        assert body.outline_level == BODY_TEXT_OUTLINE_LEVEL
+        assert body.page_break_before is False
+        # 段落属性中的大纲级别覆盖样式
+        assert control.style_name == "Heading 1"
+        assert control.outline_level == BODY_TEXT_OUTLINE_LEVEL
+        # 不存在的样式按默认样式处理
+        assert unknown.style_name == "Normal"
+
+    def test_display_style_name(self):
+        """测试内置样式显示名"""
+        assert display_style_name("heading 1") == "Heading 1"
+        assert display_style_name("toc 2") == "TOC 2"
+        assert display_style_name("table of figures") == "Table of Figures"
+        assert display_style_name("标题 1") == "标题 1"
+        assert display_style_name(None) is None
+
+    def test_align_with_and_without_row_ends(self):
+        """测试两种行结束标记计数方式都能对齐"""
+        table = ParagraphTable.from_flat_opc(flat_opc())
+        assert table.align(8)
+        assert len(table) == 8
+
+        assert table.align(7)
+        assert [row.index for row in table] == list(range(7))
+        assert not any(row.row_end for row in table)
+
+        assert not ParagraphTable.from_flat_opc(flat_opc()).align(5)
+
+    def test_paragraph_at(self):
+        """测试按位置查找段落与逐段比较一致"""
+        table = ParagraphTable.from_flat_opc(flat_opc())
+        assert table.paragraph_at(0) is None  # 未经校验不使用位置
+
+        table.offsets_verified = True
+        assert table.paragraph_at(0).index == 0
+        assert table.paragraph_at(4).index == 1
+        # 交界处：Start <= 位置 <= End 的第一段是前一段
+        assert table.paragraph_at(4, include_end=True).index == 0
+        assert table.paragraph_at(table.end) is None
+        assert table.paragraph_at(table.end, include_end=True).index == len(table) - 1
+
+        a = table[2]
+        assert [row.index for row in table.paragraphs_in(a.start, table[5].end)] == [2, 3, 4, 5]
+
+    def test_package_and_errors(self, tmp_path):
+        """测试从文档包读取和无效输入"""
+        table = ParagraphTable.from_package(write_docx(tmp_path / "doc.docx"))
+        assert [row.text for row in table] == [row.text for row in ParagraphTable.from_flat_opc(flat_opc())]
+
+        broken = tmp_path / "broken.docx"
+        broken.write_bytes(b"not a zip")
+        with pytest.raises(DocumentError):
+            ParagraphTable.from_package(str(broken))
+        with pytest.raises(DocumentError):
+            ParagraphTable.from_flat_opc("<not xml")
+        with pytest.raises(DocumentError):
+            ParagraphTable.from_flat_opc(f'<pkg:package xmlns:pkg="{PKG_NS}"/>')
+
+
+class TestLoadParagraphTable:
+    """测试从 Word 文档加载段落表"""
+
+    def test_load_and_localize(self):
+        """测试加载、位置校验和样式名本地化（每个样式只读一次）"""
+        document = make_document()
+        table = load_paragraph_table(document)
+
+        assert table is not None
+        assert table.offsets_verified
+        assert table[0].style_name == "本地:Chapter"
+        assert table[1].style_name == "本地:Normal"
+        assert document.Styles.call_count == 3  # Chapter、Normal、Heading 1
+
+    def test_offsets_not_verified(self):
+        """测试总长度不一致时不使用位置"""
+        table = load_paragraph_table(make_document(content_end=999))
+        assert table is not None
+        assert not table.offsets_verified
+        assert table.paragraph_at(0) is None
+
+    def test_count_mismatch_falls_back(self):
+        """测试段落数不一致时返回 None"""
+        assert load_paragraph_table(make_document(paragraph_count=3)) is None
+
+    def test_word_open_xml_unavailable(self):
+        """测试无法读取 WordOpenXML 时返回 None"""
+        document = Mock()
+        type(document.Content).WordOpenXML = PropertyMock(side_effect=AttributeError("WordOpenXML"))
+        assert load_paragraph_table(document) is None
+
+
+class TestConsumers:
+    """测试段落表与逐段 COM 读取结果一致"""
+
+    def test_extractor_equivalent_with_fewer_calls(self, tmp_path):
+        """测试提取器使用段落表时结果相同、COM 调用更少"""
+        extractor_module = pytest.importorskip("autoword.vnext.extractor.document_extractor")
+        from autoword.vnext.benchmarks.com_sim import SimulatedDocument
+
+        path = write_docx(tmp_path / "doc.docx")
+        extractor = extractor_module.DocumentExtractor()
+        results, calls = {}, {}
+        for bulk_xml in (True, False):
+            document = SimulatedDocument(path, bulk_xml=bulk_xml)
+            extractor._paragraph_table = load_paragraph_table(document)
+            paragraphs = extractor._extract_paragraphs(document)
+            positions = [row.start for row in document.table] + [row.end for row in document.table]
+            indices = [extractor._paragraph_index(document, position) for position in positions]
+            results[bulk_xml] = ([p.model_dump() for p in paragraphs], indices)
+            calls[bulk_xml] = document.counter.calls
+            extractor._paragraph_table = None
+
+        assert results[True] == results[False]
+        assert results[True][0][0]["is_heading"] and results[True][0][0]["heading_level"] == 1
+        assert calls[True] * 5 < calls[False]
+
+
+def test_bulk_read_benchmark_smoke():
+    """WordOpenXML 读取与逐段读取结果一致且调用更少"""
+    pytest.importorskip("autoword.vnext.extractor.document_extractor")
+    from autoword.vnext.benchmarks.harness import benchmark_bulk_read
+
+    report = benchmark_bulk_read(["small"], rounds=1)
+    entry = report["documents"][0]
+    assert entry["equivalent"]
+    assert entry["strategies"]["word_open_xml"]["com_calls"] < entry["strategies"]["per_paragraph"]["com_calls"]
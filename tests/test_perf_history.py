@@ -0,0 +1,170 @@
+"""
+Tests for the cross-run performance history.
+
+Covers recording runs, percentile queries per stage / size bucket / version,
+p95 regression flagging, VNextLogger integration and the history CLI command.
+"""
+
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from autoword.vnext.perf_history import (
+    PerformanceHistoryStore, percentile, size_bucket, format_percentile_table
+)
+from autoword.vnext.monitoring import VNextLogger
+from autoword.vnext import cli
+
+
+def make_report(stage_durations, success=True):
+    return {
+        "timestamp": "2024-05-01T12:00:00",
+        "stage_stats": {
+            "total_pipeline_duration_ms": sum(stage_durations.values()),
+            "stage_breakdown": {
+                name: {"duration_ms": duration, "success": success, "operations_count": 1}
+                for name, duration in stage_durations.items()
+            }
+        },
+        "memory_stats": {"peak_memory_mb": 100.0}
+    }
+
+
+def record_runs(store, count, extract_ms, execute_ms, size_mb=0.5, version="2.0.0"):
+    for i in range(count):
+        store.record_run(
+            make_report({"Extract": extract_ms + i % 3, "Execute": execute_ms + i % 5}),
+            {"pipeline_version": version, "document_size_mb": size_mb, "status": "SUCCESS"},
+            [{"operation_name": "document_extraction", "duration_ms": extract_ms, "success": True}]
+        )
+
+
+class TestHelpers:
+    """Percentile and size bucket helpers."""
+
+    def test_percentile(self):
+        assert percentile([], 95) is None
+        assert percentile([10], 95) == 10
+        assert percentile([1, 2, 3, 4, 5], 50) == 3
+        assert percentile([0, 100], 95) == pytest.approx(95)
+
+    def test_size_bucket(self):
+        assert size_bucket(None) is None
+        assert size_bucket(0.2) == "<1MB"
+        assert size_bucket(3) == "1-5MB"
+        assert size_bucket(19.9) == "5-20MB"
+        assert size_bucket(50) == "20MB+"
+
+
+class TestPerformanceHistoryStore:
+    """Recording and querying runs."""
+
+    def test_percentiles_per_stage(self, tmp_path):
+        store = PerformanceHistoryStore(str(tmp_path / "history.sqlite"))
+        record_runs(store, 10, extract_ms=100, execute_ms=500)
+
+        rows = {row["stage"]: row for row in store.stage_percentiles(percentiles=(50, 95))}
+        assert store.run_count() == 10
+        assert rows["Extract"]["count"] == 10
+        assert 100 <= rows["Extract"]["p50"] <= rows["Extract"]["p95"] <= 102
+        assert 500 <= rows["Execute"]["p95"] <= 504
+
+    def test_group_by_size_and_version(self, tmp_path):
+        store = PerformanceHistoryStore(str(tmp_path / "history.sqlite"))
+        record_runs(store, 5, extract_ms=100, execute_ms=500, size_mb=0.5, version="2.0.0")
+        record_runs(store, 5, extract_ms=900, execute_ms=500, size_mb=30, version="2.1.0")
+
+        rows = store.stage_percentiles(group_by=("stage", "size", "version"), stage_name="Extract")
+        assert [(row["size"], row["version"]) for row in rows] == [("20MB+", "2.1.0"), ("<1MB", "2.0.0")]
+        assert rows[0]["p50"] > 800
+
+        assert len(store.stage_percentiles(last_runs=5, stage_name="Extract")) == 1
+        assert "p95" in format_percentile_table(rows)
+
+    def test_failed_stages_excluded(self, tmp_path):
+        store = PerformanceHistoryStore(str(tmp_path / "history.sqlite"))
+        store.record_run(make_report({"Execute": 99999}, success=False))
+        record_runs(store, 3, extract_ms=100, execute_ms=500)
+
+        execute = [row for row in store.stage_percentiles() if row["stage"] == "Execute"][0]
+        assert execute["count"] == 3
+
+    def test_unknown_group_rejected(self, tmp_path):
+        store = PerformanceHistoryStore(str(tmp_path / "history.sqlite"))
+        with pytest.raises(ValueError):
+            store.stage_percentiles(group_by=("document",))
+
+    def test_detect_regressions(self, tmp_path):
+        store = PerformanceHistoryStore(str(tmp_path / "history.sqlite"))
+        record_runs(store, 30, extract_ms=100, execute_ms=500)
+        assert store.detect_regressions(recent_runs=10, baseline_runs=20) == []
+
+        record_runs(store, 10, extract_ms=100, execute_ms=900)
+        regressions = store.detect_regressions(recent_runs=10, baseline_runs=20)
+
+        assert [r.stage_name for r in regressions] == ["Execute"]
+        assert regressions[0].size_bucket == "<1MB"
+        assert regressions[0].ratio > 1.7
+        assert "Execute" in regressions[0].describe()
+
+    def test_regressions_need_enough_samples(self, tmp_path):
+        store = PerformanceHistoryStore(str(tmp_path / "history.sqlite"))
+        record_runs(store, 3, extract_ms=100, execute_ms=500)
+        record_runs(store, 3, extract_ms=100, execute_ms=5000)
+        assert store.detect_regressions(recent_runs=3, baseline_runs=3) == []
+
+
+class TestVNextLoggerHistory:
+    """VNextLogger appends its final report to the history."""
+
+    def test_report_recorded_with_run_context(self, tmp_path):
+        history = tmp_path / "history.sqlite"
+        vnext_logger = VNextLogger(str(tmp_path / "audit"), enable_memory_monitoring=False,
+                                   history_path=str(history))
+        vnext_logger.update_run_context(document_size_mb=2.5, paragraph_count=120, status="SUCCESS")
+        with vnext_logger.track_stage("Extract"):
+            with vnext_logger.track_operation("document_extraction"):
+                pass
+        vnext_logger.cleanup()
+
+        store = PerformanceHistoryStore(str(history))
+        rows = store.stage_percentiles(group_by=("stage", "size", "version"))
+        assert rows[0]["stage"] == "Extract"
+        assert rows[0]["size"] == "1-5MB"
+        assert rows[0]["version"] == "2.0.0"
+
+        with open(tmp_path / "audit" / "performance_report.json", encoding="utf-8") as f:
+            assert json.load(f)["regressions"] == []
+
+
+class TestHistoryCommand:
+    """The history CLI command."""
+
+    def run_cli(self, *argv):
+        with patch.object(sys, "argv", ["autoword.vnext.cli", *argv]):
+            return cli.main()
+
+    def test_percentile_output(self, tmp_path, capsys):
+        db = tmp_path / "history.sqlite"
+        record_runs(PerformanceHistoryStore(str(db)), 5, extract_ms=100, execute_ms=500)
+
+        assert self.run_cli("history", "--db", str(db), "--json") == 0
+        output = json.loads(capsys.readouterr().out)
+        assert output["runs"] == 5
+        assert {row["stage"] for row in output["percentiles"]} == {"Extract", "Execute"}
+
+    def test_regressions_exit_code(self, tmp_path, capsys):
+        db = tmp_path / "history.sqlite"
+        store = PerformanceHistoryStore(str(db))
+        record_runs(store, 20, extract_ms=100, execute_ms=500)
+        record_runs(store, 10, extract_ms=100, execute_ms=1500)
+
+        code = self.run_cli("history", "--db", str(db), "--by", "stage", "size",
+                            "--regressions", "--recent-runs", "10", "--baseline-runs", "20")
+        assert code == 2
+        assert "[REGRESSION] Execute" in capsys.readouterr().out
+
+    def test_missing_database(self, tmp_path):
+        assert self.run_cli("history", "--db", str(tmp_path / "missing.sqlite")) == 1
@@ -13,7 +13,7 @@ from autoword.core.pipeline import (
 )
 from autoword.core.models import (
     Comment, DocumentStructure, TaskPlan, Task, TaskType, 
-    ExecutionResult, TaskResult, ValidationResult
+    ExecutionResult, TaskResult, ValidationResult, Heading, Locator, LocatorType
 )
 from autoword.core.llm_client import ModelType
 from autoword.core.word_executor import ExecutionMode
@@ -327,6 +327,71 @@ class TestDocumentProcessor:
             self.processor._execute_tasks(mock_task_plan, "test.docx", mock_comments)
 
 
+class TestPipelineValidation:
+    """测试管道的事后校验"""
+    
+    def setup_method(self):
+        """测试前设置"""
+        self.processor = DocumentProcessor(PipelineConfig(export_results=False))
+    
+    def teardown_method(self):
+        """测试后清理"""
+        self.processor.close()
+    
+    def make_structure(self, level):
+        return DocumentStructure(
+            page_count=1,
+            word_count=100,
+            headings=[
+                Heading(level=level, text="引言", style="Heading 1", range_start=10, range_end=20),
+                Heading(level=level, text="方法", style="Heading 1", range_start=500, range_end=520)
+            ]
+        )
+    
+    @patch.object(DocumentProcessor, '_load_document')
+    @patch.object(DocumentProcessor, '_inspect_document')
+    @patch.object(DocumentProcessor, '_plan_tasks')
+    @patch.object(DocumentProcessor, '_execute_tasks')
+    def test_validation_uses_snapshots_and_task_ranges(self, mock_execute, mock_plan, mock_inspect,
+                                                       mock_load, tmp_path):
+        """测试验证比较执行前后快照，并按执行结果中的范围授权变更"""
+        source = tmp_path / "input.docx"
+        source.write_bytes(b"before")
+        output = tmp_path / "output.docx"
+        output.write_bytes(b"after")
+        
+        comments = [Comment(id="c1", author="审阅者", page=1, anchor_text="方法", comment_text="改为二级标题",
+                            range_start=100, range_end=120)]
+        mock_load.return_value = (Mock(), Mock())
+        mock_inspect.side_effect = [(comments, self.make_structure(1)), (comments, self.make_structure(2))]
+        
+        task = Task(id="t1", type=TaskType.SET_HEADING_LEVEL, source_comment_id="c1",
+                    locator=Locator(by=LocatorType.FIND, value="方法"), instruction="改为二级标题")
+        mock_plan.return_value = Mock(success=True, task_plan=TaskPlan(tasks=[task], total_tasks=1))
+        mock_execute.return_value = ExecutionResult(
+            success=True, total_tasks=1, completed_tasks=1, failed_tasks=0, execution_time=0.1,
+            task_results=[TaskResult(task_id="t1", success=True, message="ok", execution_time=0.1,
+                                     range_start=495, range_end=525)]
+        )
+        after_document, after_app = Mock(), Mock()
+        
+        with patch.object(self.processor.doc_loader, 'load_document',
+                          return_value=(after_app, after_document)) as mock_reload:
+            result = self.processor.process_document(str(source), str(output))
+        
+        assert result.success is True
+        assert PipelineStage.VALIDATION in result.stages_completed
+        mock_reload.assert_called_once_with(str(output), create_backup=False)
+        after_document.Close.assert_called_once()
+        after_app.Quit.assert_called_once()
+        
+        # 500-520 处的变更在执行时定位到的范围内，10-20 处的变更未授权
+        validation = result.validation_result
+        assert validation.is_valid is False
+        assert validation.details["authorized_changes"] == 1
+        assert validation.errors == ["未授权变更: heading_level_change (heading_10_20)"]
+
+
 class TestConvenienceFunction:
     """测试便捷函数"""
     
@@ -0,0 +1,560 @@
+"""
+Tests for the DocumentExecutor plan optimizer.
+
+Covers style rule merging, reassign fusion, dead operation elimination and
+field update/repagination skipping, plus randomized equivalence tests that
+run optimized and unoptimized plans against a simulated Word document.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from autoword.vnext.executor import DocumentExecutor, PlanOptimizer
+from autoword.vnext.executor.plan_optimizer import (
+    FusedReassignment, merge_style_rules, can_merge_style_rules,
+    operation_affects_layout, style_key
+)
+from autoword.vnext.models import (
+    PlanV1, DeleteSectionByHeading, UpdateToc, DeleteToc, SetStyleRule,
+    ReassignParagraphsToStyle, ClearDirectFormatting, FontSpec, ParagraphSpec,
+    LineSpacingMode, MatchMode
+)
+
+
+WD_FIELD_TOC = 13
+
+
+class FakeFont:
+    def __init__(self):
+        self.Name = "Calibri"
+        self.NameFarEast = "宋体"
+        self.Size = 11
+        self.Bold = False
+        self.Italic = False
+        self.Color = 0
+
+
+class FakeParagraphFormat:
+    def __init__(self):
+        self.LineSpacingRule = 0
+        self.LineSpacing = 12
+        self.SpaceBefore = 0
+        self.SpaceAfter = 0
+        self.LeftIndent = 0
+        self.RightIndent = 0
+        self.FirstLineIndent = 0
+
+
+class FakeStyle:
+    def __init__(self, name: str, outline_level: int = 10):
+        self.NameLocal = name
+        self.OutlineLevel = outline_level
+        self.Font = FakeFont()
+        self.ParagraphFormat = FakeParagraphFormat()
+
+    def snapshot(self):
+        return (self.NameLocal, dict(vars(self.Font)), dict(vars(self.ParagraphFormat)))
+
+
+class FakeStyles:
+    def __init__(self, styles):
+        self._styles = {style.NameLocal: style for style in styles}
+
+    def __getitem__(self, name):
+        return self._styles[name]
+
+    def __iter__(self):
+        return iter(list(self._styles.values()))
+
+    def Add(self, name, style_type):
+        level = int(name[-1]) if name.startswith("Heading ") and name[-1].isdigit() else 10
+        self._styles[name] = FakeStyle(name, level)
+        return self._styles[name]
+
+
+class FakeRange:
+    def __init__(self, doc, start, end, paragraph=None):
+        self.doc = doc
+        self.Start = start
+        self.End = end
+        self._paragraph = paragraph
+
+    @property
+    def Text(self):
+        if self._paragraph is not None:
+            return self._paragraph.text + "\r"
+        return "".join(p.text + "\r" for p in self.doc.paragraphs_in(self.Start, self.End))
+
+    def Delete(self):
+        self.doc.delete_range(self.Start, self.End)
+
+    def ClearFormatting(self):
+        for para in self.doc.paragraphs_in(self.Start, self.End):
+            para.direct_formatting = False
+
+
+class FakeParagraph:
+    def __init__(self, doc, text, style_name, direct_formatting=False):
+        self.doc = doc
+        self.text = text
+        self.style_name = style_name
+        self.direct_formatting = direct_formatting
+
+    @property
+    def Style(self):
+        return self.doc.Styles[self.style_name]
+
+    @Style.setter
+    def Style(self, name):
+        self.doc.Styles[name]  # raises KeyError like COM for unknown styles
+        self.style_name = name
+
+    @property
+    def OutlineLevel(self):
+        return self.Style.OutlineLevel
+
+    @property
+    def Range(self):
+        start = self.doc.start_of(self)
+        return FakeRange(self.doc, start, start + len(self.text) + 1, self)
+
+    def Next(self):
+        position = self.doc.paragraphs.index(self)
+        return self.doc.paragraphs[position + 1] if position + 1 < len(self.doc.paragraphs) else None
+
+
+class FakeField:
+    def __init__(self, doc):
+        self.doc = doc
+        self.Type = WD_FIELD_TOC
+
+    def Update(self):
+        pass
+
+    def Delete(self):
+        self.doc.Fields.remove(self)
+
+
+class FakeFields(list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.update_calls = 0
+
+    def Update(self):
+        self.update_calls += 1
+
+
+class FakeDocument:
+    """Minimal simulation of the Word object model used by DocumentExecutor."""
+
+    def __init__(self, paragraphs, toc_count=1):
+        names = ["Normal", "Body Text", "Caption", "Title"] + [f"Heading {i}" for i in range(1, 4)]
+        self.Styles = FakeStyles([
+            FakeStyle(name, int(name[-1]) if name.startswith("Heading") else 10) for name in names
+        ])
+        self.Paragraphs = []
+        for text, style_name, direct in paragraphs:
+            self.Paragraphs.append(FakeParagraph(self, text, style_name, direct))
+        self.Fields = FakeFields(FakeField(self) for _ in range(toc_count))
+        self.repaginate_calls = 0
+        self.Application = Mock()
+
+    @property
+    def paragraphs(self):
+        return self.Paragraphs
+
+    def start_of(self, paragraph):
+        start = 0
+        for para in self.Paragraphs:
+            if para is paragraph:
+                return start
+            start += len(para.text) + 1
+        raise ValueError("paragraph not in document")
+
+    def paragraphs_in(self, start, end):
+        result, position = [], 0
+        for para in self.Paragraphs:
+            if start <= position < end:
+                result.append(para)
+            position += len(para.text) + 1
+        return result
+
+    def delete_range(self, start, end):
+        doomed = set(map(id, self.paragraphs_in(start, end)))
+        self.Paragraphs = [p for p in self.Paragraphs if id(p) not in doomed]
+
+    def Range(self, start=None, end=None):
+        total = sum(len(p.text) + 1 for p in self.Paragraphs)
+        return FakeRange(self, 0 if start is None else start, total if end is None else end)
+
+    def Repaginate(self):
+        self.repaginate_calls += 1
+
+    def Save(self):
+        pass
+
+    def Close(self, SaveChanges=False):
+        pass
+
+    def snapshot(self):
+        return (
+            [(p.text, p.style_name, p.direct_formatting) for p in self.Paragraphs],
+            sorted(style.snapshot() for style in self.Styles),
+            len(self.Fields)
+        )
+
+
+def build_document(rng: random.Random) -> FakeDocument:
+    paragraphs = []
+    for chapter in range(rng.randint(2, 4)):
+        paragraphs.append((f"Chapter {chapter}", "Heading 1", False))
+        for section in range(rng.randint(0, 3)):
+            paragraphs.append((f"Section {chapter}.{section}", "Heading 2", rng.random() < 0.3))
+            for body in range(rng.randint(0, 3)):
+                style = rng.choice(["Normal", "Normal", "Body Text", "Caption"])
+                paragraphs.append((f"Body {chapter}.{section}.{body} note", style, rng.random() < 0.5))
+    return FakeDocument(paragraphs, toc_count=rng.randint(0, 2))
+
+
+STYLE_NAMES = ["Normal", "正文", "Heading 1", "Heading 2", "Caption", "Custom", "custom"]
+
+
+def random_operation(rng: random.Random):
+    kind = rng.choice(["style", "style", "style", "reassign", "reassign", "reassign",
+                       "delete", "delete", "update_toc", "delete_toc", "clear"])
+    if kind == "style":
+        font = FontSpec(
+            latin=rng.choice([None, "Arial", "Times New Roman"]),
+            east_asian=rng.choice([None, "", "黑体"]),
+            size_pt=rng.choice([None, 10, 12, 14]),
+            bold=rng.choice([None, True, False]),
+            color_hex=rng.choice([None, "#FF0000"])
+        ) if rng.random() < 0.8 else None
+        paragraph = ParagraphSpec(
+            line_spacing_mode=rng.choice([None, LineSpacingMode.SINGLE, LineSpacingMode.MULTIPLE]),
+            line_spacing_value=rng.choice([None, 1.5, 2.0]),
+            space_after_pt=rng.choice([None, 6, 12])
+        ) if rng.random() < 0.5 else None
+        return SetStyleRule(target_style_name=rng.choice(STYLE_NAMES), font=font, paragraph=paragraph)
+    if kind == "reassign":
+        selector = rng.choice([
+            {"style_name": rng.choice(["Normal", "Body Text", "Caption", "Heading 2"])},
+            {"text_contains": rng.choice(["note", "Section", "1."])},
+            {"outline_level": rng.choice([1, 2, 10])},
+            {"text_regex": r"Body \d\.1", "style_name": "Normal"},
+        ])
+        return ReassignParagraphsToStyle(
+            selector=selector,
+            target_style_name=rng.choice(["Normal", "Body Text", "Caption", "Heading 2", "Heading 3"]),
+            clear_direct_formatting=rng.random() < 0.5
+        )
+    if kind == "delete":
+        level = rng.choice([1, 2, 2])
+        prefix = "Chapter" if level == 1 else "Section"
+        return DeleteSectionByHeading(
+            heading_text=f"{prefix} {rng.randint(0, 3)}",
+            level=level,
+            match=MatchMode.CONTAINS,
+            occurrence_index=rng.choice([None, 1, 2])
+        )
+    if kind == "update_toc":
+        return UpdateToc()
+    if kind == "delete_toc":
+        return DeleteToc(mode=rng.choice(["all", "first", "last"]))
+    return ClearDirectFormatting(scope="document")
+
+
+class ExecutorTestCase(unittest.TestCase):
+    """Runs DocumentExecutor against FakeDocument instances."""
+
+    def setUp(self):
+        self.win32_patcher = patch('autoword.vnext.executor.document_executor.WIN32_AVAILABLE', True)
+        self.win32_patcher.start()
+        self.win32com_patcher = patch('autoword.vnext.executor.document_executor.win32com')
+        self.mock_win32com = self.win32com_patcher.start()
+        self.constants_patcher = patch('autoword.vnext.executor.document_executor.wdConstants')
+        constants = self.constants_patcher.start()
+        constants.wdFieldTOC = WD_FIELD_TOC
+        constants.wdStyleTypeParagraph = 1
+        constants.wdLineSpaceSingle = 0
+        constants.wdLineSpaceMultiple = 5
+        constants.wdLineSpaceExactly = 4
+
+    def tearDown(self):
+        self.win32_patcher.stop()
+        self.win32com_patcher.stop()
+        self.constants_patcher.stop()
+
+    def run_plan(self, plan: PlanV1, doc: FakeDocument, optimize: bool, tmp_docx: str):
+        word_app = Mock()
+        word_app.Documents.Open.return_value = doc
+        self.mock_win32com.client.Dispatch.return_value = word_app
+        executor = DocumentExecutor(optimize_plan=optimize)
+        try:
+            executor.execute_plan(plan, tmp_docx)
+            outcome = "ok"
+        except Exception as e:
+            outcome = type(e).__name__
+        return executor, outcome
+
+
+class TestPlanOptimizer(unittest.TestCase):
+    """Unit tests for the plan rewriting passes."""
+
+    def setUp(self):
+        self.optimizer = PlanOptimizer()
+
+    def test_merges_style_rules_on_same_style(self):
+        plan = PlanV1(ops=[
+            SetStyleRule(target_style_name="Normal", font=FontSpec(latin="Arial", size_pt=12)),
+            DeleteSectionByHeading(heading_text="摘要", level=1),
+            SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=14, bold=True),
+                         paragraph=ParagraphSpec(space_after_pt=6)),
+        ])
+        optimized = self.optimizer.optimize(plan)
+
+        self.assertEqual(len(optimized.steps), 2)
+        merged = optimized.steps[0]
+        self.assertEqual(merged.font.latin, "Arial")
+        self.assertEqual(merged.font.size_pt, 14)
+        self.assertTrue(merged.font.bold)
+        self.assertEqual(merged.paragraph.space_after_pt, 6)
+        self.assertEqual(optimized.report.merged_style_rules, [{"style": "Normal", "op_indexes": [0, 2]}])
+
+    def test_aliased_style_names_are_not_reordered(self):
+        plan = PlanV1(ops=[
+            SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=12)),
+            SetStyleRule(target_style_name="正文", font=FontSpec(size_pt=10)),
+            SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=14)),
+        ])
+        optimized = self.optimizer.optimize(plan)
+
+        self.assertEqual(len(optimized.steps), 3)
+        self.assertEqual(optimized.report.merged_style_rules, [])
+        self.assertEqual(style_key("Normal"), style_key("正文"))
+
+    def test_conflicting_line_spacing_modes_not_merged(self):
+        first = SetStyleRule(target_style_name="Normal", paragraph=ParagraphSpec(
+            line_spacing_mode=LineSpacingMode.MULTIPLE, line_spacing_value=1.5))
+        second = SetStyleRule(target_style_name="Normal", paragraph=ParagraphSpec(
+            line_spacing_mode=LineSpacingMode.SINGLE, line_spacing_value=1.0))
+        self.assertFalse(can_merge_style_rules(first, second))
+
+        # A value without a mode is ignored by the executor, so it must not override
+        third = SetStyleRule(target_style_name="Normal", paragraph=ParagraphSpec(line_spacing_value=3.0))
+        merged = merge_style_rules(first, third)
+        self.assertEqual(merged.paragraph.line_spacing_value, 1.5)
+
+    def test_fuses_successive_reassignments(self):
+        plan = PlanV1(ops=[
+            ReassignParagraphsToStyle(selector={"style_name": "Normal"}, target_style_name="Body Text"),
+            ReassignParagraphsToStyle(selector={"outline_level": 2}, target_style_name="Heading 2"),
+            UpdateToc(),
+            ReassignParagraphsToStyle(selector={"text_contains": "x"}, target_style_name="Caption"),
+        ])
+        optimized = self.optimizer.optimize(plan)
+
+        self.assertIsInstance(optimized.steps[0], FusedReassignment)
+        self.assertEqual(len(optimized.steps[0].operations), 2)
+        self.assertIsInstance(optimized.steps[2], ReassignParagraphsToStyle)
+        self.assertEqual(optimized.step_op_indexes, [[0, 1], [2], [3]])
+        self.assertEqual(optimized.report.fused_reassignments[0]["op_indexes"], [0, 1])
+
+    def test_eliminates_overwritten_toc_updates(self):
+        plan = PlanV1(ops=[
+            UpdateToc(),
+            SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=12)),
+            UpdateToc(),
+            DeleteToc(mode="all"),
+        ])
+        optimized = self.optimizer.optimize(plan)
+
+        self.assertEqual([step.operation_type for step in optimized.steps], ["set_style_rule", "delete_toc"])
+        self.assertEqual([e["op_index"] for e in optimized.report.eliminated_operations], [0, 2])
+
+    def test_toc_update_kept_when_content_read_in_between(self):
+        plan = PlanV1(ops=[
+            UpdateToc(),
+            ReassignParagraphsToStyle(selector={"text_contains": "1"}, target_style_name="Normal"),
+            UpdateToc(),
+            DeleteToc(mode="first"),
+        ])
+        optimized = self.optimizer.optimize(plan)
+        self.assertEqual(len(optimized.steps), 4)
+
+    def test_marks_nested_deletes(self):
+        outer = DeleteSectionByHeading(heading_text="Chapter 1", level=1)
+        plan = PlanV1(ops=[
+            DeleteSectionByHeading(heading_text="Section 1.0", level=2),
+            SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=12)),
+            outer,
+        ])
+        optimized = self.optimizer.optimize(plan)
+        self.assertEqual(optimized.superseding_deletes, {0: outer})
+
+    def test_color_only_style_rule_does_not_affect_layout(self):
+        self.assertFalse(operation_affects_layout(
+            SetStyleRule(target_style_name="Normal", font=FontSpec(color_hex="#112233"))))
+        self.assertTrue(operation_affects_layout(
+            SetStyleRule(target_style_name="Normal", font=FontSpec(size_pt=12))))
+        self.assertTrue(operation_affects_layout(UpdateToc()))
+
+    def test_passthrough_keeps_plan(self):
+        plan = PlanV1(ops=[UpdateToc(), UpdateToc()])
+        optimized = PlanOptimizer.passthrough(plan)
+        self.assertEqual(optimized.steps, list(plan.ops))
+        self.assertFalse(optimized.optimized)
+
+
+class TestOptimizedExecution(ExecutorTestCase):
+    """Executor behaviour with optimization enabled."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.tmp_docx = os.path.join(self.tmp_dir, "input.docx")
+        with open(self.tmp_docx, "wb") as f:
+            f.write(b"docx")
+
+    def sample_document(self):
+        return FakeDocument([
+            ("Chapter 1", "Heading 1", False),
+            ("Section 1.0", "Heading 2", False),
+            ("Body one", "Normal", True),
+            ("Section 1.1", "Heading 2", False),
+            ("Body two", "Normal", False),
+            ("Chapter 2", "Heading 1", False),
+            ("Body three", "Normal", True),
+        ])
+
+    def test_skips_field_update_and_repagination_for_noop_plan(self):
+        doc = self.sample_document()
+        plan = PlanV1(ops=[DeleteSectionByHeading(heading_text="Missing", level=1)])
+        executor, outcome = self.run_plan(plan, doc, True, self.tmp_docx)
+
+        self.assertEqual(outcome, "ok")
+        self.assertEqual(doc.Fields.update_calls, 0)
+        self.assertEqual(doc.repaginate_calls, 0)
+        self.assertTrue(executor.last_optimization_report.field_update_skipped)
+        self.assertTrue(executor.last_optimization_report.repagination_skipped)
+
+    def test_color_only_plan_skips_refresh(self):
+        doc = self.sample_document()
+        plan = PlanV1(ops=[SetStyleRule(target_style_name="Normal", font=FontSpec(color_hex="#FF0000"))])
+        self.run_plan(plan, doc, True, self.tmp_docx)
+
+        self.assertEqual(doc.Styles["Normal"].Font.Color, 0xFF0000)
+        self.assertEqual(doc.Fields.update_calls, 0)
+        self.assertEqual(doc.repaginate_calls, 0)
+
+    def test_unoptimized_always_refreshes(self):
+        doc = self.sample_document()
+        plan = PlanV1(ops=[DeleteSectionByHeading(heading_text="Missing", level=1)])
+        self.run_plan(plan, doc, False, self.tmp_docx)
+
+        self.assertEqual(doc.Fields.update_calls, 1)
+        self.assertEqual(doc.repaginate_calls, 1)
+
+    def test_layout_change_refreshes(self):
+        doc = self.sample_document()
+        plan = PlanV1(ops=[ReassignParagraphsToStyle(selector={"style_name": "Normal"},
+                                                     target_style_name="Body Text")])
+        self.run_plan(plan, doc, True, self.tmp_docx)
+
+        self.assertEqual(doc.Fields.update_calls, 1)
+        self.assertEqual(doc.repaginate_calls, 1)
+
+    def test_nested_delete_skipped_on_live_document(self):
+        doc = self.sample_document()
+        plan = PlanV1(ops=[
+            DeleteSectionByHeading(heading_text="Section 1.1", level=2),
+            DeleteSectionByHeading(heading_text="Chapter 1", level=1),
+        ])
+        executor, outcome = self.run_plan(plan, doc, True, self.tmp_docx)
+
+        self.assertEqual(outcome, "ok")
+        self.assertEqual([p.text for p in doc.Paragraphs], ["Chapter 2", "Body three"])
+        eliminated = executor.last_optimization_report.eliminated_operations
+        self.assertEqual(eliminated, [{
+            "op_index": 0,
+            "operation_type": "delete_section_by_heading",
+            "reason": "section removed by later delete_section_by_heading"
+        }])
+
+    def test_containment_check_is_single_sweep(self):
+        doc = self.sample_document()
+        doc.Paragraphs.extend(FakeParagraph(doc, f"Body {i}", "Normal") for i in range(50))
+        inner = DeleteSectionByHeading(heading_text="Section 1.1", level=2)
+        outer = DeleteSectionByHeading(heading_text="Chapter 1", level=1)
+        executor = DocumentExecutor()
+        visited = []
+        outline_level = FakeParagraph.OutlineLevel
+
+        with patch.object(FakeParagraph, "OutlineLevel",
+                          property(lambda p: visited.append(p.text) or outline_level.fget(p))):
+            self.assertTrue(executor._section_superseded(inner, outer, doc))
+            self.assertFalse(executor._section_superseded(
+                DeleteSectionByHeading(heading_text="Chapter 2", level=1), outer, doc))
+
+        # One pass that stops where the outer section ends
+        self.assertEqual(visited[:6], ["Chapter 1", "Section 1.0", "Body one",
+                                       "Section 1.1", "Body two", "Chapter 2"])
+        self.assertEqual(len(visited), 6 + len(doc.Paragraphs))
+
+    def test_fused_sweep_applies_operations_in_order(self):
+        doc = self.sample_document()
+        plan = PlanV1(ops=[
+            ReassignParagraphsToStyle(selector={"style_name": "Normal"}, target_style_name="Caption"),
+            ReassignParagraphsToStyle(selector={"style_name": "Caption"}, target_style_name="Body Text",
+                                      clear_direct_formatting=True),
+        ])
+        executor, outcome = self.run_plan(plan, doc, True, self.tmp_docx)
+
+        self.assertEqual(outcome, "ok")
+        self.assertEqual(executor.last_optimization_report.step_count, 1)
+        body = [(p.style_name, p.direct_formatting) for p in doc.Paragraphs if p.text.startswith("Body")]
+        self.assertEqual(body, [("Body Text", False)] * 3)
+
+
+class TestOptimizerEquivalence(ExecutorTestCase):
+    """Optimized and unoptimized execution produce the same document."""
+
+    SEEDS = range(150)
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.tmp_docx = os.path.join(self.tmp_dir, "input.docx")
+        with open(self.tmp_docx, "wb") as f:
+            f.write(b"docx")
+
+    def test_random_plans_equivalent(self):
+        optimized_steps = 0
+        original_ops = 0
+        for seed in self.SEEDS:
+            rng = random.Random(seed)
+            plan = PlanV1(ops=[random_operation(rng) for _ in range(rng.randint(1, 12))])
+
+            doc_seed = rng.random()
+            baseline_doc = build_document(random.Random(doc_seed))
+            optimized_doc = build_document(random.Random(doc_seed))
+
+            _, baseline_outcome = self.run_plan(plan, baseline_doc, False, self.tmp_docx)
+            executor, optimized_outcome = self.run_plan(plan, optimized_doc, True, self.tmp_docx)
+
+            with self.subTest(seed=seed):
+                self.assertEqual(optimized_outcome, baseline_outcome)
+                if baseline_outcome == "ok":
+                    self.assertEqual(optimized_doc.snapshot(), baseline_doc.snapshot())
+                    original_ops += len(plan.ops)
+                    optimized_steps += executor.last_optimization_report.step_count
+
+        # The generator produces plenty of fusable plans
+        self.assertLess(optimized_steps, original_ops)
+
+
+if __name__ == '__main__':
+    unittest.main()
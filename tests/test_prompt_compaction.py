@@ -0,0 +1,132 @@
+"""
+Test AutoWord vNext Prompt Compaction
+测试规划提示词的结构压缩
+"""
+
+import json
+
+import pytest
+
+from autoword.vnext.models import (
+    StructureV1, DocumentMetadata, StyleDefinition, StyleType, FontSpec,
+    ParagraphSkeleton, HeadingReference, FieldReference
+)
+from autoword.vnext.planner import (
+    DocumentPlanner, PromptCompactionConfig, compact_structure, estimate_tokens
+)
+from autoword.vnext.benchmarks.harness import StubLLMClient, build_stub_plan
+
+
+def make_structure(body_per_section=40, sections=5):
+    paragraphs, headings = [], []
+    index = 0
+    for section in range(sections):
+        text = f"第{section + 1}章 \"章节\" {section}"
+        paragraphs.append(ParagraphSkeleton(index=index, style_name="Heading 1", preview_text=text,
+                                            is_heading=True, heading_level=1))
+        headings.append(HeadingReference(paragraph_index=index, level=1, text=text, style_name="Heading 1"))
+        index += 1
+        for _ in range(body_per_section):
+            paragraphs.append(ParagraphSkeleton(index=index, style_name="Normal",
+                                                preview_text="正文段落内容" * 5))
+            index += 1
+    font = FontSpec(east_asian="宋体", size_pt=12)
+    return StructureV1(
+        metadata=DocumentMetadata(title="Doc", paragraph_count=index),
+        styles=[StyleDefinition(name="Normal", type=StyleType.PARAGRAPH, font=font),
+                StyleDefinition(name="Normal", type=StyleType.PARAGRAPH, font=font),
+                StyleDefinition(name="Body Text", type=StyleType.PARAGRAPH, font=font),
+                StyleDefinition(name="Heading 1", type=StyleType.PARAGRAPH,
+                                font=FontSpec(east_asian="黑体", size_pt=16, bold=True))],
+        paragraphs=paragraphs,
+        headings=headings,
+        fields=[FieldReference(paragraph_index=0, field_type="TOC", field_code="TOC \\o \"1-3\"")],
+    )
+
+
+class TestCompactStructure:
+    """测试压缩视图"""
+
+    def test_runs_outline_and_styles(self):
+        structure = make_structure()
+        result = compact_structure(structure, PromptCompactionConfig(token_budget=None))
+        text = result.text
+
+        # 连续的正文段落合并为一行
+        assert "p1-40 [Normal] ×40" in text
+        # 标题原文（含引号）原样保留，并附章节段落数
+        assert f'H1 {json.dumps(structure.headings[0].text, ensure_ascii=False)} [Heading 1] p0 +40' in text
+        # 重复的样式名去重，相同定义的样式合并为一行
+        assert text.count('"Normal"') == 1
+        assert '"Normal"×200, "Body Text": paragraph' in text
+        assert result.compact_tokens < result.original_tokens / 5
+        assert not result.truncated_sections
+
+    def test_budget_truncates_by_priority(self):
+        structure = make_structure(body_per_section=3, sections=200)
+        result = compact_structure(structure, PromptCompactionConfig(token_budget=800))
+
+        assert result.compact_tokens <= 800
+        assert result.included_sections[:2] == ["metadata", "outline"]
+        assert "outline" in result.truncated_sections
+        assert "paragraph_runs" in result.dropped_sections
+        assert "more omitted" in result.text
+
+    def test_disabled_returns_full_json(self):
+        structure = make_structure(sections=1)
+        result = compact_structure(structure, PromptCompactionConfig(enabled=False))
+        assert json.loads(result.text) == structure.model_dump(mode="json")
+
+    def test_accepts_dict_structure(self):
+        data = {"metadata": {"title": "T"}, "paragraphs": [
+            {"index": 0, "style_name": "正文", "preview_text": "a"},
+            {"index": 1, "style_name": "正文", "preview_text": "b"},
+        ], "headings": [], "styles": [{"name": "正文", "type": "paragraph"}]}
+        text = compact_structure(data).text
+        assert "p0-1 [正文] ×2" in text
+        assert '"正文"×2: paragraph' in text
+
+    def test_unknown_section(self):
+        with pytest.raises(ValueError):
+            compact_structure(make_structure(sections=1), PromptCompactionConfig(section_priority=("bogus",)))
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("abcd" * 10) == 10
+        assert estimate_tokens("中文") == 2
+
+
+class TestPlannerPrompt:
+    """测试规划器使用压缩提示词"""
+
+    def test_plan_unchanged_with_compaction(self):
+        structure = make_structure()
+        plan_json = build_stub_plan(structure).model_dump_json()
+
+        planner = DocumentPlanner(llm_client=StubLLMClient(plan_json))
+        plan = planner.generate_plan(structure, "删除最后一章")
+        prompt = planner._build_user_prompt(structure, "删除最后一章")
+
+        assert plan.model_dump() == build_stub_plan(structure).model_dump()
+        assert json.dumps(plan.ops[0].heading_text, ensure_ascii=False) in prompt
+        assert planner.last_prompt_stats["compact_tokens"] < planner.last_prompt_stats["original_tokens"]
+
+    def test_custom_llm_client_prompt(self):
+        from autoword.vnext.core import CustomLLMClient, LLMConfig
+
+        structure_json = json.dumps(make_structure().model_dump(mode="json"), ensure_ascii=False)
+        compact = CustomLLMClient(LLMConfig())._build_prompt(structure_json, "删除摘要")
+        full = CustomLLMClient(LLMConfig(compact_prompt=False))._build_prompt(structure_json, "删除摘要")
+
+        assert "p1-40 [Normal] ×40" in compact
+        assert structure_json in full
+        assert len(compact) < len(full)
+
+
+def test_corpus_prompt_measurements():
+    """合成语料上压缩后的提示词保留计划引用的标题和样式"""
+    from autoword.vnext.benchmarks.harness import benchmark_prompt_compaction
+
+    report = benchmark_prompt_compaction(["tiny", "small"], rounds=1)
+    for entry in report["documents"]:
+        assert entry["plan_equivalent"], entry["missing_references"]
+        assert entry["reduction"] > 0.5
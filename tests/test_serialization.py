@@ -0,0 +1,218 @@
+"""
+Tests for pluggable artifact serialization.
+
+Covers the pretty JSON, streaming JSON and binary serializers, the lazy
+format-sniffing readers, DocumentAuditor integration and a write-time /
+disk-usage comparison on a large structure.
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from autoword.vnext import serialization
+from autoword.vnext.serialization import (
+    PrettyJsonSerializer, StreamingJsonSerializer, BinaryArtifactSerializer,
+    BinaryArtifactReader, JsonArtifactReader, get_serializer, open_artifact, load_artifact
+)
+from autoword.vnext.compact import CompactStructureV1
+from autoword.vnext.auditor.document_auditor import DocumentAuditor
+from autoword.vnext.exceptions import AuditError
+from autoword.vnext.models import (
+    StructureV1, PlanV1, InventoryFullV1, DocumentMetadata, StyleDefinition,
+    FontSpec, ParagraphSpec, ParagraphSkeleton, HeadingReference, FieldReference,
+    TableSkeleton, MediaReference, FootnoteReference, DeleteSectionByHeading,
+    SetStyleRule, UpdateToc, StyleType, LineSpacingMode
+)
+
+
+def build_structure(paragraph_count: int = 50) -> StructureV1:
+    paragraphs = [
+        ParagraphSkeleton(
+            index=i,
+            style_name="Heading 1" if i % 10 == 0 else "Normal",
+            preview_text=f"标题 {i}" if i % 10 == 0 else f"Body \"quoted\" text {i} — ünïcode",
+            is_heading=i % 10 == 0,
+            heading_level=1 if i % 10 == 0 else None
+        )
+        for i in range(paragraph_count)
+    ]
+    return StructureV1(
+        metadata=DocumentMetadata(title="Doc", author="A", creation_time=datetime(2024, 5, 1, 12, 30),
+                                  page_count=3),
+        styles=[
+            StyleDefinition(name="Normal", type=StyleType.PARAGRAPH,
+                            font=FontSpec(east_asian="宋体", size_pt=12),
+                            paragraph=ParagraphSpec(line_spacing_mode=LineSpacingMode.MULTIPLE,
+                                                    line_spacing_value=1.5)),
+            StyleDefinition(name="Heading 1", type=StyleType.PARAGRAPH, font=FontSpec(bold=True, size_pt=16)),
+        ],
+        paragraphs=paragraphs,
+        headings=[HeadingReference(paragraph_index=p.index, level=1, text=p.preview_text)
+                  for p in paragraphs if p.is_heading],
+        fields=[FieldReference(paragraph_index=1, field_type="TOC", field_code="TOC \\o", result_text="1")],
+        tables=[TableSkeleton(paragraph_index=2, rows=3, columns=2, cell_references=[3, 4, 5, 6, 7, 8],
+                              cell_paragraph_map={"0,0": [3], "0,1": [4]})]
+    )
+
+
+def build_inventory() -> InventoryFullV1:
+    return InventoryFullV1(
+        ooxml_fragments={"sect_0": "<w:sectPr/>"},
+        media_indexes={"rId5": MediaReference(media_id="rId5", content_type="image/png", size_bytes=1024)},
+        footnotes=[FootnoteReference(paragraph_index=3, footnote_id="1", reference_mark="1", text_preview="note")]
+    )
+
+
+def build_plan() -> PlanV1:
+    return PlanV1(ops=[
+        DeleteSectionByHeading(heading_text="摘要", level=1),
+        SetStyleRule(target_style_name="Normal", font=FontSpec(east_asian="宋体", size_pt=12)),
+        UpdateToc()
+    ])
+
+
+ALL_SERIALIZERS = [PrettyJsonSerializer, StreamingJsonSerializer, BinaryArtifactSerializer]
+
+
+class TestSerializers:
+    """Round-trip tests for every serializer."""
+
+    @pytest.mark.parametrize("serializer_class", ALL_SERIALIZERS)
+    @pytest.mark.parametrize("factory", [build_structure, build_inventory, build_plan])
+    def test_round_trip(self, tmp_path, serializer_class, factory):
+        artifact = factory()
+        serializer = serializer_class()
+        path = serializer.dump(artifact, tmp_path / f"artifact{serializer.extension}")
+
+        reader = open_artifact(path)
+        assert reader.schema_version == artifact.schema_version
+        assert load_artifact(path) == artifact
+
+    @pytest.mark.parametrize("serializer_class", [StreamingJsonSerializer, BinaryArtifactSerializer])
+    def test_same_content_as_pretty_json(self, tmp_path, serializer_class):
+        structure = build_structure()
+        pretty = PrettyJsonSerializer().dump(structure, tmp_path / "pretty.json")
+        other = serializer_class().dump(structure, tmp_path / f"other{serializer_class.extension}")
+
+        with open(pretty, encoding='utf-8') as f:
+            expected = json.load(f)
+        assert open_artifact(other).load() == expected
+
+    def test_streaming_json_is_valid_json(self, tmp_path):
+        path = StreamingJsonSerializer().dump(build_structure(), tmp_path / "s.json")
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        assert data['schema_version'] == "structure.v1"
+        assert len(data['paragraphs']) == 50
+
+    @pytest.mark.parametrize("serializer_class", ALL_SERIALIZERS)
+    def test_compact_structure_serializes_identically(self, tmp_path, serializer_class):
+        structure = build_structure()
+        compact = CompactStructureV1.from_structure(structure)
+        serializer = serializer_class()
+
+        model_path = serializer.dump(structure, tmp_path / f"model{serializer.extension}")
+        compact_path = serializer.dump(compact, tmp_path / f"compact{serializer.extension}")
+
+        assert open_artifact(compact_path).load() == open_artifact(model_path).load()
+
+    def test_get_serializer(self):
+        assert isinstance(get_serializer(), PrettyJsonSerializer)
+        assert isinstance(get_serializer("binary"), BinaryArtifactSerializer)
+        instance = StreamingJsonSerializer()
+        assert get_serializer(instance) is instance
+        with pytest.raises(ValueError):
+            get_serializer("yaml")
+
+
+class TestLazyReaders:
+    """Tests for lazy item streaming."""
+
+    @pytest.mark.parametrize("serializer_class", ALL_SERIALIZERS)
+    def test_iter_items_streams_paragraphs(self, tmp_path, monkeypatch, serializer_class):
+        # Tiny chunks force items to straddle read boundaries
+        monkeypatch.setattr(serialization, "_READ_CHUNK_SIZE", 7)
+        structure = build_structure(120)
+        serializer = serializer_class()
+        path = serializer.dump(structure, tmp_path / f"s{serializer.extension}")
+
+        items = list(open_artifact(path).iter_items("paragraphs"))
+        assert items == [p.model_dump() for p in structure.paragraphs]
+        assert list(open_artifact(path).iter_items("fields")) == [f.model_dump() for f in structure.fields]
+        assert list(open_artifact(path).iter_items("missing")) == []
+
+    def test_format_detection(self, tmp_path):
+        structure = build_structure(5)
+        json_path = PrettyJsonSerializer().dump(structure, tmp_path / "a.json")
+        binary_path = BinaryArtifactSerializer().dump(structure, tmp_path / "a.msgpack")
+
+        assert isinstance(open_artifact(json_path), JsonArtifactReader)
+        assert isinstance(open_artifact(binary_path), BinaryArtifactReader)
+
+    def test_truncated_binary_raises_audit_error(self, tmp_path):
+        path = BinaryArtifactSerializer().dump(build_structure(20), tmp_path / "a.msgpack")
+        data = path.read_bytes()
+        path.write_bytes(data[:len(data) // 2])
+
+        with pytest.raises(AuditError):
+            open_artifact(path).load()
+
+    def test_unsupported_binary_version(self, tmp_path):
+        path = BinaryArtifactSerializer().dump(build_plan(), tmp_path / "a.msgpack")
+        data = bytearray(path.read_bytes())
+        data[3] = 99
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(AuditError):
+            open_artifact(path).load()
+
+
+class TestAuditorIntegration:
+    """DocumentAuditor writes artifacts through the configured serializer."""
+
+    def test_default_format_unchanged(self, tmp_path):
+        auditor = DocumentAuditor(base_audit_dir=str(tmp_path))
+        audit_dir = Path(auditor.create_audit_directory())
+        auditor.save_snapshots("missing.docx", "missing.docx", build_structure(), build_structure(), build_plan())
+
+        assert (audit_dir / "structures" / "structure.before.v1.json").exists()
+        assert (audit_dir / "plan.v1.json").exists()
+
+    def test_binary_format(self, tmp_path):
+        auditor = DocumentAuditor(base_audit_dir=str(tmp_path), artifact_format="binary")
+        audit_dir = Path(auditor.create_audit_directory())
+        structure = build_structure()
+        auditor.save_snapshots("missing.docx", "missing.docx", structure, structure, build_plan())
+        auditor.save_inventory(build_inventory())
+
+        assert load_artifact(audit_dir / "structures" / "structure.after.v1.msgpack") == structure
+        assert load_artifact(audit_dir / "plan.v1.msgpack") == build_plan()
+        assert load_artifact(audit_dir / "inventory.full.v1.msgpack") == build_inventory()
+
+    def test_save_inventory_requires_directory(self, tmp_path):
+        auditor = DocumentAuditor(base_audit_dir=str(tmp_path))
+        with pytest.raises(AuditError):
+            auditor.save_inventory(build_inventory())
+
+
+class TestSerializationBenchmark:
+    """Write time and disk usage for a large structure."""
+
+    def test_large_structure(self, tmp_path):
+        structure = build_structure(20000)
+        results = {}
+        for serializer_class in ALL_SERIALIZERS:
+            serializer = serializer_class()
+            start = time.perf_counter()
+            path = serializer.dump(structure, tmp_path / f"{serializer.name}{serializer.extension}")
+            results[serializer.name] = (time.perf_counter() - start, path.stat().st_size)
+
+        print("\nArtifact serialization (20000 paragraphs):")
+        for name, (seconds, size) in results.items():
+            print(f"  {name:12s} {seconds:.3f}s {size / 1e6:.2f}MB")
+
+        assert results["binary"][1] < results["json-stream"][1] < results["json"][1]
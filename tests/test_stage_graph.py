@@ -0,0 +1,144 @@
+"""
+Test AutoWord vNext Stage Graph
+测试阶段依赖图调度和流水线的提取/规划重叠
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from autoword.vnext.stage_graph import StageGraph
+
+
+class TestStageGraph:
+    """测试阶段依赖图"""
+
+    def test_emit_starts_dependent_worker_early(self):
+        events = []
+
+        def extract(values, emit):
+            emit("structure", "S")
+            time.sleep(0.1)  # 清单提取期间规划已经开始
+            events.append("inventory_done")
+            return "S", "I"
+
+        def plan(values, emit):
+            events.append(("plan_started", values["structure"]))
+            return "P"
+
+        graph = StageGraph()
+        graph.add_stage("Extract", extract, provides=("structure", "inventory"))
+        graph.add_stage("Plan", plan, requires=("structure",), provides=("plan",), affinity="worker")
+        graph.add_stage("Execute", lambda values, emit: values["plan"] + values["inventory"],
+                        requires=("plan", "inventory"), provides=("result",))
+        values = graph.run()
+
+        assert values["result"] == "PI"
+        assert events == [("plan_started", "S"), "inventory_done"]
+        assert graph.overlap_ms("Extract", "Plan") > 0
+        assert graph.timings["Execute"].start_ms >= graph.timings["Extract"].end_ms
+        assert graph.overlaps()[0]["stages"] == ["Extract", "Plan"]
+
+    def test_main_stages_stay_on_calling_thread(self):
+        threads = {}
+
+        def record(name):
+            def func(values, emit):
+                threads[name] = threading.current_thread()
+                return name
+            return func
+
+        graph = StageGraph()
+        graph.add_stage("com", record("com"), provides=("a",))
+        graph.add_stage("llm", record("llm"), requires=("a",), provides=("b",), affinity="worker")
+        graph.add_stage("com2", record("com2"), requires=("b",))
+        graph.run()
+
+        assert threads["com"] is threading.current_thread()
+        assert threads["com2"] is threading.current_thread()
+        assert threads["llm"] is not threading.current_thread()
+
+    def test_sequential_mode_runs_inline(self):
+        graph = StageGraph(max_workers=0)
+        graph.add_stage("a", lambda values, emit: 1, provides=("x",))
+        graph.add_stage("b", lambda values, emit: threading.current_thread(),
+                        requires=("x",), provides=("thread",), affinity="worker")
+        assert graph.run()["thread"] is threading.current_thread()
+
+    def test_worker_error_skips_pending_stages(self):
+        executed = []
+
+        def fail(values, emit):
+            raise ValueError("plan failed")
+
+        graph = StageGraph()
+        graph.add_stage("Extract", lambda values, emit: (emit("s", 1), time.sleep(0.05), (1, 2))[-1], provides=("s", "i"))
+        graph.add_stage("Plan", fail, requires=("s",), provides=("p",), affinity="worker")
+        graph.add_stage("Execute", lambda values, emit: executed.append(True), requires=("p", "i"))
+
+        with pytest.raises(ValueError, match="plan failed"):
+            graph.run()
+        assert not executed
+        assert graph.timings["Plan"].status == "failed"
+        assert graph.timings["Extract"].status == "completed"
+
+    def test_missing_provider_rejected(self):
+        graph = StageGraph()
+        graph.add_stage("b", lambda values, emit: None, requires=("nothing",))
+        with pytest.raises(RuntimeError, match="requires values nobody provides"):
+            graph.run()
+
+    def test_unemitted_value_stalls(self):
+        graph = StageGraph()
+        graph.add_stage("a", lambda values, emit: None, provides=())
+        graph.add_stage("b", lambda values, emit: 1, provides=("x",))
+        graph.add_stage("c", lambda values, emit: None, requires=("y",))
+        graph.add_stage("d", lambda values, emit: None, provides=("y",), requires=("z",))
+        with pytest.raises(RuntimeError):
+            graph.run()
+
+
+class TestPipelineOverlap:
+    """测试流水线在清单提取期间开始规划"""
+
+    def test_plan_overlaps_inventory_extraction(self, tmp_path):
+        from autoword.vnext.benchmarks.corpus import SIZE_TIERS, generate_docx
+        from autoword.vnext.benchmarks.harness import build_stub_plan
+        from autoword.vnext.ooxml_reader import read_structure, read_inventory
+        from autoword.vnext.pipeline import VNextPipeline
+
+        document = generate_docx(SIZE_TIERS["tiny"], tmp_path / "doc.docx")
+        structure = read_structure(str(document.path))
+        inventory = read_inventory(str(document.path))
+
+        def extract(on_structure=None):
+            on_structure(structure)
+            time.sleep(0.2)  # 模拟耗时的清单提取
+            return structure, inventory
+
+        def generate_plan(structure, user_intent):
+            time.sleep(0.1)
+            return build_stub_plan(structure)
+
+        pipeline = VNextPipeline(base_audit_dir=str(tmp_path / "audit"), enable_memory_monitoring=False)
+        validation = Mock(is_valid=True, modified_structure=structure, errors=[], warnings=[])
+        with patch.object(pipeline, "_extract_document", side_effect=extract), \
+                patch.object(pipeline, "_generate_plan", side_effect=generate_plan), \
+                patch.object(pipeline, "_execute_plan", side_effect=lambda plan: str(document.path)), \
+                patch.object(pipeline, "_validate_modifications", return_value=validation):
+            start = time.perf_counter()
+            result = pipeline.process_document(str(document.path), "删除最后一章")
+            elapsed = time.perf_counter() - start
+
+        assert result.status == "SUCCESS", result.errors
+        stages = {stage["name"]: stage for stage in pipeline.last_stage_timeline["stages"]}
+        assert stages["Plan"]["start_ms"] < stages["Extract"]["end_ms"]
+        assert stages["Execute"]["start_ms"] >= stages["Extract"]["end_ms"]
+        assert any(set(overlap["stages"]) == {"Extract", "Plan"} for overlap in pipeline.last_stage_timeline["overlaps"])
+        assert stages["Snapshot"]["status"] == "completed"
+        assert elapsed < 0.3 + 1.0  # 规划耗时隐藏在清单提取中
+
+        audit_dir = tmp_path / "audit"
+        assert list(audit_dir.glob("run_*/snapshots/before.docx"))
@@ -0,0 +1,94 @@
+"""
+Test AutoWord vNext TOC Alignment
+测试目录条目与标题树的序列对齐
+"""
+
+import time
+
+from autoword.vnext.validator.toc_alignment import (
+    align_toc, normalize_toc_text, text_similarity
+)
+
+
+HEADINGS = [("Introduction", 1), ("Background", 2), ("Methodology", 1), ("Results", 2), ("Conclusion", 1)]
+
+
+class TestNormalization:
+    """测试文本规范化和相似度"""
+
+    def test_normalize_strips_leaders_and_page_numbers(self):
+        assert normalize_toc_text("Ｃｈａｐｔｅｒ  One ........ 12") == "chapter one"
+        assert normalize_toc_text("Results\t4") == "results"
+        # 标题末尾的编号不是页码
+        assert normalize_toc_text("Section 3") == "section 3"
+
+    def test_similarity(self):
+        assert text_similarity("intro", "introduction") == 1.0
+        assert text_similarity("introduction", "introductoin") == 1.0
+        assert text_similarity("introduction", "conclusion") < 0.8
+        assert text_similarity("", "a") == 0.0
+
+
+class TestAlignToc:
+    """测试目录对齐"""
+
+    def test_identical_toc_is_consistent(self):
+        alignment = align_toc(list(HEADINGS), HEADINGS)
+        assert alignment.is_consistent
+        assert len(alignment.matches) == 5
+
+    def test_missing_entry_does_not_cascade(self):
+        toc = [entry for entry in HEADINGS if entry[0] != "Background"]
+        alignment = align_toc(toc, HEADINGS)
+
+        assert alignment.missing == [1]
+        assert not alignment.extra and not alignment.reordered
+        errors = alignment.errors()
+        assert len(errors) == 1
+        assert "'Background'" in errors[0] and "missing" in errors[0]
+
+    def test_extra_reordered_and_level(self):
+        toc = [("Introduction", 1), ("Methodology", 1), ("Background", 3), ("Results", 2),
+               ("Appendix", 1), ("Conclusion", 1)]
+        alignment = align_toc(toc, HEADINGS)
+
+        assert [HEADINGS[match.heading_index][0] for match in alignment.reordered] == ["Background"]
+        assert [toc[index][0] for index in alignment.extra] == ["Appendix"]
+        assert not alignment.missing
+        assert [toc[match.toc_index][0] for match in alignment.level_mismatches] == ["Background"]
+
+    def test_truncated_entries_match(self):
+        toc = [("Intro", 1), ("Backgrnd", 2), ("Methodology", 1), ("Results", 2), ("Conclusion", 1)]
+        alignment = align_toc(toc, HEADINGS)
+        assert alignment.is_consistent
+
+    def test_large_toc(self):
+        headings = [(f"第{i}章 标题 {i}", 1 + i % 3) for i in range(600)]
+        toc = list(headings)
+        del toc[10]
+        toc.insert(200, ("额外条目", 1))
+
+        start = time.perf_counter()
+        alignment = align_toc(toc, headings)
+        assert time.perf_counter() - start < 1.0
+
+        assert alignment.missing == [10]
+        assert [toc[index][0] for index in alignment.extra] == ["额外条目"]
+        assert len(alignment.matches) == 599
+
+
+def test_validator_reports_single_missing_entry():
+    """验证器对缺失的目录条目只报告一次"""
+    from autoword.vnext.models import StructureV1, DocumentMetadata, HeadingReference, FieldReference
+    from autoword.vnext.validator.document_validator import DocumentValidator
+
+    structure = StructureV1(
+        metadata=DocumentMetadata(title="Doc"),
+        headings=[HeadingReference(paragraph_index=i, level=level, text=text)
+                  for i, (text, level) in enumerate(HEADINGS)],
+        fields=[FieldReference(paragraph_index=0, field_type="TOC", field_code="TOC \\o \"1-3\"",
+                               result_text="Introduction\t1\nMethodology\t3\n  Results\t4\nConclusion\t5")],
+    )
+    errors = DocumentValidator().check_toc_assertions(structure)
+    assert len(errors) == 1
+    assert "Background" in errors[0]
@@ -143,7 +143,7 @@ class TestVNextPipeline:
         assert self.pipeline.auditor == mock_auditor_instance
         assert self.pipeline.error_handler == mock_error_handler_instance
         
-        mock_auditor.assert_called_once_with(self.audit_dir)
+        mock_auditor.assert_called_once_with(self.audit_dir, artifact_format="json")
         mock_auditor_instance.create_audit_directory.assert_called_once()
         mock_error_handler.assert_called_once_with("/audit/run_123")
         mock_copy.assert_called_once()
@@ -181,7 +181,7 @@ class TestVNextPipeline:
         assert structure == mock_structure
         assert inventory == mock_inventory
         
-        mock_extractor_class.assert_called_once_with(visible=False)
+        mock_extractor_class.assert_called_once_with(visible=False, watchdog=self.pipeline.watchdog)
         mock_extractor.extract_structure.assert_called_once_with(self.test_docx)
         mock_extractor.extract_inventory.assert_called_once_with(self.test_docx)
     
@@ -276,7 +276,9 @@ class TestVNextPipeline:
         assert result_path == "/path/to/modified.docx"
         
         expected_warnings_path = os.path.join("/audit/run_123", "warnings.log")
-        mock_executor_class.assert_called_once_with(warnings_log_path=expected_warnings_path)
+        mock_executor_class.assert_called_once_with(warnings_log_path=expected_warnings_path,
+                                                    layout_tracker=self.pipeline.layout_tracker,
+                                                    watchdog=self.pipeline.watchdog)
         mock_executor.execute_plan.assert_called_once_with(mock_plan, self.test_docx)
     
     @patch('autoword.vnext.pipeline.DocumentValidator')
@@ -302,7 +304,8 @@ class TestVNextPipeline:
         # Verify
         assert result == mock_validation_result
         
-        mock_validator_class.assert_called_once_with(visible=False)
+        mock_validator_class.assert_called_once_with(visible=False, layout_tracker=None,
+                                                     watchdog=self.pipeline.watchdog)
         mock_validator.validate_modifications.assert_called_once_with(
             mock_structure, modified_docx_path
         )
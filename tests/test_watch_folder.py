@@ -0,0 +1,361 @@
+"""
+Tests for watch-folder ingestion.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+from autoword.vnext import cli
+from autoword.vnext.batch_manifest import MANIFEST_FILE
+from autoword.vnext.checkpoint import file_sha256
+from autoword.vnext.models import ProcessingResult
+from autoword.vnext.monitoring import VNextLogger
+from autoword.vnext.watch_folder import FolderWatcher, WatchFolder, is_complete_docx, load_watch_config
+
+
+def write_docx(path, text="content"):
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr("[Content_Types].xml", "<Types/>")
+        package.writestr("word/document.xml", f"<w:document>{text}</w:document>")
+    return path
+
+
+class FakePipeline:
+    """Pipeline writing the output a successful VNextPipeline run leaves."""
+
+    def __init__(self, audit_root, folder, calls, status="SUCCESS"):
+        self.audit_root = audit_root
+        self.folder = folder
+        self.calls = calls
+        self.status = status
+
+    def process_document(self, docx_path, user_intent):
+        self.calls.append((os.path.basename(docx_path), user_intent, self.folder.model))
+        run_dir = os.path.join(self.audit_root, f"run_{len(self.calls)}")
+        os.makedirs(os.path.join(run_dir, "snapshots"))
+        with open(docx_path, "rb") as source, open(os.path.join(run_dir, "snapshots", "after.docx"), "wb") as f:
+            f.write(b"processed " + source.read())
+        errors = [] if self.status == "SUCCESS" else ["Validation failed"]
+        return ProcessingResult(status=self.status, errors=errors, audit_directory=run_dir)
+
+
+class LoggingPipeline(FakePipeline):
+    """FakePipeline logging its run like VNextPipeline, overlapping with other workers."""
+
+    def __init__(self, *args, overlap, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.overlap = overlap
+
+    def process_document(self, docx_path, user_intent):
+        name = os.path.basename(docx_path)
+        run_dir = os.path.join(self.audit_root, f"log_{name}")
+        run_logger = VNextLogger(run_dir, enable_memory_monitoring=False)
+        try:
+            run_logger.log_stage_start(f"Extract {name}")
+            self.overlap.wait(timeout=5)  # both runs are logging now
+            run_logger.log_stage_complete(f"Extract {name}", 1.0)
+        finally:
+            run_logger.cleanup()
+        return super().process_document(docx_path, user_intent)
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    directory = tmp_path / "inbox"
+    directory.mkdir()
+    return directory
+
+
+def make_watcher(tmp_path, folders, status="SUCCESS", **kwargs):
+    calls = []
+    audit_root = tmp_path / "audit"
+    audit_root.mkdir(exist_ok=True)
+    watcher = FolderWatcher(
+        folders, lambda folder: FakePipeline(str(audit_root), folder, calls, status=status),
+        manifest_path=tmp_path / "audit" / MANIFEST_FILE, settle_seconds=2.0, use_fs_events=False, **kwargs)
+    watcher.start()
+    return watcher, calls
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def settle(watcher, start=0.0):
+    """Scan twice, settle_seconds apart, and wait for the workers."""
+    watcher.scan(now=start)
+    dispatched = watcher.scan(now=start + 10)
+    assert wait_for(lambda: not watcher._in_flight)
+    return dispatched
+
+
+class TestDebounce:
+    """Test that only fully written documents are processed."""
+
+    def test_waits_until_file_is_unchanged(self, tmp_path, inbox):
+        """Test that a growing file is not dispatched before it settles."""
+        watcher, calls = make_watcher(tmp_path, [WatchFolder(str(inbox), "Format")])
+        try:
+            document = write_docx(inbox / "a.docx")
+            assert watcher.scan(now=0) == []
+            write_docx(document, "content written later")
+            assert watcher.scan(now=5) == []      # changed since the last scan
+            assert watcher.scan(now=6) == []      # unchanged for 1s only
+            assert watcher.scan(now=7.5) == [str(document)]
+            assert wait_for(lambda: watcher.idle())
+        finally:
+            watcher.stop()
+        assert calls == [("a.docx", "Format", None)]
+
+    def test_ignores_lock_files_and_incomplete_packages(self, tmp_path, inbox):
+        """Test that Word lock files are ignored and truncated packages fail."""
+        watcher, calls = make_watcher(tmp_path, [WatchFolder(str(inbox), "Format")])
+        try:
+            (inbox / "~$a.docx").write_bytes(b"owner")
+            (inbox / "broken.docx").write_bytes(b"PK\x03\x04 truncated")
+            settle(watcher)
+        finally:
+            watcher.stop()
+
+        assert calls == []
+        assert (inbox / "~$a.docx").exists()
+        failed = tmp_path / "inbox_failed"
+        assert (failed / "broken.docx").exists()
+        assert "not a valid DOCX" in json.loads((failed / "broken.docx.error.json").read_text(encoding="utf-8"))["errors"][0]
+        assert not is_complete_docx(str(failed / "broken.docx"))
+
+
+class TestProcessing:
+    """Test processing, deduplication and routing of results."""
+
+    def test_success_moves_output_and_input(self, tmp_path, inbox):
+        """Test that outputs and processed inputs go to the done folder."""
+        watcher, calls = make_watcher(tmp_path, [WatchFolder(str(inbox), "Format")])
+        try:
+            write_docx(inbox / "a.docx")
+            settle(watcher)
+        finally:
+            watcher.stop()
+
+        done = tmp_path / "inbox_done"
+        assert list(inbox.iterdir()) == []
+        assert (done / "a.docx").read_bytes().startswith(b"processed ")
+        assert (done / "originals" / "a.docx").exists()
+        assert (watcher.stats.processed, watcher.stats.failed) == (1, 0)
+
+    def test_duplicates_reuse_output(self, tmp_path, inbox):
+        """Test that identical content is processed once, also when dropped again later."""
+        watcher, calls = make_watcher(tmp_path, [WatchFolder(str(inbox), "Format")], workers=2)
+        try:
+            write_docx(inbox / "a.docx")
+            write_docx(inbox / "a_copy.docx")
+            settle(watcher)
+            # The copy waited for the original and now reuses its output
+            settle(watcher, start=20)
+            assert watcher.idle()
+        finally:
+            watcher.stop()
+        assert len(calls) == 1
+
+        # A new watcher finds the content in the manifest
+        write_docx(inbox / "a.docx")
+        watcher, calls = make_watcher(tmp_path, [WatchFolder(str(inbox), "Format")])
+        try:
+            settle(watcher)
+        finally:
+            watcher.stop()
+        assert calls == []
+        assert watcher.stats.reused == 1
+
+        done = tmp_path / "inbox_done"
+        assert sorted(os.listdir(done)) == ["a.docx", "a_1.docx", "a_copy.docx", "originals"]
+        assert (done / "a_copy.docx").read_bytes() == (done / "a.docx").read_bytes()
+
+    def test_failed_run_moves_input_to_failed(self, tmp_path, inbox):
+        """Test that failed runs leave the input and an error report in the failed folder."""
+        watcher, _ = make_watcher(tmp_path, [WatchFolder(str(inbox), "Format")], status="FAILED_VALIDATION")
+        try:
+            write_docx(inbox / "a.docx")
+            settle(watcher)
+        finally:
+            watcher.stop()
+
+        failed = tmp_path / "inbox_failed"
+        report = json.loads((failed / "a.docx.error.json").read_text(encoding="utf-8"))
+        assert report["status"] == "FAILED_VALIDATION"
+        assert report["audit_directory"].endswith("run_1")
+        assert not (tmp_path / "inbox_done" / "a.docx").exists()
+        assert watcher.stats.failed == 1
+
+    def test_per_folder_intent_and_config(self, tmp_path):
+        """Test that each folder is processed with its own intent and model."""
+        reports = tmp_path / "reports"
+        letters = tmp_path / "letters"
+        reports.mkdir()
+        letters.mkdir()
+        watcher, calls = make_watcher(tmp_path, [
+            WatchFolder(str(reports), "Update TOC", model="claude37"),
+            WatchFolder(str(letters), "Apply letterhead", model="gpt5"),
+        ])
+        try:
+            # The same content is processed again for a different intent
+            write_docx(reports / "r.docx")
+            write_docx(letters / "l.docx")
+            settle(watcher)
+        finally:
+            watcher.stop()
+        assert sorted(calls) == [("l.docx", "Apply letterhead", "gpt5"), ("r.docx", "Update TOC", "claude37")]
+
+    def test_workers_initialize_com(self, tmp_path, inbox):
+        """Test that documents are processed on worker threads with COM initialized."""
+        events = []
+
+        class FakePythoncom:
+            @staticmethod
+            def CoInitialize():
+                events.append(("init", threading.current_thread().name))
+
+            @staticmethod
+            def CoUninitialize():
+                events.append(("uninit", threading.current_thread().name))
+
+        watcher, calls = make_watcher(tmp_path, [WatchFolder(str(inbox), "Format")])
+        pipeline_factory = watcher.pipeline_factory
+
+        def factory(folder):
+            pipeline = pipeline_factory(folder)
+            process_document = pipeline.process_document
+            pipeline.process_document = lambda path, intent: (
+                events.append(("job", threading.current_thread().name)) or process_document(path, intent))
+            return pipeline
+
+        watcher.pipeline_factory = factory
+        try:
+            write_docx(inbox / "a.docx")
+            with patch("autoword.vnext.watchdog.pythoncom", FakePythoncom):
+                settle(watcher)
+        finally:
+            watcher.stop()
+
+        worker = events[0][1]
+        assert worker.startswith("watch-worker")
+        assert events == [("init", worker), ("job", worker), ("uninit", worker)]
+
+    def test_parallel_workers_keep_separate_run_logs(self, tmp_path, inbox):
+        """Test that documents processed at the same time log into their own run directories."""
+        calls = []
+        overlap = threading.Barrier(2)
+        watcher = FolderWatcher(
+            [WatchFolder(str(inbox), "Format")],
+            lambda folder: LoggingPipeline(str(tmp_path), folder, calls, overlap=overlap),
+            manifest_path=tmp_path / MANIFEST_FILE, settle_seconds=2.0, use_fs_events=False, workers=2)
+        watcher.start()
+        try:
+            write_docx(inbox / "a.docx", "first")
+            write_docx(inbox / "b.docx", "second")
+            settle(watcher)
+        finally:
+            watcher.stop()
+
+        assert watcher.stats.processed == 2
+        for name, other in (("a.docx", "b.docx"), ("b.docx", "a.docx")):
+            log = (tmp_path / f"log_{name}" / "pipeline.log").read_text(encoding="utf-8")
+            assert f"Starting pipeline stage: Extract {name}" in log
+            assert f"Completed pipeline stage: Extract {name}" in log
+            assert other not in log
+
+    def test_file_error_leaves_document_for_next_scan(self, tmp_path, inbox):
+        """Test that an I/O error on one file neither stops the scan nor loses the file."""
+        watcher, calls = make_watcher(tmp_path, [WatchFolder(str(inbox), "Format")])
+        failing = {str(inbox / "a.docx")}
+
+        def sha256(path):
+            if path in failing:
+                raise PermissionError(f"Access denied: {path}")
+            return file_sha256(path)
+
+        try:
+            write_docx(inbox / "a.docx")
+            write_docx(inbox / "b.docx", "other content")
+            with patch("autoword.vnext.watch_folder.file_sha256", side_effect=sha256):
+                assert settle(watcher) == [str(inbox / "b.docx")]
+                assert (inbox / "a.docx").exists()
+                failing.clear()
+                assert watcher.scan(now=20) == [str(inbox / "a.docx")]
+            assert wait_for(lambda: watcher.idle())
+        finally:
+            watcher.stop()
+        assert sorted(call[0] for call in calls) == ["a.docx", "b.docx"]
+
+    def test_run_loop_picks_up_arrivals(self, tmp_path, inbox):
+        """Test that the watch loop processes a dropped document within its poll and settle time."""
+        calls = []
+        watcher = FolderWatcher([WatchFolder(str(inbox), "Format")],
+                                lambda folder: FakePipeline(str(tmp_path), folder, calls),
+                                manifest_path=tmp_path / MANIFEST_FILE,
+                                poll_interval_seconds=0.05, settle_seconds=0.2, use_fs_events=False)
+        stop = threading.Event()
+        thread = threading.Thread(target=watcher.run, args=(stop,))
+        thread.start()
+        try:
+            time.sleep(0.1)
+            write_docx(inbox / "a.docx")
+            assert wait_for(lambda: (tmp_path / "inbox_done" / "a.docx").exists(), timeout=5)
+        finally:
+            stop.set()
+            thread.join(timeout=10)
+        assert calls == [("a.docx", "Format", None)]
+
+
+class TestWatchCommand:
+    """Test the watch CLI command."""
+
+    def test_watcher_error_exit_code(self, tmp_path, inbox, capsys):
+        """Test that the command fails when watching stops with an error."""
+        argv = ["autoword.vnext.cli", "--audit-dir", str(tmp_path / "audit"), "watch", str(inbox), "Format"]
+        with patch.object(sys, "argv", argv), \
+                patch("autoword.vnext.watch_folder.FolderWatcher.run", side_effect=OSError("Disk full")):
+            assert cli.main() == 1
+        assert "Disk full" in capsys.readouterr().out
+
+
+class TestWatchConfig:
+    """Test loading watch folder configurations."""
+
+    def test_load_relative_paths(self, tmp_path):
+        """Test that folder paths are resolved against the configuration file."""
+        config = tmp_path / "watch.json"
+        config.write_text(json.dumps({"folders": [
+            {"path": "in", "intent": "Format", "model": "claude37", "failed_dir": "errors"}
+        ]}), encoding="utf-8")
+
+        folder, = load_watch_config(config)
+        assert folder.path == str(tmp_path / "in")
+        assert folder.output_dir == str(tmp_path / "in_done")
+        assert folder.failed_dir == str(tmp_path / "errors")
+        assert folder.config == {"model": "claude37", "temperature": 0.1}
+
+    @pytest.mark.parametrize("content", [
+        "not json",
+        json.dumps({"folders": []}),
+        json.dumps({"folders": [{"path": "in"}]}),
+        json.dumps({"folders": [{"path": "in", "intent": "Format", "unknown": 1}]}),
+    ])
+    def test_invalid_config(self, tmp_path, content):
+        """Test that invalid configurations are rejected."""
+        config = tmp_path / "watch.json"
+        config.write_text(content, encoding="utf-8")
+        with pytest.raises(ValueError):
+            load_watch_config(config)
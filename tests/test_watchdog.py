@@ -0,0 +1,287 @@
+"""
+Tests for the Word COM watchdog.
+
+A fake Word server (a sleeping child process) stands in for WINWORD.EXE; its
+calls block like a hung COM call until they finish or the server process
+dies, in which case they fail like an RPC call to a dead server.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from autoword.vnext.checkpoint import CheckpointStore
+from autoword.vnext.cli import pipeline_timeouts, report_result
+from autoword.vnext.exceptions import ValidationError, WordTimeoutError
+from autoword.vnext.models import InventoryFullV1, ProcessingResult
+from autoword.vnext.watchdog import ComWatchdog
+
+
+SPAWN_CHILD = (
+    "import subprocess, sys, time; "
+    "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(120)']); "
+    "time.sleep(120)"
+)
+
+
+class FakeWordServer:
+    """Sleeping process with blocking calls that fail once it is killed."""
+
+    def __init__(self, spawn_child: bool = False):
+        code = SPAWN_CHILD if spawn_child else "import time; time.sleep(120)"
+        self.process = subprocess.Popen([sys.executable, "-c", code])
+        self.pid = self.process.pid
+
+    def call(self, seconds: float) -> str:
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise OSError("The RPC server is unavailable")
+            time.sleep(0.02)
+        return "done"
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self):
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+
+
+@pytest.fixture
+def word():
+    server = FakeWordServer()
+    yield server
+    server.close()
+
+
+def make_watchdog(word, **kwargs):
+    return ComWatchdog(process_finder=lambda: [word.pid], **kwargs)
+
+
+class TestComWatchdog:
+    """Test deadlines and killing of the Word process tree."""
+
+    def test_operation_timeout_kills_word(self, word):
+        """Test that an expired operation kills Word and raises WordTimeoutError."""
+        expiries = []
+        watchdog = make_watchdog(word, on_timeout=expiries.append)
+        try:
+            started = time.monotonic()
+            with pytest.raises(WordTimeoutError) as exc_info:
+                with watchdog.operation("Repaginate", timeout_seconds=0.3):
+                    word.call(60)
+            assert time.monotonic() - started < 10
+        finally:
+            watchdog.stop()
+
+        assert not word.alive()
+        assert exc_info.value.details["operation"] == "Repaginate"
+        assert exc_info.value.details["timeout_seconds"] == 0.3
+        assert len(expiries) == 1 and expiries[0].killed_pids == [word.pid]
+
+    def test_fast_call_passes(self, word):
+        """Test that calls finishing within their deadline are not affected."""
+        watchdog = make_watchdog(word)
+        try:
+            with watchdog.stage("Execute", timeout_seconds=5):
+                with watchdog.operation("Documents.Open", timeout_seconds=5):
+                    assert word.call(0.05) == "done"
+        finally:
+            watchdog.stop()
+        assert word.alive()
+        assert watchdog.expiries == []
+
+    def test_stage_converts_wrapped_errors(self, word):
+        """Test that errors wrapped by the component still surface as a stage timeout."""
+        watchdog = make_watchdog(word)
+        try:
+            with pytest.raises(WordTimeoutError) as exc_info:
+                with watchdog.stage("Validate", timeout_seconds=30):
+                    try:
+                        with watchdog.operation("Fields.Update", timeout_seconds=0.3):
+                            word.call(60)
+                    except Exception as e:
+                        raise ValidationError(f"Failed to update fields: {e}")
+        finally:
+            watchdog.stop()
+
+        assert exc_info.value.details["stage"] == "Validate"
+        assert exc_info.value.details["operation"] == "Fields.Update"
+
+    def test_swallowed_error_still_fails_stage(self, word):
+        """Test that a stage cannot finish normally after Word was killed."""
+        watchdog = make_watchdog(word)
+        try:
+            with pytest.raises(WordTimeoutError, match="Extract"):
+                with watchdog.stage("Extract", timeout_seconds=0.3):
+                    try:
+                        word.call(60)
+                    except OSError:
+                        pass  # Extractors log and skip failing items
+        finally:
+            watchdog.stop()
+
+    def test_kills_process_tree(self):
+        """Test that children of the Word process are killed too."""
+        word = FakeWordServer(spawn_child=True)
+        psutil = pytest.importorskip("psutil")
+        try:
+            deadline = time.monotonic() + 10
+            while not psutil.Process(word.pid).children() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            child = psutil.Process(word.pid).children()[0]
+
+            watchdog = make_watchdog(word)
+            try:
+                with pytest.raises(WordTimeoutError):
+                    with watchdog.operation("Documents.Open", timeout_seconds=0.2):
+                        word.call(60)
+            finally:
+                watchdog.stop()
+
+            assert sorted(watchdog.expiries[0].killed_pids) == sorted([word.pid, child.pid])
+            assert not child.is_running() or child.status() == psutil.STATUS_ZOMBIE
+        finally:
+            word.close()
+
+    def test_attached_process_and_disabled_deadlines(self, word):
+        """Test killing attached processes and deadlines disabled with 0."""
+        watchdog = ComWatchdog(stage_timeouts={"Execute": 0}, operation_timeout_seconds=0)
+        try:
+            with watchdog.stage("Execute"), watchdog.operation("Save"):
+                word.call(0.05)
+            assert watchdog._thread is None
+
+            watchdog.attach_process(word.pid)
+            with pytest.raises(WordTimeoutError):
+                with watchdog.operation("Save", timeout_seconds=0.2):
+                    word.call(60)
+        finally:
+            watchdog.stop()
+        assert not word.alive()
+
+    def test_only_attached_processes_are_killed(self, word):
+        """Test that detached, unattached and reused PIDs survive an expiry."""
+        other_worker = FakeWordServer()
+        watchdog = ComWatchdog()
+        try:
+            # Nothing attached: another worker's Word must not be taken for this run's
+            with pytest.raises(WordTimeoutError):
+                with watchdog.operation("Save", timeout_seconds=0.2):
+                    word.call(1)
+            assert watchdog.expiries[0].killed_pids == []
+
+            # Word quit by the stage: its PID is detached
+            watchdog.attach_process(word.pid)
+            watchdog.detach_process(word.pid)
+            with pytest.raises(WordTimeoutError):
+                with watchdog.operation("Save", timeout_seconds=0.2):
+                    word.call(1)
+            assert watchdog.expiries[1].killed_pids == []
+
+            # The PID now belongs to a process created at another time
+            watchdog.attach_process(word.pid)
+            watchdog._word_processes[word.pid] -= 60
+            with pytest.raises(WordTimeoutError):
+                with watchdog.operation("Save", timeout_seconds=0.2):
+                    word.call(1)
+            assert watchdog.expiries[2].killed_pids == []
+            assert word.alive() and other_worker.alive()
+        finally:
+            watchdog.stop()
+            other_worker.close()
+
+
+    def test_attach_callbacks(self, word):
+        """Test that attached and detached Word PIDs are reported."""
+        attached, detached = [], []
+        watchdog = ComWatchdog(on_attach=attached.append, on_detach=detached.append)
+        watchdog.attach_process(word.pid)
+        watchdog.detach_process(word.pid)
+        watchdog.detach_process(None)
+
+        assert attached == [word.pid]
+        assert detached == [word.pid]
+
+
+class TestPipelineTimeout:
+    """Test the TIMEOUT status of pipeline runs."""
+
+    def test_hung_validate_ends_with_timeout(self, tmp_path, word):
+        """Test that a hung Word call during Validate kills Word and leaves the run resumable."""
+        from autoword.vnext.pipeline import VNextPipeline
+        from tests.test_checkpoint import make_plan, make_structure
+
+        document = tmp_path / "input.docx"
+        document.write_bytes(b"document")
+
+        def execute(pipeline, plan):
+            return pipeline.working_docx_path
+
+        def validate(pipeline, structure, modified_docx_path):
+            pipeline.watchdog.attach_process(word.pid)
+            word.call(60)
+
+        pipeline = VNextPipeline(base_audit_dir=str(tmp_path / "audit"), enable_memory_monitoring=False,
+                                 stage_timeouts={"Validate": 0.5})
+        with patch.object(VNextPipeline, "_extract_document", return_value=(make_structure(), InventoryFullV1())), \
+                patch.object(VNextPipeline, "_generate_plan", return_value=make_plan()), \
+                patch.object(VNextPipeline, "_execute_plan", autospec=True, side_effect=execute), \
+                patch.object(VNextPipeline, "_validate_modifications", autospec=True, side_effect=validate):
+            started = time.monotonic()
+            result = pipeline.process_document(str(document), "Remove introduction")
+
+        assert time.monotonic() - started < 30
+        assert result.status == "TIMEOUT"
+        assert not word.alive()
+        assert "Validate" in result.message
+        with open(os.path.join(result.audit_directory, "result.status.txt"), encoding="utf-8") as f:
+            assert "TIMEOUT" in f.read()
+        # Timed-out runs are not finished, so resume() continues them
+        assert CheckpointStore.open(result.audit_directory).result is None
+        assert pipeline.watchdog is None
+
+
+    def test_memory_monitor_tracks_attached_word(self, tmp_path, word):
+        """Test that the run's memory monitor samples the Word attached to the watchdog."""
+        from autoword.vnext.pipeline import VNextPipeline
+
+        document = tmp_path / "input.docx"
+        document.write_bytes(b"document")
+        other_worker = FakeWordServer()
+        pipeline = VNextPipeline(base_audit_dir=str(tmp_path / "audit"))
+        pipeline._setup_run_environment(str(document))
+        try:
+            monitor = pipeline.vnext_logger.memory_monitor
+            pipeline.watchdog.attach_process(word.pid)
+            monitor.sample_word_processes()
+            assert monitor.get_word_stats()["tracked_pids"] == [word.pid]
+
+            pipeline.watchdog.detach_process(word.pid)
+            assert monitor.sample_word_processes() is None
+        finally:
+            pipeline._cleanup_run_environment()
+            other_worker.close()
+
+
+class TestCliTimeouts:
+    """Test CLI handling of watchdog options and the TIMEOUT status."""
+
+    def test_pipeline_timeouts(self):
+        """Test parsing --stage-timeout and --operation-timeout."""
+        args = argparse.Namespace(stage_timeout=["execute=600", "Validate=0"], operation_timeout=60.0)
+        assert pipeline_timeouts(args) == {"stage_timeouts": {"Execute": 600.0, "Validate": 0.0},
+                                           "operation_timeout_seconds": 60.0}
+        with pytest.raises(ValueError):
+            pipeline_timeouts(argparse.Namespace(stage_timeout=["Execute"], operation_timeout=60.0))
+
+    def test_timeout_exit_code(self):
+        """Test the exit code of timed-out runs."""
+        assert report_result(ProcessingResult(status="TIMEOUT")) == 6